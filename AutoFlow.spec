@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('autoflow/dist', 'ui'), ('excel', 'excel'), ('screenshot', 'screenshot')],
-    hiddenimports=['webview', 'flask', 'requests', 'PIL', 'PIL.Image', 'PIL.ImageStat', 'PIL.ImageGrab', 'PIL.ImageChops', 'pyautogui', 'docx', 'pygetwindow', 'clr_loader', 'clr', 'tkinter', 'tkinter.filedialog'],
+    hiddenimports=['webview', 'http.server', 'requests', 'PIL', 'PIL.Image', 'PIL.ImageStat', 'PIL.ImageGrab', 'PIL.ImageChops', 'pyautogui', 'docx', 'pygetwindow', 'clr_loader', 'clr', 'tkinter', 'tkinter.filedialog'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -10,6 +10,7 @@ import LogModal from './components/LogModal';
 import HelpModal from './components/HelpModal';
 import UpdateDialog from './components/UpdateDialog';
 import { ViewType, AutomationConfig, DisplaySettings, TaskStatus } from './types';
+import { subscribeProgress } from './progress';
 
 const App: React.FC = () => {
   const [currentView, setCurrentView] = useState<ViewType>('dashboard');
@@ -249,50 +250,43 @@ const App: React.FC = () => {
       retryCount++;
     }, 500);
 
-    // Polling task status
-    const interval = setInterval(async () => {
-      // @ts-ignore
-      // @ts-ignore
-      if (window.pywebview?.api) {
-        // @ts-ignore
-        const status = await window.pywebview.api.get_task_status();
-        if (status) {
-          setTaskStatus(status);
-
-          // Check for new errors
-          const currentErrors = status.errors || [];
-          if (currentErrors.length > lastErrorCount.current) {
-            // New error detected!
-            const newError = currentErrors[currentErrors.length - 1];
-            const toastId = Date.now();
-            setToasts(prev => [...prev, { id: toastId, ...newError }]);
-
-            // Auto remove toast after 6 seconds
-            setTimeout(() => {
-              setToasts(prev => prev.filter(t => t.id !== toastId));
-            }, 6000);
-
-            lastErrorCount.current = currentErrors.length;
-          }
+    // Task status and history are pushed by the backend (see progress.ts)
+    const handleStatus = (status: any) => {
+      setTaskStatus(status);
 
-          // Reset error count if status becomes idle and errors are cleared in backend (optional)
-          if (status.status === 'idle' && currentErrors.length === 0) {
-            lastErrorCount.current = 0;
-          }
-        }
+      // Check for new errors
+      const currentErrors = status.errors || [];
+      if (currentErrors.length > lastErrorCount.current) {
+        // New error detected!
+        const newError = currentErrors[currentErrors.length - 1];
+        const toastId = Date.now();
+        setToasts(prev => [...prev, { id: toastId, ...newError }]);
 
-        // Poll app state for history (every 2s might be heavy, maybe separate interval? 
-        // optimize: only fetch if view is logs or header needs it. But header always needs it for notifications.
-        // Let's optimize by fetching history separately or assuming get_app_state is fast enough)
-        // @ts-ignore
-        const appState = await window.pywebview.api.get_app_state();
-        if (appState && appState.history) {
-          setHistory(appState.history);
-        }
+        // Auto remove toast after 6 seconds
+        setTimeout(() => {
+          setToasts(prev => prev.filter(t => t.id !== toastId));
+        }, 6000);
+
+        lastErrorCount.current = currentErrors.length;
       }
-    }, 2000);
 
-    return () => clearInterval(interval);
+      // Reset error count if status becomes idle and errors are cleared in backend (optional)
+      if (status.status === 'idle' && currentErrors.length === 0) {
+        lastErrorCount.current = 0;
+      }
+    };
+
+    const unsubscribe = subscribeProgress(events => {
+      events.forEach(event => {
+        if (event.type === 'status') handleStatus(event.status);
+        else if (event.type === 'state') setHistory(event.history);
+      });
+    });
+
+    return () => {
+      clearInterval(retryInterval);
+      unsubscribe();
+    };
   }, []);
 
   // Save settings when they change
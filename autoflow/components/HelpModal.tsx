@@ -56,7 +56,7 @@ const HelpModal: React.FC<HelpModalProps> = ({ isOpen, onClose }) => {
                                 <div className="grid grid-cols-2 gap-3 text-xs font-medium">
                                     <div className="p-3 bg-slate-50 dark:bg-slate-800/50 rounded-xl border border-slate-100 dark:border-slate-700 flex items-center gap-2">
                                         <span className="material-symbols-outlined text-base text-emerald-500">done_all</span>
-                                        <span className="dark:text-slate-300">支援 .xlsx, .xls, .csv</span>
+                                        <span className="dark:text-slate-300">支援 .xlsx, .csv, .parquet</span>
                                     </div>
                                     <div className="p-3 bg-slate-50 dark:bg-slate-800/50 rounded-xl border border-slate-100 dark:border-slate-700 flex items-center gap-2">
                                         <span className="material-symbols-outlined text-base text-emerald-500">group</span>
@@ -0,0 +1,69 @@
+// 後端進度事件（core/progress_channel.py）：Bridge 以 evaluate_js 發出 'autoflow-progress' 視窗事件，
+// 頁面剛載入或偵測到漏接時改用 get_progress_since 補回，不再定時輪詢。
+
+export interface ProgressEvent {
+  seq: number;
+  type: 'status' | 'state' | 'results' | 'url';
+  [key: string]: any;
+}
+
+export interface ProgressBatch {
+  after: number;
+  seq: number;
+  reset?: boolean;
+  events: ProgressEvent[];
+}
+
+export const subscribeProgress = (onEvents: (events: ProgressEvent[], reset: boolean) => void): (() => void) => {
+  let lastSeq = 0;
+  let syncing = false;
+  let resyncPending = false;
+  let disposed = false;
+
+  const sync = async () => {
+    if (disposed || !window.pywebview?.api) return;
+    if (syncing) {
+      resyncPending = true;
+      return;
+    }
+    syncing = true;
+    try {
+      const batch = await window.pywebview.api.get_progress_since(lastSeq);
+      // 補回期間若已經由推送收到更新的事件，這份結果就過時了
+      if (!disposed && batch && (batch.reset || batch.seq > lastSeq) && batch.after === lastSeq) {
+        lastSeq = batch.seq;
+        onEvents(batch.events, !!batch.reset);
+      }
+    } catch (e) {
+      console.error('Failed to sync progress', e);
+    } finally {
+      syncing = false;
+      if (resyncPending) {
+        resyncPending = false;
+        sync();
+      }
+    }
+  };
+
+  const onPush = (e: Event) => {
+    const batch = (e as CustomEvent<ProgressBatch>).detail;
+    if (!batch || batch.seq <= lastSeq) return;
+    if (batch.after > lastSeq) {
+      // 中間有批次沒收到（例如頁面載入前的推送），改用補回
+      sync();
+      return;
+    }
+    lastSeq = batch.seq;
+    onEvents(batch.events, false);
+  };
+
+  window.addEventListener('autoflow-progress', onPush);
+  window.addEventListener('pywebviewready', sync);
+  sync();
+
+  return () => {
+    disposed = true;
+    window.removeEventListener('autoflow-progress', onPush);
+    window.removeEventListener('pywebviewready', sync);
+  };
+};
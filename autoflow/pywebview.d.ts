@@ -2,7 +2,7 @@
 interface PyWebViewAPI {
     // Excel conversion
     select_excel_file(): Promise<{ status: string; path?: string; filename?: string }>;
-    run_excel_convert(start_date?: string, end_date?: string): Promise<any>;
+    run_excel_convert(start_date?: string, end_date?: string, rows?: Record<string, string>[], incremental?: boolean): Promise<any>;
 
     // Screenshot automation
     select_file(file_types?: any): Promise<any>;
@@ -11,6 +11,12 @@ interface PyWebViewAPI {
     select_directory(): Promise<any>;
     start_screenshot(config: any): Promise<any>;
     get_task_status(): Promise<any>;
+    get_progress_since(seq?: number): Promise<{
+        after: number;
+        seq: number;
+        reset: boolean;
+        events: { seq: number; type: 'status' | 'state' | 'results' | 'url'; [key: string]: any }[];
+    }>;
 
     // File operations
     open_file(path: string): Promise<boolean>;
@@ -19,6 +19,8 @@ export interface Task {
 
 export interface AutomationConfig {
   waitPerPage: { min: number, max: number }; // replace simple number
+  adaptiveWait?: boolean; // 頁面穩定就截圖，waitPerPage 改為下限/上限
+  learnedWait?: boolean; // 依各網域歷史載入時間決定等待
   screenshotDelay: number;
   cropEnabled: boolean;
   cropTop: number;
@@ -30,6 +32,7 @@ export interface AutomationConfig {
   keywords: string[];
   autoWordExport: boolean;
   skipDone: boolean;
+  doneStore?: 'json' | 'sqlite';
   // Extended Config
   captchaKeywords: string[];
   notFoundKeywords: string[];
@@ -38,6 +41,12 @@ export interface AutomationConfig {
   textCheckEnabled: boolean;
   scrollCapture: boolean;
   scrollStitch: boolean;
+  streamStitch?: boolean;
+  captureEngine?: 'desktop' | 'browser';
+  browserHeadless?: boolean;
+  cdpMode?: boolean;
+  concurrentPages?: number;
+  shardWorkers?: number; // 多程序分片數（browser 引擎）
   scrollTimes: number;
   customCategories?: Record<string, string[]>;
   categoryPause?: Record<string, boolean>;
@@ -1,6 +1,7 @@
 
 import React, { useRef, useState, useEffect } from 'react';
 import { AutomationConfig, Task, TaskStatus } from '../types';
+import { subscribeProgress } from '../progress';
 
 interface DashboardProps {
   onOpenConfig: () => void;
@@ -22,6 +23,7 @@ const Dashboard: React.FC<DashboardProps> = ({
   const [outputFiles, setOutputFiles] = useState<{ name: string, path: string }[]>([]);
   const [outputFolder, setOutputFolder] = useState<string | null>(null);
   const [dateRange, setDateRange] = useState<{ start: string, end: string }>({ start: '', end: '' });
+  const [incrementalConvert, setIncrementalConvert] = useState(false);
   const [isStartingTask, setIsStartingTask] = useState(false);
   const [defaultOutputDir, setDefaultOutputDir] = useState<string>('');
   const [isOutputListCollapsed, setIsOutputListCollapsed] = useState(false);
@@ -30,6 +32,7 @@ const Dashboard: React.FC<DashboardProps> = ({
   // Screenshot State
   const [screenshotStatus, setScreenshotStatus] = useState<{ processed: number, total: number, status: string }>({ processed: 0, total: 0, status: 'idle' });
   const [appState, setAppState] = useState<any>({ stats: {}, history: [] });
+  const [lastUrlResult, setLastUrlResult] = useState<any>(null); // 最近一個網址的結果（狀態、分類、耗時）
 
   const handleMoveToScreenshot = (path: string, name: string, urlCount?: number) => {
     // 累加模式：將新檔案加入現有的輸入清單
@@ -148,58 +151,22 @@ const Dashboard: React.FC<DashboardProps> = ({
     fileInputRef.current?.click();
   };
 
-  // Polling State
+  // Progress State (pushed by the backend, see progress.ts)
   useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        // @ts-ignore
-        if (window.pywebview && window.pywebview.api) {
-          // @ts-ignore
-          // @ts-ignore
-          const status = await window.pywebview.api.get_task_status();
-          if (status) {
-            setScreenshotStatus(prev => {
-              if (JSON.stringify(prev) !== JSON.stringify(status)) return status;
-              return prev;
-            });
-          }
-
-          // @ts-ignore
-          const state = await window.pywebview.api.get_app_state();
-          if (state) {
-            let latestResults = undefined;
-            try {
-              // @ts-ignore
-              const r = await window.pywebview.api.get_latest_screenshot_results();
-              if (r && r.results) latestResults = r.results;
-            } catch (e) { }
-
-            setAppState(prev => {
-              // If we got new results, use them. Otherwise keep previous results (or undefined if never set)
-              // Actually, if we got results (even empty list), we should use it.
-              // Logic: get_app_state doesn't include latest_screenshot_results.
-              const combined = {
-                ...state,
-                latest_screenshot_results: latestResults !== undefined ? latestResults : (prev?.latest_screenshot_results || [])
-              };
-
-              if (JSON.stringify(prev) !== JSON.stringify(combined)) {
-                return combined;
-              }
-              return prev;
-            });
-          }
-        } else {
-          // Fallback for dev mode
-          const res = await fetch('http://localhost:8000/api/status');
-          const data = await res.json();
-          console.log("System Status:", data);
+    return subscribeProgress((events, reset) => {
+      if (reset) setLastUrlResult(null);
+      events.forEach(event => {
+        if (event.type === 'status') {
+          setScreenshotStatus(event.status);
+        } else if (event.type === 'state') {
+          setAppState((prev: any) => ({ ...prev, history: event.history, stats: event.stats }));
+        } else if (event.type === 'results') {
+          setAppState((prev: any) => ({ ...prev, latest_screenshot_results: event.results }));
+        } else if (event.type === 'url') {
+          setLastUrlResult(event);
         }
-      } catch (e) {
-        console.error("Failed to poll status", e);
-      }
-    }, 1000);
-    return () => clearInterval(interval);
+      });
+    });
   }, []);
 
   // Update default output dir when input file changes
@@ -284,7 +251,7 @@ const Dashboard: React.FC<DashboardProps> = ({
     if (window.pywebview && window.pywebview.api) {
       try {
         // @ts-ignore
-        const res = await window.pywebview.api.run_excel_convert(dateRange.start, dateRange.end);
+        const res = await window.pywebview.api.run_excel_convert(dateRange.start, dateRange.end, undefined, incrementalConvert);
         if (res.status === 'success') {
           setOutputFiles(res.output_files || []);
           setOutputFolder(res.output_folder);
@@ -432,6 +399,7 @@ const Dashboard: React.FC<DashboardProps> = ({
         // @ts-ignore
         await window.pywebview.api.clear_latest_results();
       }
+      setLastUrlResult(null);
       setUploadedFile(null);
       setOutputFiles([]);
       setOutputFolder('');
@@ -518,7 +486,7 @@ const Dashboard: React.FC<DashboardProps> = ({
                 </div>
               </div>
 
-              <input type="file" ref={fileInputRef} className="hidden" accept=".xlsx,.xls,.csv" onChange={handleFileChange} />
+              <input type="file" ref={fileInputRef} className="hidden" accept=".xlsx,.csv,.parquet,.feather,.arrow" onChange={handleFileChange} />
 
               {uploadedFile ? (
                 <div className="flex flex-col items-center justify-center gap-3 py-6 px-6 rounded-xl border-2 border-emerald-500/30 bg-emerald-50/20 dark:bg-emerald-500/5 transition-all group relative">
@@ -540,7 +508,7 @@ const Dashboard: React.FC<DashboardProps> = ({
                   </div>
                   <div className="text-center">
                     <p className="text-sm font-bold dark:text-slate-200">選擇 Excel 檔案</p>
-                    <p className="text-[10px] text-slate-400 mt-1">支援 .xlsx, .xls</p>
+                    <p className="text-[10px] text-slate-400 mt-1">支援 .xlsx, .csv, .parquet</p>
                   </div>
                 </div>
               )}
@@ -636,6 +604,16 @@ const Dashboard: React.FC<DashboardProps> = ({
                 </div>
               )}
 
+              <label className="mx-1 flex items-center gap-2 cursor-pointer select-none">
+                <input
+                  type="checkbox"
+                  checked={incrementalConvert}
+                  onChange={(e) => setIncrementalConvert(e.target.checked)}
+                  className="w-4 h-4 rounded border-slate-300 text-emerald-600 focus:ring-emerald-500 cursor-pointer"
+                />
+                <span className="text-[11px] font-bold text-slate-500 dark:text-slate-400">只轉換上次之後新增的資料列</span>
+              </label>
+
               <button
                 onClick={handleConvert}
                 disabled={!uploadedFile || (!!dateRange.start && !!dateRange.end && new Date(dateRange.start) > new Date(dateRange.end))}
@@ -927,6 +905,14 @@ const Dashboard: React.FC<DashboardProps> = ({
                 </span>
               ) : (screenshotStatus.processed > 0 && screenshotStatus.processed === screenshotStatus.total ? '任務已全數完成' : '正等待工作排程')}
             </div>
+            {lastUrlResult && (
+              <div className="flex items-center gap-2 text-[10px] text-slate-500 dark:text-slate-400" title={lastUrlResult.error || lastUrlResult.url}>
+                <span className={`size-1.5 rounded-full shrink-0 ${lastUrlResult.status === 'success' ? 'bg-emerald-500' : lastUrlResult.status === 'error' ? 'bg-red-500' : 'bg-amber-500'}`}></span>
+                <span className="truncate flex-1">{lastUrlResult.url}</span>
+                {lastUrlResult.classification && <span className="shrink-0 font-bold">{lastUrlResult.classification}</span>}
+                {lastUrlResult.seconds != null && <span className="shrink-0 tabular-nums">{lastUrlResult.seconds.toFixed(1)}s</span>}
+              </div>
+            )}
           </div>
 
           <div className="space-y-4 border-t border-slate-100 dark:border-slate-800 pt-5">
@@ -1,7 +1,28 @@
+import fs from 'fs';
 import path from 'path';
-import { defineConfig, loadEnv } from 'vite';
+import zlib from 'zlib';
+import { defineConfig, loadEnv, Plugin } from 'vite';
 import react from '@vitejs/plugin-react';
 
+// 建置後為文字類檔案產生 .br / .gz，core/static_server.py 啟動時直接載入使用
+const precompress = (): Plugin => ({
+  name: 'autoflow-precompress',
+  apply: 'build',
+  writeBundle(options, bundle) {
+    const outDir = options.dir || path.resolve(__dirname, 'dist');
+    for (const fileName of Object.keys(bundle)) {
+      if (!/\.(js|mjs|css|html|svg|json)$/.test(fileName)) continue;
+      const file = path.join(outDir, fileName);
+      const data = fs.readFileSync(file);
+      if (data.length < 1024) continue;
+      fs.writeFileSync(`${file}.br`, zlib.brotliCompressSync(data, {
+        params: { [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY },
+      }));
+      fs.writeFileSync(`${file}.gz`, zlib.gzipSync(data, { level: 9 }));
+    }
+  },
+});
+
 export default defineConfig(({ mode }) => {
     const env = loadEnv(mode, '.', '');
     return {
@@ -9,7 +30,7 @@ export default defineConfig(({ mode }) => {
         port: 3000,
         host: '0.0.0.0',
       },
-      plugins: [react()],
+      plugins: [react(), precompress()],
       define: {
         'process.env.API_KEY': JSON.stringify(env.GEMINI_API_KEY),
         'process.env.GEMINI_API_KEY': JSON.stringify(env.GEMINI_API_KEY)
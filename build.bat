@@ -34,7 +34,7 @@ if "%BUILD_MODE%"=="FULL" (
         --add-data "autoflow/dist;ui" ^
         --add-data "excel;excel" ^
         --add-data "screenshot;screenshot" ^
-        --hidden-import webview --hidden-import flask --hidden-import requests ^
+        --hidden-import webview --hidden-import http.server --hidden-import requests ^
         --hidden-import PIL --hidden-import PIL.Image --hidden-import PIL.ImageStat --hidden-import PIL.ImageGrab --hidden-import PIL.ImageChops ^
         --hidden-import pyautogui --hidden-import docx --hidden-import pygetwindow ^
         --hidden-import clr_loader --hidden-import clr ^
@@ -58,7 +58,7 @@ if "%BUILD_MODE%"=="FULL" (
             --add-data "autoflow/dist;ui" ^
             --add-data "excel;excel" ^
             --add-data "screenshot;screenshot" ^
-            --hidden-import webview --hidden-import flask --hidden-import requests ^
+            --hidden-import webview --hidden-import http.server --hidden-import requests ^
             --hidden-import PIL --hidden-import PIL.Image --hidden-import PIL.ImageStat --hidden-import PIL.ImageGrab --hidden-import PIL.ImageChops ^
             --hidden-import pyautogui --hidden-import docx --hidden-import pygetwindow ^
             --hidden-import clr_loader --hidden-import clr ^
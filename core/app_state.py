@@ -0,0 +1,183 @@
+import atexit
+import copy
+import datetime
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+DEFAULT_STATS = {
+    "total_conversions": 0,
+    "total_tasks": 0,
+    "success_rate": "100%",
+    "time_saved": "0h",
+}
+HISTORY_LIMIT = 100
+# 連續寫入合併成一次：最後一次變更後等多久才寫檔
+SAVE_DEBOUNCE_SECONDS = 0.5
+
+
+def format_seconds(total_s: float) -> str:
+    if total_s < 60:
+        return f"{total_s:.1f}s"
+    if total_s < 3600:
+        return f"{int(total_s // 60)}m {int(total_s % 60)}s"
+    return f"{int(total_s // 3600)}h {int((total_s % 3600) // 60)}m"
+
+
+class AppState:
+    """
+    app_data.json（歷史紀錄、統計、設定）的記憶體服務：
+    - 啟動時讀一次檔，之後的讀取都從記憶體回傳（Dashboard 輪詢 get_app_state 不再反覆解析 JSON）；
+    - 變更後延遲 debounce 秒再寫檔，期間的多次變更合併成一次；寫入先寫暫存檔再 os.replace，不會留下寫一半的檔案；
+    - 所有操作以鎖保護，截圖工作執行緒與 UI 執行緒可同時呼叫；
+    - 成功率以計數器增量更新，不必每次重掃歷史紀錄。
+    程式結束時（atexit 或呼叫 close()）會把尚未寫入的變更寫回。
+    """
+
+    def __init__(self, path: str | Path, debounce: float = SAVE_DEBOUNCE_SECONDS):
+        self.path = Path(path)
+        self.debounce = max(0.0, float(debounce))
+        self.saves = 0
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+        self._data = self._read()
+        self._successes = sum(1 for h in self._data["history"] if h.get("status") == "Completed")
+        if not self.path.exists():
+            self._dirty = True
+            self.flush()
+        atexit.register(self.flush)
+
+    def _read(self) -> dict:
+        data = {}
+        try:
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        if not isinstance(data.get("stats"), dict):
+            data["stats"] = {}
+        if not isinstance(data.get("history"), list):
+            data["history"] = []
+        # Ensure all stats keys exist
+        for k, v in DEFAULT_STATS.items():
+            data["stats"].setdefault(k, v)
+        return data
+
+    # ------------------------------------------------------------------ 讀取
+
+    def snapshot(self) -> dict:
+        """目前狀態的複本（呼叫端可自由修改，不影響服務內的資料）。"""
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def history(self) -> list[dict]:
+        with self._lock:
+            return [dict(h) for h in self._data["history"]]
+
+    # ------------------------------------------------------------------ 變更
+
+    def add_history(self, name: str, status: str, duration: str = "--", message: str = "") -> dict:
+        """新增一筆任務紀錄並更新統計，回傳新增的紀錄。"""
+        entry = {
+            "id": f"#AF-{uuid.uuid4().hex[:5].upper()}",
+            "name": name,
+            "status": status,
+            "duration": duration,
+            "time": datetime.datetime.now().strftime("%I:%M %p"),
+            "message": message,
+        }
+        with self._lock:
+            history = self._data["history"]
+            stats = self._data["stats"]
+            history.insert(0, entry)
+            if status == "Completed":
+                self._successes += 1
+            for dropped in history[HISTORY_LIMIT:]:
+                if dropped.get("status") == "Completed":
+                    self._successes -= 1
+            del history[HISTORY_LIMIT:]
+
+            # Update stats
+            stats["total_tasks"] += 1
+            if status == "Completed":
+                if "Excel" in name:
+                    stats["total_conversions"] += 1
+
+                # Real time saved calculation (duration e.g. "14.2s")
+                try:
+                    seconds = float(duration.replace("s", ""))
+                except (AttributeError, ValueError):
+                    seconds = None
+                if seconds is not None:
+                    stats["total_seconds"] = stats.get("total_seconds", 0.0) + seconds
+                    stats["time_saved"] = format_seconds(stats["total_seconds"])
+
+            total = len(history)
+            stats["success_rate"] = f"{(self._successes / total * 100):.0f}%" if total > 0 else "100%"
+            self._schedule_save()
+        return entry
+
+    def clear_history(self) -> None:
+        with self._lock:
+            self._data["history"] = []
+            self._data["stats"] = {
+                "total_conversions": 0,
+                "total_tasks": 0,
+                "success_rate": "100%",
+                "time_saved": "0s",
+                "total_seconds": 0.0,
+            }
+            self._successes = 0
+            self._schedule_save()
+
+    def set_settings(self, settings: dict) -> None:
+        with self._lock:
+            self._data["settings"] = copy.deepcopy(settings)
+            self._schedule_save()
+
+    # ------------------------------------------------------------------ 寫檔
+
+    def _schedule_save(self) -> None:
+        # 呼叫端持有 _lock；寫檔一律交給計時器執行緒，避免與 flush() 的鎖順序相反
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """立即寫入尚未儲存的變更；沒有變更時不寫檔。回傳是否有寫入。"""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return False
+                payload = json.dumps(self._data, indent=4, ensure_ascii=False)
+                self._dirty = False
+            # 序列化在鎖內完成，實際寫檔在鎖外，不擋住其它執行緒的讀取與變更
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp, self.path)
+                self.saves += 1
+            except OSError as e:
+                with self._lock:
+                    self._dirty = True
+                print(f"[WARN] 無法寫入 {self.path}: {e}")
+                return False
+            return True
+
+    def close(self) -> None:
+        self.flush()
+        atexit.unregister(self.flush)
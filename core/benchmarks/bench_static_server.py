@@ -0,0 +1,136 @@
+"""
+前端載入效能：Flask send_from_directory（舊寫法，每次請求讀檔、無快取標頭與壓縮）
+vs StaticServer（預載到記憶體、ETag、gzip/br）。
+模擬 Vite 建置結果（index.html + 一個大 JS + CSS），量測冷載入（完整下載）與重新整理（帶 If-None-Match）
+的時間與傳輸量。Flask 未安裝時只量 StaticServer。
+
+用法：
+    python benchmarks/bench_static_server.py [JS 大小 KB] [重複次數]
+"""
+import http.client
+import logging
+import random
+import string
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from static_server import StaticServer
+
+PATHS = ("/", "/assets/index-BvX3k9aQ.js", "/assets/index-Dk2a91Lq.css")
+
+
+def make_bundle(root: Path, js_kb: int) -> None:
+    rng = random.Random(1)
+    words = ["".join(rng.choices(string.ascii_letters, k=rng.randint(3, 10))) for _ in range(2000)]
+    js = []
+    size = 0
+    while size < js_kb * 1024:
+        line = f"const {rng.choice(words)}=function({rng.choice(words)}){{return {rng.choice(words)}.{rng.choice(words)}({rng.randint(0, 999)})}};\n"
+        js.append(line)
+        size += len(line)
+    (root / "assets").mkdir()
+    (root / "assets" / "index-BvX3k9aQ.js").write_text("".join(js), encoding="utf-8")
+    (root / "assets" / "index-Dk2a91Lq.css").write_text(".a{color:red}\n" * 3000, encoding="utf-8")
+    (root / "index.html").write_text(
+        '<!doctype html><script type="module" src="/assets/index-BvX3k9aQ.js"></script>'
+        '<link rel="stylesheet" href="/assets/index-Dk2a91Lq.css"><div id="root"></div>',
+        encoding="utf-8",
+    )
+
+
+def start_flask(root: Path):
+    try:
+        from flask import Flask, send_from_directory
+        from werkzeug.serving import make_server
+    except ImportError:
+        return None
+    app = Flask(__name__, static_folder=str(root), static_url_path="")
+
+    @app.route("/")
+    def index():
+        return send_from_directory(str(root), "index.html")
+
+    @app.route("/<path:path>")
+    def static_proxy(path):
+        return send_from_directory(str(root), path)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_port
+
+
+def page_load(port: int, etags: dict[str, str]) -> tuple[int, dict[str, str]]:
+    """依序取回整頁資源（同一條連線），回傳 (傳輸位元組數, 各資源 ETag)。"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    transferred = 0
+    new_etags = {}
+    try:
+        for path in PATHS:
+            headers = {"Accept-Encoding": "gzip, deflate, br"}
+            if path in etags:
+                headers["If-None-Match"] = etags[path]
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            transferred += len(resp.read())
+            if resp.getheader("ETag"):
+                new_etags[path] = resp.getheader("ETag")
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    finally:
+        conn.close()
+    return transferred, new_etags
+
+
+def measure(port: int, repeat: int) -> tuple[float, int, float, int]:
+    best_cold = best_warm = float("inf")
+    cold_bytes = warm_bytes = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cold_bytes, etags = page_load(port, {})
+        t1 = time.perf_counter()
+        warm_bytes, _ = page_load(port, etags)
+        t2 = time.perf_counter()
+        best_cold = min(best_cold, t1 - t0)
+        best_warm = min(best_warm, t2 - t1)
+    return best_cold, cold_bytes, best_warm, warm_bytes
+
+
+def main(js_kb: int = 800, repeat: int = 20) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_bundle(root, js_kb)
+        print(f"bundle: JS {js_kb} KB (best of {repeat})")
+
+        t0 = time.perf_counter()
+        server = StaticServer(root).start()
+        server.wait_ready(10)
+        ready = time.perf_counter() - t0
+        # 量測前先等背景壓縮完成
+        server.bundle.compress_missing()
+
+        rows = []
+        flask = start_flask(root)
+        if flask is not None:
+            rows.append(("flask", flask[1]))
+        rows.append(("StaticServer", server.port))
+        for name, port in rows:
+            cold, cold_bytes, warm, warm_bytes = measure(port, repeat)
+            print(
+                f"  {name:<13}: cold {cold * 1000:7.1f} ms {cold_bytes / 1024:8.1f} KB   "
+                f"reload {warm * 1000:6.1f} ms {warm_bytes / 1024:8.1f} KB"
+            )
+        print(f"  StaticServer preload + bind: {ready * 1000:.1f} ms")
+        server.shutdown()
+        if flask is not None:
+            flask[0].shutdown()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,107 @@
+"""
+腳本更新下載：舊寫法（逐一 requests.get、每次新連線、ui.zip 整包讀進記憶體）
+vs Updater（共用連線池並行下載、串流寫檔、git blob sha 相同就略過）。
+以本機 HTTP 伺服器代替 GitHub，每個請求加上固定延遲模擬網路往返。
+
+用法：
+    python benchmarks/bench_updater.py [腳本數] [每個請求延遲 ms] [ui.zip 大小 KB]
+"""
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from updater import UpdateFile, Updater, git_blob_sha
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        data = self.server.files[self.path.lstrip("/")]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def old_update(base: str, names: list[str], dest: Path) -> None:
+    for name in names:
+        resp = requests.get(f"{base}/{name}", timeout=10)
+        (dest / name).write_bytes(resp.content)
+    resp = requests.get(f"{base}/ui.zip", timeout=30)
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
+        z.extractall(dest / "ui")
+
+
+def new_update(base: str, names: list[str], dest: Path, blobs: dict[str, str]) -> list:
+    with Updater(dest / ".update") as updater:
+        items = [UpdateFile(f"{base}/{n}", dest / n, git_sha=blobs.get(n)) for n in names]
+        items.append(UpdateFile(f"{base}/ui.zip", dest / ".update" / "ui.zip"))
+        results = updater.download_all(items)
+        updater.apply(results, backup=False)
+        return results
+
+
+def timed(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main(scripts: int = 25, delay_ms: int = 40, zip_kb: int = 4096) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.delay = delay_ms / 1000
+    names = [f"script_{i}.py" for i in range(scripts)]
+    server.files = {n: (f"# {n}\n" + "x = 1\n" * 3000).encode() for n in names}
+    ui_zip = io.BytesIO()
+    with zipfile.ZipFile(ui_zip, "w") as z:
+        z.writestr("index.html", "<div id=root></div>")
+        z.writestr("assets/index.js", os.urandom(zip_kb * 1024))
+    server.files["ui.zip"] = ui_zip.getvalue()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{scripts} 個腳本 + ui.zip {zip_kb} KB，每個請求延遲 {delay_ms} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        old_dir, new_dir = Path(tmp) / "old", Path(tmp) / "new"
+        old_dir.mkdir()
+        new_dir.mkdir()
+
+        elapsed, peak, _ = timed(lambda: old_update(base, names, old_dir))
+        print(f"  逐一下載       : {elapsed * 1000:7.0f} ms  峰值記憶體 {peak / 1024:7.0f} KB")
+
+        elapsed, peak, _ = timed(lambda: new_update(base, names, new_dir, {}))
+        print(f"  Updater 首次   : {elapsed * 1000:7.0f} ms  峰值記憶體 {peak / 1024:7.0f} KB")
+
+        # 模擬 git tree 回傳的 blob sha：只有一個腳本有變動
+        blobs = {n: git_blob_sha(new_dir / n) for n in names}
+        server.files[names[0]] += b"# changed\n"
+        blobs[names[0]] = "changed"
+        elapsed, _, results = timed(lambda: new_update(base, names, new_dir, blobs))
+        changed = sum(1 for r in results if r.status == "updated")
+        print(f"  Updater 再次   : {elapsed * 1000:7.0f} ms  （{changed} 個檔案有變動，其餘略過）")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:4]))
@@ -4,18 +4,15 @@ import sys
 import os
 import json
 from pathlib import Path
-from flask import Flask, send_from_directory
-import requests
 import time
-import PIL.Image
-import PIL.ImageGrab
-import PIL.ImageChops
-import PIL.ImageStat
-import pyautogui
 import importlib
-import shutil
-import zipfile
-import io
+from core import startup_profile
+from core.app_state import AppState
+from core.progress_channel import ProgressChannel
+from core.static_server import StaticServer
+
+# 視窗出現前只載入必要的模組；requests / zipfile 等在用到的功能裡才載入
+# （PIL、pyautogui 只有截圖腳本會用到，由 screenshot 自行載入）
 
 # Global version but initialized in main()
 CURRENT_VERSION = "v3.3.2"
@@ -121,10 +118,16 @@ class Bridge:
         self._latest_screenshot_results: list = []
         self._data_file: Path = BASE_DIR / "app_data.json"
         self._update_check_cache: dict = {}  # Cache for update checks
-        self._init_data()
+        # 歷史紀錄 / 統計 / 設定只在啟動時讀一次，之後讀記憶體、延遲合併寫檔
+        self._state = AppState(self._data_file)
+        # 進度、歷史紀錄、輸出結果有變動時主動推送給前端（取代前端輪詢）
+        self._progress = ProgressChannel(self._push_progress)
+        self._publish_state()
 
     def check_update(self):
         """Check for updates from GitHub Releases API with caching"""
+        import requests
+
         # Check cache (valid for 1 hour)
         cache_key = "last_update_check"
         cache_ttl = 3600  # 1 hour in seconds
@@ -228,6 +231,8 @@ class Bridge:
             "total": 0, 
             "status": "idle"
         }
+        self._publish_status()
+        self._progress.publish("results", results=[])
         return {"status": "success"}
 
     def select_multiple_folders(self):
@@ -344,15 +349,33 @@ class Bridge:
 
     def update_scripts(self):
         """Download latest script files and UI from GitHub"""
-        
+        from urllib.parse import unquote
+        from core.updater import UpdateError, UpdateFile, Updater, install_zip_dir
+
         # 1. Python Scripts to update
         files_to_update = [
             {
-                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel_轉換/convert_excel.py",
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel/convert_excel.py",
                 "local_path": EXCEL_DIR / "convert_excel.py"
             },
             {
-                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/截圖腳本/main.py",
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel/excel_reader.py",
+                "local_path": EXCEL_DIR / "excel_reader.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel/grouping.py",
+                "local_path": EXCEL_DIR / "grouping.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel/columnar.py",
+                "local_path": EXCEL_DIR / "columnar.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/excel/incremental.py",
+                "local_path": EXCEL_DIR / "incremental.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/main.py",
                 "local_path": SCREENSHOT_DIR / "main.py"
             },
             {
@@ -367,186 +390,213 @@ class Bridge:
                 "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/config.py",
                 "local_path": SCREENSHOT_DIR / "config.py"
             },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/capture_pipeline.py",
+                "local_path": SCREENSHOT_DIR / "capture_pipeline.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/done_store.py",
+                "local_path": SCREENSHOT_DIR / "done_store.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/keyword_matcher.py",
+                "local_path": SCREENSHOT_DIR / "keyword_matcher.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/png_stream.py",
+                "local_path": SCREENSHOT_DIR / "png_stream.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/capture_backend.py",
+                "local_path": SCREENSHOT_DIR / "capture_backend.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/browser_backend.py",
+                "local_path": SCREENSHOT_DIR / "browser_backend.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/capture_session.py",
+                "local_path": SCREENSHOT_DIR / "capture_session.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/host_scheduler.py",
+                "local_path": SCREENSHOT_DIR / "host_scheduler.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/concurrent_capture.py",
+                "local_path": SCREENSHOT_DIR / "concurrent_capture.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/page_readiness.py",
+                "local_path": SCREENSHOT_DIR / "page_readiness.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/wait_profiles.py",
+                "local_path": SCREENSHOT_DIR / "wait_profiles.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/screenshot/sharded_run.py",
+                "local_path": SCREENSHOT_DIR / "sharded_run.py"
+            },
             # Update CORE LOGIC as well (Self Update)
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/app_state.py",
+                "local_path": BASE_DIR / "core" / "app_state.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/progress_channel.py",
+                "local_path": BASE_DIR / "core" / "progress_channel.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/startup_profile.py",
+                "local_path": BASE_DIR / "core" / "startup_profile.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/static_server.py",
+                "local_path": BASE_DIR / "core" / "static_server.py"
+            },
+            {
+                "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/updater.py",
+                "local_path": BASE_DIR / "core" / "updater.py"
+            },
             {
                 "url": f"https://raw.githubusercontent.com/{REPO_NAME}/main/core/main.py",
                 "local_path": BASE_DIR / "core" / "main.py"
             }
         ]
-        
+
         results = []
-        backups = []
-        
-        try:
-            # Step A: Update Python Scripts & Version File
-            for item in files_to_update:
-                file_path = item["local_path"]
-                file_name = file_path.name
-                try:
-                    resp = requests.get(item["url"], timeout=10)
-                    if resp.status_code == 200:
-                        if file_path.exists():
-                            backup_path = file_path.with_suffix(f".py.bak.{int(time.time())}")
-                            shutil.copy2(file_path, backup_path)
-                            backups.append((file_path, backup_path))
-                        
-                        file_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(file_path, "wb") as f:
-                            f.write(resp.content)
-                        results.append(f"✅ 腳本更新成功: {file_name}")
-                    else:
-                        results.append(f"❌ 腳本下載失敗: {file_name}")
-                except Exception as e:
-                    results.append(f"❌ 腳本更新異常: {file_name} ({str(e)})")
+        updater = Updater(BASE_DIR / ".update")
 
-            # Update version.txt specifically
-            version_url = f"https://raw.githubusercontent.com/{REPO_NAME}/main/version.txt"
-            version_path = BASE_DIR / "version.txt"
+        try:
+            # Step A: 一次取得 main 分支所有檔案的 git blob sha，本地內容相同的腳本不必下載
             try:
-                v_resp = requests.get(version_url, timeout=10)
-                if v_resp.status_code == 200:
-                    with open(version_path, "wb") as f:
-                        f.write(v_resp.content)
-                    
-                    # Update global CURRENT_VERSION immediately
-                    global CURRENT_VERSION
-                    new_v = v_resp.content.decode("utf-8").strip()
-                    CURRENT_VERSION = f"v{new_v}"
-                    results.append(f"✅ 版本號已更新為: {CURRENT_VERSION}")
-                else:
-                    results.append("❌ 版本號檔案下載失敗")
+                blobs = updater.fetch_git_blobs(f"https://api.github.com/repos/{REPO_NAME.strip()}/git/trees/main?recursive=1")
             except Exception as e:
-                results.append(f"❌ 版本更新異常: {str(e)}")
+                print(f"Git tree fetch failed, downloading all scripts: {e}")
+                blobs = {}
 
-            # Step B: Update UI (Pluggable Architecture)
-            # Try to download ui.zip from the latest release
+            script_files = []
+            for item in files_to_update:
+                remote_path = unquote(item["url"].split("/main/", 1)[1])
+                script_files.append(UpdateFile(item["url"], item["local_path"], git_sha=blobs.get(remote_path)))
+            # version.txt 和腳本一起下載、一起套用
+            script_files.append(UpdateFile(
+                f"https://raw.githubusercontent.com/{REPO_NAME}/main/version.txt",
+                BASE_DIR / "version.txt",
+                git_sha=blobs.get("version.txt"),
+            ))
+
+            # Step B: UI 更新包 (Pluggable Architecture)，release asset 附有 sha256 digest 時會驗證
+            ui_file = None
             try:
-                # Get latest release tag
-                api_url = f"https://api.github.com/repos/{REPO_NAME.strip()}/releases/latest"
-                rel_resp = requests.get(api_url, timeout=5)
-                if rel_resp.status_code == 200:
-                    assets = rel_resp.json().get('assets', [])
-                    ui_zip_asset = next((a for a in assets if a['name'] == 'ui.zip'), None)
-                    
-                    if ui_zip_asset:
-                        ui_url = ui_zip_asset['browser_download_url']
-                        results.append("🔍 發現介面更新包 (ui.zip)，正在下載...")
-                        
-                        zip_resp = requests.get(ui_url, timeout=30)
-                        if zip_resp.status_code == 200:
-                            # Use DIST_DIR determined at startup
-                            ui_target = DIST_DIR 
-                            
-                            # Backup current UI
-                            if ui_target.exists():
-                                ui_bak = ui_target.parent / f"ui_bak_{int(time.time())}"
-                                try:
-                                    shutil.move(str(ui_target), str(ui_bak))
-                                    backups.append((ui_target, ui_bak))
-                                except:
-                                    pass # Might be in use
-                            
-                            # Extract ZIP
-                            with zipfile.ZipFile(io.BytesIO(zip_resp.content)) as z:
-                                ui_target.mkdir(parents=True, exist_ok=True)
-                                z.extractall(ui_target)
-                            results.append("✨ 介面 (UI) 已更新成功！(重啟後生效)")
-                        else:
-                            results.append("❌ 介面更新包下載失敗")
-                    else:
-                        results.append("ℹ️ 本次更新不含介面變動")
+                release = updater.get_json(f"https://api.github.com/repos/{REPO_NAME.strip()}/releases/latest")
+                ui_zip_asset = next((a for a in release.get("assets", []) if a["name"] == "ui.zip"), None)
+                if ui_zip_asset:
+                    # 保留上次套用的 ui.zip，內容沒變就不重新下載與解壓
+                    ui_file = UpdateFile(
+                        ui_zip_asset["browser_download_url"],
+                        BASE_DIR / ".update" / "ui.zip",
+                        sha256=ui_zip_asset.get("digest"),
+                    )
+                    results.append("🔍 發現介面更新包 (ui.zip)，正在下載...")
+                else:
+                    results.append("ℹ️ 本次更新不含介面變動")
             except Exception as e:
                 results.append(f"⚠️ 介面更新偵測失敗: {str(e)}")
 
-            # Step C: Reload modules
-            try:
-                import convert_excel
-                importlib.reload(convert_excel)
-                results.append("🔄 核心邏輯已即時重新載入")
-            except:
-                pass
-                
+            # 所有檔案共用連線池並行下載
+            downloads = updater.download_all(script_files + ([ui_file] if ui_file else []))
+            script_results = downloads[:len(script_files)]
+            ui_result = downloads[len(script_files)] if ui_file else None
+
+            # Step C: 腳本全部下載並驗證完才一起換上，避免新舊版本混用
+            failed = [r for r in script_results if r.status == "failed"]
+            if failed:
+                updater.discard(script_results)
+                for r in failed:
+                    results.append(f"❌ 腳本下載失敗: {r.file.name} ({r.error})")
+                results.append("⚠️ 部分檔案下載失敗，腳本維持原版本（已下載的部分下次更新會接續）")
+            else:
+                updater.apply(script_results)
+                for r in script_results[:-1]:
+                    if r.status == "updated":
+                        results.append(f"✅ 腳本更新成功: {r.file.name}")
+                unchanged = sum(1 for r in script_results if r.status == "unchanged")
+                if unchanged:
+                    results.append(f"⏩ {unchanged} 個檔案已是最新，略過下載")
+
+                # Update global CURRENT_VERSION immediately
+                global CURRENT_VERSION
+                new_v = (BASE_DIR / "version.txt").read_text(encoding="utf-8").strip()
+                CURRENT_VERSION = f"v{new_v}"
+                results.append(f"✅ 版本號已更新為: {CURRENT_VERSION}")
+
+            if ui_result is not None:
+                if ui_result.status == "updated":
+                    try:
+                        # 先解壓到暫存資料夾再換名；伺服器已把介面載入記憶體，重啟後才生效
+                        install_zip_dir(ui_result.staged, DIST_DIR)
+                        updater.apply([ui_result], backup=False)
+                        results.append("✨ 介面 (UI) 已更新成功！(重啟後生效)")
+                    except Exception as e:
+                        results.append(f"❌ 介面更新失敗: {str(e)}")
+                elif ui_result.status == "unchanged":
+                    results.append("ℹ️ 介面已是最新版本")
+                else:
+                    results.append(f"❌ 介面更新包下載失敗 ({ui_result.error})")
+
+            # Step D: Reload modules
+            if not failed:
+                try:
+                    import excel_reader
+                    importlib.reload(excel_reader)
+                    import grouping
+                    importlib.reload(grouping)
+                    import columnar
+                    importlib.reload(columnar)
+                    import incremental
+                    importlib.reload(incremental)
+                    import convert_excel
+                    importlib.reload(convert_excel)
+                    results.append("🔄 核心邏輯已即時重新載入")
+                except:
+                    pass
+
             return {
-                "status": "success" if any("✅" in r or "✨" in r for r in results) else "partial",
+                "status": "partial" if failed or (ui_result is not None and ui_result.status == "failed") else "success",
                 "message": "更新完成",
                 "new_version": CURRENT_VERSION,
                 "details": results
             }
-            
-        except Exception as e:
-            # Rollback on critical failure
-            if backups:
-                results.append(f"⚠️ 嘗試回滾...")
-                for original_path, backup_path in backups:
-                    try:
-                        shutil.copy2(backup_path, original_path)
-                        results.append(f"↩️ 已回滾: {original_path.name}")
-                    except Exception as rollback_error:
-                        results.append(f"❌ 回滾失敗: {original_path.name} ({rollback_error})")
-            
+
+        except UpdateError as e:
+            # apply() 已還原換到一半的檔案
+            results.append(f"↩️ {str(e)}")
             return {
                 "status": "error",
                 "message": f"更新過程發生嚴重錯誤: {str(e)}",
                 "details": results
             }
-
-    def _init_data(self):
-        if not self._data_file.exists():
-            initial_data = {
-                "stats": {
-                    "total_conversions": 0,
-                    "total_tasks": 0,
-                    "success_rate": "100%",
-                    "time_saved": "0h"
-                },
-                "history": []
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"更新過程發生嚴重錯誤: {str(e)}",
+                "details": results
             }
-            with open(self._data_file, "w", encoding="utf-8") as f:
-                json.dump(initial_data, f, indent=4, ensure_ascii=False)
-
-    def _load_data(self):
-        default_stats = {
-            "total_conversions": 0,
-            "total_tasks": 0,
-            "success_rate": "100%",
-            "time_saved": "0h"
-        }
-        try:
-            if self._data_file.exists():
-                with open(self._data_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if "stats" not in data: data["stats"] = default_stats
-                    if "history" not in data: data["history"] = []
-                    # Ensure all stats keys exist
-                    for k, v in default_stats.items():
-                        if k not in data["stats"]: data["stats"][k] = v
-                    return data
-        except:
-            pass
-        return {"stats": default_stats, "history": []}
-
-    def _save_data(self, data):
-        with open(self._data_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        finally:
+            updater.close()
 
     def clear_history(self):
-        data = self._load_data()
-        data["history"] = []
-        data["stats"] = {
-            "total_conversions": 0,
-            "total_tasks": 0,
-            "success_rate": "100%",
-            "time_saved": "0s",
-            "total_seconds": 0.0
-        }
-        self._save_data(data)
+        self._state.clear_history()
+        self._publish_state()
         return {"status": "success", "message": "歷史紀錄與統計數據已清除"}
 
     def export_history(self):
         import csv
         
-        data = self._load_data()
-        if not data["history"]:
+        history = self._state.history()
+        if not history:
             return {"status": "error", "message": "沒有可導出的紀錄"}
             
         file_path = self._window.create_file_dialog(
@@ -560,62 +610,25 @@ class Bridge:
                 with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
                     writer = csv.DictWriter(f, fieldnames=["id", "name", "status", "duration", "time", "message"])
                     writer.writeheader()
-                    writer.writerows(data["history"])
+                    writer.writerows(history)
                 return {"status": "success", "path": file_path}
             except Exception as e:
                 return {"status": "error", "message": str(e)}
         return {"status": "canceled"}
 
     def _add_history(self, name, status, duration="--", message=""):
-        import datetime
-        import uuid
-        data = self._load_data()
-        entry = {
-            "id": f"#AF-{uuid.uuid4().hex[:5].upper()}",
-            "name": name,
-            "status": status,
-            "duration": duration,
-            "time": datetime.datetime.now().strftime("%I:%M %p"),
-            "message": message
-        }
-        data["history"].insert(0, entry)
-        data["history"] = data["history"][:100] # Increased to 100
-        
-        # Update stats
-        data["stats"]["total_tasks"] += 1
-        if status == "Completed":
-            if "Excel" in name:
-                data["stats"]["total_conversions"] += 1
-            
-            # Real time saved calculation
-            try:
-                # Parse duration (e.g., "14.2s")
-                seconds = float(duration.replace("s", ""))
-                if "total_seconds" not in data["stats"]:
-                    data["stats"]["total_seconds"] = 0.0
-                data["stats"]["total_seconds"] += seconds
-                
-                total_s = data["stats"]["total_seconds"]
-                if total_s < 60:
-                    data["stats"]["time_saved"] = f"{total_s:.1f}s"
-                elif total_s < 3600:
-                    data["stats"]["time_saved"] = f"{int(total_s // 60)}m {int(total_s % 60)}s"
-                else:
-                    data["stats"]["time_saved"] = f"{int(total_s // 3600)}h {int((total_s % 3600) // 60)}m"
-            except:
-                pass
-        
-        # Calculate success rate
-        successes = len([h for h in data["history"] if h["status"] == "Completed"])
-        total = len(data["history"])
-        data["stats"]["success_rate"] = f"{(successes / total * 100):.0f}%" if total > 0 else "100%"
-        
-        self._save_data(data)
+        self._state.add_history(name, status, duration, message)
+        self._publish_state()
 
     def select_excel_file(self):
         result = self._window.create_file_dialog(
             webview.OPEN_DIALOG, 
-            file_types=("Excel Files (*.xlsx)", "All files (*.*)")
+            file_types=(
+                "Excel Files (*.xlsx)",
+                "CSV Files (*.csv)",
+                "Parquet / Arrow Files (*.parquet;*.feather;*.arrow)",
+                "All files (*.*)",
+            )
         )
         
         if result:
@@ -652,46 +665,81 @@ class Bridge:
     def get_task_status(self):
         return self._task_status
 
-    def run_excel_convert(self, start_date=None, end_date=None):
+    def get_progress_since(self, seq=0):
+        """前端重新連線時補回序號 seq 之後的進度事件（reset 時為各類最新快照）"""
+        return self._progress.since(seq)
+
+    def _push_progress(self, batch):
+        # 視窗建立前的事件不必推送，頁面載入後會用 get_progress_since 取回
+        if not self._window:
+            return
+        payload = json.dumps(batch, ensure_ascii=False)
+        self._window.evaluate_js(f"window.dispatchEvent(new CustomEvent('autoflow-progress', {{ detail: {payload} }}))")
+
+    def _publish_status(self):
+        status = dict(self._task_status)
+        if "errors" in status:
+            status["errors"] = list(status["errors"])
+        self._progress.publish("status", status=status)
+
+    def _publish_state(self):
+        data = self._state.snapshot()
+        self._progress.publish("state", history=data["history"], stats=data["stats"])
+
+    def run_excel_convert(self, start_date=None, end_date=None, rows=None, incremental=False):
+        """
+        rows: 可直接傳入記憶體中的資料列（dict 的 list，鍵為 公文文號/檢舉人/檢舉人信箱/網址），
+        略過選檔與讀檔，直接分群輸出（此時不套用日期篩選）。
+        incremental: 只輸出上次轉換後新增的資料列（索引存在 excel/output/convert_index.json）。
+        """
         try:
-            if not self._current_excel_path:
+            if rows is None and not self._current_excel_path:
                 res = self.select_excel_file()
                 if res["status"] == "canceled":
                     return {"status": "canceled", "message": "請先選擇檔案"}
             
             import convert_excel
-            import glob
             import time
             
             start_time = time.time()
-            # The script now raises ValueError for issues and returns the output_dir on success
-            output_dir_path = convert_excel.main(self._current_excel_path, start_date, end_date)
+            # The script raises ValueError for issues and returns the output manifest on success
+            if rows is not None:
+                source_name = "記憶體資料"
+                result = convert_excel.convert_rows([
+                    {col: convert_excel.normalize(row.get(col)) for col in convert_excel.REQUIRED_COLUMNS}
+                    for row in rows
+                ], incremental=bool(incremental))
+            else:
+                source_name = os.path.basename(self._current_excel_path)
+                result = convert_excel.main(self._current_excel_path, start_date, end_date, incremental=bool(incremental))
             duration = f"{time.time() - start_time:.1f}s"
+
+            if incremental and result is None:
+                self._add_history(f"Excel 增量轉換 ({source_name})", "Completed", duration)
+                return {"status": "success", "message": "沒有新增的資料列", "output_files": [], "report": {"new_rows": 0}}
             
-            if output_dir_path and os.path.exists(output_dir_path):
-                files = glob.glob(os.path.join(output_dir_path, "*.txt"))
-                if files:
-                    output_files = []
-                    for f in files:
-                        output_files.append({
-                            "name": os.path.basename(f),
-                            "path": f,
-                            "urlCount": self._count_valid_urls(f)
-                        })
-                    
-                    # Sort by name for consistency
-                    output_files.sort(key=lambda x: x["name"])
-                    
-                    self._latest_output_folder = output_dir_path
-                    self._add_history(f"Excel 轉換 ({os.path.basename(self._current_excel_path)})", "Completed", duration)
-                    return {
-                        "status": "success", 
-                        "message": "Excel 轉換完成！",
-                        "output_files": output_files,
-                        "output_folder": output_dir_path
-                    }
+            if result and result["files"]:
+                # The manifest already has paths and URL counts; no need to rescan the folder
+                output_files = [
+                    {"name": f["name"], "path": f["path"], "urlCount": f["url_count"]}
+                    for f in result["files"]
+                ]
+                
+                # Sort by name for consistency
+                output_files.sort(key=lambda x: x["name"])
+                
+                report = result["report"]
+                self._latest_output_folder = result["output_dir"]
+                self._add_history(f"Excel 轉換 ({source_name})", "Completed", duration)
+                return {
+                    "status": "success", 
+                    "message": f"Excel 轉換完成！新增 {report['new_rows']} 筆資料" if report else "Excel 轉換完成！",
+                    "output_files": output_files,
+                    "output_folder": result["output_dir"],
+                    "report": report
+                }
 
-            self._add_history(f"Excel 轉換 ({os.path.basename(self._current_excel_path)})", "Completed", duration)
+            self._add_history(f"Excel 轉換 ({source_name})", "Completed", duration)
             return {"status": "success", "message": "Excel 轉換完成！", "output_files": []}
         except ValueError as e:
             # Catch specific conversion errors
@@ -786,14 +834,12 @@ class Bridge:
         return {"status": "canceled"}
 
     def save_settings(self, settings):
-        data = self._load_data()
-        data["settings"] = settings
-        self._save_data(data)
+        self._state.set_settings(settings)
         return {"status": "success"}
         
     def get_app_state(self):
         """Returns app state including history and setting"""
-        data = self._load_data()
+        data = self._state.snapshot()
         
         # Add version to the state
         version_file = BASE_DIR / "version.txt"
@@ -822,6 +868,7 @@ class Bridge:
             
         self._task_status = {"processed": 0, "total": 0, "status": "running"}
         self._screenshot_stop_signal = False
+        self._publish_status()
         
         # Save last used files to history if needed (optional)
         
@@ -851,6 +898,8 @@ class Bridge:
             "input_files": input_files,
             "wait_min": config.get("waitPerPage", {}).get("min", 3),
             "wait_max": config.get("waitPerPage", {}).get("max", 10),
+            "adaptive_wait": config.get("adaptiveWait", False),
+            "learned_wait": config.get("learnedWait", True),
             "screenshot_delay": config.get("screenshotDelay", 3),
             "output_dir": config.get("outputDir"),
             
@@ -879,13 +928,21 @@ class Bridge:
             # Others
             "auto_word_export": config.get("autoWordExport", True),
             "skip_done": config.get("skipDone", False),
+            "done_store": config.get("doneStore", "json"),
             "check_text": config.get("textCheckEnabled", False),
             "scroll_capture": config.get("scrollCapture", False),
             "scroll_stitch": config.get("scrollStitch", True),
+            "stream_stitch": config.get("streamStitch", False),
+            "engine": config.get("captureEngine", "desktop"),
+            "headless": config.get("browserHeadless", True),
+            "cdp_mode": config.get("cdpMode", False),
+            "concurrent_pages": config.get("concurrentPages", 1),
+            "shard_workers": config.get("shardWorkers", 1),
             "scroll_times": config.get("scrollTimes", 4)
         }
         
         self._task_status["total"] = len(input_files)
+        self._publish_status()
         
         def progress_callback(processed_count, total_count, status_msg, current_file=None, errors=None):
             self._task_status["processed"] = processed_count
@@ -894,17 +951,23 @@ class Bridge:
             self._task_status["current_file"] = current_file
             if errors:
                 self._task_status["errors"] = errors
+            self._publish_status()
             
             # Check stop signal
             return self._screenshot_stop_signal
 
+        def url_callback(event):
+            # 每個網址的狀態、分類與耗時
+            self._progress.publish("url", **event)
+
         try:
             start_time = time.time()
             results = capture_app.run_from_api(
                 should_stop_callback=lambda: self._screenshot_stop_signal,
                 config_overrides=api_config,
                 progress_callback=progress_callback,
-                suppress_popups=True
+                suppress_popups=True,
+                url_callback=url_callback
             )
             
             # Enhance results with open folder path
@@ -928,6 +991,7 @@ class Bridge:
                 })
             
             self._latest_screenshot_results = enhanced_results
+            self._progress.publish("results", results=enhanced_results)
             
             duration_sec = time.time() - start_time
             if duration_sec < 60:
@@ -949,6 +1013,7 @@ class Bridge:
             self._add_history("自動截圖任務", "Error", message=str(e))
         finally:
             self._task_status["status"] = "idle"
+            self._publish_status()
             # Ensure window focus is restored
             try:
                 # Force restore using minimize -> restore hack for Windows
@@ -962,39 +1027,8 @@ class Bridge:
             except:
                 pass
 
-app = Flask(__name__, static_folder=str(DIST_DIR))
-
-# Fallback for when static_folder init arg is not fully dynamic?
-# Actually Flask needs the path at init. Since DIST_DIR is calculated in setup_paths,
-# we need to be careful.
-# SOLUTION: We will init Flask INSIDE main() after path setup.
-
-server = None
-def start_server():
-    global app, server
-    app = Flask(__name__, static_folder=str(DIST_DIR))
-
-    @app.route("/")
-    def index():
-        return send_from_directory(str(DIST_DIR), "index.html")
-
-    @app.route("/<path:path>")
-    def assets(path):
-        return send_from_directory(str(DIST_DIR), path)
-    
-    # Run flask in a separate thread without blocking
-    # Werkzeug server is blocking, so threading is needed.
-    # Production uses PyWebView's built-in HTTP server usually, 
-    # but 'webview.start' with paths can also serve static files.
-    # However, for API endpoints or custom logic (if any), Flask is good.
-    # But here we heavily rely on Bridge.
-    # We can actually skip Flask if we just want to serve a static folder.
-    # Pywebview supports pointing to a local file or local server.
-    # Let's keep Flask for potential future API extensions or just use it as a robust file server.
-    
-    app.run(port=5000)
-
 def main():
+    startup_profile.mark("core.main 載入完成")
     setup_paths()
     
     # Initialize version
@@ -1003,30 +1037,24 @@ def main():
         global CURRENT_VERSION
         CURRENT_VERSION = f"v{version_file.read_text().strip()}"
     
-    # Setup Flask server to serve the React frontend
-    app = Flask(__name__, static_folder=str(DIST_DIR), static_url_path='')
+    # Serve the React frontend: 背景執行緒預載 DIST_DIR 到記憶體，綁在隨機可用埠
+    server = StaticServer(DIST_DIR).start()
     
-    @app.route('/')
-    def index():
-        return send_from_directory(str(DIST_DIR), 'index.html')
-    
-    @app.route('/<path:path>')
-    def static_proxy(path):
-        return send_from_directory(str(DIST_DIR), path)
-        
-    port = 5000
-    # Start Flask in a background thread
-    t = threading.Thread(target=lambda: app.run(port=port, threaded=True), daemon=True)
-    t.start()
+    # Create Bridge and link to Window（與伺服器啟動同時進行）
+    bridge = Bridge(None)
+    startup_profile.mark("Bridge 初始化完成")
     
-    # Give the server a moment to start
-    time.sleep(0.5)
+    # 等伺服器開始監聽再開視窗；啟動失敗時改顯示說明頁，不開一個空白視窗
+    if not server.wait_ready(timeout=15):
+        print(f"[ERROR] 前端伺服器未就緒: {server.error or '逾時'}")
+        content = {"html": server.error_page()}
+    else:
+        startup_profile.mark(f"前端伺服器就緒 ({len(server.bundle.assets)} 個檔案, {server.bundle.total_bytes / 1024:.0f} KB)")
+        content = {"url": server.url}
     
-    # Create Bridge and link to Window
-    bridge = Bridge(None)
     window = webview.create_window(
         f"AutoFlow Control Center {CURRENT_VERSION}",
-        url=f'http://127.0.0.1:{port}',
+        **content,
         js_api=bridge,
         width=1200,
         height=800,
@@ -1034,9 +1062,19 @@ def main():
         min_size=(1024, 768)
     )
     bridge._window = window
+
+    def on_loaded():
+        startup_profile.mark("視窗載入完成")
+        startup_profile.finish(BASE_DIR / startup_profile.PROFILE_FILE)
+
+    window.events.loaded += on_loaded
     
     # Start webview in production mode (debug=False)
     webview.start(debug=False)
+    # 視窗關閉後把還在等待寫入的歷史紀錄 / 設定寫回
+    bridge._progress.close()
+    bridge._state.close()
+    server.shutdown()
 
 if __name__ == "__main__":
     main()
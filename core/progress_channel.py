@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# 狀態快照類事件：只有最新一筆有意義，推送與補送時同類只保留最後一筆
+SNAPSHOT_TYPES = ("status", "state", "results")
+PUSH_INTERVAL_SECONDS = 0.2
+BUFFER_SIZE = 1000
+
+
+class ProgressChannel:
+    """
+    後端 -> 前端的進度事件通道（取代前端定時輪詢 get_task_status / get_app_state）：
+    - publish() 給事件編上遞增的序號並放進環狀緩衝區，由背景執行緒推送給 push(batch)；
+    - 推送有節流：閒置後的第一個事件立即推送，之後每 interval 秒最多推送一次，期間的事件合併成一批，
+      快照類事件（SNAPSHOT_TYPES）同類只送最後一筆，所以批次內的序號不一定連續；
+    - 每批為 {"after": 上一批的序號, "seq": 這批的序號, "events": [...]}。前端記住收到的 seq，
+      after 比它新（漏接）或頁面重新載入時以 since(seq) 取回之後的事件；
+      序號太舊（已被緩衝區擠掉）或比目前還新（後端重啟過）時回傳 reset 與各類最新快照。
+    沒有事件時推送執行緒在 Condition 上等待，不佔 CPU。
+    """
+
+    def __init__(
+        self,
+        push: Callable[[dict], None],
+        interval: float = PUSH_INTERVAL_SECONDS,
+        buffer_size: int = BUFFER_SIZE,
+    ):
+        self.push = push
+        self.interval = interval
+        self.pushes = 0
+        self._events: deque[dict] = deque(maxlen=buffer_size)
+        self._latest: dict[str, dict] = {}
+        self._seq = 0
+        self._pushed = 0
+        self._last_push = 0.0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def publish(self, type: str, **payload) -> int:
+        """新增事件並喚醒推送執行緒，回傳事件序號。"""
+        with self._cond:
+            self._seq += 1
+            event = {"seq": self._seq, "type": type, **payload}
+            self._events.append(event)
+            if type in SNAPSHOT_TYPES:
+                self._latest[type] = event
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="progress-push", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._seq
+
+    def since(self, seq: int = 0) -> dict:
+        """
+        回傳 {"after": seq, "seq": 目前序號, "reset": bool, "events": [...]}。
+        reset 為 True 時 events 為各類最新快照加上緩衝區內的其它事件，前端應以此重建畫面。
+        """
+        seq = int(seq or 0)
+        with self._cond:
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if seq <= 0 or seq > self._seq or seq < oldest - 1:
+                events = [e for e in self._events if e["type"] not in SNAPSHOT_TYPES]
+                events.extend(self._latest.values())
+                events.sort(key=lambda e: e["seq"])
+                return {"after": seq, "seq": self._seq, "reset": True, "events": events}
+            return {"after": seq, "seq": self._seq, "reset": False, "events": coalesce(self._after(seq))}
+
+    def _after(self, seq: int) -> list[dict]:
+        # 緩衝區依序號排列，從尾端往回找比逐一掃描省事
+        events = []
+        for event in reversed(self._events):
+            if event["seq"] <= seq:
+                break
+            events.append(event)
+        events.reverse()
+        return events
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pushed == self._seq and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # 節流：距離上次推送未滿 interval 時先等，這段時間內的新事件一併合併
+                deadline = self._last_push + self.interval
+                while not self._closed and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                batch = {"after": self._pushed, "seq": self._seq, "events": coalesce(self._after(self._pushed))}
+                self._pushed = self._seq
+                self._last_push = time.monotonic()
+            try:
+                self.push(batch)
+                self.pushes += 1
+            except Exception as e:
+                # 視窗還沒準備好或已關閉；前端之後會用 since() 補回
+                print(f"[WARN] 進度推送失敗: {e}")
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+
+def coalesce(events: list[dict]) -> list[dict]:
+    """快照類事件同類只保留最後一筆，其它事件（例如每個網址的結果）全部保留，順序不變。"""
+    last = {}
+    for event in events:
+        if event["type"] in SNAPSHOT_TYPES:
+            last[event["type"]] = event["seq"]
+    return [e for e in events if e["type"] not in SNAPSHOT_TYPES or last[e["type"]] == e["seq"]]
@@ -0,0 +1,124 @@
+import builtins
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROFILE_FILE = "startup_profile.txt"
+
+
+class StartupProfiler:
+    """
+    啟動時間分析（run.py --profile-startup）：
+    - 替換 builtins.__import__，記錄每個「第一次載入」的模組花了多少時間，
+      輸出格式比照 python -X importtime（self / cumulative 微秒、依巢狀深度縮排），
+      打包後的執行檔不能加 -X 參數，所以自己量；
+    - mark(label) 記錄各階段（載入 core.main、伺服器就緒、視窗載入完成…）距離啟動的時間。
+    其它執行緒的載入也會記錄，巢狀關係只在同一執行緒內計算。
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+        # (模組名稱, self 秒數, cumulative 秒數, 深度)，依載入完成的順序
+        self.imports: list[tuple[str, float, float, int]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original = builtins.__import__
+        self._installed = False
+
+    def install(self) -> "StartupProfiler":
+        if not self._installed:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+            self._installed = True
+        return self
+
+    def uninstall(self) -> None:
+        if self._installed:
+            builtins.__import__ = self._original
+            self._installed = False
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        if level:
+            return original(name, globals, locals, fromlist, level)
+        new_package = name not in sys.modules
+        # from pkg import x：x 若是還沒載入的子模組，這次也會一起載入
+        candidates = [f"{name}.{f}" for f in fromlist or () if f != "*" and f"{name}.{f}" not in sys.modules]
+        if not new_package and not candidates:
+            return original(name, globals, locals, fromlist, level)
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            # x 只是屬性（不是子模組）時不列出
+            label = ", ".join(([name] if new_package else []) + [m for m in candidates if m in sys.modules])
+            if label:
+                with self._lock:
+                    self.imports.append((label, elapsed - children, elapsed, len(stack)))
+
+    def mark(self, label: str) -> None:
+        with self._lock:
+            self.marks.append((label, time.perf_counter() - self.t0))
+
+    def report(self, top: int = 15) -> str:
+        with self._lock:
+            marks = list(self.marks)
+            imports = list(self.imports)
+        lines = ["# 啟動階段（距離啟動的秒數）"]
+        for label, t in marks:
+            lines.append(f"{t:8.3f} s  {label}")
+
+        total = sum(cum for _, _, cum, depth in imports if depth == 0)
+        lines.append("")
+        lines.append(f"# 載入最久的模組（cumulative，共 {len(imports)} 個模組，頂層合計 {total:.3f} s）")
+        for name, _, cum, _ in sorted(imports, key=lambda r: r[2], reverse=True)[:top]:
+            lines.append(f"{cum * 1e6:>10.0f} us  {name}")
+
+        lines.append("")
+        lines.append("import time: self [us] | cumulative | imported package")
+        for name, self_s, cum, depth in imports:
+            lines.append(f"import time: {self_s * 1e6:>9.0f} | {cum * 1e6:>10.0f} | {'  ' * depth}{name}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(self.report(), encoding="utf-8")
+        return path
+
+
+# 目前啟用中的分析器；沒有加 --profile-startup 時為 None，mark() / finish() 什麼都不做
+_active: StartupProfiler | None = None
+
+
+def start() -> StartupProfiler:
+    global _active
+    if _active is None:
+        _active = StartupProfiler().install()
+    return _active
+
+
+def mark(label: str) -> None:
+    if _active is not None:
+        _active.mark(label)
+
+
+def finish(path: str | Path) -> Path | None:
+    """停止量測並寫出報告，回傳報告路徑（未啟用時回傳 None）。"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.uninstall()
+    report_path = profiler.write(path)
+    print(f"[INFO] 啟動分析報告: {report_path}")
+    return report_path
@@ -0,0 +1,246 @@
+import gzip
+import hashlib
+import html
+import mimetypes
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Vite 建置的檔名帶有內容雜湊（例如 assets/index-BvX3k9aQ.js），內容變了檔名就變，可以永久快取
+HASHED_ASSET = re.compile(r"(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/manifest+json")
+# 太小的檔案壓縮後省不了多少，直接送原檔
+MIN_COMPRESS_SIZE = 1024
+# 編碼偏好順序：br 比 gzip 小
+ENCODINGS = ("br", "gzip")
+PRECOMPRESSED_SUFFIXES = {".br": "br", ".gz": "gzip"}
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/javascript", ".mjs")
+mimetypes.add_type("text/css", ".css")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+class StaticAsset:
+    __slots__ = ("body", "content_type", "etag", "cache_control", "variants")
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.cache_control = cache_control
+        # 編碼 -> 壓縮後內容（只保留比原檔小的）
+        self.variants: dict[str, bytes] = {}
+
+    def add_variant(self, encoding: str, data: bytes) -> None:
+        if len(data) < len(self.body):
+            self.variants[encoding] = data
+
+
+class StaticBundle:
+    """
+    前端建置結果（ui/ 或 autoflow/dist）的記憶體快取：啟動時讀一次所有檔案並計算強 ETag。
+    建置時產生的 .br / .gz 直接沿用；缺少的壓縮版本由 compress_missing() 補上
+    （gzip，有安裝 brotli 套件時也產生 br），壓縮完成前先送原檔。
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.assets: dict[str, StaticAsset] = {}
+        self.total_bytes = 0
+        if self.root.is_dir():
+            self._load()
+
+    def _load(self) -> None:
+        files = sorted(p for p in self.root.rglob("*") if p.is_file())
+        precompressed = {}
+        for path in files:
+            encoding = PRECOMPRESSED_SUFFIXES.get(path.suffix)
+            if encoding and path.with_suffix("").is_file():
+                precompressed[(path.with_suffix(""), encoding)] = path
+        for path in files:
+            if PRECOMPRESSED_SUFFIXES.get(path.suffix) and path.with_suffix("").is_file():
+                continue
+            rel = path.relative_to(self.root).as_posix()
+            body = path.read_bytes()
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type == "application/javascript":
+                content_type += "; charset=utf-8"
+            cache = IMMUTABLE_CACHE if HASHED_ASSET.search(rel) else REVALIDATE_CACHE
+            asset = StaticAsset(body, content_type, cache)
+            for encoding in ENCODINGS:
+                pre = precompressed.get((path, encoding))
+                if pre is not None:
+                    asset.add_variant(encoding, pre.read_bytes())
+            self.assets[rel] = asset
+            self.total_bytes += len(body)
+
+    def compress_missing(self) -> int:
+        """為沒有預先壓縮的文字檔產生壓縮版本，回傳新增的版本數。"""
+        added = 0
+        for asset in list(self.assets.values()):
+            if len(asset.body) < MIN_COMPRESS_SIZE or not asset.content_type.startswith(COMPRESSIBLE_TYPES):
+                continue
+            if "gzip" not in asset.variants:
+                asset.add_variant("gzip", gzip.compress(asset.body, compresslevel=9, mtime=0))
+                added += 1
+            if "br" not in asset.variants and brotli is not None:
+                asset.add_variant("br", brotli.compress(asset.body))
+                added += 1
+        return added
+
+    def lookup(self, url_path: str) -> StaticAsset | None:
+        """以網址路徑找檔案（只查預先載入的表，不碰檔案系統，也就不會有路徑穿越）。"""
+        rel = url_path.split("?", 1)[0].split("#", 1)[0].lstrip("/")
+        if rel == "" or rel.endswith("/"):
+            rel += "index.html"
+        return self.assets.get(rel)
+
+
+def choose_encoding(accept_encoding: str, available) -> str | None:
+    """依 Accept-Encoding 選擇壓縮方式（忽略 q=0 的編碼）。"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name.strip().lower())
+    for encoding in ENCODINGS:
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+class StaticRequestHandler(BaseHTTPRequestHandler):
+    server_version = "AutoFlowStatic"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body: bool) -> None:
+        asset = self.server.bundle.lookup(self.path)
+        if asset is None:
+            body = b"Not Found"
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        if asset.etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(asset)
+            self.end_headers()
+            return
+
+        encoding = choose_encoding(self.headers.get("Accept-Encoding", ""), asset.variants)
+        body = asset.variants[encoding] if encoding else asset.body
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(asset)
+        self.send_header("Content-Type", asset.content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, asset: StaticAsset) -> None:
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", asset.cache_control)
+        if asset.variants:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        # 不在主控台逐筆印出請求
+        pass
+
+
+class StaticServer:
+    """
+    前端靜態檔伺服器（取代 Flask 開發伺服器）：
+    預設綁在 127.0.0.1 的隨機可用埠（port=0），多開或埠被其它程式占用都不會衝突；
+    start() 在背景執行緒預載檔案並開始監聽，就緒（或失敗）時設定 ready，失敗原因在 error；
+    缺少的壓縮版本在就緒後才另外產生，不拖慢開窗。
+    """
+
+    def __init__(self, root: str | Path, host: str = "127.0.0.1", port: int = 0):
+        self.root = Path(root)
+        self.host = host
+        self.port = port
+        self.ready = threading.Event()
+        self.error: BaseException | None = None
+        self.bundle: StaticBundle | None = None
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StaticServer":
+        self._thread = threading.Thread(target=self._serve, name="ui-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self) -> None:
+        try:
+            self.bundle = StaticBundle(self.root)
+            httpd = ThreadingHTTPServer((self.host, self.port), StaticRequestHandler)
+            httpd.daemon_threads = True
+            httpd.bundle = self.bundle
+        except BaseException as e:
+            self.error = e
+            self.ready.set()
+            return
+        self._httpd = httpd
+        self.port = httpd.server_address[1]
+        self.ready.set()
+        threading.Thread(target=self.bundle.compress_missing, name="ui-compress", daemon=True).start()
+        httpd.serve_forever(poll_interval=0.5)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """等到開始監聽；逾時或啟動失敗回傳 False。"""
+        return self.ready.wait(timeout) and self.error is None
+
+    def error_page(self) -> str:
+        """伺服器沒有就緒時給視窗顯示的說明頁（直接以 HTML 載入，不經過伺服器）。"""
+        reason = str(self.error) if self.error is not None else "啟動逾時"
+        return (
+            "<!doctype html><html lang=\"zh-Hant\"><meta charset=\"utf-8\"><title>介面載入失敗</title>"
+            "<body style=\"font-family: sans-serif; padding: 2em\">"
+            "<h2>介面載入失敗</h2>"
+            f"<p>無法啟動前端伺服器：{html.escape(reason)}</p>"
+            f"<p>介面資料夾：<code>{html.escape(str(self.root))}</code></p>"
+            "<p>請確認介面檔案完整（可重新下載安裝），再重新開啟程式。</p>"
+            "</body></html>"
+        )
+
+    def shutdown(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,148 @@
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app_state import HISTORY_LIMIT, AppState
+
+
+class TestAppState(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "app_data.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def open(self, debounce=60.0) -> AppState:
+        state = AppState(self.path, debounce=debounce)
+        self.addCleanup(state.close)
+        return state
+
+    def read(self) -> dict:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def test_creates_default_file(self):
+        self.open()
+        data = self.read()
+        self.assertEqual(data["history"], [])
+        self.assertEqual(data["stats"]["success_rate"], "100%")
+
+    def test_loads_existing_file_and_fills_missing_stats(self):
+        """測試舊檔缺少的統計欄位補上預設值，且不會立刻改寫檔案"""
+        self.path.write_text(json.dumps({"history": [{"status": "Error"}], "stats": {"total_tasks": 1}}), encoding="utf-8")
+        before = self.path.read_text(encoding="utf-8")
+        state = self.open()
+        snap = state.snapshot()
+        self.assertEqual((snap["stats"]["total_tasks"], snap["stats"]["time_saved"]), (1, "0h"))
+        self.assertEqual(self.path.read_text(encoding="utf-8"), before)
+
+    def test_corrupt_file_falls_back_to_defaults(self):
+        self.path.write_text("{not json", encoding="utf-8")
+        self.assertEqual(self.open().snapshot()["history"], [])
+
+    def test_writes_are_coalesced(self):
+        """測試連續多次變更只在 flush 時寫一次檔"""
+        state = self.open()
+        saves = state.saves
+        for i in range(20):
+            state.add_history(f"任務 {i}", "Completed", "1.0s")
+        state.set_settings({"theme": "dark"})
+        self.assertEqual(state.saves, saves)
+        self.assertEqual(self.read()["history"], [])
+
+        self.assertTrue(state.flush())
+        self.assertFalse(state.flush())
+        self.assertEqual(state.saves, saves + 1)
+        data = self.read()
+        self.assertEqual(len(data["history"]), 20)
+        self.assertEqual(data["settings"], {"theme": "dark"})
+        self.assertFalse(self.path.with_suffix(".json.tmp").exists())
+
+    def test_debounced_write_behind(self):
+        state = self.open(debounce=0.05)
+        state.add_history("Excel 轉換", "Completed", "2.0s")
+        deadline = time.monotonic() + 5
+        while not self.read()["history"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.read()["history"][0]["name"], "Excel 轉換")
+
+    def test_stats(self):
+        """測試統計與原本逐次重算的結果相同"""
+        state = self.open()
+        state.add_history("Excel 轉換", "Completed", "30.0s")
+        state.add_history("自動截圖任務", "Error")
+        state.add_history("自動截圖任務", "Completed", "45.5s")
+        stats = state.snapshot()["stats"]
+        self.assertEqual(stats["total_tasks"], 3)
+        self.assertEqual(stats["total_conversions"], 1)
+        self.assertEqual(stats["success_rate"], "67%")
+        self.assertEqual(stats["time_saved"], "1m 15s")
+
+    def test_success_rate_follows_history_window(self):
+        """測試成功率只算保留下來的紀錄（被擠出上限的紀錄不再計入）"""
+        state = self.open()
+        for _ in range(HISTORY_LIMIT):
+            state.add_history("自動截圖任務", "Completed", "1.0s")
+        for _ in range(HISTORY_LIMIT // 4):
+            state.add_history("自動截圖任務", "Error")
+        history = state.history()
+        self.assertEqual(len(history), HISTORY_LIMIT)
+        expected = sum(h["status"] == "Completed" for h in history) / len(history) * 100
+        self.assertEqual(state.snapshot()["stats"]["success_rate"], f"{expected:.0f}%")
+        self.assertEqual(state.snapshot()["stats"]["total_tasks"], HISTORY_LIMIT + HISTORY_LIMIT // 4)
+
+    def test_clear_history(self):
+        state = self.open()
+        state.add_history("自動截圖任務", "Error")
+        state.clear_history()
+        state.add_history("自動截圖任務", "Completed", "1.0s")
+        stats = state.snapshot()["stats"]
+        self.assertEqual((stats["total_tasks"], stats["success_rate"]), (1, "100%"))
+
+    def test_snapshot_is_a_copy(self):
+        state = self.open()
+        state.set_settings({"paths": ["a"]})
+        snap = state.snapshot()
+        snap["settings"]["paths"].append("b")
+        snap["history"].append({})
+        self.assertEqual(state.snapshot()["settings"], {"paths": ["a"]})
+        self.assertEqual(state.history(), [])
+
+    def test_concurrent_updates(self):
+        """測試多個執行緒同時新增紀錄，計數不會遺失"""
+        state = self.open(debounce=0.01)
+
+        def worker():
+            for _ in range(50):
+                state.add_history("自動截圖任務", "Completed", "0.1s")
+                state.snapshot()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        state.flush()
+        stats = self.read()["stats"]
+        self.assertEqual(stats["total_tasks"], 200)
+        self.assertAlmostEqual(stats["total_seconds"], 20.0)
+
+    def test_reopen_after_close(self):
+        state = AppState(self.path, debounce=60.0)
+        state.add_history("Excel 轉換", "Completed", "3.0s")
+        state.close()
+        reopened = self.open()
+        self.assertEqual(reopened.history()[0]["name"], "Excel 轉換")
+        reopened.add_history("自動截圖任務", "Error")
+        self.assertEqual(reopened.snapshot()["stats"]["success_rate"], "50%")
+
+
+if __name__ == "__main__":
+    unittest.main()
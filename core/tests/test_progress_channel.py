@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from progress_channel import ProgressChannel, coalesce
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.times = []
+        self.event = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+        self.times.append(time.monotonic())
+        self.event.set()
+
+    def wait(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.batches) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(self.batches) >= count
+
+
+class TestProgressChannel(unittest.TestCase):
+    def open(self, push, **kwargs) -> ProgressChannel:
+        channel = ProgressChannel(push, **kwargs)
+        self.addCleanup(channel.close)
+        return channel
+
+    def test_coalesce_keeps_latest_snapshot_and_all_urls(self):
+        events = [
+            {"seq": 1, "type": "status", "processed": 0},
+            {"seq": 2, "type": "url", "url": "a"},
+            {"seq": 3, "type": "status", "processed": 1},
+            {"seq": 4, "type": "url", "url": "b"},
+            {"seq": 5, "type": "state"},
+        ]
+        self.assertEqual([e["seq"] for e in coalesce(events)], [2, 3, 4, 5])
+
+    def test_first_event_is_pushed_immediately(self):
+        """測試閒置後的第一個事件不等節流間隔"""
+        recorder = Recorder()
+        channel = self.open(recorder, interval=10)
+        t0 = time.monotonic()
+        channel.publish("status", status={"processed": 1})
+        self.assertTrue(recorder.event.wait(2))
+        self.assertLess(recorder.times[0] - t0, 1)
+        self.assertEqual(recorder.batches[0]["after"], 0)
+        self.assertEqual(recorder.batches[0]["seq"], 1)
+
+    def test_burst_is_throttled_and_coalesced(self):
+        """測試短時間內大量進度只推送少數幾批，且最後狀態一定送達"""
+        recorder = Recorder()
+        channel = self.open(recorder, interval=0.2)
+        for i in range(500):
+            channel.publish("status", status={"processed": i})
+            if i % 100 == 0:
+                channel.publish("url", url=f"https://x.example/{i}")
+        # 機器較慢時整批可能在一次推送內送完，只先等第一批
+        self.assertTrue(recorder.wait(1))
+        deadline = time.monotonic() + 5
+        while recorder.batches[-1]["seq"] != channel.seq and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertLessEqual(len(recorder.batches), 5)
+        # 批次首尾相接
+        for prev, batch in zip(recorder.batches, recorder.batches[1:]):
+            self.assertEqual(batch["after"], prev["seq"])
+        events = [e for b in recorder.batches for e in b["events"]]
+        self.assertEqual(events[-1]["status"], {"processed": 499})
+        self.assertEqual(sum(e["type"] == "url" for e in events), 5)
+
+    def test_since_returns_delta(self):
+        channel = self.open(lambda batch: None)
+        channel.publish("status", status={"processed": 0})
+        seq = channel.publish("url", url="a")
+        channel.publish("status", status={"processed": 1})
+        channel.publish("status", status={"processed": 2})
+        delta = channel.since(seq)
+        self.assertFalse(delta["reset"])
+        self.assertEqual((delta["after"], delta["seq"]), (seq, 4))
+        self.assertEqual(delta["events"], [{"seq": 4, "type": "status", "status": {"processed": 2}}])
+        self.assertEqual(channel.since(4)["events"], [])
+
+    def test_since_resets_when_too_old_or_unknown(self):
+        """測試剛載入（0）、序號已被擠出緩衝區或比目前還新時回傳各類最新快照"""
+        channel = self.open(lambda batch: None, buffer_size=3)
+        channel.publish("state", history=[], stats={})
+        for i in range(5):
+            channel.publish("status", status={"processed": i})
+        channel.publish("url", url="a")
+
+        for seq in (0, 1, 99):
+            result = channel.since(seq)
+            self.assertTrue(result["reset"])
+            self.assertEqual([e["type"] for e in result["events"]], ["state", "status", "url"])
+            self.assertEqual(result["events"][1]["status"], {"processed": 4})
+        self.assertFalse(channel.since(5)["reset"])
+
+    def test_push_failure_does_not_stop_channel(self):
+        calls = []
+
+        def push(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise RuntimeError("window closed")
+
+        channel = self.open(push, interval=0)
+        channel.publish("status", status={})
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        channel.publish("status", status={"processed": 1})
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1]["after"], 1)
+
+    def test_idle_channel_does_not_push(self):
+        recorder = Recorder()
+        channel = self.open(recorder, interval=0.01)
+        channel.publish("status", status={})
+        self.assertTrue(recorder.wait(1))
+        time.sleep(0.2)
+        self.assertEqual(len(recorder.batches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import builtins
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+import startup_profile
+from startup_profile import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        # 暫存套件：sp_pkg 載入時會再載入 sp_pkg.child
+        pkg = self.tmp / "sp_pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("import sp_pkg.child\n", encoding="utf-8")
+        (pkg / "child.py").write_text("VALUE = 1\n", encoding="utf-8")
+        (pkg / "extra.py").write_text("VALUE = 2\n", encoding="utf-8")
+        sys.path.insert(0, str(self.tmp))
+        self.original_import = builtins.__import__
+
+    def tearDown(self):
+        builtins.__import__ = self.original_import
+        sys.path.remove(str(self.tmp))
+        for name in [m for m in sys.modules if m == "sp_pkg" or m.startswith("sp_pkg.")]:
+            del sys.modules[name]
+        startup_profile._active = None
+        self._tmp.cleanup()
+
+    def test_records_first_imports_with_nesting(self):
+        """測試記錄第一次載入的模組與巢狀深度，已載入的模組不重複記錄"""
+        profiler = StartupProfiler().install()
+        import sp_pkg  # noqa: F401
+        import sp_pkg  # noqa: F401,F811
+        from sp_pkg import extra, child  # noqa: F401
+        profiler.uninstall()
+
+        names = [(name, depth) for name, _, _, depth in profiler.imports]
+        self.assertEqual(names, [("sp_pkg.child", 1), ("sp_pkg", 0), ("sp_pkg.extra", 0)])
+        for _, self_s, cum, _ in profiler.imports:
+            self.assertLessEqual(self_s, cum + 1e-9)
+        self.assertIs(builtins.__import__, self.original_import)
+
+    def test_report_format(self):
+        profiler = StartupProfiler().install()
+        import sp_pkg  # noqa: F401
+        profiler.uninstall()
+        profiler.mark("視窗載入完成")
+        report = profiler.report()
+        self.assertIn("視窗載入完成", report)
+        self.assertIn("import time: self [us] | cumulative | imported package", report)
+        self.assertRegex(report, r"import time: +\d+ \| +\d+ \|   sp_pkg\.child")
+
+    def test_module_functions(self):
+        """測試未啟用時 mark / finish 不做事；啟用後 finish 寫出報告並還原 __import__"""
+        startup_profile.mark("ignored")
+        self.assertIsNone(startup_profile.finish(self.tmp / "none.txt"))
+        self.assertFalse((self.tmp / "none.txt").exists())
+
+        startup_profile.start()
+        self.assertIsNot(builtins.__import__, self.original_import)
+        startup_profile.mark("core.main 載入完成")
+        path = startup_profile.finish(self.tmp / "profile.txt")
+        self.assertIs(builtins.__import__, self.original_import)
+        self.assertIn("core.main 載入完成", path.read_text(encoding="utf-8"))
+        self.assertIsNone(startup_profile._active)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import gzip
+import html
+import http.client
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from static_server import IMMUTABLE_CACHE, REVALIDATE_CACHE, StaticBundle, StaticServer, choose_encoding
+
+APP_JS = ("console.log('autoflow');\n" * 200).encode("utf-8")
+
+
+class TestChooseEncoding(unittest.TestCase):
+    def test_prefers_brotli(self):
+        self.assertEqual(choose_encoding("gzip, deflate, br", {"br": b"", "gzip": b""}), "br")
+        self.assertEqual(choose_encoding("gzip, deflate, br", {"gzip": b""}), "gzip")
+
+    def test_respects_q_zero(self):
+        self.assertEqual(choose_encoding("br;q=0, gzip;q=0.5", {"br": b"", "gzip": b""}), "gzip")
+        self.assertIsNone(choose_encoding("", {"gzip": b""}))
+        self.assertEqual(choose_encoding("*", {"gzip": b""}), "gzip")
+
+
+class TestStaticServer(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "assets").mkdir()
+        (self.root / "index.html").write_text("<!doctype html><div id=root></div>", encoding="utf-8")
+        (self.root / "assets" / "index-BvX3k9aQ.js").write_bytes(APP_JS)
+        # 建置時產生的 .br（內容是假的，只用來確認直接沿用）
+        (self.root / "assets" / "index-BvX3k9aQ.js.br").write_bytes(b"BR" * 10)
+        (self.root / "assets" / "style-Dk2a91Lq.css").write_text("body{margin:0}" * 200, encoding="utf-8")
+        (self.root / "favicon.png").write_bytes(b"\x89PNG" + b"\x00" * 2000)
+        self.server = StaticServer(self.root).start()
+        self.assertTrue(self.server.wait_ready(10))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self._tmp.cleanup()
+
+    def request(self, path, headers=None, method="GET"):
+        conn = http.client.HTTPConnection(self.server.host, self.server.port, timeout=5)
+        try:
+            conn.request(method, path, headers=headers or {})
+            resp = conn.getresponse()
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, resp.read()
+        finally:
+            conn.close()
+
+    def test_binds_ephemeral_port(self):
+        """測試預設綁隨機可用埠，兩個伺服器可同時執行"""
+        self.assertNotEqual(self.server.port, 0)
+        other = StaticServer(self.root).start()
+        try:
+            self.assertTrue(other.wait_ready(10))
+            self.assertNotEqual(other.port, self.server.port)
+        finally:
+            other.shutdown()
+
+    def test_port_in_use_reports_error(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            server = StaticServer(self.root, port=sock.getsockname()[1]).start()
+            self.assertFalse(server.wait_ready(10))
+            self.assertIsInstance(server.error, OSError)
+            # 視窗改顯示說明頁（含失敗原因），而不是開一個空白頁
+            page = server.error_page()
+            self.assertIn("介面載入失敗", page)
+            self.assertIn(html.escape(str(server.error)), page)
+
+    def test_index_and_headers(self):
+        """測試首頁需重新驗證、雜湊檔名的資源可永久快取"""
+        status, headers, body = self.request("/")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, (self.root / "index.html").read_bytes())
+        self.assertEqual(headers["cache-control"], REVALIDATE_CACHE)
+        self.assertTrue(headers["content-type"].startswith("text/html"))
+
+        status, headers, _ = self.request("/assets/style-Dk2a91Lq.css")
+        self.assertEqual(headers["cache-control"], IMMUTABLE_CACHE)
+        self.assertEqual(headers["content-type"], "text/css; charset=utf-8")
+
+    def test_etag_revalidation(self):
+        _, headers, _ = self.request("/index.html")
+        etag = headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+        status, headers, body = self.request("/index.html", {"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+        self.assertEqual(headers["etag"], etag)
+        self.assertEqual(self.request("/index.html", {"If-None-Match": '"other"'})[0], 200)
+
+    def test_compressed_variants(self):
+        """測試依 Accept-Encoding 送出建置時的 .br 或補產生的 gzip"""
+        # 背景壓縮可能還沒跑完，這裡直接補齊（已有的版本不會重做）
+        self.server.bundle.compress_missing()
+        status, headers, body = self.request("/assets/index-BvX3k9aQ.js", {"Accept-Encoding": "gzip, br"})
+        self.assertEqual((headers["content-encoding"], body), ("br", b"BR" * 10))
+        self.assertEqual(headers["vary"], "Accept-Encoding")
+
+        status, headers, body = self.request("/assets/index-BvX3k9aQ.js", {"Accept-Encoding": "gzip"})
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), APP_JS)
+        self.assertEqual(int(headers["content-length"]), len(body))
+
+        status, headers, body = self.request("/assets/index-BvX3k9aQ.js")
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(body, APP_JS)
+
+        # 二進位檔與太小的檔案不壓縮
+        _, headers, _ = self.request("/favicon.png", {"Accept-Encoding": "gzip"})
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(headers["content-type"], "image/png")
+
+    def test_precompressed_files_are_not_served_directly(self):
+        self.assertEqual(self.request("/assets/index-BvX3k9aQ.js.br")[0], 404)
+
+    def test_not_found_and_traversal(self):
+        self.assertEqual(self.request("/missing.js")[0], 404)
+        self.assertEqual(self.request("/../" + Path(__file__).name)[0], 404)
+
+    def test_head(self):
+        status, headers, body = self.request("/index.html", method="HEAD")
+        self.assertEqual((status, body), (200, b""))
+        self.assertEqual(int(headers["content-length"]), (self.root / "index.html").stat().st_size)
+
+    def test_served_from_memory(self):
+        """測試啟動後檔案改變不影響已預載的內容"""
+        (self.root / "index.html").write_text("changed", encoding="utf-8")
+        self.assertNotEqual(self.request("/")[2], b"changed")
+
+    def test_compress_missing_before_and_after(self):
+        """測試預載時只沿用建置時的壓縮檔，缺少的 gzip 由 compress_missing() 補上"""
+        bundle = StaticBundle(self.root)
+        self.assertEqual(set(bundle.lookup("/assets/index-BvX3k9aQ.js").variants), {"br"})
+        self.assertEqual(bundle.lookup("/assets/style-Dk2a91Lq.css").variants, {})
+        self.assertGreaterEqual(bundle.compress_missing(), 2)
+        self.assertIn("gzip", bundle.lookup("/assets/style-Dk2a91Lq.css").variants)
+        self.assertEqual(bundle.lookup("/favicon.png").variants, {})
+
+    def test_missing_root(self):
+        self.assertEqual(StaticBundle(self.root / "missing").assets, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+import hashlib
+import re
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from updater import UpdateError, UpdateFile, Updater, git_blob_sha, install_zip_dir, sha256_file
+
+BIG = bytes(range(256)) * 4096  # 1 MB
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+def sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class FakeGitHub(ThreadingHTTPServer):
+    """
+    代替 GitHub 的本機 HTTP 伺服器：支援 ETag / Range / If-Range，
+    cut_after 可讓某個檔案第一次傳到一半就斷線。
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.files: dict[str, bytes] = {}
+        self.cut_after: dict[str, int] = {}
+        self.delay = 0.0
+        self.log: list[tuple[str, str]] = []  # (路徑, Range 標頭)
+        self.connections: set[int] = set()
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/{path}"
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.lstrip("/")
+        with server.lock:
+            server.log.append((path, self.headers.get("Range", "")))
+            server.connections.add(self.client_address[1])
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._respond(server, path)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self, server, path):
+        time.sleep(server.delay)
+        data = server.files.get(path)
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{sha(data)[:16]}"'
+        start = 0
+        range_header = self.headers.get("Range", "")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        cut = server.cut_after.pop(path, None)
+        if cut is not None:
+            # 傳一部分就斷線
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestUpdater(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.server = FakeGitHub()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.updater = Updater(self.root / ".update", workers=4, retries=2)
+
+    def tearDown(self):
+        self.updater.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def requests_for(self, path):
+        return [r for p, r in self.server.log if p == path]
+
+    def test_parallel_download_and_apply(self):
+        """測試並行下載（共用連線池）、全部完成後才換上檔案並保留備份"""
+        self.server.delay = 0.1
+        items = []
+        for i in range(8):
+            self.server.files[f"scripts/s{i}.py"] = f"print({i})\n".encode()
+            items.append(UpdateFile(self.server.url(f"scripts/s{i}.py"), self.root / "scripts" / f"s{i}.py"))
+        (self.root / "scripts").mkdir()
+        (self.root / "scripts" / "s0.py").write_text("old\n", encoding="utf-8")
+
+        results = self.updater.download_all(items)
+        self.assertEqual([r.status for r in results], ["updated"] * 8)
+        self.assertGreater(self.server.max_active, 1)
+        self.assertLessEqual(len(self.server.connections), 4)
+        # 下載完成但還沒套用
+        self.assertEqual((self.root / "scripts" / "s0.py").read_text(encoding="utf-8"), "old\n")
+
+        backups = self.updater.apply(results)
+        for i in range(8):
+            self.assertEqual((self.root / "scripts" / f"s{i}.py").read_text(encoding="utf-8"), f"print({i})\n")
+        self.assertEqual(len(backups), 1)
+        self.assertEqual(backups[0][1].read_text(encoding="utf-8"), "old\n")
+        self.assertEqual(list((self.root / ".update").iterdir()), [])
+
+    def test_skips_current_files_without_request(self):
+        """測試 sha256 或 git blob sha 與本地檔相同時不下載"""
+        data = b"VALUE = 1\n"
+        self.server.files["a.py"] = data
+        self.server.files["b.py"] = data
+        (self.root / "a.py").write_bytes(data)
+        (self.root / "b.py").write_bytes(data)
+        self.assertEqual(git_blob_sha(self.root / "a.py"), hashlib.sha1(b"blob 10\0" + data).hexdigest())
+
+        results = self.updater.download_all([
+            UpdateFile(self.server.url("a.py"), self.root / "a.py", sha256="sha256:" + sha(data)),
+            UpdateFile(self.server.url("b.py"), self.root / "b.py", git_sha=git_blob_sha(self.root / "b.py")),
+        ])
+        self.assertEqual([r.status for r in results], ["unchanged", "unchanged"])
+        self.assertEqual(self.server.log, [])
+
+    def test_same_content_without_hash_is_not_swapped(self):
+        self.server.files["c.py"] = b"same\n"
+        (self.root / "c.py").write_bytes(b"same\n")
+        result = self.updater.download(UpdateFile(self.server.url("c.py"), self.root / "c.py"))
+        self.assertEqual((result.status, result.staged), ("unchanged", None))
+        self.assertEqual(self.updater.apply([result]), [])
+
+    def test_checksum_mismatch_is_rejected(self):
+        self.server.files["ui.zip"] = BIG
+        dest = self.root / "ui.zip"
+        result = self.updater.download(UpdateFile(self.server.url("ui.zip"), dest, sha256=sha(b"other")))
+        self.assertEqual(result.status, "failed")
+        self.assertIn("sha256", result.error)
+        self.assertFalse(dest.exists())
+        self.assertFalse(self.updater.part_path(result.file).exists())
+
+    def test_git_sha_mismatch_is_rejected(self):
+        """測試只有 git blob sha 時也驗證下載內容（例如 CDN 回傳舊版或損毀的內容），不符就不套用"""
+        self.server.files["main.py"] = b"print('truncated"
+        dest = self.root / "main.py"
+        dest.write_bytes(b"print('old')\n")
+        expected = hashlib.sha1(b"blob 13\0print('new')\n").hexdigest()
+        result = self.updater.download(UpdateFile(self.server.url("main.py"), dest, git_sha=expected))
+        self.assertEqual(result.status, "failed")
+        self.assertIn("git blob sha", result.error)
+        self.assertEqual(self.updater.apply([result]), [])
+        self.assertEqual(dest.read_bytes(), b"print('old')\n")
+        self.assertFalse(self.updater.part_path(result.file).exists())
+
+        self.server.files["main.py"] = b"print('new')\n"
+        result = self.updater.download(UpdateFile(self.server.url("main.py"), dest, git_sha=expected))
+        self.assertEqual(result.status, "updated")
+
+    def test_resumes_after_disconnect(self):
+        """測試傳到一半斷線時以 Range 接續，不重頭下載"""
+        self.server.files["ui.zip"] = BIG
+        self.server.cut_after["ui.zip"] = 300_000
+        item = UpdateFile(self.server.url("ui.zip"), self.root / "ui.zip", sha256=sha(BIG))
+        result = self.updater.download(item)
+        self.assertEqual(result.status, "updated")
+        # 斷線前最後一個不完整的區塊會丟掉，從已寫入的位置接續
+        self.assertTrue(0 < result.resumed_from <= 300_000)
+        self.assertEqual(result.downloaded, len(BIG))
+        self.assertEqual(self.requests_for("ui.zip"), ["", f"bytes={result.resumed_from}-"])
+        self.assertEqual(sha256_file(result.staged), sha(BIG))
+
+    def test_resumes_partial_file_from_previous_run(self):
+        self.server.files["ui.zip"] = BIG
+        item = UpdateFile(self.server.url("ui.zip"), self.root / "ui.zip", sha256=sha(BIG))
+        part = self.updater.part_path(item)
+        part.parent.mkdir(parents=True)
+        part.write_bytes(BIG[:700_000])
+
+        result = self.updater.download(item)
+        self.assertEqual((result.status, result.resumed_from), ("updated", 700_000))
+        self.assertEqual(result.downloaded, len(BIG) - 700_000)
+        self.updater.apply([result])
+        self.assertEqual((self.root / "ui.zip").read_bytes(), BIG)
+
+    def test_changed_remote_restarts_download(self):
+        """測試暫存檔的 ETag 與伺服器不符時（檔案已變動）重頭下載"""
+        self.server.files["app.js"] = b"new content " * 1000
+        item = UpdateFile(self.server.url("app.js"), self.root / "app.js")
+        part = self.updater.part_path(item)
+        part.parent.mkdir(parents=True)
+        part.write_bytes(b"old content " * 500)
+        part.with_name(part.name + ".etag").write_text('"stale"', encoding="utf-8")
+
+        result = self.updater.download(item)
+        self.assertEqual((result.status, result.resumed_from), ("updated", 0))
+        self.assertEqual(result.staged.read_bytes(), b"new content " * 1000)
+
+    def test_missing_file_fails(self):
+        result = self.updater.download(UpdateFile(self.server.url("missing.py"), self.root / "missing.py"))
+        self.assertEqual(result.status, "failed")
+        self.assertIn("404", result.error)
+
+    def test_apply_rolls_back_on_failure(self):
+        """測試換上途中失敗時還原已換上的檔案"""
+        self.server.files["a.py"] = b"new a\n"
+        self.server.files["b.py"] = b"new b\n"
+        (self.root / "a.py").write_bytes(b"old a\n")
+        results = self.updater.download_all([
+            UpdateFile(self.server.url("a.py"), self.root / "a.py"),
+            UpdateFile(self.server.url("b.py"), self.root / "b.py"),
+        ])
+        # 目標位置是非空資料夾，os.replace 會失敗
+        (self.root / "b.py").mkdir()
+        (self.root / "b.py" / "keep").write_text("x", encoding="utf-8")
+        with self.assertRaises(UpdateError):
+            self.updater.apply(results)
+        self.assertEqual((self.root / "a.py").read_bytes(), b"old a\n")
+
+    def test_install_zip_dir(self):
+        target = self.root / "ui"
+        target.mkdir()
+        (target / "index.html").write_text("old", encoding="utf-8")
+        archive = self.root / "ui.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("index.html", "new")
+            z.writestr("assets/app.js", "console.log(1)")
+
+        backup = install_zip_dir(archive, target)
+        self.assertEqual((target / "index.html").read_text(encoding="utf-8"), "new")
+        self.assertTrue((target / "assets" / "app.js").exists())
+        self.assertEqual((backup / "index.html").read_text(encoding="utf-8"), "old")
+
+        archive.write_bytes(b"not a zip")
+        with self.assertRaises(zipfile.BadZipFile):
+            install_zip_dir(archive, target)
+        self.assertEqual((target / "index.html").read_text(encoding="utf-8"), "new")
+
+
+class TestHotUpdateList(unittest.TestCase):
+    def test_raw_urls_point_at_repo_files(self):
+        """測試 core/main.py 熱更新清單的每個網址都對應到 repo 裡實際存在的檔案（否則下載 404，整批更新會放棄）"""
+        source = (REPO_ROOT / "core" / "main.py").read_text(encoding="utf-8")
+        paths = re.findall(r'https://raw\.githubusercontent\.com/\{REPO_NAME\}/main/([^"]+)"', source)
+        self.assertIn("core/main.py", paths)
+        self.assertIn("version.txt", paths)
+        missing = [p for p in paths if not (REPO_ROOT / p).is_file()]
+        self.assertEqual(missing, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
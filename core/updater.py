@@ -0,0 +1,343 @@
+import hashlib
+import os
+import shutil
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CHUNK_SIZE = 256 * 1024
+DEFAULT_WORKERS = 6
+# (連線, 讀取) 逾時秒數；讀取逾時是「兩個封包之間」的間隔，大檔不會因此中斷
+TIMEOUT = (5, 30)
+RETRIES = 3
+PART_SUFFIX = ".part"
+# 斷點續傳時用來確認伺服器上的檔案沒變（If-Range）
+VALIDATOR_SUFFIX = ".etag"
+
+
+class UpdateError(Exception):
+    pass
+
+
+@dataclass
+class UpdateFile:
+    """
+    要更新的一個檔案。
+    sha256: 預期內容雜湊（manifest、GitHub release asset 的 digest），下載後驗證，不符就不套用
+    git_sha: GitHub git tree 的 blob sha1，用來判斷本地檔是否已是最新（不必下載）；
+             沒有 sha256 時下載後也以它驗證，不符就不套用
+    """
+
+    url: str
+    dest: Path
+    sha256: str | None = None
+    git_sha: str | None = None
+
+    @property
+    def name(self) -> str:
+        return self.dest.name
+
+
+@dataclass
+class UpdateResult:
+    """
+    status: "updated"（已下載驗證，等待 apply）/ "unchanged"（本地已是最新）/ "failed"
+    staged: 下載完成的暫存檔（updated 時才有）
+    downloaded: 本次實際傳輸的位元組數；resumed_from: 從暫存檔第幾個位元組接續下載
+    """
+
+    file: UpdateFile
+    status: str
+    staged: Path | None = None
+    error: str = ""
+    downloaded: int = 0
+    resumed_from: int = 0
+
+
+def sha256_file(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def git_blob_sha(path: str | Path) -> str:
+    """git 計算 blob 的方式：sha1("blob <長度>\\0" + 內容)，可以直接和 git tree 比對。"""
+    data = Path(path).read_bytes()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def normalize_sha256(value: str | None) -> str | None:
+    """接受 "abc…" 或 GitHub release asset 的 "sha256:abc…" 格式。"""
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value.startswith("sha256:"):
+        value = value[len("sha256:"):]
+    return value or None
+
+
+class Updater:
+    """
+    腳本 / 介面更新下載器：
+    - 同一個 requests.Session（連線池大小 = 工作執行緒數）並行下載，同一主機的連線重複使用；
+    - 分塊串流寫入 staging_dir 下的 .part 暫存檔，不把整個檔案讀進記憶體；
+    - 斷線時從暫存檔大小接續（Range + If-Range），下次更新時也會接續上次沒下載完的檔案；
+    - 有 sha256（或 git blob sha）時下載前先比對本地檔，相同就略過；下載後驗證，不符則丟棄重下；
+    - 全部下載完成後才由 apply() 以 os.replace 一次換上，中途失敗會還原已換上的檔案。
+    staging_dir 要和目標檔案在同一個磁碟，os.replace 才是原子操作。
+    """
+
+    def __init__(
+        self,
+        staging_dir: str | Path,
+        workers: int = DEFAULT_WORKERS,
+        session: requests.Session | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        retries: int = RETRIES,
+        timeout=TIMEOUT,
+    ):
+        self.staging_dir = Path(staging_dir)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Updater":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_json(self, url: str, timeout=5):
+        resp = self.session.get(url, timeout=timeout)
+        if resp.status_code != 200:
+            raise UpdateError(f"HTTP {resp.status_code}: {url}")
+        return resp.json()
+
+    def fetch_git_blobs(self, tree_url: str) -> dict[str, str]:
+        """
+        取得 GitHub git tree（/git/trees/<branch>?recursive=1）中每個檔案的 blob sha，
+        一次請求就能判斷所有腳本是否有變動。
+        """
+        tree = self.get_json(tree_url)
+        return {entry["path"]: entry["sha"] for entry in tree.get("tree", []) if entry.get("type") == "blob"}
+
+    def is_current(self, item: UpdateFile) -> bool:
+        if not item.dest.is_file():
+            return False
+        if item.sha256:
+            return sha256_file(item.dest) == normalize_sha256(item.sha256)
+        if item.git_sha:
+            return git_blob_sha(item.dest) == item.git_sha
+        return False
+
+    def part_path(self, item: UpdateFile) -> Path:
+        # 以目標路徑區分暫存檔，不同資料夾的同名檔案（例如兩個 main.py）不會互相覆蓋
+        key = hashlib.sha1(str(item.dest).encode("utf-8")).hexdigest()[:12]
+        return self.staging_dir / f"{key}-{item.dest.name}{PART_SUFFIX}"
+
+    def download_all(self, items: list[UpdateFile]) -> list[UpdateResult]:
+        """並行下載，結果順序與 items 相同。"""
+        if not items:
+            return []
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items)), thread_name_prefix="update-dl") as pool:
+            return list(pool.map(self.download, items))
+
+    def download(self, item: UpdateFile) -> UpdateResult:
+        try:
+            if self.is_current(item):
+                return UpdateResult(item, "unchanged")
+        except OSError as e:
+            return UpdateResult(item, "failed", error=str(e))
+
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        part = self.part_path(item)
+        validator_file = part.with_name(part.name + VALIDATOR_SUFFIX)
+        expected = normalize_sha256(item.sha256)
+        result = UpdateResult(item, "failed")
+        resume_allowed = True
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(min(0.5 * 2 ** (attempt - 1), 4))
+            try:
+                digest = self._fetch(item, part, validator_file, result, resume_allowed)
+            except UpdateError as e:
+                # 4xx（檔案不存在等）重試也沒用
+                result.error = str(e)
+                break
+            except (requests.RequestException, OSError) as e:
+                result.error = str(e)
+                continue
+            mismatch = self._verify(item, part, digest, expected)
+            if mismatch:
+                result.error = mismatch
+                self._discard(part)
+                if not result.resumed_from:
+                    # 完整下載仍不符，是預期雜湊與檔案不一致，不再重試
+                    break
+                # 接續到不同版本的檔案，整個重下
+                resume_allowed = False
+                continue
+            validator_file.unlink(missing_ok=True)
+            if not expected and item.dest.is_file() and sha256_file(item.dest) == digest:
+                part.unlink(missing_ok=True)
+                result.status, result.error = "unchanged", ""
+                return result
+            result.status, result.staged, result.error = "updated", part, ""
+            return result
+        return result
+
+    def _verify(self, item: UpdateFile, part: Path, digest: str, expected: str | None) -> str:
+        """比對下載內容與預期雜湊，不符時回傳錯誤訊息。沒有 sha256 時以 git blob sha 驗證（腳本更新的情況）。"""
+        if expected:
+            if digest != expected:
+                return f"sha256 不符 ({digest[:12]}… != {expected[:12]}…)"
+        elif item.git_sha:
+            blob = git_blob_sha(part)
+            if blob != item.git_sha:
+                return f"git blob sha 不符 ({blob[:12]}… != {item.git_sha[:12]}…)"
+        return ""
+
+    def _fetch(self, item: UpdateFile, part: Path, validator_file: Path, result: UpdateResult, resume_allowed: bool) -> str:
+        """下載到 part（可接續），回傳整個檔案的 sha256。"""
+        offset = part.stat().st_size if part.exists() else 0
+        validator = validator_file.read_text(encoding="utf-8").strip() if validator_file.exists() else ""
+        # 沒有 sha256 也沒有 ETag 時無法確認接續的是同一個檔案，只能重頭下載
+        if offset and not (resume_allowed and (validator or item.sha256)):
+            offset = 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # 位移是以未壓縮的內容計算，接續時不能讓伺服器改送 gzip
+            headers["Accept-Encoding"] = "identity"
+            if validator:
+                headers["If-Range"] = validator
+
+        with self.session.get(item.url, headers=headers, stream=True, timeout=self.timeout) as resp:
+            if resp.status_code == 416 and offset:
+                # 暫存檔已經完整（上次下載完但還沒套用）
+                result.resumed_from = offset
+                return sha256_file(part)
+            if resp.status_code == 206 and offset and resp.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+                mode = "ab"
+                result.resumed_from = offset
+            elif resp.status_code == 200:
+                # 伺服器不支援 Range 或檔案已變動（If-Range 不符），重頭下載
+                mode, offset = "wb", 0
+                result.resumed_from = 0
+            elif 400 <= resp.status_code < 500:
+                raise UpdateError(f"HTTP {resp.status_code}")
+            else:
+                raise requests.HTTPError(f"HTTP {resp.status_code}")
+
+            etag = resp.headers.get("ETag", "")
+            if mode == "wb":
+                if etag and not etag.startswith("W/"):
+                    validator_file.write_text(etag, encoding="utf-8")
+                else:
+                    validator_file.unlink(missing_ok=True)
+
+            h = hashlib.sha256()
+            if mode == "ab":
+                with open(part, "rb") as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                        h.update(chunk)
+            with open(part, mode) as f:
+                for chunk in resp.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    h.update(chunk)
+                    result.downloaded += len(chunk)
+
+            length = resp.headers.get("Content-Length")
+            if length is not None and resp.headers.get("Content-Encoding") is None:
+                if part.stat().st_size != offset + int(length):
+                    raise requests.exceptions.ChunkedEncodingError("下載不完整")
+        return h.hexdigest()
+
+    def _discard(self, part: Path) -> None:
+        part.unlink(missing_ok=True)
+        part.with_name(part.name + VALIDATOR_SUFFIX).unlink(missing_ok=True)
+
+    def apply(self, results: list[UpdateResult], backup: bool = True) -> list[tuple[Path, Path]]:
+        """
+        把下載完成的檔案換上（os.replace，讀取端不會看到寫一半的檔案）。
+        backup=True 時先把舊檔複製成 <檔名>.bak.<時間戳>，回傳 [(目標, 備份)]；
+        任一檔案換上失敗就還原已換上的檔案並丟出 UpdateError。
+        """
+        stamp = int(time.time())
+        backups: list[tuple[Path, Path | None]] = []
+        try:
+            for r in results:
+                if r.status != "updated" or r.staged is None:
+                    continue
+                dest = r.file.dest
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                saved = None
+                if dest.exists():
+                    saved = dest.with_name(f"{dest.name}.bak.{stamp}")
+                    shutil.copy2(dest, saved)
+                os.replace(r.staged, dest)
+                backups.append((dest, saved))
+        except OSError as e:
+            for dest, saved in reversed(backups):
+                try:
+                    if saved is not None:
+                        os.replace(saved, dest)
+                    else:
+                        dest.unlink(missing_ok=True)
+                except OSError:
+                    pass
+            raise UpdateError(f"套用更新失敗，已還原: {e}") from e
+        if not backup:
+            for _, saved in backups:
+                if saved is not None:
+                    saved.unlink(missing_ok=True)
+        return [(dest, saved) for dest, saved in backups if saved is not None]
+
+    def discard(self, results: list[UpdateResult]) -> None:
+        """
+        不套用時清掉已下載完成的暫存檔；有 sha256 的保留，下次更新可直接驗證使用（不必重下）。
+        """
+        for r in results:
+            if r.staged is not None and not r.file.sha256:
+                self._discard(r.staged)
+
+
+def install_zip_dir(zip_path: str | Path, target: str | Path) -> Path | None:
+    """
+    把 zip 解壓到 target（例如介面資料夾）：先解到旁邊的暫存資料夾，完成後才換名，
+    解壓失敗時原本的資料夾不受影響。回傳舊資料夾的備份路徑（原本不存在時回傳 None）。
+    """
+    target = Path(target)
+    staging = target.with_name(target.name + ".new")
+    if staging.exists():
+        shutil.rmtree(staging)
+    with zipfile.ZipFile(zip_path) as z:
+        z.extractall(staging)
+
+    backup = None
+    if target.exists():
+        backup = target.with_name(f"{target.name}_bak_{int(time.time())}")
+        os.replace(target, backup)
+    try:
+        os.replace(staging, target)
+    except OSError:
+        if backup is not None:
+            os.replace(backup, target)
+        raise
+    return backup
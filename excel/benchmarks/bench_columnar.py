@@ -0,0 +1,81 @@
+"""
+日期篩選與正規化效能測試：舊寫法（逐列 isinstance + strptime + 建 dict） vs columnar（整欄解析日期 + 快取 + 遮罩）。
+資料直接在記憶體產生（不含讀檔），日期欄混合 datetime 與兩種文字格式。
+
+用法：
+    python benchmarks/bench_columnar.py [列數]
+"""
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from columnar import apply_mask, date_mask, load_columns, normalize_column
+from excel_reader import normalize
+
+
+def make_rows(n: int) -> list[tuple]:
+    rng = random.Random(42)
+    start = datetime.datetime(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        day = start + datetime.timedelta(days=rng.randint(0, 365))
+        raw_date = rng.choice([day, day.strftime("%Y-%m-%d"), day.strftime("%Y/%m/%d")])
+        person = rng.randint(0, n // 5)
+        rows.append((1150000000 + i, f"檢舉人{person}", f"user{person}@example.com", f"https://shopee.tw/product/{i}", raw_date))
+    return rows
+
+
+def legacy(rows, filter_start, filter_end) -> int:
+    """convert_excel 原本的逐列篩選（僅供比較）。"""
+    data = []
+    for doc_no, informant, email, url, raw_date in rows:
+        row_date = None
+        if isinstance(raw_date, datetime.datetime):
+            row_date = raw_date.date()
+        elif isinstance(raw_date, str):
+            try:
+                if "-" in raw_date:
+                    row_date = datetime.datetime.strptime(raw_date, "%Y-%m-%d").date()
+                elif "/" in raw_date:
+                    row_date = datetime.datetime.strptime(raw_date, "%Y/%m/%d").date()
+            except:
+                pass
+        if row_date:
+            if filter_start and row_date < filter_start:
+                continue
+            if filter_end and row_date > filter_end:
+                continue
+        else:
+            continue
+        data.append({
+            "公文文號": normalize(doc_no),
+            "檢舉人": normalize(informant),
+            "檢舉人信箱": normalize(email),
+            "網址": normalize(url),
+        })
+    return len(data)
+
+
+def columnar(rows, filter_start, filter_end) -> int:
+    *columns, raw_dates = load_columns(iter(rows), 5)
+    columns = apply_mask(columns, date_mask(raw_dates, filter_start, filter_end))
+    doc_nos, informants, emails, urls = (normalize_column(col) for col in columns)
+    return len(doc_nos)
+
+
+def main(n: int = 200_000) -> None:
+    rows = make_rows(n)
+    filter_start, filter_end = datetime.date(2024, 3, 1), datetime.date(2024, 9, 30)
+    print(f"{n} rows, filter {filter_start} ~ {filter_end}")
+    for name, fn in (("legacy", legacy), ("columnar", columnar)):
+        t0 = time.perf_counter()
+        kept = fn(rows, filter_start, filter_end)
+        print(f"  {name:<9}: {time.perf_counter() - t0:6.2f} s  ({kept} rows kept)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,139 @@
+"""
+Excel 讀取效能測試：load_workbook 一般模式（舊寫法）、openpyxl 唯讀模式、projected_rows（直接解析工作表 XML + 欄位投影）。
+產生一份有多餘欄位的大型檢舉清單，分別量測時間與 Python 記憶體峰值（tracemalloc 會拖慢執行，峰值另跑一次量測）。
+同樣的資料另存成 CSV 與 Parquet（需 pyarrow），比較 projected_rows 讀取各格式的速度。
+
+用法：
+    python benchmarks/bench_excel_ingest.py [列數]
+"""
+import csv
+import datetime
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import openpyxl
+
+from excel_reader import INPUT_COLUMNS, normalize, projected_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXTRA_COLUMNS = ["案件類別", "處理狀態", "承辦人", "備註", "商品名稱", "賣家帳號", "平台", "回覆內容"]
+
+
+def make_workbook(path: Path, rows: int) -> None:
+    rng = random.Random(42)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    header = INPUT_COLUMNS[:2] + EXTRA_COLUMNS[:4] + INPUT_COLUMNS[2:] + EXTRA_COLUMNS[4:]
+    ws.append(header)
+    start = datetime.datetime(2024, 1, 1)
+    for i in range(rows):
+        person = rng.randint(0, rows // 5)
+        values = {
+            "公文文號": f"11500{i:06d}",
+            "檢舉人": f"檢舉人{person}",
+            "檢舉人信箱": f"user{person}@example.com",
+            "網址": f"https://shopee.tw/product/{rng.randint(1, 10**9)}/{rng.randint(1, 10**9)}",
+            "檢舉日期": start + datetime.timedelta(days=rng.randint(0, 365)),
+        }
+        ws.append([values.get(col, f"{col}內容{rng.randint(0, 9999)}" * 3) for col in header])
+    wb.save(path)
+
+
+def export_copies(path: Path) -> list[Path]:
+    """把同一份資料另存成 CSV（與 Parquet），日期存成文字。"""
+    wb = openpyxl.load_workbook(path, read_only=True)
+    rows = [[v.strftime("%Y/%m/%d") if isinstance(v, datetime.datetime) else v for v in row]
+            for row in wb.active.iter_rows(values_only=True)]
+    wb.close()
+    copies = [path.with_suffix(".csv")]
+    with open(copies[0], "w", encoding="utf-8-sig", newline="") as f:
+        csv.writer(f).writerows(rows)
+    if pa is not None:
+        header, *body = rows
+        table = pa.table({name: [None if r[i] is None else str(r[i]) for r in body] for i, name in enumerate(header)})
+        copies.append(path.with_suffix(".parquet"))
+        pq.write_table(table, copies[-1])
+    return copies
+
+
+def load_full(path: Path) -> int:
+    """舊寫法：一般模式載入整本活頁簿後逐列讀取。"""
+    wb = openpyxl.load_workbook(path, data_only=True)
+    ws = wb.active
+    row_iter = ws.iter_rows(values_only=True)
+    headers = {normalize(name): idx for idx, name in enumerate(next(row_iter))}
+    n = 0
+    for row in row_iter:
+        if not any(row):
+            continue
+        _ = [normalize(row[headers[col]]) for col in INPUT_COLUMNS]
+        n += 1
+    wb.close()
+    return n
+
+
+def load_read_only(path: Path) -> int:
+    """openpyxl 唯讀模式，仍會轉換每一格。"""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    row_iter = wb.active.iter_rows(values_only=True)
+    headers = {normalize(name): idx for idx, name in enumerate(next(row_iter))}
+    n = 0
+    for row in row_iter:
+        if not any(row):
+            continue
+        _ = [normalize(row[headers[col]]) for col in INPUT_COLUMNS]
+        n += 1
+    wb.close()
+    return n
+
+
+def load_streaming(path: Path) -> int:
+    n = 0
+    with projected_rows(path) as (_, rows):
+        for row in rows:
+            _ = [normalize(v) for v in row]
+            n += 1
+    return n
+
+
+def measure(fn, path: Path) -> tuple[int, float, float]:
+    t0 = time.perf_counter()
+    n = fn(path)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n, elapsed, peak / 1024 / 1024
+
+
+def main(rows: int = 50000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "complaints.xlsx"
+        t0 = time.perf_counter()
+        make_workbook(path, rows)
+        print(f"{rows} rows x {len(INPUT_COLUMNS) + len(EXTRA_COLUMNS)} columns, "
+              f"{path.stat().st_size / 1024 / 1024:.1f} MB (generated in {time.perf_counter() - t0:.1f}s)")
+
+        for name, fn in (("load_workbook", load_full), ("read_only", load_read_only), ("projected_rows", load_streaming)):
+            n, elapsed, peak = measure(fn, path)
+            print(f"  {name:<15}: {elapsed:6.2f} s  peak {peak:8.1f} MB  ({n} rows)")
+
+        for copy in export_copies(path):
+            n, elapsed, peak = measure(load_streaming, copy)
+            print(f"  {copy.suffix[1:]:<15}: {elapsed:6.2f} s  peak {peak:8.1f} MB  ({n} rows)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
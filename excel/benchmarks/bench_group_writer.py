@@ -0,0 +1,97 @@
+"""
+輸出效能測試：舊寫法（逐檔 open/write + 每檔 print，之後 Bridge 再 glob 資料夾並重讀每個檔案數網址）
+vs write_groups（內容先組好、執行緒池寫檔、直接回傳含網址數的輸出清單）。
+
+用法：
+    python benchmarks/bench_group_writer.py [群數] [每群列數]
+"""
+import contextlib
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from convert_excel import write_groups
+
+
+def make_data(groups: int, per_group: int):
+    doc_nos, urls, members = [], [], []
+    for g in range(groups):
+        rows = []
+        for _ in range(per_group):
+            rows.append(len(doc_nos))
+            doc_nos.append(f"115{len(doc_nos):07d}")
+            urls.append(f"https://shopee.tw/product/{g}/{len(urls)}")
+        members.append(rows)
+    return members, doc_nos, urls
+
+
+def count_valid_urls(file_path):
+    """core.main.Bridge._count_valid_urls"""
+    count = 0
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            s = line.strip()
+            if s and not s.startswith("#"):
+                count += 1
+    return count
+
+
+def legacy_write(output_dir, members, doc_nos, urls):
+    for row_indices in members:
+        lines = []
+        for idx in row_indices:
+            lines.append(f"#文號{doc_nos[idx]}")
+            lines.append(urls[idx])
+            lines.append("")
+        filepath = os.path.join(output_dir, f"{doc_nos[row_indices[0]]}.txt")
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines).strip())
+        print(f"Created: {filepath}")
+    return output_dir
+
+
+def legacy_list(output_dir) -> int:
+    files = glob.glob(os.path.join(output_dir, "*.txt"))
+    return sum(count_valid_urls(f) for f in files)
+
+
+def manifest_list(files) -> int:
+    return sum(f["url_count"] for f in files)
+
+
+def best_of(repeat: int, write, listing, members, doc_nos, urls) -> tuple[float, float, int]:
+    """寫檔與列出輸出各取 repeat 次中最快的一次（檔案系統的時間抖動很大）。"""
+    best_write = best_list = float("inf")
+    total = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = write(tmp, members, doc_nos, urls)
+            t1 = time.perf_counter()
+            total = listing(result)
+            t2 = time.perf_counter()
+        best_write = min(best_write, t1 - t0)
+        best_list = min(best_list, t2 - t1)
+    return best_write, best_list, total
+
+
+def main(groups: int = 5000, per_group: int = 4, repeat: int = 3) -> None:
+    members, doc_nos, urls = make_data(groups, per_group)
+    print(f"{groups} groups x {per_group} rows (best of {repeat})")
+    for name, write, listing in (
+        ("legacy", legacy_write, legacy_list),
+        ("write_groups", write_groups, manifest_list),
+    ):
+        t_write, t_list, total = best_of(repeat, write, listing, members, doc_nos, urls)
+        print(f"  {name:<13}: write {t_write:6.2f} s  list+count {t_list:6.3f} s  ({total} URLs)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+"""
+分群效能測試：舊寫法（遞迴 find + "NAME:..." 字串鍵 + dict of lists） vs grouping.group_rows。
+資料分兩種：
+- random：檢舉人與信箱從 n/5 個人中隨機挑選（一般情況）；
+- chain：每列與下一列共用檢舉人或信箱，所有列串成一條很長的鏈。
+
+用法：
+    python benchmarks/bench_grouping.py [最大列數]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from grouping import group_rows
+
+
+def legacy_groups(informants, emails):
+    """convert_excel 原本的分群寫法（僅供比較）。"""
+    parent = list(range(len(informants)))
+
+    def find(i):
+        if parent[i] == i:
+            return i
+        parent[i] = find(parent[i])
+        return parent[i]
+
+    def union(i, j):
+        root_i = find(i)
+        root_j = find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    value_to_indices = {}
+    for idx in range(len(informants)):
+        keys = []
+        if informants[idx]:
+            keys.append(f"NAME:{informants[idx]}")
+        if emails[idx]:
+            keys.append(f"EMAIL:{emails[idx]}")
+        for key in keys:
+            if key not in value_to_indices:
+                value_to_indices[key] = []
+            value_to_indices[key].append(idx)
+
+    for key, indices in value_to_indices.items():
+        for other_idx in indices[1:]:
+            union(indices[0], other_idx)
+
+    groups = {}
+    for idx in range(len(informants)):
+        groups.setdefault(find(idx), []).append(idx)
+    return list(groups.values())
+
+
+def make_random(n: int):
+    rng = random.Random(42)
+    people = max(1, n // 5)
+    informants, emails = [], []
+    for _ in range(n):
+        p = rng.randint(0, people)
+        informants.append(f"檢舉人{p}" if rng.random() < 0.9 else "")
+        emails.append(f"user{rng.randint(0, people) if rng.random() < 0.1 else p}@example.com")
+    return informants, emails
+
+
+def make_chain(n: int):
+    return [f"檢舉人{i // 2}" for i in range(n)], [f"user{(i + 1) // 2}@example.com" for i in range(n)]
+
+
+def timed(fn, informants, emails) -> str:
+    t0 = time.perf_counter()
+    try:
+        groups = fn(informants, emails)
+    except RecursionError:
+        return "RecursionError".rjust(20)
+    return f"{time.perf_counter() - t0:7.2f} s {len(groups):>9} grp"
+
+
+def main(max_rows: int = 1_000_000) -> None:
+    sizes = [n for n in (10_000, 100_000, 1_000_000, 3_000_000) if n <= max_rows] or [max_rows]
+    print(f"{'rows':>10} {'data':<7} {'legacy':>22} {'group_rows':>22}")
+    for n in sizes:
+        for name, make in (("random", make_random), ("chain", make_chain)):
+            informants, emails = make(n)
+            print(f"{n:>10} {name:<7} {timed(legacy_groups, informants, emails):>22} {timed(group_rows, informants, emails):>22}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,61 @@
+import datetime
+from itertools import compress
+from typing import Iterable, Sequence
+
+# 文字日期依分隔符號判斷格式
+DATE_TEXT_FORMATS = (("-", "%Y-%m-%d"), ("/", "%Y/%m/%d"))
+
+
+def load_columns(rows: Iterable[tuple], width: int) -> list[list]:
+    """把 projected_rows 產生的資料列轉成 width 個欄位 list（一次轉置，不逐列建 dict）。"""
+    columns = [list(col) for col in zip(*rows)]
+    return columns or [[] for _ in range(width)]
+
+
+def normalize_column(values: Sequence) -> list[str]:
+    """與 excel_reader.normalize 相同（None -> ""，其餘轉字串去頭尾空白），字串走快速路徑。"""
+    return [v.strip() if v.__class__ is str else ("" if v is None else str(v).strip()) for v in values]
+
+
+def parse_date_value(raw) -> datetime.date | None:
+    """
+    單一儲存格的日期：datetime / date 直接取日期；文字依 DATE_TEXT_FORMATS 判斷格式後解析；
+    其它型別或無法解析時回傳 None。
+    """
+    if isinstance(raw, datetime.datetime):
+        return raw.date()
+    if isinstance(raw, datetime.date):
+        return raw
+    if isinstance(raw, str):
+        for sep, fmt in DATE_TEXT_FORMATS:
+            if sep in raw:
+                try:
+                    return datetime.datetime.strptime(raw, fmt).date()
+                except ValueError:
+                    return None
+    return None
+
+
+def parse_date_column(values: Sequence) -> list[datetime.date | None]:
+    """
+    整欄解析日期：先收集不重複的原始值判斷格式並解析一次，再依快取對應回每一列。
+    檢舉日期通常只有幾百個不同的值，strptime 的次數與列數無關。
+    """
+    cache = {raw: parse_date_value(raw) for raw in dict.fromkeys(values)}
+    return [cache[raw] for raw in values]
+
+
+def date_mask(values: Sequence, start: datetime.date | None, end: datetime.date | None) -> list[bool]:
+    """
+    日期區間篩選的遮罩：日期在 [start, end] 內為 True；
+    缺少日期或無法解析的列一律為 False（有篩選時略過）。
+    """
+    dates = parse_date_column(values)
+    return [
+        d is not None and (start is None or d >= start) and (end is None or d <= end)
+        for d in dates
+    ]
+
+
+def apply_mask(columns: list[list], mask: Sequence[bool]) -> list[list]:
+    return [list(compress(col, mask)) for col in columns]
@@ -1,10 +1,20 @@
-import openpyxl
 import os
 import sys
+import json
 import datetime
 import tkinter as tk
 from tkinter import filedialog
 import ctypes
+from concurrent.futures import ThreadPoolExecutor
+
+from columnar import apply_mask, date_mask, load_columns, normalize_column
+from excel_reader import DATE_COLUMN, INPUT_COLUMNS, REQUIRED_COLUMNS, normalize, projected_rows
+from grouping import group_rows
+from incremental import INDEX_FILE, ConvertIndex
+
+REPORT_FILE = "incremental_report.json"
+# 寫檔的執行緒數（Windows 上建立檔案常被防毒掃描拖慢，多執行緒可重疊等待）
+WRITER_WORKERS = 8
 
 def enable_dpi_awareness():
     # Fix blurry UI on Windows High DPI screens
@@ -18,11 +28,6 @@ def enable_dpi_awareness():
         except Exception:
             pass
 
-def normalize(val):
-    if val is None:
-        return ""
-    return str(val).strip()
-
 def select_file():
     # Allow command line argument for testing purposes
     if len(sys.argv) > 1 and os.path.exists(sys.argv[1]):
@@ -37,11 +42,16 @@ def select_file():
     print("請選擇 Excel 檔案...")
     file_path = filedialog.askopenfilename(
         title="請選擇 Excel 檔案",
-        filetypes=[("Excel Files", "*.xlsx"), ("All Files", "*.*")]
+        filetypes=[
+            ("Excel Files", "*.xlsx"),
+            ("CSV Files", "*.csv"),
+            ("Parquet / Arrow Files", "*.parquet *.feather *.arrow"),
+            ("All Files", "*.*"),
+        ]
     )
     return file_path
 
-def main(input_file=None, start_date=None, end_date=None):
+def main(input_file=None, start_date=None, end_date=None, incremental=False, index_path=None):
     if not input_file:
         input_file = select_file()
     
@@ -55,30 +65,6 @@ def main(input_file=None, start_date=None, end_date=None):
     if end_date:
         print(f"篩選結束日期: {end_date.replace('-', '年', 1).replace('-', '月', 1) + '日'}")
 
-    try:
-        wb = openpyxl.load_workbook(input_file, data_only=True)
-        ws = wb.active
-    except Exception as e:
-        raise ValueError(f"讀取 Excel 檔案失敗: {e}")
-
-    # Get headers
-    headers = {}
-    row_iter = ws.iter_rows(values_only=True)
-    try:
-        header_row = next(row_iter)
-    except StopIteration:
-        raise ValueError("錯誤: 檔案內容為空")
-
-    for idx, col_name in enumerate(header_row):
-        headers[normalize(col_name)] = idx
-
-    # Ensure required columns exist
-    # "檢舉日期" is optional if strictly required only for filtering, but good to have check if filtering is enabled
-    required_cols = ["公文文號", "檢舉人", "檢舉人信箱", "網址"] 
-    missing = [col for col in required_cols if col not in headers]
-    if missing:
-        raise ValueError(f"錯誤: 缺少必要欄位 {missing}。現有欄位: {list(headers.keys())}")
-
     # Parse filter dates
     filter_start = None
     filter_end = None
@@ -90,150 +76,189 @@ def main(input_file=None, start_date=None, end_date=None):
     except ValueError:
         raise ValueError("日期格式錯誤，請使用 年-月-日 (例如 2024-01-01)")
 
-    # Read data
-    data = []
-    
     # Check if we need to filter by date
     check_date = (filter_start is not None) or (filter_end is not None)
-    date_col_idx = headers.get("檢舉日期")
-    
-    if check_date and date_col_idx is None:
-        raise ValueError("無法篩選日期：Excel 中找不到「檢舉日期」欄位")
-
-    for row in row_iter:
-        # Check if row is empty/all None
-        if not any(row):
-            continue
-            
-        # Date filtering logic
-        if check_date:
-            raw_date = row[date_col_idx]
-            row_date = None
-            if isinstance(raw_date, datetime.datetime):
-                row_date = raw_date.date()
-            elif isinstance(raw_date, str):
-                try:
-                    # Try parsing common formats
-                    if "-" in raw_date:
-                         row_date = datetime.datetime.strptime(raw_date, "%Y-%m-%d").date()
-                    elif "/" in raw_date:
-                         row_date = datetime.datetime.strptime(raw_date, "%Y/%m/%d").date()
-                except:
-                    pass
-            
-            if row_date:
-                if filter_start and row_date < filter_start:
-                    continue
-                if filter_end and row_date > filter_end:
-                    continue
-            else:
-                # If date is missing or invalid format, decide policy. 
-                # Strict: skip. Loose: keep. Let's skip to be safe if filtering is ON.
-                continue
-
-        row_data = {
-            "公文文號": normalize(row[headers["公文文號"]]),
-            "檢舉人": normalize(row[headers["檢舉人"]]),
-            "檢舉人信箱": normalize(row[headers["檢舉人信箱"]]),
-            "網址": normalize(row[headers["網址"]]),
-        }
-        data.append(row_data)
 
-    if not data:
+    # Read data (streaming, only the needed columns) into one list per column
+    # "檢舉日期" is optional if strictly required only for filtering, but good to have check if filtering is enabled
+    with projected_rows(input_file, INPUT_COLUMNS, REQUIRED_COLUMNS) as (headers, rows):
+        if check_date and DATE_COLUMN not in headers:
+            raise ValueError("無法篩選日期：Excel 中找不到「檢舉日期」欄位")
+        *columns, raw_dates = load_columns(rows, len(INPUT_COLUMNS))
+
+    # Date filtering: parse the date column once, then keep rows inside the range.
+    # Rows with a missing or invalid date are skipped when filtering is ON.
+    if check_date:
+        columns = apply_mask(columns, date_mask(raw_dates, filter_start, filter_end))
+
+    doc_nos, informants, emails, urls = (normalize_column(col) for col in columns)
+    if not doc_nos:
         raise ValueError("錯誤: 未在 Excel 中找到有效數據 (可能因日期篩選而為空)")
 
-    # Union-Find initialization
-    parent = list(range(len(data)))
-    
-    def find(i):
-        if parent[i] == i:
-            return i
-        parent[i] = find(parent[i])
-        return parent[i]
-
-    def union(i, j):
-        root_i = find(i)
-        root_j = find(j)
-        if root_i != root_j:
-            parent[root_j] = root_i
-
-    # Map values to row indices
-    value_to_indices = {}
-
-    for idx, row in enumerate(data):
-        informant = row["檢舉人"]
-        email = row["檢舉人信箱"]
-
-        keys = []
-        if informant:
-            keys.append(f"NAME:{informant}")
-        if email:
-            keys.append(f"EMAIL:{email}")
-        
-        for key in keys:
-            if key not in value_to_indices:
-                value_to_indices[key] = []
-            value_to_indices[key].append(idx)
-
-    # Union rows that share the same key
-    for key, indices in value_to_indices.items():
-        first_idx = indices[0]
-        for other_idx in indices[1:]:
-            union(first_idx, other_idx)
-
-    # Group rows by root
-    groups = {}
-    for idx in range(len(data)):
-        root = find(idx)
-        if root not in groups:
-            groups[root] = []
-        groups[root].append(idx)
+    return convert_columns(doc_nos, informants, emails, urls, incremental=incremental, index_path=index_path)
 
-    # Output directory with timestamp
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    output_dir = os.path.join(script_dir, "output", timestamp)
-    os.makedirs(output_dir, exist_ok=True)
+def convert_rows(data, output_root=None, incremental=False, index_path=None):
+    """
+    將資料列分群並輸出文字檔（每群一個 .txt，以該群第一筆公文文號命名）。
+    data: dict 的 list，需有「公文文號」「檢舉人」「檢舉人信箱」「網址」四個鍵（值為字串）；
+          core 的 Bridge.run_excel_convert 可直接傳入記憶體中的資料列，不必先存成 Excel。
+    output_root: 輸出資料夾的上層，預設為本程式旁的 output/；實際輸出到其下以時間命名的資料夾。
+    incremental / index_path: 增量轉換，與 convert_columns 相同。
+    回傳轉換結果（見 convert_columns）。
+    """
+    if not data:
+        raise ValueError("錯誤: 沒有可轉換的資料")
+    missing = [col for col in REQUIRED_COLUMNS if col not in data[0]]
+    if missing:
+        raise ValueError(f"錯誤: 資料列缺少欄位 {missing}")
+    return convert_columns(
+        *([row[col] for row in data] for col in REQUIRED_COLUMNS),
+        output_root=output_root,
+        incremental=incremental,
+        index_path=index_path,
+    )
+
+def convert_columns(doc_nos, informants, emails, urls, output_root=None, incremental=False, index_path=None):
+    """
+    convert_rows 的欄位版本：四個等長的字串 list（依 REQUIRED_COLUMNS 順序）。
+    incremental: 只輸出沒處理過的資料列（見 convert_incremental）。
+
+    回傳轉換結果 dict：
+        - output_dir: 輸出資料夾
+        - files: 輸出檔清單（見 write_groups），呼叫端不必再掃描資料夾或重讀檔案
+        - report: 增量模式的新增摘要（完整轉換為 None）
+    """
+    if output_root is None:
+        output_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+    if incremental:
+        return convert_incremental(doc_nos, informants, emails, urls, output_root, index_path)
+
+    groups = group_rows(informants, emails)
+    output_dir = new_output_dir(output_root)
 
     # Process groups
     print(f"Found {len(groups)} unique groups.")
     print(f"Output directory: {output_dir}")
-    
-    for group_idx, (root, row_indices) in enumerate(groups.items()):
-        # Sort indices to preserve original order
-        row_indices.sort()
-        
-        # Collect content
-        lines = []
-        first_doc_no = None
+    files = write_groups(output_dir, groups, doc_nos, urls)
+    print(f"Created {len(files)} files.")
+    print("Done!")
+    return {"output_dir": output_dir, "files": files, "report": None}
 
-        for idx in row_indices:
-            row = data[idx]
-            doc_no = row["公文文號"]
-            url = row["網址"]
+def convert_incremental(doc_nos, informants, emails, urls, output_root, index_path=None):
+    """
+    增量轉換：依本機索引 (output_root/convert_index.json) 略過已處理的資料列（指紋為 公文文號 + 網址），
+    只為含有新資料列的群輸出 .txt，檔案內只有新資料列，讓截圖只處理新網址：
+    - 新資料列的檢舉人或信箱與既有的群相同時併入該群，沿用該群的檔名；
+    - 都沒有的另成新群，以第一筆公文文號命名，與其他群的檔名重複時加上 _2、_3…（見 ConvertIndex.unique_names）。
+    輸出資料夾另有 incremental_report.json 記錄本次新增內容。沒有新資料列時回傳 None。
+    """
+    index = ConvertIndex(index_path or os.path.join(output_root, INDEX_FILE))
+    new_rows, groups = index.plan(doc_nos, informants, emails, urls)
+    skipped = len(doc_nos) - len(new_rows)
+    print(f"增量模式: {len(new_rows)} 筆新資料列，略過 {skipped} 筆已處理的資料列")
+    if not new_rows:
+        print("沒有新增的資料列。")
+        return None
 
-            if first_doc_no is None:
-                first_doc_no = doc_no
+    output_dir = new_output_dir(output_root)
+    print(f"Found {len(groups)} new or updated groups.")
+    print(f"Output directory: {output_dir}")
+    members = [rows for rows, _ in groups]
+    names = group_file_names(members, doc_nos, [index.groups[gids[0]]["name"] if gids else None for _, gids in groups])
+    names = index.unique_names(groups, names)
+    files = write_groups(output_dir, members, doc_nos, urls, names)
+    summary = index.commit(groups, names, doc_nos, informants, emails, urls)
 
-            lines.append(f"#文號{doc_no}")
-            lines.append(url)
-            lines.append("") # Empty line after each pair
-        
-        # Sanitize filename
-        safe_name = "".join(c for c in first_doc_no if c.isalnum() or c in (' ', '_', '-')).strip()
+    report = {
+        "new_rows": len(new_rows),
+        "skipped_rows": skipped,
+        "new_groups": sum(1 for g in summary if not g["merged"]),
+        "updated_groups": sum(1 for g in summary if g["merged"]),
+        "groups": summary,
+    }
+    with open(os.path.join(output_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    index.save()
+    print(f"Created {len(files)} files.")
+    print(f"新群 {report['new_groups']} 個，更新既有群 {report['updated_groups']} 個")
+    print("Done!")
+    return {"output_dir": output_dir, "files": files, "report": report}
+
+def new_output_dir(output_root):
+    # Output directory with timestamp
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_dir = os.path.join(output_root, timestamp)
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+def group_file_names(groups, doc_nos, names=None):
+    """各群的檔名（不含 .txt）：names 有指定的沿用，否則以該群第一筆公文文號命名（去除不能當檔名的字元）。"""
+    result = []
+    for group_idx, row_indices in enumerate(groups):
+        safe_name = names[group_idx] if names else None
+        if not safe_name:
+            # Sanitize filename
+            first_doc_no = doc_nos[row_indices[0]]
+            safe_name = "".join(c for c in first_doc_no if c.isalnum() or c in (' ', '_', '-')).strip()
         if not safe_name:
             safe_name = f"Group_{group_idx + 1}"
-            
+        result.append(safe_name)
+    return result
+
+def count_url_lines(text):
+    """與 Bridge._count_valid_urls 相同的算法：去除空白後非空、且不是 # 開頭的行數。"""
+    count = 0
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            count += 1
+    return count
+
+def write_groups(output_dir, groups, doc_nos, urls, names=None, workers=WRITER_WORKERS):
+    """
+    每群寫一個 .txt（#文號 與網址成對，中間空一行），內容先在記憶體組好，再交給執行緒池寫檔。
+    names: 各群的檔名（不含 .txt），None 表示以該群第一筆公文文號命名。
+    檔名重複時以後面的群為準（與依序寫檔時後寫的覆蓋先寫的相同）。
+
+    回傳輸出檔清單（依各檔第一次出現的順序），每項為
+        {"name": 檔名, "path": 完整路徑, "url_count": 網址行數, "first_doc_no": 第一筆公文文號, "rows": 列索引}
+    """
+    names = group_file_names(groups, doc_nos, names)
+    files = {}
+    contents = {}
+    for row_indices, safe_name in zip(groups, names):
+        # Collect content (row_indices 已依原始順序排列)
+        lines = []
+        for idx in row_indices:
+            lines.append(f"#文號{doc_nos[idx]}")
+            lines.append(urls[idx])
+            lines.append("") # Empty line after each pair
+        content = "\n".join(lines).strip()
+
         filename = f"{safe_name}.txt"
-        filepath = os.path.join(output_dir, filename)
+        contents[filename] = content
+        files[filename] = {
+            "name": filename,
+            "path": os.path.join(output_dir, filename),
+            "url_count": count_url_lines(content),
+            "first_doc_no": doc_nos[row_indices[0]],
+            "rows": list(row_indices),
+        }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines).strip())
-        
-        print(f"Created: {filepath}")
-    
-    print("Done!")
-    return output_dir
+    def write(entry):
+        with open(entry["path"], "w", encoding="utf-8") as f:
+            f.write(contents[entry["name"]])
+
+    entries = list(files.values())
+    workers = max(1, min(int(workers), len(entries)))
+    if workers == 1:
+        for entry in entries:
+            write(entry)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="group-writer") as pool:
+            # list() 讓任何一個寫檔錯誤在這裡拋出
+            list(pool.map(write, entries))
+    return entries
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,371 @@
+import codecs
+import csv
+import itertools
+import posixpath
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from xml.etree.ElementTree import iterparse, parse
+
+import openpyxl
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 轉換需要的欄位（檢舉日期只在篩選日期時需要）
+REQUIRED_COLUMNS = ["公文文號", "檢舉人", "檢舉人信箱", "網址"]
+DATE_COLUMN = "檢舉日期"
+INPUT_COLUMNS = REQUIRED_COLUMNS + [DATE_COLUMN]
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_SHEET_DATA, _ROW, _CELL = f"{_NS}sheetData", f"{_NS}row", f"{_NS}c"
+_VALUE, _INLINE, _TEXT, _RUN = f"{_NS}v", f"{_NS}is", f"{_NS}t", f"{_NS}r"
+
+
+def normalize(val):
+    if val is None:
+        return ""
+    return str(val).strip()
+
+
+@contextmanager
+def projected_rows(input_file, columns: list[str] = INPUT_COLUMNS, required: list[str] = REQUIRED_COLUMNS):
+    """
+    串流讀取輸入檔，逐列只取出 columns 指定的欄位。依副檔名選擇 READERS 裡的讀取方式：
+    - .xlsx / .xlsm：直接解析工作表 XML（見 SheetXmlReader）；
+    - .csv：標準函式庫 csv 逐列讀取；
+    - .parquet / .feather / .arrow：pyarrow 依欄位讀取（需安裝 pyarrow）。
+    不論來源為何，產生的資料列與同內容的 Excel 相同，後續分群與輸出結果一致。
+
+    Yields:
+        (headers, rows):
+            - headers: 欄位名稱 -> 欄位索引（第一列）
+            - rows: 依 columns 順序的 tuple 產生器（檔案中沒有的欄位為 None），略過整列空白的列
+    """
+    reader = READERS.get(Path(input_file).suffix.lower(), _xlsx_source)
+    with reader(input_file) as (header_row, project):
+        headers = _headers(header_row, required)
+        yield headers, project([headers.get(col) for col in columns])
+
+
+@contextmanager
+def _xlsx_source(input_file):
+    """
+    load_workbook 一般模式會先在記憶體建出所有儲存格物件，20 萬列的檔案需要數 GB。
+    這裡以 SheetXmlReader 逐列解析工作表 XML，只轉換需要的欄位，記憶體用量與列數無關；
+    遇到不認得的檔案結構時改用 openpyxl 唯讀模式 (read_only=True)，結果相同。
+    """
+    try:
+        sheet = SheetXmlReader(input_file)
+    except Exception:
+        sheet = None
+
+    if sheet is not None:
+        try:
+            yield sheet.header_row(), sheet.project
+        finally:
+            sheet.close()
+        return
+
+    try:
+        wb = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"讀取 Excel 檔案失敗: {e}")
+
+    try:
+        row_iter = wb.active.iter_rows(values_only=True)
+        yield next(row_iter, None), lambda indices: _project(row_iter, indices)
+    finally:
+        wb.close()
+
+
+@contextmanager
+def _csv_source(input_file):
+    """
+    CSV 逐列讀取。編碼依檔案開頭判斷（UTF-8，含 BOM；否則視為 Excel 在繁體中文 Windows 存出的 cp950）。
+    空白欄位視為 None，與 Excel 的空白儲存格相同；其它值一律是字串，日期欄位沿用文字日期的解析方式。
+    """
+    try:
+        f = open(input_file, "r", encoding=_sniff_encoding(input_file), newline="")
+    except OSError as e:
+        raise ValueError(f"讀取 CSV 檔案失敗: {e}")
+
+    try:
+        row_iter = ([cell if cell != "" else None for cell in row] for row in csv.reader(f))
+        try:
+            yield next(row_iter, None), lambda indices: _project(row_iter, indices)
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ValueError(f"讀取 CSV 檔案失敗: {e}")
+    finally:
+        f.close()
+
+
+def _sniff_encoding(path, size: int = 1 << 16) -> str:
+    with open(path, "rb") as f:
+        head = f.read(size)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False：讀取長度可能切在多位元組字元中間
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp950"
+
+
+@contextmanager
+def _arrow_source(input_file):
+    """
+    Parquet / Arrow (Feather) 依欄位讀取：每批只把需要的欄位轉成 Python 值；
+    只有在某列需要的欄位全是空值時，才取出該批其它欄位判斷是否為整列空白（與 Excel 的略過規則一致）。
+    """
+    if pa is None:
+        raise ValueError("讀取 Parquet / Arrow 檔案需要安裝 pyarrow (pip install pyarrow)")
+    try:
+        if Path(input_file).suffix.lower() == ".parquet":
+            source = pq.ParquetFile(input_file)
+            names = source.schema_arrow.names
+            batches = lambda: source.iter_batches()
+        else:
+            table = pa_feather.read_table(input_file, memory_map=True)
+            names = table.column_names
+            batches = lambda: table.to_batches()
+    except Exception as e:
+        raise ValueError(f"讀取 Parquet / Arrow 檔案失敗: {e}")
+
+    def project(indices: list[int | None]) -> Iterator[tuple]:
+        wanted = sorted({i for i in indices if i is not None})
+        for batch in batches():
+            columns = {i: batch.column(i).to_pylist() for i in wanted}
+            empty = [None] * batch.num_rows
+            projected = list(zip(*(columns[i] if i is not None else empty for i in indices)))
+            blank = [n for n, row in enumerate(projected) if not any(row)]
+            if blank:
+                others = [batch.column(i).to_pylist() for i in range(batch.num_columns) if i not in columns]
+                blank = {n for n in blank if not any(col[n] for col in others)}
+            for n, row in enumerate(projected):
+                if n not in blank:
+                    yield row
+
+    yield (names or None), project
+
+
+# 副檔名 -> 讀取方式；每個讀取方式是 context manager，產生 (標題列, project(indices) -> 資料列產生器)
+READERS = {
+    ".xlsx": _xlsx_source,
+    ".xlsm": _xlsx_source,
+    ".csv": _csv_source,
+    ".parquet": _arrow_source,
+    ".feather": _arrow_source,
+    ".arrow": _arrow_source,
+}
+
+
+def _headers(header_row, required: list[str]) -> dict[str, int]:
+    if header_row is None:
+        raise ValueError("錯誤: 檔案內容為空")
+
+    headers = {}
+    for idx, col_name in enumerate(header_row):
+        headers[normalize(col_name)] = idx
+
+    missing = [col for col in required if col not in headers]
+    if missing:
+        raise ValueError(f"錯誤: 缺少必要欄位 {missing}。現有欄位: {list(headers.keys())}")
+    return headers
+
+
+def _project(row_iter, indices: list[int | None]) -> Iterator[tuple]:
+    for row in row_iter:
+        # Check if row is empty/all None
+        if not any(row):
+            continue
+        n = len(row)
+        yield tuple(row[i] if i is not None and i < n else None for i in indices)
+
+
+def _column_index(ref: str) -> int:
+    """'AB12' -> 27（從 0 起算）"""
+    col = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        col = col * 26 + ord(ch) - 64
+    return col - 1
+
+
+def _cast_number(text: str):
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+class SheetXmlReader:
+    """
+    直接解析 .xlsx 壓縮檔裡作用中工作表的 XML（結果與 openpyxl read_only + data_only 一致）：
+    - 共用字串表與儲存格樣式只在開啟時讀一次；
+    - 逐列 iterparse，處理完的列立即從樹上移除，記憶體不隨列數增加；
+    - project() 只轉換需要的欄位，其它儲存格只判斷是否有值（用來略過空白列）。
+    """
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path)
+        try:
+            names = set(self._zip.namelist())
+            workbook = self._parse("xl/workbook.xml")
+            self.epoch = CALENDAR_WINDOWS_1900
+            pr = workbook.find(f"{_NS}workbookPr")
+            if pr is not None and pr.get("date1904") in ("1", "true"):
+                self.epoch = CALENDAR_MAC_1904
+
+            sheets = workbook.find(f"{_NS}sheets")
+            view = workbook.find(f"{_NS}bookViews/{_NS}workbookView")
+            active = int(view.get("activeTab", 0)) if view is not None else 0
+            targets = {
+                rel.get("Id"): rel.get("Target")
+                for rel in self._parse("xl/_rels/workbook.xml.rels").iter(f"{_PKG_REL_NS}Relationship")
+            }
+            target = targets[sheets[active].get(f"{_REL_NS}id")]
+            if target.startswith("/"):
+                self.sheet_path = target[1:]
+            else:
+                self.sheet_path = posixpath.normpath(posixpath.join("xl", target))
+            if self.sheet_path not in names:
+                raise KeyError(self.sheet_path)
+
+            self.shared_strings = []
+            if "xl/sharedStrings.xml" in names:
+                self.shared_strings = [_string_text(si) for si in self._parse("xl/sharedStrings.xml").iter(f"{_NS}si")]
+            self.date_styles, self.timedelta_styles = self._date_styles(names)
+        except Exception:
+            self._zip.close()
+            raise
+        self._fh = None
+        self._rows = None
+        self._pending = None
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._zip.close()
+
+    def _parse(self, name: str):
+        with self._zip.open(name) as fh:
+            return parse(fh).getroot()
+
+    def _date_styles(self, names: set[str]) -> tuple[set[int], set[int]]:
+        if "xl/styles.xml" not in names:
+            return set(), set()
+        styles = self._parse("xl/styles.xml")
+        formats = dict(BUILTIN_FORMATS)
+        for fmt in styles.iter(f"{_NS}numFmt"):
+            formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+        date_styles, timedelta_styles = set(), set()
+        xfs = styles.find(f"{_NS}cellXfs")
+        for i, xf in enumerate(xfs if xfs is not None else []):
+            code = formats.get(int(xf.get("numFmtId", 0)))
+            if code and is_date_format(code):
+                date_styles.add(i)
+                if is_timedelta_format(code):
+                    timedelta_styles.add(i)
+        return date_styles, timedelta_styles
+
+    def _row_elements(self) -> Iterator:
+        """逐一產生 <row> 元素；呼叫端處理完後才取下一列，上一列隨即從 sheetData 移除。"""
+        self._fh = self._zip.open(self.sheet_path)
+        sheet_data = None
+        for event, elem in iterparse(self._fh, events=("start", "end")):
+            if event == "start":
+                if sheet_data is None and elem.tag == _SHEET_DATA:
+                    sheet_data = elem
+            elif elem.tag == _ROW:
+                yield elem
+                sheet_data.remove(elem)
+
+    def header_row(self) -> list | None:
+        """第 1 列的所有值；工作表沒有任何列時回傳 None，第 1 列空白時回傳空列。"""
+        self._rows = self._row_elements()
+        first = next(self._rows, None)
+        if first is None:
+            return None
+        if first.get("r", "1") != "1":
+            self._pending = first
+            return []
+        row = []
+        for col, cell in _cells(first):
+            if col >= len(row):
+                row.extend([None] * (col + 1 - len(row)))
+            row[col] = self._value(cell)
+        return row
+
+    def project(self, indices: list[int | None]) -> Iterator[tuple]:
+        wanted = {i: pos for pos, i in enumerate(indices) if i is not None}
+        if self._pending is not None:
+            rows = itertools.chain([self._pending], self._rows)
+        else:
+            rows = self._rows
+        value = self._value
+        for elem in rows:
+            out = [None] * len(indices)
+            has_value = False
+            for col, cell in _cells(elem):
+                pos = wanted.get(col)
+                if pos is not None:
+                    out[pos] = v = value(cell)
+                    has_value = has_value or bool(v)
+                elif not has_value:
+                    has_value = bool(value(cell))
+            if has_value:
+                yield tuple(out)
+
+    def _value(self, cell):
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            child = cell.find(_INLINE)
+            return None if child is None else _string_text(child)
+        text = cell.findtext(_VALUE) or None
+        if text is None:
+            return None
+        if kind == "n":
+            value = _cast_number(text)
+            style = int(cell.get("s", 0))
+            if style in self.date_styles:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if kind == "s":
+            return self.shared_strings[int(text)]
+        if kind == "b":
+            return bool(int(text))
+        if kind == "d":
+            return from_ISO8601(text)
+        return text
+
+
+def _cells(row) -> Iterator[tuple[int, object]]:
+    col = -1
+    for cell in row:
+        if cell.tag != _CELL:
+            continue
+        ref = cell.get("r")
+        col = _column_index(ref) if ref else col + 1
+        yield col, cell
+
+
+def _string_text(si) -> str:
+    """<si>/<is> 的文字：純文字 <t>，或 rich text 各段 <r><t> 串接（不含注音 <rPh>）。"""
+    t = si.find(_TEXT)
+    if t is not None:
+        return t.text or ""
+    return "".join(r.findtext(_TEXT) or "" for r in si.iter(_RUN))
@@ -0,0 +1,114 @@
+from typing import Sequence
+
+
+class DisjointSet:
+    """
+    以 list 儲存的 union-find：
+    - find 用迴圈加上路徑減半 (path halving)，不會因為很長的鏈超過 Python 遞迴上限；
+    - union 依集合大小合併（小的掛到大的底下），樹高維持在 O(log n)。
+    """
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> int:
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i == root_j:
+            return root_i
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        return root_i
+
+
+def group_rows(informants: Sequence[str], emails: Sequence[str]) -> list[list[int]]:
+    """
+    依檢舉人或檢舉人信箱分群：兩列只要檢舉人相同或信箱相同就屬於同一群（可遞移）。
+    空字串不參與比對。
+
+    檢舉人與信箱各用一個 dict 記錄「第一次出現的列」，不必組出 "NAME:..." 之類的字串當鍵，
+    也不必為每個值保留整串列索引。
+
+    Returns:
+        各群的列索引（群內由小到大）；群的順序依每群第一列的位置排列。
+    """
+    n = len(informants)
+    if len(emails) != n:
+        raise ValueError(f"檢舉人與檢舉人信箱的列數不同 ({n} != {len(emails)})")
+
+    ds = DisjointSet(n)
+    for column in (informants, emails):
+        first_row: dict[str, int] = {}
+        for idx, value in enumerate(column):
+            if not value:
+                continue
+            first = first_row.setdefault(value, idx)
+            if first != idx:
+                ds.union(first, idx)
+
+    groups: dict[int, list[int]] = {}
+    find = ds.find
+    for idx in range(n):
+        root = find(idx)
+        members = groups.get(root)
+        if members is None:
+            groups[root] = [idx]
+        else:
+            members.append(idx)
+    return list(groups.values())
+
+
+def link_new_rows(
+    informants: Sequence[str],
+    emails: Sequence[str],
+    name_groups: dict[str, str],
+    email_groups: dict[str, str],
+) -> list[tuple[list[int], list[str]]]:
+    """
+    增量分群：新資料列彼此分群，並依檢舉人 / 信箱接到先前已存在的群。
+    name_groups / email_groups: 先前的檢舉人、信箱 -> 群代號。
+
+    Returns:
+        每個含有新資料列的群：(新資料列索引, 併入的既有群代號)。
+        既有群代號可能有多個（新資料列把兩個舊群連起來），也可能沒有（全新的群）；
+        順序與 group_rows 相同，依第一列的位置排列。
+    """
+    n = len(informants)
+    if len(emails) != n:
+        raise ValueError(f"檢舉人與檢舉人信箱的列數不同 ({n} != {len(emails)})")
+
+    # 節點 0..n-1 是新資料列，之後每個被參考到的既有群一個節點
+    group_nodes: dict[str, int] = {}
+    links: list[tuple[int, int]] = []
+    for column, known in ((informants, name_groups), (emails, email_groups)):
+        first_row: dict[str, int] = {}
+        for idx, value in enumerate(column):
+            if not value:
+                continue
+            first = first_row.setdefault(value, idx)
+            if first != idx:
+                links.append((first, idx))
+            gid = known.get(value)
+            if gid is not None:
+                links.append((idx, group_nodes.setdefault(gid, n + len(group_nodes))))
+
+    ds = DisjointSet(n + len(group_nodes))
+    for i, j in links:
+        ds.union(i, j)
+
+    groups: dict[int, tuple[list[int], list[str]]] = {}
+    for idx in range(n):
+        groups.setdefault(ds.find(idx), ([], []))[0].append(idx)
+    for gid, node in group_nodes.items():
+        groups[ds.find(node)][1].append(gid)
+    return list(groups.values())
@@ -0,0 +1,155 @@
+import datetime
+import hashlib
+import json
+from pathlib import Path
+from typing import Sequence
+
+from grouping import link_new_rows
+
+INDEX_FILE = "convert_index.json"
+
+
+def row_fingerprint(doc_no: str, url: str) -> str:
+    """資料列指紋：公文文號 + 網址（任一改變都視為新資料列）。"""
+    return hashlib.blake2b(f"{doc_no}\x1f{url}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ConvertIndex:
+    """
+    增量轉換的本機索引（JSON）：
+    - rows：已處理過的資料列指紋；
+    - groups：群代號 -> {"name": 輸出檔名（不含 .txt）, "rows": 列數, "updated": 時間}；
+    - names / emails：檢舉人、信箱 -> 群代號，新資料列靠這兩張表併入既有的群。
+    新資料列把兩個既有的群連起來時，保留較早建立的群代號，另一個群的檢舉人與信箱改指向它。
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.rows: set[str] = set()
+        self.groups: dict[str, dict] = {}
+        self.names: dict[str, str] = {}
+        self.emails: dict[str, str] = {}
+        self.next_id = 1
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            raise ValueError(f"無法讀取增量索引 {self.path}: {e}")
+        if data.get("version") != self.VERSION:
+            raise ValueError(f"增量索引版本不符 ({data.get('version')})，請刪除 {self.path} 後重新執行")
+        self.rows = set(data.get("rows", []))
+        self.groups = data.get("groups", {})
+        self.names = data.get("names", {})
+        self.emails = data.get("emails", {})
+        self.next_id = int(data.get("next_id", len(self.groups) + 1))
+
+    def save(self) -> None:
+        """先寫暫存檔再取代，中途中斷不會留下寫一半的索引。"""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "next_id": self.next_id,
+                    "rows": sorted(self.rows),
+                    "groups": self.groups,
+                    "names": self.names,
+                    "emails": self.emails,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        tmp.replace(self.path)
+
+    def plan(
+        self,
+        doc_nos: Sequence[str],
+        informants: Sequence[str],
+        emails: Sequence[str],
+        urls: Sequence[str],
+    ) -> tuple[list[int], list[tuple[list[int], list[str]]]]:
+        """
+        找出沒處理過的資料列，並分群（可能併入既有的群）。索引本身不變，輸出成功後再呼叫 commit()。
+
+        Returns:
+            (new_rows, groups)：new_rows 為新資料列在輸入中的索引；
+            groups 為 link_new_rows 的結果，列索引已換回輸入中的索引。
+        """
+        new_rows = [i for i, (d, u) in enumerate(zip(doc_nos, urls)) if row_fingerprint(d, u) not in self.rows]
+        linked = link_new_rows(
+            [informants[i] for i in new_rows],
+            [emails[i] for i in new_rows],
+            self.names,
+            self.emails,
+        )
+        groups = [([new_rows[i] for i in members], sorted(gids, key=self._created_order)) for members, gids in linked]
+        return new_rows, groups
+
+    def _created_order(self, gid: str) -> int:
+        return int(gid[1:])
+
+    def unique_names(self, groups: list[tuple[list[int], list[str]]], names: list[str]) -> list[str]:
+        """
+        讓這次的輸出檔名不重複：併入既有群的沿用原檔名；新群的檔名若與既有的群或這次其他群相同
+        （不分大小寫，Windows 檔名不分大小寫），依序加上 _2、_3…。
+        否則 write_groups 只會留下後寫的檔案，commit 卻把兩群的資料列都記為已處理，前一群的網址就永遠不會再輸出。
+        """
+        taken = {g["name"].casefold() for g in self.groups.values()}
+        taken.update(name.casefold() for name, (_, gids) in zip(names, groups) if gids)
+        result = []
+        for name, (_, gids) in zip(names, groups):
+            if not gids:
+                candidate, n = name, 2
+                while candidate.casefold() in taken:
+                    candidate, n = f"{name}_{n}", n + 1
+                taken.add(candidate.casefold())
+                name = candidate
+            result.append(name)
+        return result
+
+    def commit(
+        self,
+        groups: list[tuple[list[int], list[str]]],
+        names: list[str],
+        doc_nos: Sequence[str],
+        informants: Sequence[str],
+        emails: Sequence[str],
+        urls: Sequence[str],
+    ) -> list[dict]:
+        """
+        記錄這次輸出的群（names 為各群的輸出檔名），回傳每群的摘要：
+        {"name", "group", "new_rows", "merged": 併入的既有群代號}。
+        """
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        summary = []
+        for (members, gids), name in zip(groups, names):
+            if gids:
+                gid, merged = gids[0], gids[1:]
+            else:
+                gid, merged = f"g{self.next_id}", []
+                self.next_id += 1
+                self.groups[gid] = {"name": name, "rows": 0, "updated": now}
+            entry = self.groups[gid]
+            for other in merged:
+                entry["rows"] += self.groups.pop(other)["rows"]
+                for table in (self.names, self.emails):
+                    for key, value in table.items():
+                        if value == other:
+                            table[key] = gid
+            entry["rows"] += len(members)
+            entry["updated"] = now
+            for idx in members:
+                self.rows.add(row_fingerprint(doc_nos[idx], urls[idx]))
+                if informants[idx]:
+                    self.names[informants[idx]] = gid
+                if emails[idx]:
+                    self.emails[emails[idx]] = gid
+            summary.append({"name": name, "group": gid, "new_rows": len(members), "merged": list(gids)})
+        return summary
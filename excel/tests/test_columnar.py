@@ -0,0 +1,78 @@
+import datetime
+import random
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+import columnar
+from columnar import apply_mask, date_mask, load_columns, normalize_column, parse_date_value
+from excel_reader import normalize
+
+
+class TestParseDates(unittest.TestCase):
+    def test_parse_date_value(self):
+        """測試各種儲存格值的日期解析（與舊的逐列邏輯相同）"""
+        cases = [
+            (datetime.datetime(2024, 5, 1, 13, 30), datetime.date(2024, 5, 1)),
+            (datetime.date(2024, 5, 1), datetime.date(2024, 5, 1)),
+            ("2024-05-01", datetime.date(2024, 5, 1)),
+            ("2024/5/1", datetime.date(2024, 5, 1)),
+            ("2024-05-01 10:00:00", None),
+            ("2024.05.01", None),
+            ("2024-13-01", None),
+            ("", None),
+            (None, None),
+            (45413, None),
+        ]
+        for raw, expected in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_date_value(raw), expected)
+
+    def test_each_distinct_value_parsed_once(self):
+        """測試相同的原始值只解析一次"""
+        values = ["2024-05-01", "2024/05/02", None] * 1000
+        with mock.patch.object(columnar, "parse_date_value", wraps=columnar.parse_date_value) as parse:
+            dates = columnar.parse_date_column(values)
+        self.assertEqual(parse.call_count, 3)
+        self.assertEqual(dates[:3], [datetime.date(2024, 5, 1), datetime.date(2024, 5, 2), None])
+
+    def test_date_mask_matches_row_filter(self):
+        """測試遮罩與舊的逐列篩選結果一致（區間含頭尾，缺少日期的列略過）"""
+        rng = random.Random(3)
+        day = datetime.date(2024, 1, 1)
+        values = []
+        for _ in range(500):
+            d = day + datetime.timedelta(days=rng.randint(0, 60))
+            values.append(rng.choice([
+                d.strftime("%Y-%m-%d"), d.strftime("%Y/%m/%d"),
+                datetime.datetime.combine(d, datetime.time(9)), None, "不明",
+            ]))
+        start, end = datetime.date(2024, 1, 10), datetime.date(2024, 2, 10)
+        for s, e in ((start, end), (start, None), (None, end)):
+            expected = []
+            for raw in values:
+                d = parse_date_value(raw)
+                expected.append(bool(d) and not (s and d < s) and not (e and d > e))
+            self.assertEqual(date_mask(values, s, e), expected)
+
+
+class TestColumns(unittest.TestCase):
+    def test_load_columns(self):
+        rows = [("1", "甲", None), ("2", "乙", "x")]
+        self.assertEqual(load_columns(iter(rows), 3), [["1", "2"], ["甲", "乙"], [None, "x"]])
+        self.assertEqual(load_columns(iter([]), 3), [[], [], []])
+
+    def test_normalize_column(self):
+        values = [None, " a ", 1150001, 1.5, datetime.datetime(2024, 5, 1), True, ""]
+        self.assertEqual(normalize_column(values), [normalize(v) for v in values])
+
+    def test_apply_mask(self):
+        self.assertEqual(apply_mask([[1, 2, 3], ["a", "b", "c"]], [True, False, True]), [[1, 3], ["a", "c"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import csv
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+import openpyxl
+
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+
+import excel_reader
+from excel_reader import INPUT_COLUMNS, normalize, projected_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+def write_xlsx(path: Path, rows: list[list]) -> None:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+class TestProjectedRows(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "input.xlsx"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_projects_needed_columns_in_order(self):
+        """測試只取出需要的欄位，依指定順序排列，忽略其它欄位"""
+        when = datetime.datetime(2024, 5, 1)
+        write_xlsx(self.path, [
+            ["備註", " 網址 ", "檢舉人", "公文文號", "承辦人", "檢舉人信箱", "檢舉日期"],
+            ["x", "https://a.example", "王小明", "1150001", "甲", "a@example.com", when],
+            [None, None, None, None, None, None, None],
+            ["只有備註", None, None, None, None, None, None],
+        ])
+        with projected_rows(self.path) as (headers, rows):
+            self.assertEqual(headers["網址"], 1)
+            result = list(rows)
+        self.assertEqual(result, [
+            ("1150001", "王小明", "a@example.com", "https://a.example", when),
+            (None, None, None, None, None),
+        ])
+
+    def test_optional_column_missing(self):
+        """測試選用欄位（檢舉日期）不存在時為 None"""
+        write_xlsx(self.path, [
+            ["公文文號", "檢舉人", "檢舉人信箱", "網址"],
+            ["1150001", "王小明", "", "https://a.example"],
+        ])
+        with projected_rows(self.path) as (headers, rows):
+            self.assertNotIn("檢舉日期", headers)
+            self.assertEqual(next(rows)[4], None)
+
+    def test_missing_required_columns(self):
+        """測試缺少必要欄位時回報缺少的欄位"""
+        write_xlsx(self.path, [["公文文號", "網址"], ["1", "https://a.example"]])
+        with self.assertRaises(ValueError) as ctx:
+            with projected_rows(self.path):
+                pass
+        self.assertIn("檢舉人", str(ctx.exception))
+
+    def test_empty_and_unreadable_files(self):
+        """測試空白檔案與無法讀取的檔案"""
+        write_xlsx(self.path, [])
+        with self.assertRaises(ValueError):
+            with projected_rows(self.path):
+                pass
+        bad = Path(self._tmp.name) / "bad.xlsx"
+        bad.write_bytes(b"not a workbook")
+        with self.assertRaisesRegex(ValueError, "讀取 Excel 檔案失敗"):
+            with projected_rows(bad):
+                pass
+
+    def test_custom_columns(self):
+        """測試自訂欄位清單"""
+        write_xlsx(self.path, [INPUT_COLUMNS, ["1", "甲", "", "https://a.example", None]])
+        with projected_rows(self.path, ["網址", "公文文號"], required=["網址"]) as (_, rows):
+            self.assertEqual(list(rows), [("https://a.example", "1")])
+
+    def test_matches_openpyxl_read_only(self):
+        """測試直接解析 XML 的結果與 openpyxl 唯讀模式一致（日期、數字、布林、rich text、空白列、作用中工作表）"""
+        wb = openpyxl.Workbook()
+        wb.active.append(["其它工作表"])
+        ws = wb.create_sheet("清單")
+        ws.append(["備註", "公文文號", None, "檢舉人", "檢舉人信箱", "網址", "檢舉日期"])
+        ws.append([1.5, 1150001, "x", "王小明", "a@example.com", "https://a.example", datetime.datetime(2024, 5, 1, 13, 30)])
+        ws.append([None] * 7)
+        ws.append([0, None, None, None, None, None, None])
+        ws.append([True, "1150002", None, CellRichText("李", TextBlock(InlineFont(b=True), "大華")), None, "https://b.example", datetime.date(2024, 6, 2)])
+        ws.cell(row=8, column=6, value="https://c.example")
+        ws.cell(row=8, column=7, value=45500).number_format = "yyyy/mm/dd"
+        wb.active = 1
+        wb.save(self.path)
+
+        with projected_rows(self.path) as (headers, rows):
+            fast = (headers, list(rows))
+
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        row_iter = wb.active.iter_rows(values_only=True)
+        expected_headers = excel_reader._headers(next(row_iter), excel_reader.REQUIRED_COLUMNS)
+        expected = list(excel_reader._project(row_iter, [expected_headers.get(c) for c in INPUT_COLUMNS]))
+        wb.close()
+
+        self.assertEqual(fast, (expected_headers, expected))
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(expected[1][1], "李大華")
+        self.assertEqual(expected[2][4], datetime.datetime(2024, 7, 27))
+
+
+class TestOtherFormats(unittest.TestCase):
+    ROWS = [
+        ["備註", "公文文號", "檢舉人", "檢舉人信箱", "網址", "檢舉日期"],
+        ["x", "1150001", "王小明", "a@example.com", "https://a.example", "2024/05/01"],
+        [None, None, None, None, None, None],
+        ["只有備註", None, None, None, None, None],
+        [None, "1150002", None, "b@example.com", " https://b.example ", "2024-06-02"],
+    ]
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def read(self, path: Path) -> list[tuple]:
+        with projected_rows(path) as (_, rows):
+            return [tuple(normalize(v) for v in row) for row in rows]
+
+    def write_csv(self, name: str, encoding: str) -> Path:
+        path = self.tmp / name
+        with open(path, "w", encoding=encoding, newline="") as f:
+            csv.writer(f).writerows([["" if v is None else v for v in row] for row in self.ROWS])
+        return path
+
+    def test_csv_matches_xlsx(self):
+        """測試 CSV（UTF-8 含 BOM、cp950）讀出的資料列與同內容的 Excel 相同"""
+        xlsx = self.tmp / "input.xlsx"
+        write_xlsx(xlsx, self.ROWS)
+        expected = self.read(xlsx)
+        self.assertEqual(len(expected), 3)
+        for name, encoding in (("utf8.csv", "utf-8-sig"), ("big5.csv", "cp950"), ("plain.csv", "utf-8")):
+            with self.subTest(encoding=encoding):
+                self.assertEqual(self.read(self.write_csv(name, encoding)), expected)
+
+    def test_csv_missing_columns_and_empty(self):
+        """測試 CSV 缺少欄位與空白檔案的錯誤訊息"""
+        path = self.tmp / "bad.csv"
+        path.write_text("公文文號,網址\n1,https://a.example\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "缺少必要欄位"):
+            with projected_rows(path):
+                pass
+        path.write_text("", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "檔案內容為空"):
+            with projected_rows(path):
+                pass
+
+    @unittest.skipIf(pa is None, "pyarrow 未安裝")
+    def test_parquet_matches_xlsx(self):
+        """測試 Parquet 讀出的資料列與同內容的 Excel 相同（含只有其它欄位有值的列）"""
+        xlsx = self.tmp / "input.xlsx"
+        write_xlsx(xlsx, self.ROWS)
+        header, *rows = self.ROWS
+        table = pa.table({name: [row[i] for row in rows] for i, name in enumerate(header)})
+        path = self.tmp / "input.parquet"
+        pq.write_table(table, path, row_group_size=2)
+        self.assertEqual(self.read(path), self.read(xlsx))
+
+
+if __name__ == "__main__":
+    unittest.main()
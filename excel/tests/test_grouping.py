@@ -0,0 +1,119 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from convert_excel import convert_rows, write_groups
+from grouping import DisjointSet, group_rows
+
+
+def reference_groups(informants, emails):
+    """暴力法：反覆合併有共同檢舉人或信箱的群，直到不再變動"""
+    groups = [{i} for i in range(len(informants))]
+    merged = True
+    while merged:
+        merged = False
+        for a in range(len(groups)):
+            for b in range(a + 1, len(groups)):
+                keys_a = {("n", informants[i]) for i in groups[a] if informants[i]} | {("e", emails[i]) for i in groups[a] if emails[i]}
+                keys_b = {("n", informants[i]) for i in groups[b] if informants[i]} | {("e", emails[i]) for i in groups[b] if emails[i]}
+                if keys_a & keys_b:
+                    groups[a] |= groups.pop(b)
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted(sorted(g) for g in groups)
+
+
+class TestGroupRows(unittest.TestCase):
+    def test_transitive_groups_in_original_order(self):
+        """測試同名或同信箱可遞移合併，群依第一列位置排列、群內依原始順序"""
+        informants = ["甲", "乙", "", "甲", "丙", ""]
+        emails = ["", "b@x", "b@x", "c@x", "c@x", ""]
+        self.assertEqual(group_rows(informants, emails), [[0, 3, 4], [1, 2], [5]])
+
+    def test_name_and_email_do_not_collide(self):
+        """測試檢舉人與信箱是不同的鍵（名稱剛好等於某個信箱時不合併）"""
+        self.assertEqual(group_rows(["a@x", ""], ["", "a@x"]), [[0], [1]])
+
+    def test_matches_reference(self):
+        """測試隨機資料與暴力法結果一致"""
+        rng = random.Random(7)
+        for _ in range(20):
+            n = rng.randint(1, 40)
+            informants = [rng.choice(["", "甲", "乙", "丙", "丁"]) for _ in range(n)]
+            emails = [rng.choice(["", "a", "b", "c", "d", "e"]) for _ in range(n)]
+            self.assertEqual(sorted(group_rows(informants, emails)), reference_groups(informants, emails))
+
+    def test_long_chain_without_recursion(self):
+        """測試很長的鏈（每列與下一列共用檢舉人或信箱）不會超過遞迴上限"""
+        n = sys.getrecursionlimit() * 20
+        informants = [f"n{i // 2}" for i in range(n)]
+        emails = [f"e{(i + 1) // 2}" for i in range(n)]
+        groups = group_rows(informants, emails)
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0], list(range(n)))
+
+    def test_union_by_size(self):
+        """測試小集合掛到大集合底下"""
+        ds = DisjointSet(4)
+        ds.union(0, 1)
+        self.assertEqual(ds.union(2, 0), 0)
+        self.assertEqual(ds.size[0], 3)
+        self.assertEqual(ds.find(3), 3)
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            group_rows(["a"], [])
+
+
+class TestConvertRows(unittest.TestCase):
+    def test_writes_one_file_per_group(self):
+        """測試記憶體中的資料列可直接分群輸出"""
+        rows = [
+            {"公文文號": "1150001", "檢舉人": "甲", "檢舉人信箱": "", "網址": "https://a.example"},
+            {"公文文號": "1150002", "檢舉人": "乙", "檢舉人信箱": "", "網址": "https://b.example"},
+            {"公文文號": "1150003", "檢舉人": "甲", "檢舉人信箱": "", "網址": "https://c.example"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(convert_rows(rows, output_root=tmp)["output_dir"])
+            self.assertEqual(sorted(p.name for p in output_dir.iterdir()), ["1150001.txt", "1150002.txt"])
+            self.assertEqual(
+                (output_dir / "1150001.txt").read_text(encoding="utf-8"),
+                "#文號1150001\nhttps://a.example\n\n#文號1150003\nhttps://c.example",
+            )
+
+    def test_manifest_matches_written_files(self):
+        """測試輸出清單的網址數與實際檔案相同，檔名重複時以後面的群為準"""
+        doc_nos = ["A-1", "A/1", "B", ""]
+        urls = ["https://a.example", "", "https://b.example\nhttps://c.example", "https://d.example"]
+        groups = [[0], [1], [2], [3]]
+        with tempfile.TemporaryDirectory() as tmp:
+            files = write_groups(tmp, groups, doc_nos, urls, workers=4)
+            self.assertEqual([f["name"] for f in files], ["A-1.txt", "A1.txt", "B.txt", "Group_4.txt"])
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), sorted(f["name"] for f in files))
+            for entry in files:
+                with open(entry["path"], "r", encoding="utf-8") as fh:
+                    expected = sum(1 for line in fh if line.strip() and not line.strip().startswith("#"))
+                self.assertEqual(entry["url_count"], expected)
+            self.assertEqual(files[2]["url_count"], 2)
+            self.assertEqual((files[0]["first_doc_no"], files[0]["rows"]), ("A-1", [0]))
+
+            files = write_groups(tmp, [[0], [1], [2]], ["X", "Y", "X"], urls)
+            self.assertEqual([(f["name"], f["rows"]) for f in files], [("X.txt", [2]), ("Y.txt", [1])])
+            self.assertIn("https://c.example", (Path(tmp) / "X.txt").read_text(encoding="utf-8"))
+
+    def test_rejects_bad_rows(self):
+        with self.assertRaises(ValueError):
+            convert_rows([])
+        with self.assertRaisesRegex(ValueError, "網址"):
+            convert_rows([{"公文文號": "1", "檢舉人": "", "檢舉人信箱": ""}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from convert_excel import REPORT_FILE, convert_columns, convert_rows
+from excel_reader import REQUIRED_COLUMNS
+from grouping import link_new_rows
+from incremental import ConvertIndex
+
+
+def columns(rows):
+    return [list(col) for col in zip(*rows)]
+
+
+BASE = [
+    ("1150001", "甲", "a@x", "https://a.example/1"),
+    ("1150002", "乙", "b@x", "https://b.example/1"),
+    ("1150003", "甲", "", "https://a.example/2"),
+]
+
+
+class TestLinkNewRows(unittest.TestCase):
+    def test_links_to_existing_groups(self):
+        """測試新資料列彼此分群，並依檢舉人 / 信箱接到既有的群"""
+        groups = link_new_rows(
+            ["甲", "丙", "丁", "丙"],
+            ["", "c@x", "b@x", ""],
+            {"甲": "g1"},
+            {"b@x": "g2"},
+        )
+        self.assertEqual(groups, [([0], ["g1"]), ([1, 3], []), ([2], ["g2"])])
+
+    def test_bridges_two_groups(self):
+        """測試一筆新資料列同時連到兩個既有的群"""
+        self.assertEqual(link_new_rows(["甲"], ["b@x"], {"甲": "g1"}, {"b@x": "g2"}), [([0], ["g1", "g2"])])
+
+
+class TestIncrementalConvert(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.index_path = self.tmp / "convert_index.json"
+        self.runs = 0
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def convert(self, rows, incremental=True):
+        # 每次用不同的輸出根目錄，避免同一秒內的時間戳資料夾重複
+        self.runs += 1
+        result = convert_columns(*columns(rows), output_root=self.tmp / f"run{self.runs}", incremental=incremental, index_path=self.index_path)
+        return Path(result["output_dir"]) if result else None
+
+    def read(self, output_dir: Path) -> dict[str, str]:
+        return {p.name: p.read_text(encoding="utf-8") for p in output_dir.glob("*.txt")}
+
+    def test_first_run_matches_full_conversion(self):
+        """測試沒有索引時與完整轉換的輸出相同"""
+        full = self.read(self.convert(BASE, incremental=False))
+        first = self.convert(BASE)
+        self.assertEqual(self.read(first), full)
+        report = json.loads((first / REPORT_FILE).read_text(encoding="utf-8"))
+        self.assertEqual((report["new_rows"], report["new_groups"], report["updated_groups"]), (3, 2, 0))
+
+    def test_only_new_rows_are_emitted(self):
+        """測試只輸出新資料列：接到既有群的沿用原檔名，全新的群以第一筆文號命名"""
+        self.convert(BASE)
+        self.assertIsNone(self.convert(BASE))
+
+        added = BASE + [
+            ("1150004", "", "a@x", "https://a.example/3"),
+            ("1150005", "丙", "", "https://c.example/1"),
+            ("1150002", "乙", "b@x", "https://b.example/changed"),
+        ]
+        out = self.convert(added)
+        self.assertEqual(self.read(out), {
+            "1150001.txt": "#文號1150004\nhttps://a.example/3",
+            "1150002.txt": "#文號1150002\nhttps://b.example/changed",
+            "1150005.txt": "#文號1150005\nhttps://c.example/1",
+        })
+        report = json.loads((out / REPORT_FILE).read_text(encoding="utf-8"))
+        self.assertEqual((report["new_rows"], report["skipped_rows"]), (3, 3))
+        self.assertEqual((report["new_groups"], report["updated_groups"]), (1, 2))
+
+    def test_new_row_merges_existing_groups(self):
+        """測試新資料列把兩個既有的群連起來後，之後的資料列都併到較早的群"""
+        self.convert(BASE)
+        self.convert(BASE + [("1150006", "甲", "b@x", "https://x.example/1")])
+        index = ConvertIndex(self.index_path)
+        self.assertEqual(len(index.groups), 1)
+        self.assertEqual(index.names["乙"], index.emails["a@x"])
+
+        out = self.convert(BASE + [("1150006", "甲", "b@x", "https://x.example/1"), ("1150007", "乙", "", "https://y.example/1")])
+        self.assertEqual(list(self.read(out)), ["1150001.txt"])
+
+    def test_new_group_name_does_not_overwrite_existing_group(self):
+        """測試新群以第一筆文號命名時與既有群的檔名相同，改名輸出，兩群的網址都不會遺失"""
+        first = [("X1", "alice", "", "https://u.example/1")]
+        self.convert(first)
+        out = self.convert(first + [
+            ("Y", "alice", "", "https://u.example/2"),
+            ("X1", "bob", "", "https://u.example/3"),
+        ])
+        self.assertEqual(self.read(out), {
+            "X1.txt": "#文號Y\nhttps://u.example/2",
+            "X1_2.txt": "#文號X1\nhttps://u.example/3",
+        })
+        index = ConvertIndex(self.index_path)
+        self.assertEqual(sorted(g["name"] for g in index.groups.values()), ["X1", "X1_2"])
+
+        # 之後同一位檢舉人的新資料列沿用改過的檔名；再有同名的新群依序編號（不分大小寫）
+        out = self.convert(first + [
+            ("Y", "alice", "", "https://u.example/2"),
+            ("X1", "bob", "", "https://u.example/3"),
+            ("Z", "bob", "", "https://u.example/4"),
+            ("x1", "carol", "", "https://u.example/5"),
+        ])
+        self.assertEqual(self.read(out), {
+            "X1_2.txt": "#文號Z\nhttps://u.example/4",
+            "x1_3.txt": "#文號x1\nhttps://u.example/5",
+        })
+
+    def test_convert_rows_incremental(self):
+        """測試直接傳入資料列（Bridge 的 rows）時也能增量轉換"""
+        data = [dict(zip(REQUIRED_COLUMNS, row)) for row in BASE]
+        convert_rows(data, output_root=self.tmp / "rows1", incremental=True, index_path=self.index_path)
+        self.assertIsNone(convert_rows(data, output_root=self.tmp / "rows2", incremental=True, index_path=self.index_path))
+
+        data.append(dict(zip(REQUIRED_COLUMNS, ("1150004", "", "a@x", "https://a.example/3"))))
+        result = convert_rows(data, output_root=self.tmp / "rows3", incremental=True, index_path=self.index_path)
+        self.assertEqual(self.read(Path(result["output_dir"])), {"1150001.txt": "#文號1150004\nhttps://a.example/3"})
+        self.assertEqual(result["report"]["new_rows"], 1)
+
+    def test_bad_index_version(self):
+        self.index_path.write_text(json.dumps({"version": 99}), encoding="utf-8")
+        with self.assertRaises(ValueError):
+            self.convert(BASE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,8 +15,12 @@ sys.path.append(str(BASE_DIR))
 # Dummy imports to force PyInstaller to bundle them
 if False:
     import webview
-    import flask
+    import http.server
+    import gzip
+    import mimetypes
     import requests
+    import concurrent.futures
+    import hashlib
     import PIL
     import pyautogui
     import openpyxl
@@ -27,15 +31,20 @@ if False:
     import logging
     import datetime
     import ctypes
+    import sqlite3
 
 # Launcher Logic
-def launch():
+def launch(profile_startup=False):
     # VERY IMPORTANT for Windows Frozen Apps
     import multiprocessing
     multiprocessing.freeze_support()
     
     print(f"🚀 Starting AutoFlow Launcher from {BASE_DIR}")
     try:
+        if profile_startup:
+            # 從這裡開始記錄各模組載入時間，視窗載入完成後寫出 startup_profile.txt
+            from core import startup_profile
+            startup_profile.start()
         from core.main import main
         main()
     except ImportError as e:
@@ -62,6 +71,7 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="AutoFlow Control Center")
     parser.add_argument("--update", action="store_true", help="僅更新腳本與核心邏輯 (僅限開發者或命令行使用)")
+    parser.add_argument("--profile-startup", action="store_true", help="記錄啟動各階段與模組載入時間 (類似 python -X importtime)，寫到 startup_profile.txt")
     args, _ = parser.parse_known_args()
 
     if args.update:
@@ -82,4 +92,4 @@ if __name__ == "__main__":
         if result.get("new_version"):
             print(f"📌 目前版本已更新為: {result['new_version']}")
     else:
-        launch()
+        launch(profile_startup=args.profile_startup)
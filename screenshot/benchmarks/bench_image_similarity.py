@@ -0,0 +1,100 @@
+"""
+捲動截圖效能測試：
+1. 相似度：每步縮放兩張原圖（舊寫法） vs 每張只算一次的 ImageFingerprint。
+2. 合併：整張接上（舊寫法） vs 去除重疊與固定頁首/頁尾，比較高度、PNG 大小與編碼時間。
+
+用法：
+    python benchmarks/bench_image_similarity.py [每頁截圖張數]
+"""
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from utils_image import ImageFingerprint, stitch_scroll_frames
+
+
+def legacy_similarity(img1, img2) -> float:
+    if img1.size != img2.size:
+        img2 = img2.resize(img1.size)
+    max_w = 800
+    if img1.width > max_w:
+        scale = max_w / img1.width
+        new_size = (max_w, max(1, int(img1.height * scale)))
+        img1 = img1.resize(new_size)
+        img2 = img2.resize(new_size)
+    diff = ImageChops.difference(img1.convert("RGB"), img2.convert("RGB"))
+    stat = ImageStat.Stat(diff)
+    mean = sum(stat.mean) / len(stat.mean)
+    return max(0.0, 1.0 - (mean / 255.0))
+
+
+def make_page(rng: random.Random, width: int = 1920, height: int = 6000) -> Image.Image:
+    page = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    y = 0
+    while y < height:
+        h = rng.randint(14, 60)
+        color = tuple(rng.randint(0, 230) for _ in range(3))
+        draw.rectangle((rng.randint(0, 200), y, rng.randint(600, width), y + h // 2), fill=color)
+        y += h
+    return page
+
+
+def main(frames: int = 6, runs: int = 20) -> None:
+    rng = random.Random(3)
+    page = make_page(rng)
+    view_h = 950
+    # 最後兩張相同：模擬捲到底
+    shots = [page.crop((0, i * 800, page.width, i * 800 + view_h)) for i in range(frames - 1)]
+    shots.append(shots[-1].copy())
+
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        legacy = [legacy_similarity(shots[i - 1], shots[i]) for i in range(1, frames)]
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        fps = []
+        fast = []
+        for img in shots:
+            fp = ImageFingerprint(img)
+            if fps:
+                fast.append(fps[-1].similarity(fp))
+            fps.append(fp)
+    fast_s = time.perf_counter() - t0
+
+    print(f"frames={frames} size={shots[0].size}")
+    print(f"  legacy      : {legacy_s * 1000 / runs:8.2f} ms/page  {[round(v, 3) for v in legacy]}")
+    print(f"  fingerprint : {fast_s * 1000 / runs:8.2f} ms/page  {[round(v, 3) for v in fast]}")
+    print(f"  speedup     : {legacy_s / fast_s:8.1f}x")
+
+    # 合併：PageDown 只捲動 800px，畫面 950px，且有 70px 固定頁首
+    frames_ = shots[:-1]
+    for f in frames_:
+        f.paste((30, 30, 30), (0, 0, f.width, 70))
+    legacy_img = Image.new("RGB", (frames_[0].width, sum(f.height for f in frames_)))
+    y = 0
+    for f in frames_:
+        legacy_img.paste(f, (0, y))
+        y += f.height
+    t0 = time.perf_counter()
+    stitched = stitch_scroll_frames(frames_)
+    stitch_s = time.perf_counter() - t0
+    for name, img in (("legacy", legacy_img), ("overlap", stitched)):
+        buf = io.BytesIO()
+        t0 = time.perf_counter()
+        img.save(buf, format="PNG")
+        enc_s = time.perf_counter() - t0
+        print(f"  stitch {name:8}: height={img.height:5d} png={buf.tell() / 1024:8.1f} KiB encode={enc_s * 1000:7.1f} ms")
+    print(f"  overlap detection + stitch: {stitch_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
@@ -0,0 +1,81 @@
+"""
+關鍵字比對效能測試：逐一 normalize_text(k) in t（舊寫法） vs KeywordMatcher。
+
+用法：
+    python benchmarks/bench_keyword_matcher.py [自訂關鍵字數量]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import BSMI_KEYWORDS, CAPTCHA_KEYWORDS, LOGIN_KEYWORDS, NOT_FOUND_KEYWORDS
+from keyword_matcher import DEFAULT_CATEGORY_ORDER, KeywordMatcher, normalize_text
+
+# 模擬中文網頁用字：3000 個常用字，出現頻率近似 Zipf 分布
+CJK = [chr(0x4E00 + i) for i in range(3000)]
+CJK_CUM_WEIGHTS = []
+_total = 0.0
+for _rank in range(len(CJK)):
+    _total += 1.0 / (_rank + 1)
+    CJK_CUM_WEIGHTS.append(_total)
+
+
+def random_word(rng: random.Random, n: int) -> str:
+    return "".join(rng.choices(CJK, cum_weights=CJK_CUM_WEIGHTS, k=n))
+
+
+def naive_first_match(t: str, categories: dict, priority: list[str]) -> str | None:
+    for cat in priority:
+        if any(normalize_text(k) in t for k in categories.get(cat, [])):
+            return cat
+    return None
+
+
+def main(n_custom: int = 300, pages: int = 2000) -> None:
+    rng = random.Random(42)
+    categories = {
+        "登入": LOGIN_KEYWORDS,
+        "拼圖與人機驗證": CAPTCHA_KEYWORDS,
+        "查無資料": NOT_FOUND_KEYWORDS,
+        "BSMI": BSMI_KEYWORDS,
+    }
+    n_cats = max(1, n_custom // 30)
+    for c in range(n_cats):
+        categories[f"自訂{c}"] = [random_word(rng, rng.randint(3, 6)) + f" Kw{c}_{i}" for i in range(30)]
+    priority = DEFAULT_CATEGORY_ORDER + [f"自訂{c}" for c in range(n_cats)]
+
+    texts = []
+    for _ in range(pages):
+        body = random_word(rng, 1800) + " Price NT$ 1,299 Add To Cart "
+        if rng.random() < 0.2:
+            body += rng.choice(categories[rng.choice(priority)])
+        texts.append(normalize_text(body[:2000]))
+
+    n_keywords = sum(len(v) for v in categories.values())
+
+    t0 = time.perf_counter()
+    expected = [naive_first_match(t, categories, priority) for t in texts]
+    naive_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(categories)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got = [matcher.first_match(t, priority) for t in texts]
+    fast_s = time.perf_counter() - t0
+
+    if got != expected:
+        raise SystemExit("結果不一致！")
+
+    print(f"keywords={n_keywords} pages={pages}")
+    print(f"  naive   : {naive_s * 1000 / pages:8.3f} ms/page")
+    print(f"  matcher : {fast_s * 1000 / pages:8.3f} ms/page (build {build_s * 1000:.1f} ms, once per run)")
+    print(f"  speedup : {naive_s / fast_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,59 @@
+"""
+run_capture 端到端吞吐量測試（不需桌面環境）：以 SyntheticBackend 模擬開頁、截圖、捲動與取文字的延遲。
+
+用法：
+    python benchmarks/bench_run_capture.py [網址數量] [--scroll] [--text]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import main
+from capture_backend import SyntheticBackend, SyntheticLatency
+from config import RunConfig
+
+
+def run(n: int = 50, scroll: bool = False, text: bool = False) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        urls_file = tmp / "urls.txt"
+        urls_file.write_text("\n".join(f"https://bench.example/item/{i}" for i in range(n)), encoding="utf-8")
+        backend = SyntheticBackend(
+            frame_size=(1920, 950),
+            latency=SyntheticLatency(open_url=0.01, grab_frame=0.03, scroll=0.01, extract_text=0.05),
+            default_text="商品 BSMI 認證",
+        )
+        cfg = RunConfig(
+            urls_file=urls_file,
+            output_dir=tmp / "out",
+            done_log=tmp / "done_urls.json",
+            warmup_enabled=False,
+            page_wait_range=(0, 0),
+            final_countdown=0,
+            scroll_capture=scroll,
+            text_check_enabled=text,
+            crop_top_px=0,
+            batch_size=0,
+        )
+        main.UI_HIDE_BUFFER_SECONDS = 0
+        t0 = time.perf_counter()
+        results = main.run_capture(cfg, use_overlay=False, suppress_popups=True, backend=backend)
+        elapsed = time.perf_counter() - t0
+    return {"elapsed": elapsed, "processed": results["processed"], "calls": backend.calls}
+
+
+def main_cli() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else 50
+    stats = run(n, scroll="--scroll" in sys.argv, text="--text" in sys.argv)
+    print(f"urls={n} processed={stats['processed']} elapsed={stats['elapsed']:.2f}s")
+    print(f"  throughput : {stats['processed'] / stats['elapsed'] * 60:8.1f} URLs/min")
+    print(f"  per URL    : {stats['elapsed'] / max(1, n) * 1000:8.1f} ms")
+    print(f"  calls      : {stats['calls']}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,64 @@
+"""
+長頁面合併記憶體測試：整張畫布合併後存檔（舊寫法） vs ScrollStitchStream 邊截邊寫。
+每種模式在獨立子行程中執行，比較最高常駐記憶體 (ru_maxrss)。Linux/macOS 限定。
+
+用法：
+    python benchmarks/bench_stream_stitch.py [截圖張數]
+"""
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+WIDTH, HEIGHT = 3840, 2000  # 4K 寬度、裁切後的畫面高度
+
+
+def frames(n: int):
+    from PIL import Image, ImageDraw
+
+    for i in range(n):
+        img = Image.new("RGB", (WIDTH, HEIGHT), (255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for y in range(0, HEIGHT, 40):
+            draw.rectangle((0, y, (i * 997 + y * 31) % WIDTH, y + 17), fill=((i * 40) % 256, y % 256, 90))
+        yield img
+
+
+def run(mode: str, n: int, out: Path) -> None:
+    from utils_image import ScrollStitchStream, stitch_scroll_frames
+
+    t0 = time.perf_counter()
+    if mode == "canvas":
+        shots = list(frames(n))
+        merged = stitch_scroll_frames(shots, gap=20)
+        del shots
+        merged.save(out)
+    else:
+        stream = ScrollStitchStream(out, gap=20)
+        for img in frames(n):
+            stream.add(img)
+            del img
+        stream.finish()
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if sys.platform == "darwin":
+        peak_mb /= 1024
+    print(f"  {mode:7}: peak RSS {peak_mb:8.1f} MiB  time {elapsed:6.2f} s  png {out.stat().st_size / 1024 / 1024:6.1f} MiB")
+
+
+def main(n: int = 10) -> None:
+    print(f"frames={n} size={WIDTH}x{HEIGHT}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("canvas", "stream"):
+            subprocess.run([sys.executable, __file__, "--run", mode, str(n), str(Path(tmp) / f"{mode}.png")], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run(sys.argv[2], int(sys.argv[3]), Path(sys.argv[4]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,213 @@
+import io
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+try:
+    from playwright.sync_api import Error as PlaywrightError
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.sync_api import sync_playwright
+except Exception:
+    sync_playwright = None
+    PlaywrightError = PlaywrightTimeoutError = Exception
+
+from PIL import Image
+
+from capture_backend import CaptureBackend
+from config import (
+    BROWSER_CDP_PORT,
+    BROWSER_CDP_URL,
+    BROWSER_IDLE_TIMEOUT_MS,
+    BROWSER_NAV_TIMEOUT_MS,
+    BROWSER_USER_DATA_DIR,
+    BROWSER_VIEWPORT,
+)
+from logger_setup import logger
+
+# 降低自動化特徵（只在自行啟動的瀏覽器注入；CDP 連線的是使用者自己的 Chrome）
+STEALTH_SCRIPTS = [
+    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});",
+    "Object.defineProperty(navigator, 'languages', {get: () => ['zh-TW', 'zh', 'en-US', 'en']});",
+    "window.chrome = window.chrome || {runtime: {}};",
+]
+
+CHROME_CANDIDATES = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+
+def find_system_chrome() -> str | None:
+    for name in ("chrome", "google-chrome", "chromium", "chromium-browser"):
+        found = shutil.which(name)
+        if found:
+            return found
+    for path in CHROME_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def launch_system_chrome_cdp(user_data_dir: str | Path, port: int = BROWSER_CDP_PORT) -> subprocess.Popen | None:
+    """以遠端除錯模式啟動系統 Chrome（獨立的使用者資料夾，可保留登入狀態）。"""
+    chrome = find_system_chrome()
+    if not chrome:
+        logger.error("找不到系統 Chrome，無法使用 CDP 模式")
+        return None
+    Path(user_data_dir).mkdir(parents=True, exist_ok=True)
+    return subprocess.Popen(
+        [chrome, f"--remote-debugging-port={port}", f"--user-data-dir={user_data_dir}", "--no-first-run"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+class BrowserBackend(CaptureBackend):
+    """
+    Playwright 控制的 Chromium：
+    - open_url 等到 load 事件與網路閒置，取代固定的隨機倒數；
+    - 捲動截圖直接用 full_page 截整頁，不需 PageDown 合併；
+    - 頁面文字從 DOM 讀取，不經過 Ctrl+A / 剪貼簿。
+    cdp_mode=True 時連線到（必要時自動啟動）本機 Chrome 的 DevTools 介面。
+    Playwright 物件只能在建立它的執行緒使用，因此延後到第一次 open_url 才啟動。
+    """
+
+    name = "browser"
+    waits_for_load = True
+    supports_full_page = True
+
+    def __init__(
+        self,
+        headless: bool = True,
+        cdp_mode: bool = False,
+        cdp_url: str = BROWSER_CDP_URL,
+        viewport: tuple[int, int] = BROWSER_VIEWPORT,
+        nav_timeout_ms: int = BROWSER_NAV_TIMEOUT_MS,
+        idle_timeout_ms: int = BROWSER_IDLE_TIMEOUT_MS,
+        user_data_dir: str | Path = BROWSER_USER_DATA_DIR,
+    ):
+        if sync_playwright is None:
+            raise RuntimeError("瀏覽器引擎需要 playwright：pip install playwright && playwright install chromium")
+        self.headless = headless
+        self.cdp_mode = cdp_mode
+        self.cdp_url = cdp_url
+        self.viewport = viewport
+        self.nav_timeout_ms = nav_timeout_ms
+        self.idle_timeout_ms = idle_timeout_ms
+        self.user_data_dir = user_data_dir
+        self.last_load_seconds = 0.0
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._proc = None
+
+    # --- 啟動 / 關閉 ---
+    def _connect_cdp(self):
+        try:
+            return self._pw.chromium.connect_over_cdp(self.cdp_url)
+        except PlaywrightError:
+            logger.info(f"Starting Chrome in CDP mode ({self.cdp_url})...")
+            self._proc = launch_system_chrome_cdp(self.user_data_dir)
+            if self._proc is None:
+                raise
+            deadline = time.monotonic() + 15
+            while True:
+                time.sleep(0.5)
+                try:
+                    return self._pw.chromium.connect_over_cdp(self.cdp_url)
+                except PlaywrightError:
+                    if time.monotonic() > deadline:
+                        raise
+
+    def start(self) -> None:
+        if self._page is not None:
+            return
+        self._pw = sync_playwright().start()
+        try:
+            if self.cdp_mode:
+                self._browser = self._connect_cdp()
+                self._context = self._browser.contexts[0] if self._browser.contexts else self._browser.new_context()
+                self._page = self._context.pages[0] if self._context.pages else self._context.new_page()
+            else:
+                self._browser = self._pw.chromium.launch(headless=self.headless)
+                self._context = self._browser.new_context(
+                    viewport={"width": self.viewport[0], "height": self.viewport[1]},
+                    locale="zh-TW",
+                )
+                for script in STEALTH_SCRIPTS:
+                    self._context.add_init_script(script)
+                self._page = self._context.new_page()
+            self._page.set_default_navigation_timeout(self.nav_timeout_ms)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        for closer in (
+            # CDP 模式不關使用者的分頁/瀏覽器，只中斷連線
+            None if self.cdp_mode else self._context,
+            self._browser,
+        ):
+            if closer is not None:
+                try:
+                    closer.close()
+                except Exception as e:
+                    logger.debug(f"Browser close error: {e}")
+        if self._pw is not None:
+            self._pw.stop()
+        if self._proc is not None:
+            self._proc.terminate()
+        self._pw = self._browser = self._context = self._page = self._proc = None
+
+    @property
+    def page(self):
+        self.start()
+        return self._page
+
+    # --- CaptureBackend ---
+    def open_url(self, url: str) -> None:
+        page = self.page
+        t0 = time.perf_counter()
+        try:
+            page.goto(url, wait_until="load")
+        except PlaywrightTimeoutError:
+            logger.warning(f"  Load timeout ({self.nav_timeout_ms} ms), capturing anyway")
+        try:
+            page.wait_for_load_state("networkidle", timeout=self.idle_timeout_ms)
+        except PlaywrightTimeoutError:
+            logger.debug("  networkidle not reached, continuing")
+        self.last_load_seconds = time.perf_counter() - t0
+        logger.info(f"  Page ready in {self.last_load_seconds:.1f}s")
+
+    def _screenshot(self, full_page: bool) -> "Image.Image":
+        data = self.page.screenshot(full_page=full_page, type="png")
+        img = Image.open(io.BytesIO(data))
+        img.load()
+        return img.convert("RGB")
+
+    def grab_frame(self, capture_window: bool = False) -> tuple["Image.Image", bool]:
+        return self._screenshot(full_page=False), False
+
+    def grab_full_page(self) -> "Image.Image":
+        return self._screenshot(full_page=True)
+
+    def scroll(self, times: int = 1) -> None:
+        for _ in range(times):
+            self.page.keyboard.press("PageDown")
+
+    def extract_text(self) -> str:
+        try:
+            return self.page.inner_text("body")
+        except PlaywrightError as e:
+            logger.warning(f"  DOM text extraction failed: {e}")
+            return ""
+
+    def page_title(self) -> str | None:
+        try:
+            return self.page.title()
+        except PlaywrightError:
+            return None
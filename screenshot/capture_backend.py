@@ -0,0 +1,251 @@
+import hashlib
+import json
+import random
+import time
+import webbrowser
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import pyautogui
+except Exception:
+    pyautogui = None
+
+from PIL import Image, ImageDraw
+
+from logger_setup import logger
+
+
+class CaptureBackend:
+    """
+    截圖後端介面：開網址、取畫面、捲動、取頁面文字。
+    run_capture / capture_scrolling_page / handle_page_checks 只透過這個介面操作瀏覽器。
+    """
+
+    name = "base"
+    # open_url 是否已等到頁面載入完成（True 時不再跑固定倒數）
+    waits_for_load = False
+    # 是否能直接截整頁（True 時捲動截圖改用 grab_full_page，不需 PageDown 合併）
+    supports_full_page = False
+    # 畫面是否含瀏覽器工具列 / 工作列（True 時才套用裁切設定 crop_top_px / crop_bottom_px）
+    has_browser_chrome = False
+    # waits_for_load 時 open_url 實際等待載入的秒數（供網域等待紀錄使用）
+    last_load_seconds: float | None = None
+
+    def open_url(self, url: str) -> None:
+        raise NotImplementedError
+
+    def grab_frame(self, capture_window: bool = False) -> tuple["Image.Image", bool]:
+        """回傳 (畫面, 是否為視窗截圖)。"""
+        raise NotImplementedError
+
+    def grab_full_page(self) -> "Image.Image":
+        raise NotImplementedError
+
+    def scroll(self, times: int = 1) -> None:
+        raise NotImplementedError
+
+    def extract_text(self) -> str:
+        raise NotImplementedError
+
+    def page_title(self) -> str | None:
+        """目前頁面/視窗標題；None 表示無法取得（自適應等待時不以標題判斷）。"""
+        return None
+
+    def dismiss(self) -> None:
+        """文字檢查後收起選取/選單（桌面版為點角落 + Esc）。"""
+
+    def close(self) -> None:
+        pass
+
+
+class DesktopBackend(CaptureBackend):
+    """真實桌面瀏覽器：webbrowser 開頁、pyautogui/ImageGrab 截圖、PageDown 捲動、Ctrl+A 取文字。"""
+
+    name = "desktop"
+    has_browser_chrome = True
+
+    def open_url(self, url: str) -> None:
+        webbrowser.open(url, new=1)
+
+    def grab_frame(self, capture_window: bool = False) -> tuple["Image.Image", bool]:
+        from utils_image import capture_active_window
+
+        if capture_window:
+            img = capture_active_window()
+            if img is not None:
+                return img, True
+        return pyautogui.screenshot(), False
+
+    def scroll(self, times: int = 1) -> None:
+        for _ in range(times):
+            pyautogui.press("pagedown")
+
+    def extract_text(self) -> str:
+        from utils_image import extract_text_content
+
+        return extract_text_content()
+
+    def page_title(self) -> str | None:
+        from utils_system import active_window_title
+
+        return active_window_title()
+
+    def dismiss(self) -> None:
+        from utils_system import click_window_corner
+
+        click_window_corner("bottom_left")
+        time.sleep(0.05)
+        pyautogui.press("esc")
+
+
+def create_backend(cfg) -> CaptureBackend:
+    """依 RunConfig.engine 建立截圖後端。"""
+    if getattr(cfg, "engine", "desktop") == "browser":
+        from browser_backend import BrowserBackend
+
+        return BrowserBackend(headless=cfg.headless, cdp_mode=cfg.cdp_mode)
+    return DesktopBackend()
+
+
+@dataclass
+class SyntheticPage:
+    """
+    合成頁面：文字內容與頁面總高度（像素）；image 指定時改用該圖檔當整頁內容。
+    ready_after: 開頁後 N 秒內模擬載入中（畫面由上而下逐步出現、標題為網址）。
+    """
+
+    text: str = ""
+    height: int = 2400
+    image: str | Path | None = None
+    title: str = "Synthetic Page"
+    ready_after: float = 0.0
+
+
+@dataclass
+class SyntheticLatency:
+    """各操作的模擬延遲（秒）。"""
+
+    open_url: float = 0.0
+    grab_frame: float = 0.0
+    scroll: float = 0.0
+    extract_text: float = 0.0
+
+
+@dataclass
+class SyntheticBackend(CaptureBackend):
+    """
+    離線合成後端：依網址產生固定內容的頁面（相同網址每次都相同），
+    可設定各操作延遲，用於在沒有桌面環境的機器上跑 run_capture 的效能與回歸測試。
+    """
+
+    pages: dict = field(default_factory=dict)
+    frame_size: tuple[int, int] = (1280, 720)
+    latency: SyntheticLatency = field(default_factory=SyntheticLatency)
+    default_text: str = ""
+    scroll_step: int = 600
+
+    name = "synthetic"
+    # 模擬桌面瀏覽器的整個畫面，裁切設定照樣套用
+    has_browser_chrome = True
+
+    def __post_init__(self):
+        self.pages = {
+            url: page if isinstance(page, SyntheticPage) else SyntheticPage(**page)
+            for url, page in (self.pages or {}).items()
+        }
+        self.current_url: str | None = None
+        self.offset = 0
+        self.opened_at = 0.0
+        self.calls = {"open_url": 0, "grab_frame": 0, "scroll": 0, "extract_text": 0}
+        self._rendered: dict[str, "Image.Image"] = {}
+
+    @classmethod
+    def from_fixture_dir(cls, path: str | Path, **kwargs) -> "SyntheticBackend":
+        """
+        從資料夾載入 pages.json：{"網址": {"text": "...", "height": 3000, "image": "a.png"}}。
+        image 為相對於該資料夾的路徑。
+        """
+        path = Path(path)
+        data = json.loads((path / "pages.json").read_text(encoding="utf-8"))
+        for page in data.values():
+            if page.get("image"):
+                page["image"] = path / page["image"]
+        return cls(pages=data, **kwargs)
+
+    def _page(self, url: str | None) -> SyntheticPage:
+        page = self.pages.get(url)
+        if page is None:
+            page = SyntheticPage(text=self.default_text)
+        return page
+
+    def _render(self, url: str | None) -> "Image.Image":
+        key = url or ""
+        img = self._rendered.get(key)
+        if img is not None:
+            return img
+        page = self._page(url)
+        width = self.frame_size[0]
+        if page.image:
+            with Image.open(page.image) as src:
+                img = src.convert("RGB")
+        else:
+            # 以網址為種子產生固定的條紋內容，讓捲動後的畫面可以被比對/合併
+            seed = int(hashlib.md5(key.encode("utf-8")).hexdigest()[:8], 16)
+            rng = random.Random(seed)
+            img = Image.new("RGB", (width, max(page.height, self.frame_size[1])), (255, 255, 255))
+            draw = ImageDraw.Draw(img)
+            y = 0
+            while y < img.height:
+                h = rng.randint(6, 28)
+                color = tuple(rng.randint(0, 220) for _ in range(3))
+                draw.rectangle((rng.randint(0, 40), y, rng.randint(width // 4, width), y + h // 2), fill=color)
+                y += h
+        self._rendered = {key: img}
+        return img
+
+    def open_url(self, url: str) -> None:
+        time.sleep(self.latency.open_url)
+        self.calls["open_url"] += 1
+        self.current_url = url
+        self.offset = 0
+        self.opened_at = time.monotonic()
+
+    def _load_progress(self) -> float:
+        """0.0 ~ 1.0：開頁後經過時間 / ready_after。"""
+        ready_after = self._page(self.current_url).ready_after
+        if ready_after <= 0:
+            return 1.0
+        return min(1.0, (time.monotonic() - self.opened_at) / ready_after)
+
+    def grab_frame(self, capture_window: bool = False) -> tuple["Image.Image", bool]:
+        time.sleep(self.latency.grab_frame)
+        self.calls["grab_frame"] += 1
+        page = self._render(self.current_url)
+        w, h = self.frame_size
+        top = min(self.offset, max(0, page.height - h))
+        frame = page.crop((0, top, w, top + h))
+        progress = self._load_progress()
+        if progress < 1.0:
+            # 載入中：只畫出上方一部分
+            frame.paste((255, 255, 255), (0, int(h * progress), w, h))
+        return frame, capture_window
+
+    def scroll(self, times: int = 1) -> None:
+        time.sleep(self.latency.scroll)
+        self.calls["scroll"] += 1
+        self.offset += self.scroll_step * times
+
+    def extract_text(self) -> str:
+        time.sleep(self.latency.extract_text)
+        self.calls["extract_text"] += 1
+        return self._page(self.current_url).text
+
+    def page_title(self) -> str | None:
+        if self._load_progress() < 1.0:
+            return self.current_url
+        return self._page(self.current_url).title
+
+    def close(self) -> None:
+        self._rendered.clear()
+        logger.debug(f"SyntheticBackend calls: {self.calls}")
@@ -0,0 +1,82 @@
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from logger_setup import logger
+
+
+@dataclass
+class CaptureJob:
+    """擷取端交給背景寫出端的一筆工作（一張截圖）。"""
+    url: str
+    note: str | None
+    image: object
+    outpath: Path
+    classification: str | None = None
+    source_file: Path | None = None
+    # 送出時已加入 run_results["results"] 的那一筆（寫出失敗時移除）
+    result: dict | None = None
+
+
+_STOP = object()
+
+
+class CaptureWriter:
+    """
+    背景寫出管線 (producer / consumer)。
+
+    擷取執行緒呼叫 submit() 交出 PIL.Image 後就能立刻開下一個網址，
+    PNG 編碼、存檔、Word 匯出與完成紀錄交由單一背景執行緒依序處理，
+    因此結果順序與送入順序一致。
+
+    佇列有上限 (max_pending)：寫出端跟不上時 submit() 會阻塞，
+    記憶體中最多只會有 max_pending + 1 張（佇列中 + 正在寫出）完整截圖。
+    """
+
+    def __init__(self, handler: Callable[[CaptureJob], None], max_pending: int = 2):
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="capture-writer", daemon=True)
+        self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._handler(job)
+            except Exception as exc:
+                # handler 應自行處理錯誤；這裡只確保背景執行緒不會中斷
+                logger.error(f"Capture writer error ({getattr(job, 'url', '?')}): {exc}")
+            finally:
+                # 盡早釋放圖片記憶體
+                job = None
+                self._queue.task_done()
+
+    def submit(self, job: CaptureJob) -> None:
+        """送出一張截圖；佇列已滿時阻塞直到寫出端有空位 (back-pressure)。"""
+        if self._closed:
+            raise RuntimeError("CaptureWriter is closed")
+        self._queue.put(job)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def drain(self) -> None:
+        """等待目前所有已送出的截圖寫出完成。"""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """寫完剩餘工作並結束背景執行緒（可重複呼叫）。"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
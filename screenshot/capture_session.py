@@ -0,0 +1,239 @@
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+from capture_pipeline import CaptureJob, CaptureWriter
+from config import RunConfig
+from logger_setup import logger
+from utils_system import IncrementalWordDoc, load_urls, new_word_path, open_done_log, safe_filename
+
+
+class CaptureSession:
+    """
+    一次截圖執行的輸出狀態：網址清單、Word 文件、完成紀錄、背景寫出與 run_results。
+    循序 (run_capture) 與並行 (run_capture_concurrent) 兩種流程共用。
+    done_log / run_results 會被背景寫出執行緒更新，一律在 lock 內存取。
+    """
+
+    def __init__(self, cfg: RunConfig, input_files=None, entries=None, url_callback=None):
+        """
+        entries: 直接指定 (序號, 網址, 附註, 來源檔) 清單，不讀取網址檔（分片執行時由主程序分配）。
+        序號沿用原始清單的順序，截圖檔名與結果排序才會和單一程序執行一致。
+        url_callback: 每個網址有結果時呼叫一次，參數為
+        {"url", "status": success/skipped/error, "classification", "seconds", "output" 或 "error"}；
+        seconds 從 begin(url) 起算（沒有呼叫 begin 時為 None）。
+        """
+        self.cfg = cfg
+        self.url_callback = url_callback
+        self._started: dict[str, float] = {}
+        # Auto-correct output_dir if it points to a specific screenshot folder (prevents nesting)
+        if cfg.output_dir.name.startswith("screenshots_"):
+            logger.info(f"Detected sub-folder in output path ({cfg.output_dir.name}), moving up one level to prevent nesting.")
+            cfg.output_dir = cfg.output_dir.parent
+
+        cfg.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Aggregate URLs and track source files
+        self.urls: list[tuple[str, str | None]] = []
+        self.url_to_source_file: dict[str, Path] = {}  # Map URL to its source file for Word generation
+
+        self.indices: list[int] = []
+
+        if entries is not None:
+            for idx, url, note, source_file in entries:
+                self.indices.append(idx)
+                self.urls.append((url, note))
+                self.url_to_source_file[url] = Path(source_file)
+        elif input_files:
+            for f in input_files:
+                file_urls = load_urls(Path(f))
+                self.urls.extend(file_urls)
+                # Track which file each URL came from
+                for url_tuple in file_urls:
+                    self.url_to_source_file[url_tuple[0]] = Path(f)
+        else:
+            self.urls = load_urls(cfg.urls_file)
+            for url_tuple in self.urls:
+                self.url_to_source_file[url_tuple[0]] = cfg.urls_file
+
+        if not self.urls:
+            raise RuntimeError(f"沒有網址可供處理,請檢查輸入內容。")
+        if not self.indices:
+            self.indices = list(range(1, len(self.urls) + 1))
+
+        # Tracking results for API
+        self.run_results = {
+            "processed": 0,
+            "errors": [],
+            "results": [],
+            "back_to_ui": False,
+            "word_documents": [],  # Track all generated Word documents
+            "word_bytes_written": 0,
+        }
+
+        # Setup Word documents - one per source file
+        self.word_docs: dict[Path, IncrementalWordDoc] = {}
+        if cfg.word_enabled:
+            if Document is None:
+                logger.info("Word export requires python-docx; skipping.")
+            else:
+                # Create a Word document for each unique source file
+                for source_file in set(self.url_to_source_file.values()):
+                    word_path = new_word_path(cfg.output_dir, source_file, cfg.word_path)
+                    word_path.parent.mkdir(parents=True, exist_ok=True)
+                    word_doc = IncrementalWordDoc(
+                        Document(),
+                        word_path,
+                        checkpoint_every=cfg.word_checkpoint_every,
+                        checkpoint_seconds=cfg.word_checkpoint_seconds,
+                    )
+                    word_doc.save()
+                    self.word_docs[source_file] = word_doc
+                    self.run_results["word_documents"].append(str(word_path))
+                    print(f"Word file: {word_path}")
+
+        self.done_log = open_done_log(
+            cfg.done_log,
+            record_output=cfg.record_output,
+            record_classification=cfg.text_check_enabled,
+        )
+        self.done = self.done_log.done
+        self.lock = threading.Lock()
+        self.writer = CaptureWriter(self._write_capture, max_pending=cfg.writer_queue_size)
+
+    def output_path(self, idx: int, url: str) -> Path:
+        """截圖檔路徑：依來源檔分資料夾 (screenshots_<檔名>)。"""
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        fname = f"{idx:03d}_{ts}_{safe_filename(url)}.png"
+        src_f = self.url_to_source_file.get(url)
+        if src_f is None:
+            return self.cfg.output_dir / fname
+        sub_d = f"screenshots_{src_f.stem}"
+        if self.cfg.output_dir.name == sub_d:
+            target_d = self.cfg.output_dir
+        else:
+            target_d = self.cfg.output_dir / sub_d
+            target_d.mkdir(parents=True, exist_ok=True)
+        # output_subdir 之後由 outpath.parent.name 取得，資料夾開啟功能依此運作
+        return target_d / fname
+
+    def begin(self, url: str) -> None:
+        """開始處理某個網址（url_callback 的 seconds 由此起算）。"""
+        with self.lock:
+            self._started[url] = time.monotonic()
+
+    def _report(self, url: str, status: str, classification: str | None = None, **extra) -> None:
+        """呼叫端持有 lock。回報失敗只記錄，不影響截圖流程。"""
+        if self.url_callback is None:
+            return
+        started = self._started.pop(url, None)
+        event = {
+            "url": url,
+            "status": status,
+            "classification": classification,
+            "seconds": round(time.monotonic() - started, 2) if started is not None else None,
+            **extra,
+        }
+        try:
+            self.url_callback(event)
+        except Exception as e:
+            logger.debug(f"url_callback error: {e}")
+
+    def submit(self, url: str, note: str | None, image, outpath: Path, classification: str | None) -> None:
+        """
+        交給背景寫出；佇列滿時會等待（back-pressure）。
+        結果在這裡就加入 run_results["results"]（輸出路徑已確定），順序與送出順序一致；
+        背景存檔失敗時再移除並改列入 errors。
+        """
+        result = {
+            "url": url,
+            "status": "success",
+            "output": str(outpath),
+            "output_subdir": outpath.parent.name,
+            "classification": classification,
+        }
+        with self.lock:
+            self.run_results["results"].append(result)
+        self.writer.submit(CaptureJob(
+            url=url,
+            note=note,
+            image=image,
+            outpath=outpath,
+            classification=classification,
+            source_file=self.url_to_source_file.get(url),
+            result=result,
+        ))
+
+    def record_skip(self, url: str, classification: str | None) -> None:
+        """不截圖但視為完成（例如查無資料）。"""
+        with self.lock:
+            self.done_log.record(url, cls=classification, source=self.url_to_source_file.get(url))
+            self._report(url, "skipped", classification)
+
+    def record_error(self, url: str, error: str) -> None:
+        with self.lock:
+            self.run_results["errors"].append({"url": url, "error": error})
+            self._report(url, "error", error=error)
+
+    def _write_capture(self, job: CaptureJob):
+        """背景寫出：PNG 編碼存檔、Word 匯出、完成紀錄。"""
+        url, outpath, img = job.url, job.outpath, job.image
+        job.image = None
+        try:
+            img.save(outpath)
+        except Exception as exc:
+            logger.error(f"Save failed: {exc}")
+            with self.lock:
+                results = self.run_results["results"]
+                for i, r in enumerate(results):
+                    if r is job.result:
+                        del results[i]
+                        break
+            self.record_error(url, f"儲存失敗: {exc}")
+            return
+        finally:
+            # Release image from memory
+            del img
+        logger.info(f"  Saved: {outpath}")
+
+        # Append to the correct Word document for this URL's source file
+        if self.word_docs and job.source_file in self.word_docs:
+            try:
+                self.word_docs[job.source_file].add(url, outpath, job.note)
+            except Exception as e:
+                logger.error(f"Word export error: {e}")
+
+        with self.lock:
+            self.done_log.record(url, output=str(outpath), cls=job.classification, source=job.source_file)
+            self.run_results["processed"] += 1
+            self._report(url, "success", job.classification, output=str(outpath))
+
+    def flush(self) -> None:
+        # 先等背景寫出完成，確保紀錄包含所有已存檔的截圖
+        self.writer.drain()
+        with self.lock:
+            self.done_log.flush()
+
+    def _close_word_docs(self) -> None:
+        """最後存檔所有 Word 文件並統計寫出量（停止、錯誤、Ctrl+C 都會經過）。"""
+        for word_doc in self.word_docs.values():
+            try:
+                word_doc.close()
+            except Exception as e:
+                logger.error(f"Word save error ({word_doc.path}): {e}")
+        if self.word_docs:
+            total_bytes = sum(d.bytes_written for d in self.word_docs.values())
+            total_saves = sum(d.saves for d in self.word_docs.values())
+            self.run_results["word_bytes_written"] = total_bytes
+            logger.info(f"Word export: {total_saves} saves, {total_bytes / 1024 / 1024:.1f} MB written")
+
+    def close(self) -> None:
+        self.writer.close()
+        self._close_word_docs()
+        self.done_log.close()
@@ -0,0 +1,220 @@
+import asyncio
+import time
+
+try:
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+except Exception:
+    async_playwright = None
+    PlaywrightError = PlaywrightTimeoutError = Exception
+
+from PIL import Image
+
+from browser_backend import STEALTH_SCRIPTS, launch_system_chrome_cdp
+from capture_session import CaptureSession
+from config import (
+    BROWSER_CDP_URL,
+    BROWSER_IDLE_TIMEOUT_MS,
+    BROWSER_NAV_TIMEOUT_MS,
+    BROWSER_USER_DATA_DIR,
+    BROWSER_VIEWPORT,
+    HOST_MAX_CONCURRENCY,
+    HOST_MIN_INTERVAL_SECONDS,
+    HOST_POLICIES,
+    RunConfig,
+)
+from host_scheduler import FAILED, SKIPPED, HostPolicy, HostScheduler
+from keyword_matcher import build_config_matcher, normalize_text, priority_order_from_config
+from logger_setup import logger
+from png_stream import StreamedImage
+from wait_profiles import WaitProfiles
+
+
+def host_policies_from_config(cfg: RunConfig) -> tuple[HostPolicy, dict[str, HostPolicy]]:
+    """預設網域政策 + 個別網域覆寫；批次休息 (batch_size / batch_rest_range) 改為各網域各自計算。"""
+    batch = {
+        "batch_size": cfg.batch_size,
+        "batch_rest_range": cfg.batch_rest_range,
+    }
+    default = HostPolicy(max_concurrency=HOST_MAX_CONCURRENCY, min_interval=HOST_MIN_INTERVAL_SECONDS, **batch)
+    policies = {host: HostPolicy(**{**batch, **overrides}) for host, overrides in HOST_POLICIES.items()}
+    return default, policies
+
+
+async def _open_context(p, cfg: RunConfig):
+    """回傳 (browser, context, proc)。"""
+    if cfg.cdp_mode:
+        proc = None
+        try:
+            browser = await p.chromium.connect_over_cdp(BROWSER_CDP_URL)
+        except PlaywrightError:
+            proc = launch_system_chrome_cdp(BROWSER_USER_DATA_DIR)
+            if proc is None:
+                raise
+            await asyncio.sleep(3)
+            browser = await p.chromium.connect_over_cdp(BROWSER_CDP_URL)
+        context = browser.contexts[0] if browser.contexts else await browser.new_context()
+        return browser, context, proc
+    browser = await p.chromium.launch(headless=cfg.headless)
+    context = await browser.new_context(
+        viewport={"width": BROWSER_VIEWPORT[0], "height": BROWSER_VIEWPORT[1]},
+        locale="zh-TW",
+    )
+    for script in STEALTH_SCRIPTS:
+        await context.add_init_script(script)
+    return browser, context, None
+
+
+def run_capture_concurrent(
+    cfg: RunConfig,
+    external_stop_callback=None,
+    progress_callback=None,
+    input_files=None,
+    entries=None,
+    url_callback=None,
+) -> dict:
+    """
+    瀏覽器引擎的並行流程：同時載入 cfg.concurrent_pages 個分頁，各自等到載入完成就截圖。
+    每個網域遵守 HostPolicy（同時分頁數、開頁間隔、批次休息）。
+    無法人工介入，偵測到需要暫停的類別（預設為登入/驗證）時記為錯誤且不列入完成紀錄，之後可再跑一次；
+    開頁、截圖等失敗也記為錯誤（run_results["errors"] 與 url_callback）。
+    Playwright 的截圖只有頁面內容、沒有瀏覽器工具列，不套用裁切設定（crop_enabled）。
+    """
+    if async_playwright is None:
+        raise RuntimeError("並行截圖需要 playwright：pip install playwright && playwright install chromium")
+
+    session = CaptureSession(cfg, input_files, entries, url_callback=url_callback)
+    run_results = session.run_results
+    profiles = WaitProfiles(cfg.wait_profiles_file) if cfg.learned_wait else None
+    matcher = build_config_matcher(cfg) if cfg.text_check_enabled else None
+    priority_order = priority_order_from_config(cfg)
+    pause_categories = (
+        {name for name, pause in cfg.category_pause.items() if pause}
+        if cfg.category_pause
+        else {"登入", "拼圖與人機驗證"}
+    )
+
+    total = len(session.urls)
+    items = []
+    skipped = 0
+    for idx, (url, note) in zip(session.indices, session.urls):
+        if cfg.skip_done and url in session.done:
+            skipped += 1
+            continue
+        items.append((url, idx, note))
+
+    default_policy, policies = host_policies_from_config(cfg)
+    scheduler = HostScheduler(
+        default_policy,
+        policies,
+        max_workers=cfg.concurrent_pages,
+        should_stop=external_stop_callback,
+    )
+    logger.info(f"Config: {cfg}")
+    logger.info(f"Loaded {total} URLs (Done: {len(session.done)}), concurrent pages: {cfg.concurrent_pages}")
+
+    finished = {"count": 0}
+
+    def report(url: str) -> None:
+        finished["count"] += 1
+        if progress_callback:
+            progress_callback(
+                finished["count"],
+                len(items),
+                f"處理中 ({finished['count']}/{len(items)}，{scheduler.urls_per_minute:.1f} 個/分)",
+            )
+
+    async def capture_one(context, url: str, idx: int, note: str | None) -> str | None:
+        session.begin(url)
+        page = None
+        try:
+            page = await context.new_page()
+            t0 = time.perf_counter()
+            try:
+                await page.goto(url, wait_until="load", timeout=BROWSER_NAV_TIMEOUT_MS)
+            except PlaywrightTimeoutError:
+                logger.warning(f"  Load timeout: {url}")
+            try:
+                await page.wait_for_load_state("networkidle", timeout=BROWSER_IDLE_TIMEOUT_MS)
+            except PlaywrightTimeoutError:
+                pass
+            load_seconds = time.perf_counter() - t0
+            logger.info(f"[{idx}/{total}] Ready in {load_seconds:.1f}s: {url}")
+            if profiles is not None:
+                profiles.record(url, load_seconds)
+
+            cls = None
+            if matcher is not None:
+                try:
+                    text = await page.inner_text("body")
+                except PlaywrightError:
+                    text = ""
+                t = normalize_text(text[:2000])
+                cls = (matcher.first_match(t, priority_order) if t else None) or "無法判斷"
+                if cls == "查無資料":
+                    session.record_skip(url, cls)
+                    return SKIPPED
+                if cls in pause_categories:
+                    logger.warning(f"  {cls}: {url}（並行模式無法人工處理，稍後請再執行一次）")
+                    session.record_error(url, f"需要人工處理: {cls}")
+                    return FAILED
+
+            outpath = session.output_path(idx, url)
+            await page.screenshot(path=str(outpath), full_page=cfg.scroll_capture)
+            with Image.open(outpath) as img:
+                size = img.size
+            # submit 在寫出佇列滿時會等待，不能擋住事件迴圈
+            await asyncio.to_thread(session.submit, url, note, StreamedImage(outpath, *size), outpath, cls)
+        except Exception as e:
+            # 連線失敗（net::ERR_*）、截圖失敗等：列入錯誤清單，再交給 scheduler 計入失敗數
+            session.record_error(url, str(e))
+            raise
+        finally:
+            if page is not None:
+                await page.close()
+            report(url)
+
+    async def main() -> None:
+        async with async_playwright() as p:
+            browser, context, proc = await _open_context(p, cfg)
+            try:
+                await scheduler.run(items, lambda url, idx, note: capture_one(context, url, idx, note))
+            finally:
+                if not cfg.cdp_mode:
+                    await context.close()
+                await browser.close()
+                if proc is not None:
+                    proc.terminate()
+
+    try:
+        if progress_callback:
+            progress_callback(0, len(items), "開始處理")
+        asyncio.run(main())
+        session.flush()
+        # 背景寫出失敗的網址在 scheduler 看來已完成，改計入失敗，失敗數與 errors 一致
+        write_failures = len(run_results["errors"]) - scheduler.failed
+        if write_failures > 0:
+            scheduler.completed -= write_failures
+            scheduler.failed += write_failures
+        # 並行時依完成順序加入，改回輸入清單順序（與循序、分片執行一致）
+        order = {url: idx for idx, (url, _) in zip(session.indices, session.urls)}
+        run_results["results"].sort(key=lambda r: order.get(r["url"], 0))
+    finally:
+        if profiles is not None:
+            profiles.save()
+        session.close()
+
+    stats = scheduler.stats()
+    run_results["throughput"] = stats
+    run_results["back_to_ui"] = scheduler.stopped
+    logger.info("Run finished.")
+    logger.info(
+        f"Completed: {stats['completed']}, Failed: {stats['failed']}, Skipped: {skipped + stats['skipped']}, "
+        f"{stats['urls_per_minute']} URLs/min"
+    )
+    for host, host_stats in stats["hosts"].items():
+        logger.info(f"  {host}: {host_stats}")
+    if progress_callback:
+        progress_callback(finished["count"], len(items), "完成")
+    return run_results
@@ -8,18 +8,61 @@ from pathlib import Path
 # 預設值（可用參數覆蓋）
 DEFAULT_URLS_FILE = "urls.txt"     # 預設網址清單檔
 DONE_LOG = "done_urls.json"        # 已完成網址紀錄（避免重複訪問）
+DONE_JOURNAL_COMPACT_EVERY = 500   # 完成日誌 (done_urls.json.journal) 累積 N 行後合併回 done_urls.json
+DONE_DB = "done_urls.sqlite3"      # SQLite 完成紀錄（done_store="sqlite" 或 --done-log 指定 .sqlite3 時使用）
+DONE_STORE_BATCH_SIZE = 50         # SQLite 完成紀錄每 N 筆批次寫入
 
 # 一開頁就倒數（載入中 + 最終截圖倒數）
 PAGE_WAIT_RANGE = (15, 30)         # 一個網址從開頁到截圖前的總倒數秒數（含「載入中」與「準備截圖」）
 FINAL_COUNTDOWN_SECONDS = 5        # 最後 N 秒顯示「準備截圖」
 
+# 自適應等待：每秒比對畫面，頁面穩定就截圖（PAGE_WAIT_RANGE 的最小值為下限、最大值為上限）
+ADAPTIVE_WAIT_DEFAULT = False
+READY_STABLE_POLLS = 2             # 連續 N 次畫面幾乎不變視為載入完成
+READY_SIMILARITY_THRESHOLD = 0.995 # 相鄰兩次畫面相似度達此值視為「不變」
+READY_JITTER_RANGE = (0, 3)        # 穩定後再隨機多等的秒數（保留不規則節奏；(0, 0) = 停用）
+
+# 各網域載入時間紀錄：依歷史百分位數決定每頁等待（樣本不足時用 PAGE_WAIT_RANGE）
+LEARNED_WAIT_DEFAULT = True
+WAIT_PROFILES_FILE = "wait_profiles.json"
+WAIT_PROFILE_MAX_SAMPLES = 50      # 每個網域保留最近 N 筆
+WAIT_PROFILE_MIN_SAMPLES = 5       # 至少 N 筆才使用學到的等待時間
+WAIT_PROFILE_MARGIN_SECONDS = 2    # 上限再加的緩衝秒數
+WAIT_PROFILE_MAX_SECONDS = 90      # 學到的等待上限不超過此值
+
 # 批次節奏
 BATCH_SIZE = 8
 BATCH_REST_RANGE = (20, 30)
 
+# 背景寫出佇列上限（張）：PNG 編碼 / Word 匯出在背景進行，超過上限時擷取端會等待
+WRITER_QUEUE_SIZE = 2
+
 # UI 隱藏後到截圖前的重繪緩衝（避免殘影）
 UI_HIDE_BUFFER_SECONDS = 0.45
 
+# 截圖引擎："desktop" = 真實桌面瀏覽器（鍵盤/截圖）；"browser" = Playwright 控制的 Chromium
+CAPTURE_ENGINE_DEFAULT = "desktop"
+CAPTURE_ENGINES = ("desktop", "browser")
+BROWSER_VIEWPORT = (1920, 1080)
+BROWSER_NAV_TIMEOUT_MS = 30000     # 開頁（load 事件）逾時
+BROWSER_IDLE_TIMEOUT_MS = 10000    # 等待網路閒置 (networkidle) 的上限，逾時仍照常截圖
+BROWSER_CDP_URL = "http://localhost:9222"
+BROWSER_CDP_PORT = 9222
+BROWSER_USER_DATA_DIR = str(Path.home() / ".autoflow_chrome_profile")
+
+# 瀏覽器引擎並行截圖（concurrent_pages > 1 時啟用）
+CONCURRENT_PAGES_DEFAULT = 1       # 同時處理的分頁數（1 = 循序）
+HOST_MAX_CONCURRENCY = 2           # 同一網域同時開啟的分頁上限
+HOST_MIN_INTERVAL_SECONDS = 3.0    # 同一網域兩次開頁的最小間隔
+# 個別網域覆寫（後綴比對），蝦皮限流嚴格
+HOST_POLICIES = {
+    "shopee.tw": {"max_concurrency": 1, "min_interval": 8.0},
+}
+
+# 多程序分片（shard_workers > 1 時啟用，每個程序各自開一個瀏覽器）
+SHARD_WORKERS_DEFAULT = 1
+SHARD_WORKERS_MAX = 8
+
 # 暖機
 WARM_UP_ENABLED = False
 WARM_UP_URL = "https://shopee.tw/"
@@ -32,16 +75,25 @@ RECORD_OUTPUT_DEFAULT = True
 
 TEXT_CHECK_ENABLED_DEFAULT = False
 WORD_ENABLED_DEFAULT = False
+WORD_CHECKPOINT_EVERY = 20         # Word 每累積 N 張存檔一次（0 = 停用此條件，1 = 每張都存）
+WORD_CHECKPOINT_SECONDS = 120      # Word 距上次存檔超過 N 秒時存檔（0 = 停用此條件）
 SCROLL_CAPTURE_DEFAULT = False
 SCROLL_CAPTURE_MULTIPLIER = 2
 SCROLL_CAPTURE_PAGEDOWN_TIMES_DEFAULT = 4
 CAPTURE_ACTIVE_WINDOW_DEFAULT = False
-SCROLL_SIMILARITY_THRESHOLD = 0.99
+# 捲動到底判定：相鄰截圖的灰階指紋相似度達此值即停止。
+# 指紋（灰階、寬 64）比原本的 RGB 寬 800 比對略為寬鬆，只捲動幾像素的截圖可達 0.991～0.992，
+# 門檻由 0.99 提高到 0.993；游標、小型動畫等幾乎相同的畫面仍在 0.995 以上（見 test_image_similarity）
+SCROLL_SIMILARITY_THRESHOLD = 0.993
+SCROLL_FINGERPRINT_WIDTH = 64      # 捲動比對用灰階指紋寬度（高度保持原尺寸，逐列比對）
+SCROLL_OVERLAP_MIN_ROWS = 8        # 判定相鄰截圖重疊所需的最少相同列數
+SCROLL_FIXED_BAND_MAX_RATIO = 0.34 # 固定頁首/頁尾最多佔畫面高度的比例
 TOOLTIP_ALPHA = 0.75
 WEBPAGE_TOP_CROP_PX_DEFAULT = 120
 WEBPAGE_BOTTOM_CROP_PX_DEFAULT = 0
 SCROLL_CAPTURE_WAIT_SECONDS = 0.6
 SCROLL_STITCH_DEFAULT = True
+STREAM_STITCH_DEFAULT = False      # 捲動截圖邊截邊寫入 PNG（長頁面省記憶體，但編碼改在截圖執行緒）
 OCR_LANG = "chi_tra+eng"
 PREFS_FILE = "preferences.json"
 
@@ -80,6 +132,10 @@ class RunConfig:
     warmup_enabled: bool = WARM_UP_ENABLED
     page_wait_range: tuple[int, int] = PAGE_WAIT_RANGE
     final_countdown: int = FINAL_COUNTDOWN_SECONDS
+    adaptive_wait: bool = ADAPTIVE_WAIT_DEFAULT
+    ready_jitter_range: tuple[int, int] = READY_JITTER_RANGE
+    learned_wait: bool = LEARNED_WAIT_DEFAULT
+    wait_profiles_file: Path = Path(WAIT_PROFILES_FILE)
     skip_done: bool = SKIP_DONE_DEFAULT
     record_output: bool = RECORD_OUTPUT_DEFAULT
     word_enabled: bool = WORD_ENABLED_DEFAULT
@@ -95,17 +151,22 @@ class RunConfig:
     crop_top_px: int = WEBPAGE_TOP_CROP_PX_DEFAULT
     crop_bottom_px: int = WEBPAGE_BOTTOM_CROP_PX_DEFAULT
     scroll_stitch: bool = SCROLL_STITCH_DEFAULT
+    stream_stitch: bool = STREAM_STITCH_DEFAULT
     batch_size: int = BATCH_SIZE
     batch_rest_range: tuple[int, int] = BATCH_REST_RANGE
     word_path: str | Path | None = None
     login_mode: bool = False
     headless: bool = True
     cdp_mode: bool = False
+    engine: str = CAPTURE_ENGINE_DEFAULT
+    concurrent_pages: int = CONCURRENT_PAGES_DEFAULT
+    shard_workers: int = SHARD_WORKERS_DEFAULT
     custom_categories: dict = None
     category_pause: dict = None
     keywords: list = None
-
-
+    writer_queue_size: int = WRITER_QUEUE_SIZE
+    word_checkpoint_every: int = WORD_CHECKPOINT_EVERY
+    word_checkpoint_seconds: float = WORD_CHECKPOINT_SECONDS
 
     def __post_init__(self):
         if self.captcha_keywords is None:
@@ -123,6 +184,8 @@ class RunConfig:
             raise ValueError("每頁等待最小值不可大於最大值")
         if self.final_countdown < 0:
             raise ValueError("截圖倒數不可為負數")
+        if self.ready_jitter_range[0] < 0 or self.ready_jitter_range[0] > self.ready_jitter_range[1]:
+            raise ValueError("穩定後隨機等待範圍不合法")
         
         if self.batch_size < 0:
              # Allow 0 = disabled, but UI sets batch_size to int
@@ -131,6 +194,21 @@ class RunConfig:
         if self.batch_rest_range[0] > self.batch_rest_range[1]:
             raise ValueError("批次休息最小值不可大於最大值")
             
+        if self.writer_queue_size < 1:
+            raise ValueError("寫出佇列上限需大於 0")
+
+        if self.engine not in CAPTURE_ENGINES:
+            raise ValueError(f"不支援的截圖引擎: {self.engine}")
+
+        if self.concurrent_pages < 1:
+            raise ValueError("並行分頁數需大於 0")
+
+        if not 1 <= self.shard_workers <= SHARD_WORKERS_MAX:
+            raise ValueError(f"分片程序數需介於 1 到 {SHARD_WORKERS_MAX}")
+
+        if self.word_checkpoint_every < 0 or self.word_checkpoint_seconds < 0:
+            raise ValueError("Word 存檔間隔不可為負數")
+
         if self.scroll_capture and self.scroll_pagedown_times <= 0:
             raise ValueError("PageDown 次數需大於 0")
             
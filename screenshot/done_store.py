@@ -0,0 +1,287 @@
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config import DONE_STORE_BATCH_SIZE
+from logger_setup import logger
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS done_urls (
+    url TEXT PRIMARY KEY,
+    output TEXT,
+    class TEXT,
+    source_file TEXT,
+    ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_done_urls_class ON done_urls(class);
+CREATE INDEX IF NOT EXISTS idx_done_urls_source ON done_urls(source_file);
+CREATE INDEX IF NOT EXISTS idx_done_urls_ts ON done_urls(ts);
+"""
+
+_UPSERT = """
+INSERT INTO done_urls (url, output, class, source_file, ts) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    output = COALESCE(excluded.output, done_urls.output),
+    class = COALESCE(excluded.class, done_urls.class),
+    source_file = COALESCE(excluded.source_file, done_urls.source_file),
+    ts = excluded.ts
+"""
+
+
+def is_sqlite_path(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+class _DoneUrls:
+    """done_set 的唯讀檢視：url in done 直接查索引，不需整批載入。"""
+
+    def __init__(self, store: "SqliteDoneStore"):
+        self._store = store
+
+    def __contains__(self, url) -> bool:
+        return self._store.contains(url)
+
+    def __len__(self) -> int:
+        return self._store.count()
+
+    def __iter__(self):
+        return iter(self._store.urls())
+
+    def add(self, url: str) -> None:
+        self._store.record(url)
+
+
+class _DoneColumn:
+    """outputs / classes 的 dict 風格檢視。"""
+
+    def __init__(self, store: "SqliteDoneStore", column: str):
+        self._store = store
+        self._column = column
+
+    def get(self, url: str, default=None):
+        value = self._store.lookup(url, self._column)
+        return default if value is None else value
+
+    def __getitem__(self, url: str):
+        value = self._store.lookup(url, self._column)
+        if value is None:
+            raise KeyError(url)
+        return value
+
+    def __contains__(self, url) -> bool:
+        return self._store.lookup(url, self._column) is not None
+
+    def __setitem__(self, url: str, value: str) -> None:
+        self._store.record(url, **{"output" if self._column == "output" else "cls": value})
+
+    def __len__(self) -> int:
+        return self._store.count(self._column)
+
+    def items(self):
+        return self._store.column_items(self._column)
+
+
+class SqliteDoneStore:
+    """
+    SQLite 版完成紀錄（與 DoneJournal 相同介面）。
+
+    以 url 為主鍵，並對分類、來源檔、時間建索引；WAL 模式 + 批次寫入。
+    啟動時不載入全部紀錄，url in store.done 直接查詢，歷史再大也不影響啟動時間。
+    第一次建立資料庫時，會自動匯入同名的 .json 完成紀錄。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        record_output: bool = True,
+        record_classification: bool = False,
+        batch_size: int = DONE_STORE_BATCH_SIZE,
+    ):
+        self.path = Path(path)
+        self.record_output = record_output
+        self.record_classification = record_classification
+        self.batch_size = max(1, int(batch_size))
+        self._lock = threading.RLock()
+        self._pending: dict[str, tuple] = {}
+
+        is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self.done = _DoneUrls(self)
+        self.outputs = _DoneColumn(self, "output")
+        self.classes = _DoneColumn(self, "class")
+
+        legacy = self.path.with_suffix(".json")
+        if is_new and legacy.exists():
+            self.import_json(legacy)
+
+    def __contains__(self, url) -> bool:
+        return self.contains(url)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    # --- 查詢 ---
+    def contains(self, url) -> bool:
+        with self._lock:
+            if url in self._pending:
+                return True
+            row = self._conn.execute("SELECT 1 FROM done_urls WHERE url = ?", (url,)).fetchone()
+            return row is not None
+
+    def lookup(self, url: str, column: str):
+        with self._lock:
+            if url in self._pending:
+                value = self._pending[url][1 if column == "output" else 2]
+                if value is not None:
+                    return value
+            row = self._conn.execute(f"SELECT {column} FROM done_urls WHERE url = ?", (url,)).fetchone()
+            return row[0] if row else None
+
+    def count(self, column: str | None = None) -> int:
+        with self._lock:
+            self._write_pending()
+            if column:
+                sql = f"SELECT COUNT(*) FROM done_urls WHERE {column} IS NOT NULL"
+            else:
+                sql = "SELECT COUNT(*) FROM done_urls"
+            return self._conn.execute(sql).fetchone()[0]
+
+    def urls(self) -> list[str]:
+        with self._lock:
+            self._write_pending()
+            return [r[0] for r in self._conn.execute("SELECT url FROM done_urls ORDER BY url")]
+
+    def column_items(self, column: str) -> list[tuple[str, str]]:
+        with self._lock:
+            self._write_pending()
+            sql = f"SELECT url, {column} FROM done_urls WHERE {column} IS NOT NULL ORDER BY url"
+            return list(self._conn.execute(sql))
+
+    # --- 寫入 ---
+    def record(
+        self,
+        url: str,
+        output: str | None = None,
+        cls: str | None = None,
+        source: str | Path | None = None,
+    ) -> None:
+        """記錄一筆完成網址；累積 batch_size 筆才寫入資料庫。"""
+        if not (output and self.record_output):
+            output = None
+        if not (cls and self.record_classification):
+            cls = None
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            prev = self._pending.get(url)
+            if prev is not None:
+                output = output or prev[1]
+                cls = cls or prev[2]
+                source = source or prev[3]
+            self._pending[url] = (url, output, cls, str(source) if source else None, ts)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        self._pending.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def compact(self) -> None:
+        with self._lock:
+            self._write_pending()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._write_pending()
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM done_urls")
+
+    def import_json(self, json_path: str | Path) -> int:
+        """匯入 JSON 完成紀錄（快照 + 日誌，支援舊版格式）。"""
+        from utils_system import load_done_data
+
+        done_set, outputs, classes = load_done_data(json_path)
+        rows = [(url, outputs.get(url), classes.get(url), None, None) for url in done_set]
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        logger.info(f"Imported {len(rows)} done records from {json_path}")
+        return len(rows)
+
+    def replace_all(
+        self,
+        done_set,
+        outputs,
+        classes,
+        record_output: bool,
+        record_classification: bool,
+    ) -> None:
+        """save_done_data 的 SQLite 版：以傳入內容批次寫入（已存在的紀錄保留）。"""
+        rows = []
+        for url in done_set:
+            output = outputs.get(url) if record_output else None
+            cls = classes.get(url) if record_classification else None
+            rows.append((url, output, cls, None, None))
+        with self._lock:
+            self._write_pending()
+            with self._conn:
+                self._conn.executemany(_UPSERT, rows)
+
+    def query(
+        self,
+        search: str | None = None,
+        classification: str | None = None,
+        source_file: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict]:
+        """依條件查詢歷史結果（最新的在前）。"""
+        where = []
+        params: list = []
+        if search:
+            where.append("url LIKE ?")
+            params.append(f"%{search}%")
+        if classification:
+            where.append("class = ?")
+            params.append(classification)
+        if source_file:
+            where.append("source_file = ?")
+            params.append(source_file)
+        sql = "SELECT url, output, class, source_file, ts FROM done_urls"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, url LIMIT ? OFFSET ?"
+        params += [int(limit), int(offset)]
+        with self._lock:
+            self._write_pending()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"url": u, "output": o, "classification": c, "source_file": s, "time": t}
+            for u, o, c, s, t in rows
+        ]
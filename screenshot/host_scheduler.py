@@ -0,0 +1,184 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from logger_setup import logger
+
+# worker 可回傳的結果：沒有實際截圖，不計入完成數與吞吐量（回傳 None 視為完成）
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass
+class HostPolicy:
+    """
+    單一網域的禮貌限制。
+    max_concurrency: 同時開啟的頁面數上限
+    min_interval: 兩次開頁之間至少間隔秒數
+    batch_size / batch_rest_range: 每開 N 頁休息一段隨機時間（0 = 不休息），只影響該網域
+    """
+
+    max_concurrency: int = 2
+    min_interval: float = 3.0
+    batch_size: int = 0
+    batch_rest_range: tuple[float, float] = (0, 0)
+
+
+def host_of(url: str) -> str:
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+
+@dataclass
+class _HostState:
+    policy: HostPolicy
+    semaphore: asyncio.Semaphore
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_start: float = 0.0
+    started: int = 0
+    finished: int = 0
+    active: int = 0
+    peak_active: int = 0
+    rest_seconds: float = 0.0
+
+
+class HostScheduler:
+    """
+    並行截圖排程：全域最多 max_workers 個頁面同時處理，且每個網域各自遵守 HostPolicy。
+    先等網域名額（含間隔/批次休息）再取得全域名額，等待中的網域不會佔住其他網域的名額。
+    同網域內依送入順序開始（asyncio 的 Semaphore / Lock 皆為 FIFO）。
+    """
+
+    def __init__(
+        self,
+        default_policy: HostPolicy | None = None,
+        policies: dict[str, HostPolicy] | None = None,
+        max_workers: int = 4,
+        should_stop=None,
+    ):
+        self.default_policy = default_policy or HostPolicy()
+        self.policies = policies or {}
+        self.max_workers = max(1, int(max_workers))
+        self.should_stop = should_stop
+        self._hosts: dict[str, _HostState] = {}
+        self._global: asyncio.Semaphore | None = None
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.stopped = False
+
+    def policy_for(self, host: str) -> HostPolicy:
+        """完全相同的網域優先，其次為後綴（例如 "shopee.tw" 也套用到 "mall.shopee.tw"）。"""
+        if host in self.policies:
+            return self.policies[host]
+        for suffix, policy in self.policies.items():
+            if host.endswith("." + suffix):
+                return policy
+        return self.default_policy
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            policy = self.policy_for(host)
+            state = _HostState(policy=policy, semaphore=asyncio.Semaphore(max(1, policy.max_concurrency)))
+            self._hosts[host] = state
+        return state
+
+    async def _acquire(self, host: str, state: _HostState) -> None:
+        """
+        等到該網域可以開下一頁（最小間隔、批次休息）後取得全域名額。
+        整段持有網域鎖：只會擋住同網域的下一頁，開頁時間以實際開始為準。
+        """
+        policy = state.policy
+        async with state.lock:
+            delay = state.next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._global.acquire()
+            state.started += 1
+            state.next_start = time.monotonic() + policy.min_interval
+            if policy.batch_size > 0 and state.started % policy.batch_size == 0:
+                rest = random.uniform(*policy.batch_rest_range)
+                state.next_start += rest
+                state.rest_seconds += rest
+                logger.info(f"[{host}] 批次休息 {rest:.0f} 秒（每 {policy.batch_size} 個）")
+
+    async def _run_one(self, url: str, worker, *args) -> None:
+        host = host_of(url)
+        state = self._state(host)
+        async with state.semaphore:
+            if self._stop_requested():
+                return
+            await self._acquire(host, state)
+            try:
+                if self._stop_requested():
+                    return
+                state.active += 1
+                state.peak_active = max(state.peak_active, state.active)
+                try:
+                    outcome = await worker(url, *args)
+                    if outcome == SKIPPED:
+                        self.skipped += 1
+                    elif outcome == FAILED:
+                        self.failed += 1
+                    else:
+                        self.completed += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"[{host}] {url} failed: {e}")
+                finally:
+                    state.active -= 1
+                    state.finished += 1
+            finally:
+                self._global.release()
+
+    def _stop_requested(self) -> bool:
+        if not self.stopped and self.should_stop and self.should_stop():
+            self.stopped = True
+        return self.stopped
+
+    async def run(self, items, worker) -> None:
+        """
+        items: (url, *args) 的序列；worker(url, *args) 為 async 函式，
+        回傳 SKIPPED / FAILED 時分別計入略過、失敗數，其他回傳值計入完成數。
+        worker 內的例外計入失敗數並記錄，不中斷其他網址。
+        """
+        self._global = asyncio.Semaphore(self.max_workers)
+        self.started_at = time.monotonic()
+        try:
+            await asyncio.gather(*(self._run_one(item[0], worker, *item[1:]) for item in items))
+        finally:
+            self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.monotonic()
+        return max(0.0, end - self.started_at) if self.started_at else 0.0
+
+    @property
+    def urls_per_minute(self) -> float:
+        elapsed = self.elapsed
+        return self.completed / elapsed * 60 if elapsed > 0 else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_seconds": round(self.elapsed, 2),
+            "urls_per_minute": round(self.urls_per_minute, 1),
+            "hosts": {
+                host: {
+                    "finished": s.finished,
+                    "peak_concurrency": s.peak_active,
+                    "rest_seconds": round(s.rest_seconds, 1),
+                }
+                for host, s in self._hosts.items()
+            },
+        }
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from typing import Iterable, Mapping
+
+DEFAULT_CATEGORY_ORDER = ["登入", "拼圖與人機驗證", "查無資料", "BSMI"]
+
+
+def normalize_text(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+class KeywordMatcher:
+    """
+    多類別關鍵字比對器。
+
+    建立時就把所有關鍵字正規化、去重，並移除「包含同類別較短關鍵字」的多餘關鍵字
+    （較長的命中時較短的必定命中）。比對時依優先順序逐類檢查，命中即停止，
+    子字串搜尋全部交給 C 實作的 str.__contains__。
+    結果與逐一 normalize_text(k) in t 的寫法完全相同（空字串關鍵字視為必中）。
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]]):
+        self.categories = list(categories)
+        self._patterns: dict[str, tuple[str, ...]] = {}
+        self._always: set[str] = set()
+        for cat, keywords in categories.items():
+            normalized = {normalize_text(k) for k in keywords or ()}
+            if "" in normalized:
+                self._always.add(cat)
+                self._patterns[cat] = ()
+                continue
+            kept: list[str] = []
+            for p in sorted(normalized, key=len):
+                if not any(q in p for q in kept):
+                    kept.append(p)
+            self._patterns[cat] = tuple(kept)
+
+    @property
+    def pattern_count(self) -> int:
+        return sum(len(p) for p in self._patterns.values())
+
+    def matches(self, normalized_text: str, category: str) -> bool:
+        """文字（已正規化）是否命中指定類別。"""
+        if category in self._always:
+            return True
+        patterns = self._patterns.get(category)
+        if not patterns:
+            return False
+        return any(map(normalized_text.__contains__, patterns))
+
+    def match_all(self, normalized_text: str) -> set[str]:
+        """回傳文字（已正規化）中命中的所有類別。"""
+        return {cat for cat in self._patterns if self.matches(normalized_text, cat)}
+
+    def first_match(self, normalized_text: str, priority_order: Iterable[str]) -> str | None:
+        """依優先順序回傳第一個命中的類別，沒有則回傳 None。"""
+        for cat in priority_order:
+            if self.matches(normalized_text, cat):
+                return cat
+        return None
+
+
+def category_keywords(cfg) -> dict[str, list[str]]:
+    """
+    依 RunConfig 組出「類別 -> 關鍵字」對照。
+    預設四類優先於同名的自訂類別（與 handle_page_checks 的判斷順序一致）。
+    """
+    categories = {
+        "登入": cfg.login_keywords,
+        "拼圖與人機驗證": cfg.captcha_keywords,
+        "查無資料": cfg.not_found_keywords,
+        "BSMI": cfg.bsmi_keywords,
+    }
+    for name, keywords in (cfg.custom_categories or {}).items():
+        if name not in categories:
+            categories[name] = keywords
+    return categories
+
+
+def priority_order_from_config(cfg) -> list[str]:
+    priority_order = getattr(cfg, "keywords", None)
+    # 確保 priority_order 是列表（防止 None 或其它類型導致循環報錯）
+    if not priority_order or not isinstance(priority_order, list):
+        return list(DEFAULT_CATEGORY_ORDER)
+    return priority_order
+
+
+def build_config_matcher(cfg) -> KeywordMatcher:
+    return KeywordMatcher(category_keywords(cfg))
+
+
+@lru_cache(maxsize=16)
+def cached_matcher(categories: tuple[tuple[str, tuple[str, ...]], ...]) -> KeywordMatcher:
+    """以 (類別, 關鍵字 tuple) 為 key 快取比對器，供 classify_text 這類每頁呼叫的函式使用。"""
+    return KeywordMatcher(dict(categories))
@@ -1,10 +1,14 @@
 import argparse
 import random
 import time
-import webbrowser
-import pyautogui
-# Disable FailSafe to prevent crashes when mouse hits corners during automation
-pyautogui.FAILSAFE = False
+try:
+    import pyautogui
+except Exception:
+    # 無桌面環境（例如 Linux 建置機）時仍可使用 SyntheticBackend
+    pyautogui = None
+if pyautogui is not None:
+    # Disable FailSafe to prevent crashes when mouse hits corners during automation
+    pyautogui.FAILSAFE = False
 from datetime import datetime
 from pathlib import Path
 
@@ -13,18 +17,17 @@ try:
 except ImportError:
     Image = None
 
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
 from config import (
     BATCH_REST_RANGE,
     BATCH_SIZE,
     BSMI_KEYWORDS,
     CAPTCHA_KEYWORDS,
     CAPTURE_ACTIVE_WINDOW_DEFAULT,
+    CAPTURE_ENGINE_DEFAULT,
+    CAPTURE_ENGINES,
+    CONCURRENT_PAGES_DEFAULT,
     DEFAULT_URLS_FILE,
+    DONE_DB,
     DONE_LOG,
     FINAL_COUNTDOWN_SECONDS,
     LOGIN_KEYWORDS,
@@ -38,7 +41,9 @@ from config import (
     SCROLL_CAPTURE_PAGEDOWN_TIMES_DEFAULT,
     SCROLL_CAPTURE_WAIT_SECONDS,
     SCROLL_SIMILARITY_THRESHOLD,
+    SHARD_WORKERS_DEFAULT,
     UI_HIDE_BUFFER_SECONDS,
+    WAIT_PROFILES_FILE,
     WARM_UP_ENABLED,
     WARM_UP_URL,
     WARM_UP_WAIT_RANGE,
@@ -47,33 +52,31 @@ from config import (
     WORD_ENABLED_DEFAULT,
     RunConfig,
 )
+from capture_backend import CaptureBackend, DesktopBackend, create_backend
+from capture_session import CaptureSession
+from host_scheduler import host_of
+from keyword_matcher import KeywordMatcher, build_config_matcher, normalize_text, priority_order_from_config
 from logger_setup import logger
+from page_readiness import PageReadiness
 from ui import OverlayUI, show_error_ui, show_info_ui, ui_collect_settings
+from wait_profiles import WaitProfiles
 from utils_system import (
     append_text_log,
-    append_to_word,
-    click_window_corner,
     default_output_dir_from_urls,
-    load_done_data,
-    load_urls,
-    new_word_path,
-    safe_filename,
-    save_done_data,
     short_url,
     sleep_random,
 )
 from utils_image import (
-    capture_active_window,
     classify_text,
     crop_webpage_area,
     image_similarity,
-    extract_text_content,
     capture_scrolling_page,
 
 )
 
 # 初始化設定
-pyautogui.PAUSE = 0.15
+if pyautogui is not None:
+    pyautogui.PAUSE = 0.15
 
 class DummyOverlay:
     """
@@ -97,12 +100,27 @@ class DummyOverlay:
     
     def close(self): 
         pass
-    
-    def countdown_with_status(self, base_lines: list[str], total_seconds: int, final_seconds: int) -> str:
+
+    def screen_bbox_ratio(self):
+        return None
+
+    # 倒數每格秒數（測試可縮短）
+    tick_seconds = 1.0
+
+    def countdown_with_status(
+        self,
+        base_lines: list[str],
+        total_seconds: int,
+        final_seconds: int,
+        ready_check=None,
+        min_seconds: int = 0,
+    ) -> str:
         """Simulate countdown by sleeping"""
         import time
         for t in range(total_seconds, 0, -1):
-            time.sleep(1)
+            if ready_check is not None and ready_check() and total_seconds - t >= min_seconds:
+                return "ready"
+            time.sleep(self.tick_seconds)
         return "done"
 
 
@@ -124,7 +142,7 @@ def parse_args():
     parser.add_argument(
         "--done-log",
         default=DONE_LOG,
-        help=f"完成紀錄檔（預設：{DONE_LOG}）",
+        help=f"完成紀錄檔（預設：{DONE_LOG}；副檔名 .sqlite3 / .db 時使用 SQLite）",
     )
     parser.add_argument(
         "--no-warmup",
@@ -151,21 +169,78 @@ def parse_args():
         default=None,
         help="Word 檔案路徑（預設輸出資料夾內）",
     )
+    parser.add_argument(
+        "--adaptive-wait",
+        action="store_true",
+        help="頁面穩定就截圖（每頁等待範圍改為下限/上限），取代固定隨機倒數",
+    )
+    parser.add_argument(
+        "--no-learned-wait",
+        action="store_true",
+        help="不使用各網域歷史載入時間，一律採用每頁等待範圍",
+    )
+    parser.add_argument(
+        "--wait-profiles",
+        default=WAIT_PROFILES_FILE,
+        help="網域等待紀錄檔（預設 wait_profiles.json）",
+    )
+    parser.add_argument(
+        "--wait-report",
+        action="store_true",
+        help="列出各網域的載入時間百分位數與建議等待後結束",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=CAPTURE_ENGINES,
+        default=CAPTURE_ENGINE_DEFAULT,
+        help="截圖引擎：desktop = 真實桌面瀏覽器；browser = Playwright Chromium（整頁截圖、DOM 取文字）",
+    )
+    parser.add_argument(
+        "--cdp",
+        action="store_true",
+        help="browser 引擎改連線本機 Chrome 的 DevTools (CDP)，可沿用登入狀態",
+    )
+    parser.add_argument(
+        "--headed",
+        action="store_true",
+        help="browser 引擎顯示瀏覽器視窗",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=SHARD_WORKERS_DEFAULT,
+        help="多程序分片：以 N 個程序同時處理（需 browser 引擎），結束後合併結果、完成紀錄與 Word",
+    )
+    parser.add_argument(
+        "--concurrent",
+        type=int,
+        default=CONCURRENT_PAGES_DEFAULT,
+        help="browser 引擎同時處理的分頁數（>1 時改用並行流程，各網域仍受 HOST_POLICIES 限制）",
+    )
     return parser.parse_args()
 
 
-def handle_page_checks(cfg: RunConfig, overlay: OverlayUI) -> tuple[str | None, bool, bool]:
+def handle_page_checks(
+    cfg: RunConfig,
+    overlay: OverlayUI,
+    matcher: KeywordMatcher | None = None,
+    backend: CaptureBackend | None = None,
+) -> tuple[str | None, bool, bool]:
     """
     Check for login/captcha/not found pages based on priority order.
+    matcher: 由 build_config_matcher(cfg) 預先建立（每次執行只建一次）；未提供時臨時建立。
+    backend: 取頁面文字的來源，預設為桌面瀏覽器 (Ctrl+A)。
     Returns: (classification_result, should_stop, should_skip)
     """
     if not cfg.text_check_enabled:
         return None, False, False
+    if backend is None:
+        backend = DesktopBackend()
 
     # 進行文字檢查 (Ctrl+A)
     try:
         logger.debug("  Starting text extraction (Ctrl+A)...")
-        extracted_text = extract_text_content()
+        extracted_text = backend.extract_text()
         logger.debug(f"  Text extraction complete. Length: {len(extracted_text) if extracted_text else 0}")
     except Exception as e:
         logger.error(f"  Critical error during text extraction: {e}")
@@ -174,67 +249,40 @@ def handle_page_checks(cfg: RunConfig, overlay: OverlayUI) -> tuple[str | None,
     if not extracted_text:
         return "無法判斷", False, False
 
-    from utils_image import normalize_text
     t = normalize_text(extracted_text[:min(2000, len(extracted_text))])
 
     # 定義類別與其關鍵字/邏輯的映射
     # 注意：這裡的 Key 必須與前端傳來的 cfg.keywords 內容一致
     category_logic = {
         "登入": {
-            "keywords": cfg.login_keywords,
             "pause_msg": "偵測到登入頁面，請登入後按繼續",
             "footer": "偵測到登入頁面"
         },
         "拼圖與人機驗證": {
-            "keywords": cfg.captcha_keywords,
             "pause_msg": "偵測到驗證碼或拼圖，請處理後按繼續",
             "footer": "偵測到驗證碼/拼圖"
         },
         "查無資料": {
-            "keywords": cfg.not_found_keywords,
             "is_skip": True,
             "footer": "查無資料"
         },
         "BSMI": {
-            "keywords": cfg.bsmi_keywords,
             "footer": "偵測到 BSMI"
         }
     }
 
     # 取得優先順序 (優先讀取前端傳來的順序)
-    priority_order = getattr(cfg, "keywords", None)
-    if not priority_order:
-        priority_order = ["登入", "拼圖與人機驗證", "查無資料", "BSMI"]
-    
-    # 確保 priority_order 是列表（防止 None 或其它類型導致循環報錯）
-    if not isinstance(priority_order, list):
-        priority_order = ["登入", "拼圖與人機驗證", "查無資料", "BSMI"]
+    priority_order = priority_order_from_config(cfg)
 
-
-    detected_cls = None
-    
-    # 依照優先順序循環檢查
-    for cat_name in priority_order:
-        # 1. 檢查預設類別
-        if cat_name in category_logic:
-            logic = category_logic[cat_name]
-            kws = logic.get("keywords", [])
-            if any(normalize_text(k) in t for k in kws):
-                detected_cls = cat_name
-                break
-        
-        # 2. 檢查自訂類別
-        elif cfg.custom_categories and cat_name in cfg.custom_categories:
-            kws = cfg.custom_categories[cat_name]
-            if any(normalize_text(k) in t for k in kws):
-                detected_cls = cat_name
-                break
+    # 依照優先順序逐類檢查，命中即停止（關鍵字已預先正規化）
+    # (預設類別優先於同名自訂類別，見 category_keywords)
+    if matcher is None:
+        matcher = build_config_matcher(cfg)
+    detected_cls = matcher.first_match(t, priority_order)
 
     if not detected_cls:
         # Standard page behavior
-        click_window_corner("bottom_left")
-        time.sleep(0.05)
-        pyautogui.press("esc")
+        backend.dismiss()
         return "無法判斷", False, False
 
     logger.info(f"  優先權判定結果: {detected_cls}")
@@ -265,21 +313,24 @@ def handle_page_checks(cfg: RunConfig, overlay: OverlayUI) -> tuple[str | None,
         return detected_cls, False, True
     
     # 正常頁面微調
-    click_window_corner("bottom_left")
-    time.sleep(0.05)
-    pyautogui.press("esc")
+    backend.dismiss()
     
     return detected_cls, False, False
 
 
 
 
-def capture_image(cfg: RunConfig, outpath: Path) -> tuple[object | None, bool]:
+def capture_image(cfg: RunConfig, outpath: Path, backend: CaptureBackend | None = None) -> tuple[object | None, bool]:
     """
     Perform the actual capture (single or scroll).
     Returns (image, used_window_mode)
     """
+    if backend is None:
+        backend = DesktopBackend()
     try:
+        if cfg.scroll_capture and backend.supports_full_page:
+            # 瀏覽器引擎直接截整頁，不需 PageDown 合併（也不需裁掉瀏覽器工具列）
+            return backend.grab_full_page(), False
         if cfg.scroll_capture:
             return capture_scrolling_page(
                 scroll_pagedown_times=cfg.scroll_pagedown_times,
@@ -287,22 +338,15 @@ def capture_image(cfg: RunConfig, outpath: Path) -> tuple[object | None, bool]:
                 crop_bottom=cfg.crop_bottom_px,
                 scroll_stitch=cfg.scroll_stitch,
                 capture_window=cfg.capture_window,
+                stream_to=outpath if cfg.stream_stitch else None,
+                backend=backend,
             )
         else:
             # Single shot
-            used_window = False
-            img = None
-            if cfg.capture_window:
-                img = capture_active_window()
-                if img:
-                    used_window = True
-            
-            if img is None:
-                img = pyautogui.screenshot()
-                used_window = False
+            img, used_window = backend.grab_frame(cfg.capture_window)
             
-            # Crop logic
-            if cfg.crop_enabled:
+            # Crop logic（瀏覽器引擎的畫面只有頁面內容，沒有工具列可裁）
+            if cfg.crop_enabled and backend.has_browser_chrome:
                  img = crop_webpage_area(img, cfg.crop_top_px, cfg.crop_bottom_px)
             
             return img, used_window
@@ -311,62 +355,65 @@ def capture_image(cfg: RunConfig, outpath: Path) -> tuple[object | None, bool]:
         return None, False
 
 
-def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=None, use_overlay=True, suppress_popups=False, input_files=None) -> dict:
-    """ 主要執行流程。 """
-    
-    # Auto-correct output_dir if it points to a specific screenshot folder (prevents nesting)
-    if cfg.output_dir.name.startswith("screenshots_"):
-        logger.info(f"Detected sub-folder in output path ({cfg.output_dir.name}), moving up one level to prevent nesting.")
-        cfg.output_dir = cfg.output_dir.parent
-        
-    cfg.output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Aggregate URLs and track source files
-    urls = []
-    url_to_source_file = {}  # Map URL to its source file for Word generation
-    
-    if input_files:
-        for f in input_files:
-            file_urls = load_urls(Path(f))
-            urls.extend(file_urls)
-            # Track which file each URL came from
-            for url_tuple in file_urls:
-                url_to_source_file[url_tuple[0]] = Path(f)
-    else:
-        urls = load_urls(cfg.urls_file)
-        for url_tuple in urls:
-            url_to_source_file[url_tuple[0]] = cfg.urls_file
-        
-    if not urls:
-        raise RuntimeError(f"沒有網址可供處理,請檢查輸入內容。")
-
-    # Tracking results for API
-    run_results = {
-        "processed": 0,
-        "errors": [],
-        "results": [],
-        "back_to_ui": False,
-        "word_documents": []  # Track all generated Word documents
-    }
-    
-    # Setup Word documents - one per source file
-    word_docs = {}  # Map source file path to (Document, final_path)
-    if cfg.word_enabled:
-        if Document is None:
-            logger.info("Word export requires python-docx; skipping.")
-        else:
-            # Create a Word document for each unique source file
-            unique_files = set(url_to_source_file.values())
-            for source_file in unique_files:
-                word_path = new_word_path(cfg.output_dir, source_file, cfg.word_path)
-                word_path.parent.mkdir(parents=True, exist_ok=True)
-                doc = Document()
-                doc.save(word_path)
-                word_docs[source_file] = (doc, word_path)
-                run_results["word_documents"].append(str(word_path))
-                print(f"Word file: {word_path}")
-
-    done, done_outputs, done_classes = load_done_data(cfg.done_log)
+def record_adaptive_wait(run_results: dict, cfg: RunConfig, readiness: PageReadiness, waited: float, ready: bool) -> None:
+    """記錄自適應等待實際等了多久、比固定隨機倒數（範圍平均）省下多少。"""
+    baseline = sum(cfg.page_wait_range) / 2
+    saved = baseline - waited
+    stats = run_results.setdefault("adaptive_wait", {"pages": 0, "ready": 0, "waited_seconds": 0.0, "saved_seconds": 0.0})
+    stats["pages"] += 1
+    stats["ready"] += 1 if ready else 0
+    stats["waited_seconds"] = round(stats["waited_seconds"] + waited, 1)
+    stats["saved_seconds"] = round(stats["saved_seconds"] + saved, 1)
+    how = "頁面穩定" if ready else "未偵測到穩定"
+    logger.info(f"  Adaptive wait: {waited:.1f}s ({how}, {readiness.polls} polls), saved {saved:+.1f}s vs fixed avg {baseline:.0f}s")
+
+
+def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=None, use_overlay=True, suppress_popups=False, input_files=None, backend: CaptureBackend | None = None, entries=None, url_callback=None) -> dict:
+    """
+    主要執行流程。
+    backend: 開網址/截圖/捲動/取文字的來源，預設為桌面瀏覽器；測試與效能量測可傳入 SyntheticBackend。
+    entries: 分片執行時由主程序指定的 (序號, 網址, 附註, 來源檔)，見 CaptureSession。
+    url_callback: 每個網址的結果（狀態、分類、耗時），見 CaptureSession。
+    shard_workers > 1 時改走多程序分片 (sharded_run)；
+    瀏覽器引擎且 concurrent_pages > 1 時改走並行流程 (concurrent_capture)。
+    """
+    if backend is None and cfg.shard_workers > 1 and entries is None:
+        from sharded_run import run_sharded
+
+        return run_sharded(
+            cfg,
+            external_stop_callback=external_stop_callback,
+            progress_callback=progress_callback,
+            input_files=input_files,
+            url_callback=url_callback,
+        )
+
+    if backend is None and cfg.engine == "browser" and cfg.concurrent_pages > 1:
+        from concurrent_capture import run_capture_concurrent
+
+        return run_capture_concurrent(
+            cfg,
+            external_stop_callback=external_stop_callback,
+            progress_callback=progress_callback,
+            input_files=input_files,
+            entries=entries,
+            url_callback=url_callback,
+        )
+
+    session = CaptureSession(cfg, input_files, entries, url_callback=url_callback)
+    urls = session.urls
+    run_results = session.run_results
+    done = session.done
+    flush_done = session.flush
+
+    owns_backend = backend is None
+    if backend is None:
+        backend = create_backend(cfg)
+
+    # 關鍵字比對器每次執行只建立一次
+    matcher = build_config_matcher(cfg) if cfg.text_check_enabled else None
+    # 各網域歷史載入時間：決定每頁等待範圍，並記錄本次觀察到的就緒時間
+    profiles = WaitProfiles(cfg.wait_profiles_file) if cfg.learned_wait else None
     total = len(urls)
     
     logger.info(f"Config: {cfg}")
@@ -398,45 +445,31 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
     
     processed_this_run = 0
     skipped_this_run = 0
-    done_dirty = False
-
-    def flush_done(force: bool = False):
-        nonlocal done_dirty
-        if done_dirty or force:
-            save_done_data(
-                cfg.done_log,
-                done,
-                done_outputs,
-                done_classes,
-                cfg.record_output,
-                record_classification=cfg.text_check_enabled,
-            )
-            done_dirty = False
 
     try:
         if cfg.warmup_enabled:
             logger.info(f"Warmup: {WARM_UP_URL}")
             overlay.set_footer("暖機中...")
-            webbrowser.open(WARM_UP_URL, new=1)
+            backend.open_url(WARM_UP_URL)
             sleep_random(WARM_UP_WAIT_RANGE, "暖機等待")
             overlay.set_footer("")
 
         if progress_callback:
             progress_callback(0, total, "開始處理")
 
-        for idx, (url, note) in enumerate(urls, start=1):
+        for idx, (url, note) in zip(session.indices, urls):
             if progress_callback:
                 progress_callback(processed_this_run, total, f"處理中 ({processed_this_run}/{total})")
 
             if stop_requested["flag"]:
-                flush_done(force=True)
+                flush_done()
                 overlay.set_footer("已停止")
                 run_results["back_to_ui"] = True
                 return run_results
             
             # Check pause at start of loop
             if overlay.wait_if_paused() == "stop":
-                flush_done(force=True)
+                flush_done()
                 overlay.set_footer("已停止")
                 run_results["back_to_ui"] = True
                 return run_results
@@ -446,6 +479,7 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
                 continue
 
             url_short = short_url(url)
+            session.begin(url)
             
             # --- Single URL Processing Loop (Retry Logic) ---
             max_retries = 3  # Maximum retry attempts per URL
@@ -454,9 +488,26 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
             while retry_count < max_retries:
                 logger.info(f"[{idx}/{total}] Processing {url_short} (Attempt {retry_count + 1}/{max_retries})")
                 overlay.set_footer(f"[{idx}/{total}] {short_url(url, 50)}")
-                webbrowser.open(url, new=1)
-
-                total_wait = random.randint(cfg.page_wait_range[0], cfg.page_wait_range[1])
+                backend.open_url(url)
+
+                wait_range = cfg.page_wait_range
+                if profiles is not None and not backend.waits_for_load:
+                    wait_range = profiles.wait_range(url, cfg.page_wait_range, adaptive=cfg.adaptive_wait)
+                    if wait_range != cfg.page_wait_range:
+                        logger.info(f"  Learned wait for {host_of(url)}: {wait_range[0]}-{wait_range[1]}s")
+
+                readiness = None
+                if backend.waits_for_load:
+                    # open_url 已等到 load / networkidle，不需固定倒數
+                    total_wait = 0
+                    if profiles is not None and backend.last_load_seconds is not None:
+                        profiles.record(url, backend.last_load_seconds)
+                elif cfg.adaptive_wait:
+                    # 頁面穩定就截圖：最小值為下限、最大值為上限
+                    total_wait = wait_range[1]
+                    readiness = PageReadiness(backend, url, mask=overlay.screen_bbox_ratio)
+                else:
+                    total_wait = random.randint(wait_range[0], wait_range[1])
                 ts_human = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 base_lines = [
                     f"進度: {idx}/{total}",
@@ -465,43 +516,63 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
                 ]
 
                 # Countdown
+                wait_started = time.monotonic()
                 result = overlay.countdown_with_status(
                     base_lines=base_lines,
                     total_seconds=total_wait,
                     final_seconds=cfg.final_countdown,
+                    ready_check=readiness.poll if readiness else None,
+                    min_seconds=wait_range[0],
                 )
+                page_ready = result == "ready"
+                if page_ready:
+                    # 保留不規則節奏：穩定後再隨機多等一下（不超過上限）
+                    elapsed = int(time.monotonic() - wait_started)
+                    jitter = min(random.randint(*cfg.ready_jitter_range), max(0, total_wait - elapsed))
+                    result = overlay.countdown_with_status(
+                        base_lines=base_lines,
+                        total_seconds=jitter,
+                        final_seconds=jitter,
+                    )
+                if readiness is not None:
+                    waited = time.monotonic() - wait_started
+                    record_adaptive_wait(run_results, cfg, readiness, waited, page_ready)
+                    if profiles is not None and result != "stop":
+                        if page_ready and readiness.ready_at is not None:
+                            # 記錄到「就緒」為止的秒數，不含下限與隨機延長，學到的範圍才能低於固定下限
+                            profiles.record(url, readiness.ready_at - wait_started)
+                        else:
+                            profiles.record(url, waited, ready=False)
 
                 if result == "stop":
-                    flush_done(force=True)
+                    flush_done()
                     overlay.set_footer("已停止")
                     run_results["back_to_ui"] = True
                     return run_results
                 if result == "skip":
                     overlay.set_footer("手動截圖")
 
-                time.sleep(UI_HIDE_BUFFER_SECONDS)
+                if not backend.waits_for_load:
+                    time.sleep(UI_HIDE_BUFFER_SECONDS)
 
                 # --- Page Checks (OCR) ---
                 try:
                     logger.debug("Entering handle_page_checks...")
-                    cls, should_stop, should_skip_url = handle_page_checks(cfg, overlay)
+                    cls, should_stop, should_skip_url = handle_page_checks(cfg, overlay, matcher, backend)
                     logger.debug(f"Page check result: {cls}, Stop: {should_stop}, Skip: {should_skip_url}")
                 except Exception as e:
                     logger.error(f"Unexpected error in handle_page_checks: {e}")
                     cls, should_stop, should_skip_url = "無法判斷", False, False
 
                 if should_stop:
-                    flush_done(force=True)
+                    flush_done()
                     overlay.set_footer("已停止")
                     run_results["back_to_ui"] = True
                     return run_results
                 
                 if should_skip_url:
                     # e.g. Product Not Found
-                    done.add(url)
-                    if cfg.text_check_enabled and cls is not None:
-                        done_classes[url] = cls
-                    done_dirty = True
+                    session.record_skip(url, cls)
                     break  # Exit retry loop, move to next URL
 
                 # If login/captcha detected and user resolved it, retry
@@ -516,29 +587,9 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
                         break
 
                 # --- Capture ---
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                fname = f"{idx:03d}_{ts}_{safe_filename(url)}.png"
-                # Use source file to influence output directory (group by file)
-                if url in url_to_source_file:
-                    src_f = url_to_source_file[url]
-                    f_stem = src_f.stem
-                    sub_d = f"screenshots_{f_stem}"
-                    
-                    if cfg.output_dir.name == sub_d:
-                        target_d = cfg.output_dir
-                    else:
-                        target_d = cfg.output_dir / sub_d
-                        target_d.mkdir(parents=True, exist_ok=True)
-                    outpath = target_d / fname
-                    
-                    # Update output_subdir for API results so folder open works correctly
-                    # Note: We can't easily update run_results here, but 'folder' logic in core/main.py 
-                    # relies on 'output_subdir'. But Wait! output_subdir is derived from outpath.parent.name later.
-                    # Or run_results["results"].append uses outpath.parent.name. Perfect.
-                else:
-                    outpath = cfg.output_dir / fname
+                outpath = session.output_path(idx, url)
 
-                img, used_window = capture_image(cfg, outpath)
+                img, used_window = capture_image(cfg, outpath, backend)
                 
                 if img is None:
                     overlay.set_footer("截圖失敗")
@@ -551,54 +602,12 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
                         logger.error(f"  Max retries reached, skipping {url_short}")
                         break
 
-                try:
-                    img.save(outpath)
-                    logger.info(f"  Saved: {outpath}")
-                    overlay.set_footer("截圖完成")
-                    
-                    if cfg.text_check_enabled and cls is not None:
-                        done_classes[url] = cls
-                    
-                    done.add(url)
-                    if cfg.record_output:
-                        done_outputs[url] = str(outpath)
-                    
-                    # Append to the correct Word document for this URL's source file
-                    if word_docs and url in url_to_source_file:
-                        source_file = url_to_source_file[url]
-                        if source_file in word_docs:
-                            word_doc, word_path = word_docs[source_file]
-                            try:
-                                append_to_word(word_doc, word_path, url, outpath, note)
-                            except Exception as e:
-                                logger.error(f"Word export error: {e}")
-                    
-                    done_dirty = True
-                    
-                    # Record result
-                    run_results["results"].append({
-                        "url": url,
-                        "status": "success",
-                        "output": str(outpath),
-                        "output_subdir": outpath.parent.name,
-                        "classification": cls
-                    })
-                    run_results["processed"] += 1
-                    
-                    # Release image from memory
-                    del img
-                    
-                    break  # Success, exit retry loop
-
-                except Exception as exc:
-                    logger.error(f"Save failed: {exc}")
-                    overlay.set_footer(f"儲存失敗: {exc}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(1)
-                        continue
-                    else:
-                        break
+                # Hand off to the background writer; the next URL starts loading immediately.
+                # submit() blocks when the writer queue is full (back-pressure).
+                session.submit(url, note, img, outpath, cls)
+                del img
+                overlay.set_footer("截圖完成")
+                break  # Success, exit retry loop
 
             # End While (Single URL)
             
@@ -618,13 +627,13 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
             show_info_ui("完成", f"本次完成 {processed_this_run} 個，跳過 {skipped_this_run} 個。")
 
     except KeyboardInterrupt:
-        flush_done(force=True)
+        flush_done()
         logger.info("\n已中止（Ctrl+C）。已保存 done_log。")
         overlay.set_footer("已停止")
         run_results["back_to_ui"] = True
         return run_results
     except Exception:
-        flush_done(force=True)
+        flush_done()
         logger.exception("Unexpected error")
         overlay.set_footer("發生錯誤，請查看 Log")
         if cfg.output_dir: 
@@ -632,17 +641,22 @@ def run_capture(cfg: RunConfig, external_stop_callback=None, progress_callback=N
         run_results["back_to_ui"] = True
         return run_results
     finally:
-        flush_done(force=True)
+        if profiles is not None:
+            profiles.save()
+        session.close()
         overlay.close()
+        if owns_backend:
+            backend.close()
     
     return run_results
 
 
-def run_from_api(should_stop_callback, config_overrides=None, progress_callback=None, suppress_popups=False):
+def run_from_api(should_stop_callback, config_overrides=None, progress_callback=None, suppress_popups=False, url_callback=None):
     """
     Entry point for API/Server to run the capture process.
     should_stop_callback: a callable that returns True if we should abort.
     config_overrides: dict of configuration options from UI
+    url_callback: called with each URL's result (status, classification, seconds), see CaptureSession
     """
     if config_overrides is None:
         config_overrides = {}
@@ -674,6 +688,7 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
         done_log=Path(DONE_LOG).resolve(),
         warmup_enabled=WARM_UP_ENABLED,
         word_enabled=WORD_ENABLED_DEFAULT,
+        wait_profiles_file=Path(WAIT_PROFILES_FILE).resolve(),
     )
 
     # 3. Handle multiple files by injecting a "merged" urls list if we had a way,
@@ -688,6 +703,8 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
         cfg.word_enabled = config_overrides["auto_word_export"]
     if "skip_done" in config_overrides:
         cfg.skip_done = config_overrides["skip_done"]
+    if config_overrides.get("done_store") == "sqlite":
+        cfg.done_log = Path(DONE_DB).resolve()
     if "text_check_enabled" in config_overrides: # Mapping frontend name
         cfg.text_check_enabled = config_overrides["text_check_enabled"]
     if "check_text" in config_overrides: # Another mapping
@@ -696,14 +713,34 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
         cfg.scroll_capture = config_overrides["scroll_capture"]
     if "scroll_stitch" in config_overrides:
         cfg.scroll_stitch = config_overrides["scroll_stitch"]
+    if "stream_stitch" in config_overrides:
+        cfg.stream_stitch = config_overrides["stream_stitch"]
+    if config_overrides.get("engine"):
+        cfg.engine = config_overrides["engine"]
+    if "headless" in config_overrides:
+        cfg.headless = config_overrides["headless"]
+    if "cdp_mode" in config_overrides:
+        cfg.cdp_mode = config_overrides["cdp_mode"]
+    if "concurrent_pages" in config_overrides:
+        cfg.concurrent_pages = max(1, int(config_overrides["concurrent_pages"]))
+    if "shard_workers" in config_overrides:
+        cfg.shard_workers = max(1, int(config_overrides["shard_workers"]))
     if "crop_top" in config_overrides:
         cfg.crop_top_px = int(config_overrides["crop_top"])
         cfg.crop_enabled = True
     if "crop_bottom" in config_overrides:
         cfg.crop_bottom_px = int(config_overrides["crop_bottom"])
         cfg.crop_enabled = True
+    if "word_checkpoint_every" in config_overrides:
+        cfg.word_checkpoint_every = int(config_overrides["word_checkpoint_every"])
+    if "word_checkpoint_seconds" in config_overrides:
+        cfg.word_checkpoint_seconds = float(config_overrides["word_checkpoint_seconds"])
     if "wait_min" in config_overrides and "wait_max" in config_overrides:
         cfg.page_wait_range = (int(config_overrides["wait_min"]), int(config_overrides["wait_max"]))
+    if "adaptive_wait" in config_overrides:
+        cfg.adaptive_wait = config_overrides["adaptive_wait"]
+    if "learned_wait" in config_overrides:
+        cfg.learned_wait = config_overrides["learned_wait"]
 
     # Mapping keywords
     if "captcha_keywords" in config_overrides: cfg.captcha_keywords = config_overrides["captcha_keywords"]
@@ -712,6 +749,9 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
     if "login_keywords" in config_overrides: cfg.login_keywords = config_overrides["login_keywords"]
     if "category_pause" in config_overrides: cfg.category_pause = config_overrides["category_pause"]
 
+    # 覆寫值在建立 RunConfig 之後才設定，開始前檢查一次（引擎名稱、分片程序數上限等）
+    cfg.validate()
+
     # We modify run_capture to take an optional 'input_files' or aggregated urls
     try:
         results = run_capture(
@@ -720,7 +760,8 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
             progress_callback=progress_callback, 
             use_overlay=True, 
             suppress_popups=suppress_popups,
-            input_files=input_files
+            input_files=input_files,
+            url_callback=url_callback
         )
         # Note: run_capture now returns a dict of results (processed, errors, results_list)
         return results
@@ -733,6 +774,9 @@ def run_from_api(should_stop_callback, config_overrides=None, progress_callback=
 
 def main():
     args = parse_args()
+    if args.wait_report:
+        print(WaitProfiles(args.wait_profiles).format_report(PAGE_WAIT_RANGE, adaptive=args.adaptive_wait))
+        return
     # Default to UI if not explicitly no-ui
     if not args.ui and not args.no_ui:
         args.ui = True
@@ -746,6 +790,14 @@ def main():
             warmup_enabled=not args.no_warmup and WARM_UP_ENABLED,
             word_enabled=args.word,
             word_path=args.word_path,
+            adaptive_wait=args.adaptive_wait,
+            learned_wait=not args.no_learned_wait,
+            wait_profiles_file=Path(args.wait_profiles),
+            engine=args.engine,
+            cdp_mode=args.cdp,
+            headless=not args.headed,
+            concurrent_pages=args.concurrent,
+            shard_workers=args.shards,
         )
         
         # 2. If UI, collect settings to override Config
@@ -0,0 +1,88 @@
+import time
+from typing import Callable
+
+from PIL import ImageDraw
+
+from capture_backend import CaptureBackend
+from config import READY_SIMILARITY_THRESHOLD, READY_STABLE_POLLS
+from logger_setup import logger
+from utils_image import ImageFingerprint, image_similarity
+
+
+def title_still_loading(title: str | None, url: str) -> bool:
+    """
+    瀏覽器在 <title> 出現前會以網址（或空白）當標題。
+    title 為 None 表示後端取不到標題，此時不以標題判斷。
+    """
+    if title is None:
+        return False
+    title = title.strip().lower()
+    if not title:
+        return True
+    bare = url.split("://", 1)[-1].rstrip("/").lower()
+    return bare[:40] in title
+
+
+class PageReadiness:
+    """
+    頁面就緒偵測（自適應等待用，每次倒數呼叫一次 poll）：
+    - 畫面：取一張畫面算指紋，連續 stable_polls 次與前一張的相似度達門檻；
+    - 標題：視窗標題已從網址換成頁面標題（取不到標題時略過）。
+    mask: 回傳 (左, 上, 右, 下) 佔畫面比例的函式，該區域（倒數視窗）塗黑後再比對。
+    ready_at: 第一次判定就緒時的 time.monotonic()（之後倒數可能因下限或隨機延長繼續等，不影響此值）。
+    """
+
+    def __init__(
+        self,
+        backend: CaptureBackend,
+        url: str,
+        stable_polls: int = READY_STABLE_POLLS,
+        threshold: float = READY_SIMILARITY_THRESHOLD,
+        mask: Callable[[], tuple[float, float, float, float] | None] | None = None,
+    ):
+        self.backend = backend
+        self.url = url
+        self.stable_polls = max(1, int(stable_polls))
+        self.threshold = threshold
+        self.mask = mask
+        self.polls = 0
+        self.stable = 0
+        self.reason = ""
+        self.ready_at: float | None = None
+        self._prev: ImageFingerprint | None = None
+
+    def _fingerprint(self) -> ImageFingerprint:
+        frame, _ = self.backend.grab_frame()
+        box = self.mask() if self.mask else None
+        if box:
+            frame = frame.copy()
+            w, h = frame.size
+            ImageDraw.Draw(frame).rectangle(
+                (int(box[0] * w), int(box[1] * h), int(box[2] * w), int(box[3] * h)), fill=(0, 0, 0)
+            )
+        return ImageFingerprint(frame)
+
+    def poll(self) -> bool:
+        self.polls += 1
+        try:
+            fp = self._fingerprint()
+        except Exception as e:
+            logger.debug(f"Readiness frame failed: {e}")
+            self.stable = 0
+            return False
+
+        prev, self._prev = self._prev, fp
+        if prev is not None and image_similarity(prev, fp) >= self.threshold:
+            self.stable += 1
+        else:
+            self.stable = 0
+        if self.stable < self.stable_polls:
+            return False
+
+        if title_still_loading(self.backend.page_title(), self.url):
+            self.reason = "title"
+            return False
+        self.reason = f"stable x{self.stable}"
+        if self.ready_at is None:
+            self.ready_at = time.monotonic()
+        return True
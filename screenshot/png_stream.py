@@ -0,0 +1,113 @@
+import shutil
+import struct
+import zlib
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# IHDR 內容在檔案中的位置：簽章 8 + 長度 4 + 類型 4
+_IHDR_DATA_OFFSET = 16
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class PngStreamWriter:
+    """
+    逐段寫出 RGB PNG：每次寫入一張圖片的所有列，寫完即可釋放該圖片。
+
+    高度在結束時才知道，IHDR 先寫 0，close() 時再回頭補上。
+    每列使用 PNG 的 Up 濾波（與上一列相減），由 ImageChops 以 C 速度整段計算。
+    """
+
+    def __init__(self, path: str | Path, width: int, compress_level: int = 6):
+        self.path = Path(path)
+        self.width = int(width)
+        self.height = 0
+        self._fh = open(self.path, "wb")
+        self._zip = zlib.compressobj(compress_level)
+        # PNG 規定第一列的「上一列」為全 0
+        self._last_row = Image.new("RGB", (self.width, 1))
+        self._fh.write(_SIGNATURE)
+        self._fh.write(_chunk(b"IHDR", self._ihdr()))
+
+    def _ihdr(self) -> bytes:
+        # 8-bit RGB、deflate、標準濾波、不交錯
+        return struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+
+    def write_image(self, img: "Image.Image") -> None:
+        """將整張圖片的列接在目前內容下方（寬度不同時靠左貼上，其餘補黑）。"""
+        if img.height <= 0:
+            return
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.width != self.width:
+            canvas = Image.new("RGB", (self.width, img.height))
+            canvas.paste(img, (0, 0))
+            img = canvas
+        w, h = img.size
+
+        above = Image.new("RGB", (w, h))
+        above.paste(self._last_row, (0, 0))
+        if h > 1:
+            above.paste(img.crop((0, 0, w, h - 1)), (0, 1))
+        data = ImageChops.subtract_modulo(img, above).tobytes()
+        stride = w * 3
+        raw = b"".join(b"\x02" + data[i:i + stride] for i in range(0, len(data), stride))
+
+        compressed = self._zip.compress(raw)
+        if compressed:
+            self._fh.write(_chunk(b"IDAT", compressed))
+        self._last_row = img.crop((0, h - 1, w, h))
+        self.height += h
+
+    def write_blank(self, rows: int, color=(255, 255, 255)) -> None:
+        if rows > 0:
+            self.write_image(Image.new("RGB", (self.width, rows), color))
+
+    def close(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            self._fh.write(_chunk(b"IDAT", self._zip.flush()))
+            self._fh.write(_chunk(b"IEND", b""))
+            self._fh.seek(_IHDR_DATA_OFFSET)
+            ihdr = self._ihdr()
+            self._fh.write(ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr)))
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    def abort(self) -> None:
+        """放棄寫到一半的檔案。"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self.path.unlink(missing_ok=True)
+
+
+class StreamedImage:
+    """
+    已直接寫到硬碟的合併截圖，取代記憶體中的 Image 交給背景寫出。
+    save() 到同一路徑時不做任何事；其他路徑則複製檔案。
+    """
+
+    def __init__(self, path: str | Path, width: int, height: int):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    def save(self, fp, *args, **kwargs) -> None:
+        target = Path(fp)
+        if target.resolve() == self.path.resolve():
+            return
+        shutil.copyfile(self.path, target)
+
+    def open(self) -> "Image.Image":
+        return Image.open(self.path)
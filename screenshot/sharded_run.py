@@ -0,0 +1,279 @@
+import dataclasses
+import multiprocessing
+import queue
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+from config import RunConfig
+from logger_setup import logger
+from utils_system import IncrementalWordDoc, load_urls, new_word_path, open_done_log
+from wait_profiles import WaitProfiles
+
+# (序號, 網址, 附註, 來源檔)
+Entry = tuple[int, str, "str | None", str]
+
+
+def plan_shards(entries: list[Entry], workers: int) -> list[list[Entry]]:
+    """
+    分配工作給各程序：
+    - 來源檔數量 >= 程序數時，整個檔案分給同一個程序（依網址數由多到少，交給目前最少的程序）；
+    - 否則將所有網址依序切成 workers 段連續區間（同一網域的網址多半相鄰，區間內仍保持順序）。
+    """
+    workers = max(1, min(int(workers), len(entries)))
+    if workers <= 1:
+        return [list(entries)] if entries else []
+
+    by_file: dict[str, list[Entry]] = {}
+    for entry in entries:
+        by_file.setdefault(entry[3], []).append(entry)
+
+    if len(by_file) >= workers:
+        shards: list[list[Entry]] = [[] for _ in range(workers)]
+        for group in sorted(by_file.values(), key=len, reverse=True):
+            min(shards, key=len).extend(group)
+        for shard in shards:
+            shard.sort(key=lambda e: e[0])
+        return [s for s in shards if s]
+
+    size, extra = divmod(len(entries), workers)
+    shards, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(list(entries[start:end]))
+        start = end
+    return shards
+
+
+def _shard_main(shard_index: int, cfg: RunConfig, entries: list[Entry], stop_event, results_queue, backend=None) -> None:
+    """子程序進入點：跑一段網址，進度與結果經由 results_queue 回報主程序。"""
+    import main
+
+    def progress(processed, total, status_msg="", *args, **kwargs):
+        results_queue.put(("progress", shard_index, processed, total))
+
+    def url_result(event):
+        results_queue.put(("url", shard_index, event))
+
+    try:
+        results = main.run_capture(
+            cfg,
+            external_stop_callback=stop_event.is_set,
+            progress_callback=progress,
+            use_overlay=False,
+            suppress_popups=True,
+            backend=backend,
+            entries=entries,
+            url_callback=url_result,
+        )
+        results_queue.put(("done", shard_index, results))
+    except BaseException as e:
+        results_queue.put(("error", shard_index, f"{type(e).__name__}: {e}"))
+
+
+def _collect_entries(cfg: RunConfig, input_files) -> list[Entry]:
+    files = [Path(f) for f in input_files] if input_files else [cfg.urls_file]
+    entries: list[Entry] = []
+    for f in files:
+        for url, note in load_urls(f):
+            entries.append((len(entries) + 1, url, note, str(f)))
+    return entries
+
+
+def _merge_word_docs(cfg: RunConfig, results: list[dict], notes: dict[str, tuple[int, str | None, str]], run_results: dict) -> None:
+    """依原始順序把各分片的截圖寫入 Word（每個來源檔一份）。"""
+    if not cfg.word_enabled:
+        return
+    if Document is None:
+        logger.info("Word export requires python-docx; skipping.")
+        return
+    by_source: dict[str, list[tuple[int, str, str, str | None]]] = {}
+    for item in results:
+        idx, note, source = notes[item["url"]]
+        by_source.setdefault(source, []).append((idx, item["url"], item["output"], note))
+
+    total_bytes = 0
+    for source, items in by_source.items():
+        word_path = new_word_path(cfg.output_dir, Path(source), cfg.word_path)
+        word_path.parent.mkdir(parents=True, exist_ok=True)
+        word_doc = IncrementalWordDoc(
+            Document(),
+            word_path,
+            checkpoint_every=cfg.word_checkpoint_every,
+            checkpoint_seconds=cfg.word_checkpoint_seconds,
+        )
+        for _, url, output, note in sorted(items):
+            try:
+                word_doc.add(url, Path(output), note)
+            except Exception as e:
+                logger.error(f"Word export error: {e}")
+        word_doc.close()
+        total_bytes += word_doc.bytes_written
+        run_results["word_documents"].append(str(word_path))
+    run_results["word_bytes_written"] = total_bytes
+
+
+def run_sharded(
+    cfg: RunConfig,
+    external_stop_callback=None,
+    progress_callback=None,
+    input_files=None,
+    backend=None,
+    url_callback=None,
+) -> dict:
+    """
+    多程序分片執行：每個子程序以自己的瀏覽器跑一部分網址，結束後合併：
+    - run_results：結果依原始順序排列，errors 合併，shards 記錄各分片摘要；
+    - 完成紀錄：各分片先寫到暫存的 JSON 紀錄，最後統一寫入 cfg.done_log；
+    - Word：子程序不產生 Word，由主程序依原始順序一次寫出；
+    - 網域等待紀錄：各分片的新樣本併入 cfg.wait_profiles_file。
+    backend: 測試用，會複製到每個子程序（需可 pickle）；實際執行時各子程序自行建立瀏覽器。
+    使用 spawn 啟動子程序，打包後的執行檔需在入口呼叫 multiprocessing.freeze_support()。
+    """
+    if backend is None and cfg.engine != "browser":
+        raise RuntimeError("分片執行需要 browser 引擎（桌面瀏覽器同一時間只能操作一個視窗）")
+    if cfg.cdp_mode:
+        logger.warning("分片執行不支援 CDP 模式（各程序無法共用同一個 Chrome 分頁），改用各自啟動的瀏覽器")
+
+    cfg.output_dir.mkdir(parents=True, exist_ok=True)
+    entries = _collect_entries(cfg, input_files)
+    if not entries:
+        raise RuntimeError(f"沒有網址可供處理,請檢查輸入內容。")
+    notes = {url: (idx, note, source) for idx, url, note, source in entries}
+
+    done_log = open_done_log(cfg.done_log, record_output=cfg.record_output, record_classification=cfg.text_check_enabled)
+    run_results = {
+        "processed": 0,
+        "errors": [],
+        "results": [],
+        "back_to_ui": False,
+        "word_documents": [],
+        "word_bytes_written": 0,
+        "shards": [],
+    }
+    shard_dir = Path(tempfile.mkdtemp(prefix=".shards_", dir=cfg.output_dir))
+    try:
+        pending = [e for e in entries if not (cfg.skip_done and e[1] in done_log)]
+        skipped = len(entries) - len(pending)
+        shards = plan_shards(pending, cfg.shard_workers)
+        logger.info(
+            f"Sharded run: {len(entries)} URLs (Done: {skipped}), {len(shards)} workers, "
+            f"sizes {[len(s) for s in shards]}"
+        )
+        if progress_callback:
+            progress_callback(0, len(pending), "開始處理")
+
+        ctx = multiprocessing.get_context("spawn")
+        stop_event = ctx.Event()
+        results_queue = ctx.Queue()
+        procs = []
+        shard_cfgs = []
+        for i, shard_entries in enumerate(shards):
+            shard_cfg = dataclasses.replace(
+                cfg,
+                done_log=shard_dir / f"done_{i}.json",
+                wait_profiles_file=shard_dir / f"wait_profiles_{i}.json",
+                skip_done=False,
+                word_enabled=False,
+                warmup_enabled=False,
+                cdp_mode=False,
+                shard_workers=1,
+            )
+            shard_cfgs.append(shard_cfg)
+            proc = ctx.Process(
+                target=_shard_main,
+                args=(i, shard_cfg, shard_entries, stop_event, results_queue, backend),
+                name=f"capture-shard-{i}",
+                daemon=True,
+            )
+            proc.start()
+            procs.append(proc)
+
+        progress = [0] * len(shards)
+        shard_results: dict[int, dict] = {}
+        finished: set[int] = set()
+        t0 = time.monotonic()
+        while len(finished) < len(procs):
+            if external_stop_callback and external_stop_callback() and not stop_event.is_set():
+                logger.info("Stop requested, waiting for shards to finish current URL...")
+                stop_event.set()
+            try:
+                kind, i, *payload = results_queue.get(timeout=0.5)
+            except queue.Empty:
+                for i, proc in enumerate(procs):
+                    if i not in finished and not proc.is_alive() and results_queue.empty():
+                        finished.add(i)
+                        run_results["errors"].append({"url": "", "error": f"分片 {i} 異常結束 (exit code {proc.exitcode})"})
+                continue
+            if kind == "progress":
+                progress[i] = payload[0]
+                if progress_callback:
+                    done_count = sum(progress)
+                    progress_callback(done_count, len(pending), f"處理中 ({done_count}/{len(pending)}，{len(procs)} 個程序)")
+            elif kind == "url":
+                if url_callback:
+                    url_callback(payload[0])
+            elif kind == "done":
+                shard_results[i] = payload[0]
+                finished.add(i)
+            else:
+                logger.error(f"Shard {i} failed: {payload[0]}")
+                run_results["errors"].append({"url": "", "error": f"分片 {i} 失敗: {payload[0]}"})
+                finished.add(i)
+        for proc in procs:
+            proc.join(timeout=10)
+        elapsed = time.monotonic() - t0
+
+        # --- 合併 ---
+        for i, res in sorted(shard_results.items()):
+            run_results["processed"] += res.get("processed", 0)
+            run_results["errors"].extend(res.get("errors", []))
+            run_results["results"].extend(res.get("results", []))
+            run_results["back_to_ui"] = run_results["back_to_ui"] or res.get("back_to_ui", False)
+            run_results["shards"].append({
+                "shard": i,
+                "urls": len(shards[i]),
+                "processed": res.get("processed", 0),
+                "errors": len(res.get("errors", [])),
+            })
+        run_results["results"].sort(key=lambda r: notes[r["url"]][0])
+        run_results["back_to_ui"] = run_results["back_to_ui"] or stop_event.is_set()
+
+        for shard_cfg in shard_cfgs:
+            shard_log = open_done_log(shard_cfg.done_log, record_output=True, record_classification=True)
+            try:
+                for url in sorted(shard_log.done, key=lambda u: notes[u][0]):
+                    done_log.record(
+                        url,
+                        output=shard_log.outputs.get(url),
+                        cls=shard_log.classes.get(url),
+                        source=notes[url][2],
+                    )
+            finally:
+                shard_log.close()
+
+        if cfg.learned_wait:
+            profiles = WaitProfiles(cfg.wait_profiles_file)
+            for shard_cfg in shard_cfgs:
+                profiles.merge(WaitProfiles(shard_cfg.wait_profiles_file))
+            profiles.save()
+
+        _merge_word_docs(cfg, run_results["results"], notes, run_results)
+
+        rate = run_results["processed"] / elapsed * 60 if elapsed > 0 else 0.0
+        logger.info(
+            f"Sharded run finished: {run_results['processed']} captured, {len(run_results['errors'])} errors, "
+            f"{elapsed:.1f}s ({rate:.1f} URLs/min)"
+        )
+        if progress_callback:
+            progress_callback(sum(progress), len(pending), "完成")
+        return run_results
+    finally:
+        done_log.close()
+        shutil.rmtree(shard_dir, ignore_errors=True)
@@ -0,0 +1,77 @@
+import functools
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>商品</title></head>
+<body style="margin:0">
+  <h1>測試商品 BSMI R12345</h1>
+  <div style="height:3000px;background:linear-gradient(#fff,#369)"></div>
+  <script>
+    // load 之後才以 fetch 取得的內容：要等到網路閒置才會出現
+    setTimeout(() => fetch('late.txt').then(r => r.text()).then(t => {
+      document.body.insertAdjacentHTML('beforeend', '<p id="late">' + t + '</p>')
+    }), 300)
+  </script>
+</body></html>
+"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        # 不把每筆請求印到 stderr
+        pass
+
+
+class TestBrowserBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from browser_backend import BrowserBackend
+            backend = BrowserBackend(headless=True, viewport=(800, 600))
+            backend.start()
+        except Exception as e:
+            raise unittest.SkipTest(f"Playwright Chromium 無法啟動: {e}")
+        cls.backend = backend
+
+        cls._tmp = tempfile.TemporaryDirectory()
+        (Path(cls._tmp.name) / "index.html").write_text(PAGE, encoding="utf-8")
+        (Path(cls._tmp.name) / "late.txt").write_text("延遲載入", encoding="utf-8")
+        handler = functools.partial(QuietHandler, directory=cls._tmp.name)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/index.html"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.backend.close()
+        cls.server.shutdown()
+        cls._tmp.cleanup()
+
+    def test_text_comes_from_dom_after_load(self):
+        """測試 open_url 等到 load 與網路閒置才返回，取到的 DOM 文字含載入後才 fetch 的內容"""
+        self.backend.open_url(self.url)
+        text = self.backend.extract_text()
+        self.assertIn("BSMI R12345", text)
+        self.assertIn("延遲載入", text)
+
+    def test_full_page_screenshot(self):
+        """測試整頁截圖不需捲動合併"""
+        self.backend.open_url(self.url)
+        frame, used_window = self.backend.grab_frame()
+        full = self.backend.grab_full_page()
+        self.assertFalse(used_window)
+        self.assertEqual(frame.size, (800, 600))
+        self.assertEqual(full.width, 800)
+        self.assertGreater(full.height, 3000)
+
+
+if __name__ == "__main__":
+    unittest.main()
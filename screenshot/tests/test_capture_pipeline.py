@@ -0,0 +1,71 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from capture_pipeline import CaptureJob, CaptureWriter
+
+
+def make_job(i: int) -> CaptureJob:
+    return CaptureJob(url=f"https://example.com/{i}", note=None, image=object(), outpath=Path(f"{i}.png"))
+
+
+class TestCaptureWriter(unittest.TestCase):
+    def test_results_keep_submit_order(self):
+        """測試背景寫出結果維持送入順序"""
+        done = []
+
+        def handler(job):
+            time.sleep(0.001)
+            done.append(job.url)
+
+        writer = CaptureWriter(handler, max_pending=3)
+        for i in range(20):
+            writer.submit(make_job(i))
+        writer.close()
+        self.assertEqual(done, [f"https://example.com/{i}" for i in range(20)])
+
+    def test_back_pressure_limits_pending(self):
+        """測試佇列滿時 submit 會阻塞"""
+        release = threading.Event()
+        writer = CaptureWriter(lambda job: release.wait(), max_pending=2)
+        # 1 張處理中 + 2 張在佇列
+        for i in range(3):
+            writer.submit(make_job(i))
+
+        blocked = threading.Thread(target=writer.submit, args=(make_job(3),), daemon=True)
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+
+        release.set()
+        blocked.join(2)
+        self.assertFalse(blocked.is_alive())
+        writer.close()
+        self.assertEqual(writer.pending, 0)
+
+    def test_handler_error_does_not_stop_worker(self):
+        """測試單筆寫出失敗不影響後續工作"""
+        done = []
+
+        def handler(job):
+            if job.url.endswith("/1"):
+                raise OSError("disk full")
+            done.append(job.url)
+
+        writer = CaptureWriter(handler, max_pending=1)
+        for i in range(3):
+            writer.submit(make_job(i))
+        writer.drain()
+        self.assertEqual(done, ["https://example.com/0", "https://example.com/2"])
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.submit(make_job(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image
+
+from capture_session import CaptureSession
+from config import RunConfig
+
+URLS = [f"https://shop.example/{i}" for i in range(6)]
+
+
+class SlowImage:
+    """存檔前先等 release（模擬背景寫出落後），fail=True 時存檔失敗。"""
+
+    def __init__(self, release: threading.Event, fail: bool = False):
+        self.release = release
+        self.fail = fail
+
+    def save(self, path):
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("disk full")
+        Image.new("RGB", (10, 10)).save(path)
+
+
+class TestCaptureSession(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        urls_file = self.tmp / "urls.txt"
+        urls_file.write_text("\n".join(URLS) + "\n", encoding="utf-8")
+        cfg = RunConfig(
+            urls_file=urls_file,
+            output_dir=self.tmp / "out",
+            done_log=self.tmp / "done_urls.json",
+            warmup_enabled=False,
+            # 佇列夠大，送出時不會因 back-pressure 等待
+            writer_queue_size=len(URLS),
+        )
+        self.events = []
+        self.session = CaptureSession(cfg, url_callback=self.events.append)
+
+    def tearDown(self):
+        self.session.close()
+        self._tmp.cleanup()
+
+    def test_results_follow_submit_order(self):
+        """測試結果依送出順序排列（略過、錯誤在寫出完成前發生也不影響），寫出失敗的改列入 errors"""
+        release = threading.Event()
+        for i, url in enumerate(URLS):
+            if i == 2:
+                self.session.record_skip(url, "查無資料")
+            elif i == 4:
+                self.session.record_error(url, "需要人工處理: 登入")
+            else:
+                image = SlowImage(release, fail=(i == 3))
+                self.session.submit(url, None, image, self.session.output_path(i + 1, url), None)
+        # 背景寫出還沒完成，結果已依送出順序就位
+        self.assertEqual([r["url"] for r in self.session.run_results["results"]], [URLS[0], URLS[1], URLS[3], URLS[5]])
+
+        release.set()
+        self.session.flush()
+        results = self.session.run_results
+        self.assertEqual([r["url"] for r in results["results"]], [URLS[0], URLS[1], URLS[5]])
+        self.assertEqual(results["processed"], 3)
+        self.assertEqual([e["url"] for e in results["errors"]], [URLS[4], URLS[3]])
+        for r in results["results"]:
+            self.assertTrue(Path(r["output"]).exists())
+        self.assertEqual(
+            {e["url"]: e["status"] for e in self.events},
+            {URLS[0]: "success", URLS[1]: "success", URLS[2]: "skipped", URLS[3]: "error", URLS[4]: "error", URLS[5]: "success"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
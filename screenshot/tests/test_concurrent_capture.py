@@ -0,0 +1,157 @@
+import asyncio
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image
+
+import concurrent_capture
+from config import RunConfig
+
+
+class FakePage:
+    """只實作 capture_one 會用到的 Playwright Page 方法。"""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.url = ""
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        await asyncio.sleep(self.owner.delays.get(url, 0))
+        error = self.owner.goto_errors.get(url)
+        if error is not None:
+            raise error
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def inner_text(self, selector):
+        return self.owner.texts.get(self.url, "")
+
+    async def screenshot(self, path=None, full_page=False):
+        buf = io.BytesIO()
+        Image.new("RGB", (120, 80), (200, 200, 200)).save(buf, format="PNG")
+        data = buf.getvalue()
+        if path:
+            Path(path).write_bytes(data)
+        return data
+
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self, goto_errors, delays, texts):
+        self.goto_errors = goto_errors
+        self.delays = delays
+        self.texts = texts
+        self.chromium = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def launch(self, **kwargs):
+        return self
+
+    async def new_context(self, **kwargs):
+        return self
+
+    async def add_init_script(self, script):
+        pass
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        pass
+
+
+class TestRunCaptureConcurrent(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.urls_file = self.tmp / "urls.txt"
+        self.urls_file.write_text("https://a.example/1\nhttps://b.example/dns\n", encoding="utf-8")
+        self._async_playwright = concurrent_capture.async_playwright
+        self.goto_errors = {}
+        self.delays = {}
+        self.texts = {}
+        concurrent_capture.async_playwright = lambda: FakePlaywright(self.goto_errors, self.delays, self.texts)
+
+    def tearDown(self):
+        concurrent_capture.async_playwright = self._async_playwright
+        self._tmp.cleanup()
+
+    def run_capture(self, **kwargs):
+        cfg = RunConfig(
+            urls_file=self.urls_file,
+            output_dir=self.tmp / "out",
+            done_log=self.tmp / "done_urls.json",
+            wait_profiles_file=self.tmp / "wait_profiles.json",
+            warmup_enabled=False,
+            engine="browser",
+            **kwargs,
+        )
+        events = []
+        results = concurrent_capture.run_capture_concurrent(cfg, url_callback=events.append)
+        return results, events
+
+    def test_navigation_error_is_reported(self):
+        """測試開頁失敗（例如 DNS 錯誤）列入 errors 並送出 error 事件"""
+        self.goto_errors["https://b.example/dns"] = concurrent_capture.PlaywrightError("net::ERR_NAME_NOT_RESOLVED")
+        results, events = self.run_capture()
+
+        self.assertEqual([r["url"] for r in results["results"]], ["https://a.example/1"])
+        self.assertEqual(len(results["errors"]), 1)
+        self.assertEqual(results["errors"][0]["url"], "https://b.example/dns")
+        self.assertIn("ERR_NAME_NOT_RESOLVED", results["errors"][0]["error"])
+        by_url = {e["url"]: e["status"] for e in events}
+        self.assertEqual(by_url, {"https://a.example/1": "success", "https://b.example/dns": "error"})
+        self.assertEqual(results["throughput"]["failed"], 1)
+
+    def test_skip_and_pause_are_not_counted_as_completed(self):
+        """測試查無資料（略過）與需要人工處理（錯誤）不計入完成數，失敗數與 errors 一致"""
+        self.urls_file.write_text("https://a.example/1\nhttps://a.example/gone\nhttps://b.example/login\n", encoding="utf-8")
+        self.texts["https://a.example/gone"] = "很抱歉，查無資料"
+        self.texts["https://b.example/login"] = "請先登入"
+        results, _ = self.run_capture(text_check_enabled=True)
+
+        self.assertEqual([r["url"] for r in results["results"]], ["https://a.example/1"])
+        self.assertEqual([e["url"] for e in results["errors"]], ["https://b.example/login"])
+        stats = results["throughput"]
+        self.assertEqual((stats["completed"], stats["failed"], stats["skipped"]), (1, 1, 1))
+
+    def test_results_follow_input_order(self):
+        """測試結果依輸入順序排列，而不是完成順序"""
+        self.urls_file.write_text("https://a.example/slow\nhttps://b.example/fast\n", encoding="utf-8")
+        self.delays["https://a.example/slow"] = 0.2
+        results, events = self.run_capture(concurrent_pages=2)
+        self.assertEqual([e["url"] for e in events], ["https://b.example/fast", "https://a.example/slow"])
+        self.assertEqual([r["url"] for r in results["results"]], ["https://a.example/slow", "https://b.example/fast"])
+
+    def test_crop_setting_is_not_applied(self):
+        """測試裁切設定（裁掉桌面瀏覽器工具列用）不套用在 Playwright 截圖，頁面內容不會被裁掉"""
+        results, _ = self.run_capture(crop_enabled=True, crop_top_px=10, crop_bottom_px=5)
+        self.assertEqual(len(results["results"]), 2)
+        for r in results["results"]:
+            with Image.open(r["output"]) as img:
+                self.assertEqual(img.size, (120, 80))
+
+    def test_full_page_is_not_cropped(self):
+        results, _ = self.run_capture(crop_enabled=True, crop_top_px=10, crop_bottom_px=5, scroll_capture=True)
+        for r in results["results"]:
+            with Image.open(r["output"]) as img:
+                self.assertEqual(img.size, (120, 80))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils_system import DoneJournal, clear_done_log, done_journal_path, load_done_data
+
+
+class TestDoneJournal(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "done_urls.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_legacy_formats_still_load(self):
+        """測試舊版 list / dict 格式仍可讀取"""
+        self.path.write_text(json.dumps(["https://a", {"url": "https://b", "output": "b.png", "class": "BSMI"}]), encoding="utf-8")
+        done, outputs, classes = load_done_data(self.path)
+        self.assertEqual(done, {"https://a", "https://b"})
+        self.assertEqual(outputs, {"https://b": "b.png"})
+        self.assertEqual(classes, {"https://b": "BSMI"})
+
+        self.path.write_text(json.dumps({"done": ["https://a"], "outputs": {"https://c": "c.png"}}), encoding="utf-8")
+        done, outputs, _ = load_done_data(self.path)
+        self.assertEqual(done, {"https://a", "https://c"})
+        self.assertEqual(outputs, {"https://c": "c.png"})
+
+    def test_record_appends_and_replays(self):
+        """測試新增紀錄只追加日誌，重新載入時會重播"""
+        self.path.write_text(json.dumps(["https://a"]), encoding="utf-8")
+        snapshot = self.path.read_text(encoding="utf-8")
+
+        log = DoneJournal(self.path, record_output=True, record_classification=True, compact_every=0)
+        log.record("https://b", output="b.png", cls="登入")
+        log.record("https://c")
+        log.close()
+
+        self.assertEqual(self.path.read_text(encoding="utf-8"), snapshot)
+        lines = done_journal_path(self.path).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+
+        done, outputs, classes = load_done_data(self.path)
+        self.assertEqual(done, {"https://a", "https://b", "https://c"})
+        self.assertEqual(outputs, {"https://b": "b.png"})
+        self.assertEqual(classes, {"https://b": "登入"})
+
+    def test_compaction_writes_snapshot_and_clears_journal(self):
+        """測試日誌達上限時合併為快照"""
+        log = DoneJournal(self.path, record_output=True, compact_every=3)
+        for i in range(3):
+            log.record(f"https://example.com/{i}", output=f"{i}.png")
+        log.flush()
+        self.assertFalse(done_journal_path(self.path).exists())
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual([item["url"] for item in data], [f"https://example.com/{i}" for i in range(3)])
+
+        log.record("https://example.com/3")
+        log.close()
+        self.assertEqual(len(load_done_data(self.path)[0]), 4)
+
+    def test_truncated_last_line_is_ignored(self):
+        """測試當機造成的半行日誌會被略過"""
+        journal = done_journal_path(self.path)
+        journal.write_text('{"url": "https://a"}\n{"url": "https://b', encoding="utf-8")
+        done, _, _ = load_done_data(self.path)
+        self.assertEqual(done, {"https://a"})
+
+    def test_clear_removes_journal(self):
+        """測試清除紀錄時一併清除日誌"""
+        log = DoneJournal(self.path, compact_every=0)
+        log.record("https://a")
+        log.close()
+        self.assertTrue(clear_done_log(self.path))
+        self.assertEqual(load_done_data(self.path)[0], set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from done_store import SqliteDoneStore
+from utils_system import clear_done_log, load_done_data, open_done_log, save_done_data
+
+
+class TestSqliteDoneStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.db = self.tmp / "done_urls.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_membership_without_loading(self):
+        """測試批次寫入前後都能查詢是否已完成"""
+        store = SqliteDoneStore(self.db, record_output=True, record_classification=True, batch_size=2)
+        store.record("https://a", output="a.png", cls="BSMI", source="urls.txt")
+        self.assertIn("https://a", store.done)
+        self.assertEqual(store.outputs.get("https://a"), "a.png")
+        store.record("https://b")
+        self.assertNotIn("https://c", store.done)
+        store.close()
+
+        store = open_done_log(self.db)
+        self.assertIsInstance(store, SqliteDoneStore)
+        self.assertIn("https://b", store.done)
+        self.assertEqual(len(store.done), 2)
+        self.assertEqual(store.classes.get("https://a"), "BSMI")
+        store.close()
+
+    def test_imports_legacy_json_on_first_open(self):
+        """測試第一次建立資料庫時匯入同名 JSON 紀錄"""
+        (self.tmp / "done_urls.json").write_text(
+            json.dumps([{"url": "https://a", "output": "a.png"}, "https://b"]), encoding="utf-8"
+        )
+        done, outputs, _ = load_done_data(self.db)
+        self.assertIn("https://a", done)
+        self.assertIn("https://b", done)
+        self.assertEqual(outputs.get("https://a"), "a.png")
+
+    def test_load_done_data_closes_connection(self):
+        """測試 load_done_data 回傳複本並關閉連線（WAL 檔隨最後一個連線關閉而移除）"""
+        save_done_data(self.db, {"https://a", "https://b"}, {"https://a": "a.png"}, {"https://b": "登入"}, True, True)
+        done, outputs, classes = load_done_data(self.db)
+        self.assertEqual((done, outputs, classes), ({"https://a", "https://b"}, {"https://a": "a.png"}, {"https://b": "登入"}))
+        self.assertFalse(Path(str(self.db) + "-wal").exists())
+        self.assertTrue(clear_done_log(self.db))
+
+    def test_save_and_query(self):
+        """測試 save_done_data 寫入後可依分類、網址查詢"""
+        save_done_data(self.db, {"https://a", "https://b"}, {"https://a": "a.png"}, {"https://b": "登入"}, True, True)
+        store = SqliteDoneStore(self.db)
+        try:
+            records = store.query(classification="登入")
+            self.assertEqual([r["url"] for r in records], ["https://b"])
+            self.assertEqual(len(store.query(search="example")), 0)
+        finally:
+            store.close()
+
+        self.assertTrue(clear_done_log(self.db))
+        self.assertEqual(load_done_data(self.db)[0], set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from host_scheduler import FAILED, SKIPPED, HostPolicy, HostScheduler, host_of
+
+
+class Recorder:
+    """記錄每個網址的開始/結束時間與同時執行數。"""
+
+    def __init__(self, duration: float = 0.05):
+        self.duration = duration
+        self.starts: dict[str, list[float]] = {}
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, url: str, *args) -> None:
+        self.starts.setdefault(host_of(url), []).append(time.monotonic())
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.active -= 1
+
+
+def urls(host: str, n: int) -> list[tuple[str]]:
+    return [(f"https://{host}/item/{i}",) for i in range(n)]
+
+
+class TestHostScheduler(unittest.TestCase):
+    def test_per_host_concurrency_cap(self):
+        """測試單一網域同時執行數不超過 max_concurrency"""
+        scheduler = HostScheduler(HostPolicy(max_concurrency=2, min_interval=0), max_workers=8)
+        rec = Recorder()
+        asyncio.run(scheduler.run(urls("a.test", 6), rec))
+        self.assertEqual(scheduler.completed, 6)
+        self.assertEqual(scheduler.stats()["hosts"]["a.test"]["peak_concurrency"], 2)
+
+    def test_global_cap(self):
+        """測試不同網域合計不超過 max_workers"""
+        scheduler = HostScheduler(HostPolicy(max_concurrency=4, min_interval=0), max_workers=3)
+        rec = Recorder()
+        items = urls("a.test", 4) + urls("b.test", 4) + urls("c.test", 4)
+        asyncio.run(scheduler.run(items, rec))
+        self.assertEqual(scheduler.completed, 12)
+        self.assertLessEqual(rec.peak, 3)
+        self.assertEqual(rec.peak, 3)
+
+    def test_min_interval_between_starts(self):
+        """測試同網域兩次開頁至少間隔 min_interval"""
+        scheduler = HostScheduler(HostPolicy(max_concurrency=3, min_interval=0.08), max_workers=4)
+        rec = Recorder(duration=0.01)
+        asyncio.run(scheduler.run(urls("a.test", 4), rec))
+        starts = rec.starts["a.test"]
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertTrue(all(g >= 0.07 for g in gaps), gaps)
+
+    def test_policy_suffix_match(self):
+        """測試個別網域政策（含子網域後綴）"""
+        scheduler = HostScheduler(HostPolicy(), {"shop.test": HostPolicy(max_concurrency=1)})
+        self.assertEqual(scheduler.policy_for("shop.test").max_concurrency, 1)
+        self.assertEqual(scheduler.policy_for("mall.shop.test").max_concurrency, 1)
+        self.assertEqual(scheduler.policy_for("notshop.test").max_concurrency, 2)
+
+    def test_batch_rest_only_blocks_own_host(self):
+        """測試批次休息只延後該網域，其他網域照常進行"""
+        policies = {"slow.test": HostPolicy(max_concurrency=1, min_interval=0, batch_size=1, batch_rest_range=(0.3, 0.3))}
+        scheduler = HostScheduler(HostPolicy(max_concurrency=1, min_interval=0), policies, max_workers=2)
+        rec = Recorder(duration=0.01)
+        t0 = time.monotonic()
+        asyncio.run(scheduler.run(urls("slow.test", 2) + urls("fast.test", 5), rec))
+        fast_done = rec.starts["fast.test"][-1] - t0
+        slow_second = rec.starts["slow.test"][1] - t0
+        self.assertLess(fast_done, 0.25)
+        self.assertGreaterEqual(slow_second, 0.29)
+        stats = scheduler.stats()["hosts"]
+        self.assertAlmostEqual(stats["slow.test"]["rest_seconds"], 0.6, places=1)
+        self.assertEqual(stats["fast.test"]["rest_seconds"], 0)
+
+    def test_worker_error_does_not_stop_others(self):
+        """測試單一網址失敗只記錄，不中斷其他網址"""
+        scheduler = HostScheduler(HostPolicy(min_interval=0), max_workers=2)
+
+        async def worker(url):
+            if url.endswith("/1"):
+                raise RuntimeError("boom")
+
+        asyncio.run(scheduler.run(urls("a.test", 4), worker))
+        self.assertEqual(scheduler.completed, 3)
+        self.assertEqual(scheduler.failed, 1)
+
+    def test_skipped_and_failed_outcomes(self):
+        """測試 worker 回傳 SKIPPED / FAILED 時不計入完成數與吞吐量"""
+        scheduler = HostScheduler(HostPolicy(min_interval=0), max_workers=2)
+
+        async def worker(url):
+            return {"0": SKIPPED, "1": FAILED}.get(url.rsplit("/", 1)[1])
+
+        asyncio.run(scheduler.run(urls("a.test", 4), worker))
+        stats = scheduler.stats()
+        self.assertEqual((stats["completed"], stats["failed"], stats["skipped"]), (2, 1, 1))
+        self.assertEqual(stats["hosts"]["a.test"]["finished"], 4)
+        self.assertAlmostEqual(scheduler.urls_per_minute, 2 / scheduler.elapsed * 60)
+
+    def test_stop_callback(self):
+        """測試停止後不再開始新網址"""
+        rec = Recorder(duration=0.01)
+        scheduler = HostScheduler(
+            HostPolicy(max_concurrency=1, min_interval=0),
+            max_workers=1,
+            should_stop=lambda: sum(map(len, rec.starts.values())) >= 2,
+        )
+        asyncio.run(scheduler.run(urls("a.test", 10), rec))
+        self.assertTrue(scheduler.stopped)
+        self.assertEqual(scheduler.completed, 2)
+
+    def test_stats_throughput(self):
+        """測試 stats 的吞吐量欄位"""
+        scheduler = HostScheduler(HostPolicy(min_interval=0), max_workers=4)
+        asyncio.run(scheduler.run(urls("a.test", 4) + urls("b.test", 4), Recorder(duration=0.02)))
+        stats = scheduler.stats()
+        self.assertEqual(stats["completed"], 8)
+        self.assertGreater(stats["urls_per_minute"], 0)
+        self.assertEqual(set(stats["hosts"]), {"a.test", "b.test"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from config import SCROLL_SIMILARITY_THRESHOLD
+from utils_image import ImageFingerprint, find_scroll_overlap, image_similarity, stitch_scroll_frames
+
+
+def striped(width=400, height=300, offset=0):
+    img = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for y in range(-offset, height, 24):
+        draw.rectangle((0, y, width, y + 11), fill=(20, 40, 200))
+    return img
+
+
+def text_page(width=1280, height=4000, seed=3):
+    """稀疏的文字頁：大多是空白，偶爾幾行文字（捲動幾像素時差異最小的情況）。"""
+    rnd = random.Random(seed)
+    img = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    y = 10
+    while y < height:
+        if rnd.random() < 0.7:
+            y += 60
+            continue
+        x = 40
+        while x < width - 80:
+            word = "".join(rnd.choice("abcdefghij") for _ in range(rnd.randint(3, 10)))
+            draw.text((x, y), word, fill=(30, 30, 30))
+            x += len(word) * 7 + 7
+        y += 22
+    return img
+
+
+def rgb_similarity(a, b):
+    """改用指紋前的比對方式：RGB、縮到寬 800 後的平均差異（門檻 0.99）。"""
+    size = (800, int(a.height * 800 / a.width))
+    diff = ImageStat.Stat(ImageChops.difference(a.resize(size), b.resize(size)))
+    return 1.0 - sum(diff.mean) / 3 / 255.0
+
+
+class TestImageFingerprint(unittest.TestCase):
+    def test_identical_frames_exit_early(self):
+        """測試完全相同的截圖相似度為 1.0"""
+        a = ImageFingerprint(striped())
+        b = ImageFingerprint(striped())
+        self.assertEqual(a.row_hashes, b.row_hashes)
+        self.assertEqual(a.similarity(b), 1.0)
+
+    def test_scrolled_frame_is_different(self):
+        """測試捲動後的截圖低於預設門檻"""
+        sim = image_similarity(striped(), striped(offset=12))
+        self.assertLess(sim, 0.99)
+
+    def test_threshold_on_near_identical_frames(self):
+        """
+        測試門檻：原本的 RGB（寬 800）比對判定為不同的捲動截圖，指紋也低於門檻（不會提早停止捲動）；
+        游標、時鐘、角標等小範圍變動（到底後畫面幾乎相同）仍達門檻（停止）
+        """
+        for seed in range(4):
+            page = text_page(seed=seed)
+            for top in (500, 2000):
+                base = page.crop((0, top, 1280, top + 720))
+                fp = ImageFingerprint(base)
+                for dy in (1, 2, 3, 5, 12, 40):
+                    scrolled = page.crop((0, top + dy, 1280, top + 720 + dy))
+                    if rgb_similarity(base, scrolled) < 0.99:
+                        with self.subTest(seed=seed, top=top, scroll=dy):
+                            self.assertLess(fp.similarity(ImageFingerprint(scrolled)), SCROLL_SIMILARITY_THRESHOLD)
+                for box in ((40, 300, 42, 318), (620, 340, 660, 380), (1150, 5, 1270, 25), (1180, 600, 1260, 680)):
+                    with self.subTest(seed=seed, top=top, changed=box):
+                        frame = base.copy()
+                        ImageDraw.Draw(frame).rectangle(box, fill=(220, 40, 40))
+                        self.assertGreaterEqual(fp.similarity(ImageFingerprint(frame)), SCROLL_SIMILARITY_THRESHOLD)
+
+    def test_fingerprint_keeps_height(self):
+        """測試指紋只縮寬度、保留每一列"""
+        fp = ImageFingerprint(striped(width=1000, height=321))
+        self.assertEqual(fp.thumb.size, (64, 321))
+        self.assertEqual(len(fp.row_hashes), 321)
+        self.assertEqual(fp.size, (1000, 321))
+
+    def test_accepts_images_and_fingerprints(self):
+        """測試 image_similarity 可混用原圖與指紋，尺寸不同也可比較"""
+        img = striped()
+        fp = ImageFingerprint(img)
+        self.assertEqual(image_similarity(fp, img), 1.0)
+        self.assertGreater(image_similarity(img, img.resize((200, 150))), 0.9)
+
+
+def long_page(width=300, height=2000, seed=5):
+    rng = random.Random(seed)
+    page = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    y = 0
+    while y < height:
+        h = rng.randint(3, 9)
+        draw.rectangle((0, y, rng.randint(20, width), y + h - 1), fill=tuple(rng.randint(0, 230) for _ in range(3)))
+        y += h + rng.randint(0, 3)
+    return page
+
+
+def viewport(page, top, height, header=0, footer=0):
+    """模擬捲動到 top 的畫面；header/footer 為固定在畫面上下的色塊。"""
+    frame = page.crop((0, top, page.width, top + height))
+    if header:
+        frame.paste((10, 10, 10), (0, 0, page.width, header))
+    if footer:
+        frame.paste((240, 200, 0), (0, height - footer, page.width, height))
+    return frame
+
+
+class TestScrollStitch(unittest.TestCase):
+    def assertSameImage(self, a, b):
+        self.assertEqual(a.size, b.size)
+        self.assertIsNone(ImageChops.difference(a.convert("RGB"), b.convert("RGB")).getbbox())
+
+    def test_overlap_is_removed(self):
+        """測試捲動不足一整頁時，重疊區域只保留一次"""
+        page = long_page()
+        shots = [viewport(page, top, 500) for top in (0, 380, 760)]
+        merged = stitch_scroll_frames(shots)
+        self.assertSameImage(merged, page.crop((0, 0, page.width, 1260)))
+
+    def test_fixed_header_and_footer(self):
+        """測試固定頁首/頁尾只出現一次"""
+        page = long_page()
+        shots = [viewport(page, top, 500, header=60, footer=40) for top in (0, 300)]
+        header, footer, overlap = find_scroll_overlap(ImageFingerprint(shots[0]), ImageFingerprint(shots[1]))
+        # 頁首下緣若剛好與捲動後的內容相同會被併入頁首，但裁切位置不變
+        self.assertGreaterEqual(header, 60)
+        self.assertEqual(header + overlap, 160)
+        self.assertEqual(footer, 40)
+
+        merged = stitch_scroll_frames(shots)
+        self.assertEqual(merged.height, 800)
+        self.assertSameImage(merged.crop((0, 0, 300, 60)), shots[0].crop((0, 0, 300, 60)))
+        self.assertSameImage(merged.crop((0, 60, 300, 760)), page.crop((0, 60, 300, 760)))
+        self.assertSameImage(merged.crop((0, 760, 300, 800)), shots[1].crop((0, 460, 300, 500)))
+
+    def test_unrelated_frames_are_pasted_whole(self):
+        """測試找不到重疊時維持原本整張接上"""
+        shots = [viewport(long_page(seed=1), 0, 400), viewport(long_page(seed=2), 0, 400)]
+        self.assertIsNone(find_scroll_overlap(ImageFingerprint(shots[0]), ImageFingerprint(shots[1])))
+        self.assertEqual(stitch_scroll_frames(shots).height, 800)
+
+    def test_gap_mode_keeps_frames(self):
+        """測試不合併模式仍保留每張完整截圖與間隔"""
+        page = long_page()
+        shots = [viewport(page, top, 500) for top in (0, 380)]
+        self.assertEqual(stitch_scroll_frames(shots, gap=20).height, 1020)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from keyword_matcher import (
+    DEFAULT_CATEGORY_ORDER,
+    KeywordMatcher,
+    category_keywords,
+    normalize_text,
+    priority_order_from_config,
+)
+
+
+def naive_first_match(t, categories, priority):
+    for cat in priority:
+        if any(normalize_text(k) in t for k in categories.get(cat, [])):
+            return cat
+    return None
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_matches_naive_logic(self):
+        """測試隨機關鍵字與文字下，結果與逐一比對完全相同"""
+        rng = random.Random(7)
+        alphabet = "登入驗證商品不存在ab C"
+        for _ in range(200):
+            categories = {
+                f"類別{c}": ["".join(rng.choices(alphabet, k=rng.randint(0, 4))) for _ in range(rng.randint(0, 5))]
+                for c in range(4)
+            }
+            priority = list(categories)
+            rng.shuffle(priority)
+            matcher = KeywordMatcher(categories)
+            for _ in range(20):
+                t = normalize_text("".join(rng.choices(alphabet, k=rng.randint(0, 30))))
+                self.assertEqual(matcher.first_match(t, priority), naive_first_match(t, categories, priority))
+
+    def test_empty_keyword_always_matches(self):
+        """測試空字串（或只有空白）的關鍵字視為必中"""
+        matcher = KeywordMatcher({"A": ["xyz"], "B": [" "]})
+        self.assertEqual(matcher.first_match("abc", ["A", "B"]), "B")
+        self.assertEqual(matcher.match_all("abc"), {"B"})
+
+    def test_redundant_keywords_are_pruned(self):
+        """測試包含同類別較短關鍵字的關鍵字會被移除"""
+        matcher = KeywordMatcher({"登入": ["登入", "請先 登入", "會員登入", "Sign In"]})
+        self.assertEqual(matcher.pattern_count, 2)
+        self.assertEqual(matcher.first_match(normalize_text("請 SIGN in"), ["登入"]), "登入")
+
+    def test_unknown_category_in_priority_is_ignored(self):
+        matcher = KeywordMatcher({"A": ["abc"]})
+        self.assertIsNone(matcher.first_match("abc", ["不存在"]))
+        self.assertEqual(matcher.first_match("abc", ["不存在", "A"]), "A")
+
+    def test_default_categories_win_over_custom_with_same_name(self):
+        """測試自訂類別與預設類別同名時以預設關鍵字為準"""
+        cfg = SimpleNamespace(
+            login_keywords=["登入"],
+            captcha_keywords=["驗證"],
+            not_found_keywords=["不存在"],
+            bsmi_keywords=["BSMI"],
+            custom_categories={"登入": ["完全不同"], "促銷": ["特價"]},
+            keywords=None,
+        )
+        categories = category_keywords(cfg)
+        self.assertEqual(categories["登入"], ["登入"])
+        self.assertEqual(categories["促銷"], ["特價"])
+        self.assertEqual(priority_order_from_config(cfg), DEFAULT_CATEGORY_ORDER)
+
+
+if __name__ == "__main__":
+    unittest.main()
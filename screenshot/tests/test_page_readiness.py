@@ -0,0 +1,89 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from capture_backend import SyntheticBackend, SyntheticPage
+from page_readiness import PageReadiness, title_still_loading
+
+URL = "https://shop.example/item/1"
+
+
+class TestTitleSignal(unittest.TestCase):
+    def test_title_still_loading(self):
+        """測試標題仍為網址或空白時視為載入中"""
+        self.assertTrue(title_still_loading("", URL))
+        self.assertTrue(title_still_loading("shop.example/item/1 - Google Chrome", URL))
+        self.assertFalse(title_still_loading("測試商品 | shop.example - Google Chrome", URL))
+        self.assertFalse(title_still_loading(None, URL))
+
+
+class TestPageReadiness(unittest.TestCase):
+    def make_backend(self, ready_after: float) -> SyntheticBackend:
+        backend = SyntheticBackend(
+            pages={URL: SyntheticPage(title="測試商品", ready_after=ready_after)},
+            frame_size=(320, 240),
+        )
+        backend.open_url(URL)
+        return backend
+
+    def poll_until_ready(self, readiness: PageReadiness, interval: float, limit: int = 50) -> int:
+        for i in range(limit):
+            if readiness.poll():
+                return i + 1
+            time.sleep(interval)
+        return -1
+
+    def test_static_page_ready_after_stable_polls(self):
+        """測試已載入的頁面在連續 N 次畫面不變後判定就緒"""
+        readiness = PageReadiness(self.make_backend(0), URL, stable_polls=2)
+        self.assertIsNone(readiness.ready_at)
+        self.assertEqual(self.poll_until_ready(readiness, 0), 3)
+        ready_at = readiness.ready_at
+        self.assertIsNotNone(ready_at)
+        # 之後再次判定就緒不會改寫第一次的時間
+        self.assertTrue(readiness.poll())
+        self.assertEqual(readiness.ready_at, ready_at)
+
+    def test_waits_while_page_renders(self):
+        """測試載入中（畫面持續變化、標題為網址）不會判定就緒"""
+        backend = self.make_backend(0.3)
+        readiness = PageReadiness(backend, URL, stable_polls=2)
+        t0 = time.monotonic()
+        polls = self.poll_until_ready(readiness, 0.05)
+        self.assertGreater(polls, 0)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.3)
+
+    def test_title_gate(self):
+        """測試畫面不變但標題仍為網址時不判定就緒"""
+        backend = self.make_backend(0)
+        backend.page_title = lambda: URL
+        readiness = PageReadiness(backend, URL, stable_polls=1)
+        self.assertFalse(any(readiness.poll() for _ in range(4)))
+        self.assertEqual(readiness.reason, "title")
+
+    def test_mask_ignores_overlay_region(self):
+        """測試遮罩區域（倒數視窗）的變化不影響判定"""
+        backend = self.make_backend(0)
+        grab = backend.grab_frame
+        counter = {"n": 0}
+
+        def grab_with_overlay(capture_window=False):
+            frame, used = grab(capture_window)
+            counter["n"] += 1
+            shade = (counter["n"] * 40) % 255
+            frame.paste((shade, shade, shade), (220, 0, 320, 60))
+            return frame, used
+
+        backend.grab_frame = grab_with_overlay
+        unmasked = PageReadiness(backend, URL, stable_polls=2, threshold=0.999)
+        self.assertFalse(any(unmasked.poll() for _ in range(4)))
+        masked = PageReadiness(backend, URL, stable_polls=2, threshold=0.999, mask=lambda: (0.65, 0, 1, 0.3))
+        self.assertEqual(self.poll_until_ready(masked, 0), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
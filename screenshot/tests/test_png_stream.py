@@ -0,0 +1,111 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageChops, ImageDraw
+
+from png_stream import PngStreamWriter, StreamedImage
+from utils_image import ImageFingerprint, ScrollStitchStream, stitch_scroll_frames
+
+
+def long_page(width=300, height=2000, seed=5):
+    rng = random.Random(seed)
+    page = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    y = 0
+    while y < height:
+        h = rng.randint(3, 9)
+        draw.rectangle((0, y, rng.randint(20, width), y + h - 1), fill=tuple(rng.randint(0, 230) for _ in range(3)))
+        y += h + rng.randint(0, 3)
+    return page
+
+
+def viewport(page, top, height, header=0):
+    frame = page.crop((0, top, page.width, top + height))
+    if header:
+        frame.paste((10, 10, 10), (0, 0, page.width, header))
+    return frame
+
+
+class TestPngStream(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def assertSameImage(self, a, b):
+        self.assertEqual(a.size, b.size)
+        self.assertIsNone(ImageChops.difference(a.convert("RGB"), b.convert("RGB")).getbbox())
+
+    def test_rows_round_trip(self):
+        """測試分段寫入的 PNG 可被 PIL 正確讀回"""
+        a = Image.effect_noise((120, 80), 60).convert("RGB")
+        b = Image.new("RGBA", (90, 30), (10, 200, 30, 255))
+        path = self.tmp / "out.png"
+        writer = PngStreamWriter(path, 120)
+        writer.write_image(a)
+        writer.write_blank(5)
+        writer.write_image(b)
+        writer.close()
+
+        expected = Image.new("RGB", (120, 115), (255, 255, 255))
+        expected.paste(a, (0, 0))
+        expected.paste(Image.new("RGB", (120, 30)), (0, 85))
+        expected.paste(b.convert("RGB"), (0, 85))
+        with Image.open(path) as img:
+            self.assertSameImage(img, expected)
+
+    def test_stream_matches_in_memory_stitch(self):
+        """測試串流合併結果與記憶體內合併完全相同"""
+        page = long_page()
+        shots = [viewport(page, top, 500, header=40) for top in (0, 380, 760, 1140)]
+        for gap in (0, 20):
+            path = self.tmp / f"stream_{gap}.png"
+            stream = ScrollStitchStream(path, gap)
+            for shot in shots:
+                stream.add(shot, ImageFingerprint(shot))
+            result = stream.finish()
+            self.assertIsInstance(result, StreamedImage)
+            with Image.open(path) as img:
+                self.assertSameImage(img, stitch_scroll_frames(shots, gap=gap))
+            self.assertEqual(result.size, img.size)
+
+    def test_single_frame_is_returned_as_image(self):
+        """測試只有一張截圖時不寫檔，直接回傳圖片"""
+        path = self.tmp / "single.png"
+        stream = ScrollStitchStream(path)
+        shot = viewport(long_page(), 0, 300)
+        stream.add(shot)
+        self.assertIs(stream.finish(), shot)
+        self.assertFalse(path.exists())
+
+    def test_streamed_image_save(self):
+        """測試存到同一路徑不重寫、其他路徑則複製"""
+        path = self.tmp / "a.png"
+        writer = PngStreamWriter(path, 10)
+        writer.write_blank(10, (1, 2, 3))
+        writer.close()
+        streamed = StreamedImage(path, 10, 10)
+        mtime = path.stat().st_mtime_ns
+        streamed.save(path)
+        self.assertEqual(path.stat().st_mtime_ns, mtime)
+        streamed.save(self.tmp / "b.png")
+        self.assertEqual((self.tmp / "b.png").read_bytes(), path.read_bytes())
+
+    def test_abort_removes_partial_file(self):
+        path = self.tmp / "partial.png"
+        writer = PngStreamWriter(path, 10)
+        writer.write_blank(3)
+        writer.abort()
+        self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image
+
+import main
+from capture_backend import SyntheticBackend, SyntheticPage
+from config import SHARD_WORKERS_MAX, RunConfig
+from utils_system import load_done_data
+from wait_profiles import WaitProfiles
+
+
+class FullPageSyntheticBackend(SyntheticBackend):
+    """模擬瀏覽器引擎：開頁即載入完成、可直接截整頁。"""
+
+    waits_for_load = True
+    supports_full_page = True
+    has_browser_chrome = False
+
+    def grab_full_page(self):
+        return self._render(self.current_url).copy()
+
+
+class TestRunCaptureSynthetic(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.urls_file = self.tmp / "urls.txt"
+        self.urls_file.write_text(
+            "# 文號A\nhttps://shop.example/a\nhttps://shop.example/b\nhttps://shop.example/missing\n",
+            encoding="utf-8",
+        )
+        self._buffer = main.UI_HIDE_BUFFER_SECONDS
+        main.UI_HIDE_BUFFER_SECONDS = 0
+
+    def tearDown(self):
+        main.UI_HIDE_BUFFER_SECONDS = self._buffer
+        main.DummyOverlay.tick_seconds = 1.0
+        self._tmp.cleanup()
+
+    def make_cfg(self, **kwargs) -> RunConfig:
+        cfg = RunConfig(
+            urls_file=self.urls_file,
+            output_dir=self.tmp / "out",
+            done_log=self.tmp / "done_urls.json",
+            wait_profiles_file=self.tmp / "wait_profiles.json",
+            warmup_enabled=False,
+            page_wait_range=(0, 0),
+            final_countdown=0,
+            **kwargs,
+        )
+        return cfg
+
+    def run_capture(self, cfg, backend):
+        return main.run_capture(cfg, use_overlay=False, suppress_popups=True, backend=backend)
+
+    def test_crop_only_applies_to_desktop_frames(self):
+        """測試裁切設定只裁桌面瀏覽器的畫面；瀏覽器引擎的畫面沒有工具列，不裁掉頁面內容"""
+        cfg = self.make_cfg(crop_enabled=True, crop_top_px=120, crop_bottom_px=30)
+        outpath = self.tmp / "shot.png"
+        for backend, height in ((SyntheticBackend(frame_size=(200, 400)), 250), (FullPageSyntheticBackend(frame_size=(200, 400)), 400)):
+            backend.open_url("https://shop.example/a")
+            img, _ = main.capture_image(cfg, outpath, backend)
+            self.assertEqual(img.size, (200, height))
+
+    def test_end_to_end_with_scroll_and_text_check(self):
+        """測試以合成後端跑完整流程：開頁、文字檢查、捲動截圖、存檔與完成紀錄"""
+        backend = SyntheticBackend(
+            pages={
+                "https://shop.example/a": SyntheticPage(text="商品 BSMI 認證 R12345", height=1500),
+                "https://shop.example/b": SyntheticPage(text="一般商品頁", height=1500),
+                "https://shop.example/missing": {"text": "很抱歉，查無資料"},
+            },
+            frame_size=(320, 400),
+            scroll_step=300,
+        )
+        cfg = self.make_cfg(text_check_enabled=True, scroll_capture=True, scroll_pagedown_times=1, crop_top_px=0)
+        results = self.run_capture(cfg, backend)
+
+        self.assertEqual(results["errors"], [])
+        self.assertEqual(results["processed"], 2)
+        by_url = {r["url"]: r for r in results["results"]}
+        self.assertEqual(by_url["https://shop.example/a"]["classification"], "BSMI")
+        self.assertEqual(by_url["https://shop.example/b"]["classification"], "無法判斷")
+        with Image.open(by_url["https://shop.example/a"]["output"]) as img:
+            # 兩張 400px 截圖，捲動 300px，重疊 100px
+            self.assertEqual(img.size, (320, 700))
+
+        done, _, classes = load_done_data(cfg.done_log)
+        self.assertEqual(done, {"https://shop.example/a", "https://shop.example/b", "https://shop.example/missing"})
+        self.assertEqual(classes["https://shop.example/missing"], "查無資料")
+        self.assertEqual(backend.calls["open_url"], 3)
+        self.assertEqual(backend.calls["extract_text"], 3)
+
+    def test_url_callback_reports_each_url(self):
+        """測試每個網址有結果時回報狀態、分類與耗時"""
+        backend = SyntheticBackend(
+            pages={"https://shop.example/missing": {"text": "很抱歉，查無資料"}},
+            frame_size=(200, 150),
+        )
+        events = []
+        main.run_capture(
+            self.make_cfg(text_check_enabled=True),
+            use_overlay=False,
+            suppress_popups=True,
+            backend=backend,
+            url_callback=events.append,
+        )
+        by_url = {e["url"]: e for e in events}
+        self.assertEqual(len(events), 3)
+        self.assertEqual(by_url["https://shop.example/missing"]["status"], "skipped")
+        self.assertEqual(by_url["https://shop.example/missing"]["classification"], "查無資料")
+        self.assertEqual(by_url["https://shop.example/a"]["status"], "success")
+        self.assertTrue(Path(by_url["https://shop.example/a"]["output"]).exists())
+        for e in events:
+            self.assertGreaterEqual(e["seconds"], 0)
+
+    def test_skip_done_reuses_journal(self):
+        """測試第二次執行會略過已完成的網址"""
+        backend = SyntheticBackend(frame_size=(200, 150))
+        self.assertEqual(self.run_capture(self.make_cfg(), backend)["processed"], 3)
+        again = self.run_capture(self.make_cfg(skip_done=True), backend)
+        self.assertEqual(again["processed"], 0)
+        self.assertEqual(backend.calls["open_url"], 3)
+
+    def test_engine_backend_skips_countdown_and_stitching(self):
+        """測試會等待載入的引擎不跑固定倒數，捲動截圖直接取整頁"""
+        backend = FullPageSyntheticBackend(
+            pages={url: SyntheticPage(height=1234) for url in ("https://shop.example/a", "https://shop.example/b", "https://shop.example/missing")},
+            frame_size=(320, 400),
+        )
+        cfg = self.make_cfg(scroll_capture=True)
+        cfg.page_wait_range = (30, 30)
+        results = self.run_capture(cfg, backend)
+        self.assertEqual(results["processed"], 3)
+        self.assertEqual(backend.calls["scroll"], 0)
+        with Image.open(results["results"][0]["output"]) as img:
+            self.assertEqual(img.size, (320, 1234))
+
+    def test_adaptive_wait_captures_when_page_is_stable(self):
+        """測試自適應等待：頁面穩定即截圖，不等到上限；等待統計記錄在結果中"""
+        main.DummyOverlay.tick_seconds = 0.05
+        backend = SyntheticBackend(
+            pages={url: SyntheticPage(ready_after=0.2) for url in ("https://shop.example/a", "https://shop.example/b", "https://shop.example/missing")},
+            frame_size=(200, 150),
+        )
+        cfg = self.make_cfg(adaptive_wait=True, ready_jitter_range=(0, 0))
+        cfg.page_wait_range = (2, 100)
+        results = self.run_capture(cfg, backend)
+        self.assertEqual(results["processed"], 3)
+        stats = results["adaptive_wait"]
+        self.assertEqual(stats["pages"], 3)
+        self.assertEqual(stats["ready"], 3)
+        # 上限 100 格 x 0.05 秒 = 每頁 5 秒；實際約 0.2 秒載入 + 2 次穩定比對
+        self.assertLess(stats["waited_seconds"], 3 * 1.5)
+        with Image.open(results["results"][0]["output"]) as img:
+            # 截到的是載入完成的畫面（底部不是空白）
+            self.assertNotEqual(img.crop((0, 140, 200, 150)).getextrema(), ((255, 255),) * 3)
+
+    def test_learned_wait_shortens_next_run(self):
+        """測試網域等待紀錄：自適應等待記錄就緒時間，下次固定倒數改用學到的範圍"""
+        main.DummyOverlay.tick_seconds = 0.01
+        backend = SyntheticBackend(frame_size=(200, 150))
+        cfg = self.make_cfg(adaptive_wait=True, ready_jitter_range=(0, 0))
+        cfg.page_wait_range = (0, 50)
+        self.run_capture(cfg, backend)
+        profiles = WaitProfiles(self.tmp / "wait_profiles.json")
+        self.assertEqual(len(profiles.hosts["shop.example"]["samples"]), 3)
+
+        profiles.min_samples = 3
+        lo, hi = profiles.wait_range("https://shop.example/x", (40, 50))
+        self.assertLess(hi, 40)
+
+    def test_learned_wait_excludes_min_floor(self):
+        """測試自適應等待記錄的是就緒時間而不是含下限的總等待，學到的範圍可以低於固定下限"""
+        main.DummyOverlay.tick_seconds = 0.05
+        backend = SyntheticBackend(frame_size=(200, 150))
+        cfg = self.make_cfg(adaptive_wait=True, ready_jitter_range=(0, 0))
+        # 下限 10 格（0.5 秒），合成頁面約 2 格就穩定
+        cfg.page_wait_range = (10, 50)
+        self.run_capture(cfg, backend)
+        profiles = WaitProfiles(self.tmp / "wait_profiles.json")
+        entry = profiles.hosts["shop.example"]
+        self.assertEqual(len(entry["samples"]), 3)
+        self.assertEqual(entry["timeouts"], 0)
+        floor_seconds = cfg.page_wait_range[0] * main.DummyOverlay.tick_seconds
+        self.assertLess(max(entry["samples"]), floor_seconds)
+
+        profiles.min_samples = 3
+        lo, _ = profiles.wait_range("https://shop.example/x", cfg.page_wait_range, adaptive=True)
+        self.assertLess(lo, cfg.page_wait_range[0])
+
+
+class TestRunFromApi(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.urls_file = self.tmp / "urls.txt"
+        self.urls_file.write_text("https://shop.example/a\n", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_overrides_are_validated(self):
+        """測試介面傳入的覆寫值也經過 RunConfig 檢查，不合法時開始前就拋出 ValueError"""
+        for overrides in ({"engine": "firefox"}, {"shard_workers": SHARD_WORKERS_MAX + 1}, {"wait_min": 9, "wait_max": 3}):
+            with self.subTest(overrides=overrides), self.assertRaises(ValueError):
+                main.run_from_api(
+                    lambda: False,
+                    {"input_files": [str(self.urls_file)], "output_dir": str(self.tmp / "out"), **overrides},
+                    suppress_popups=True,
+                )
+        self.assertFalse((self.tmp / "out").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from capture_backend import SyntheticBackend
+from config import RunConfig
+from sharded_run import plan_shards, run_sharded
+from utils_system import load_done_data
+
+
+def make_entries(sizes: dict[str, int]) -> list:
+    entries = []
+    for source, n in sizes.items():
+        for i in range(n):
+            entries.append((len(entries) + 1, f"https://{source}.example/{i}", None, source))
+    return entries
+
+
+class TestPlanShards(unittest.TestCase):
+    def test_whole_files_balanced(self):
+        """測試檔案數足夠時整個檔案分給同一程序，且各程序網址數接近"""
+        entries = make_entries({"a": 10, "b": 6, "c": 5, "d": 1})
+        shards = plan_shards(entries, 2)
+        self.assertEqual(len(shards), 2)
+        self.assertEqual(sorted(len(s) for s in shards), [11, 11])
+        for shard in shards:
+            self.assertEqual([e[0] for e in shard], sorted(e[0] for e in shard))
+        owners = {e[3]: i for i, shard in enumerate(shards) for e in shard}
+        self.assertEqual(len(owners), 4)
+        self.assertEqual(sum(len(s) for s in shards), len(entries))
+
+    def test_split_ranges_when_few_files(self):
+        """測試檔案數少於程序數時切成連續區間"""
+        entries = make_entries({"a": 10})
+        shards = plan_shards(entries, 3)
+        self.assertEqual([len(s) for s in shards], [4, 3, 3])
+        self.assertEqual([e for s in shards for e in s], entries)
+
+    def test_more_workers_than_urls(self):
+        """測試程序數多於網址數時不產生空分片"""
+        self.assertEqual(len(plan_shards(make_entries({"a": 2}), 4)), 2)
+        self.assertEqual(plan_shards([], 4), [])
+
+
+class TestRunSharded(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.files = []
+        for name, n in (("group_a", 3), ("group_b", 2)):
+            f = self.tmp / f"{name}.txt"
+            f.write_text("".join(f"# 附註{i}\nhttps://{name}.example/{i}\n" for i in range(n)), encoding="utf-8")
+            self.files.append(f)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_cfg(self, **kwargs) -> RunConfig:
+        return RunConfig(
+            urls_file=self.files[0],
+            output_dir=self.tmp / "out",
+            done_log=self.tmp / "done_urls.json",
+            wait_profiles_file=self.tmp / "wait_profiles.json",
+            warmup_enabled=False,
+            page_wait_range=(0, 0),
+            final_countdown=0,
+            batch_size=0,
+            shard_workers=2,
+            **kwargs,
+        )
+
+    def test_merged_results_and_done_state(self):
+        """測試兩個程序分別處理兩個檔案，結果依原始順序合併、完成紀錄寫回主紀錄"""
+        backend = SyntheticBackend(frame_size=(160, 120))
+        cfg = self.make_cfg()
+        url_events = []
+        results = run_sharded(cfg, input_files=self.files, backend=backend, url_callback=url_events.append)
+
+        self.assertEqual(results["errors"], [])
+        # 子程序的每網址結果經由佇列轉回主程序
+        self.assertEqual(sorted(e["url"] for e in url_events), sorted(r["url"] for r in results["results"]))
+        self.assertEqual(results["processed"], 5)
+        self.assertEqual(len(results["shards"]), 2)
+        self.assertEqual(
+            [r["url"] for r in results["results"]],
+            [f"https://group_a.example/{i}" for i in range(3)] + [f"https://group_b.example/{i}" for i in range(2)],
+        )
+        for r in results["results"]:
+            self.assertTrue(Path(r["output"]).exists())
+
+        done, outputs, _ = load_done_data(cfg.done_log)
+        self.assertEqual(len(done), 5)
+        self.assertEqual(outputs["https://group_b.example/1"], results["results"][-1]["output"])
+        # 暫存的分片資料夾已清除
+        self.assertEqual([p.name for p in cfg.output_dir.iterdir() if p.name.startswith(".shards_")], [])
+
+        again = run_sharded(self.make_cfg(skip_done=True), input_files=self.files, backend=backend)
+        self.assertEqual(again["processed"], 0)
+
+    def test_desktop_engine_rejected(self):
+        """測試桌面引擎不能分片（同一時間只能操作一個瀏覽器視窗）"""
+        with self.assertRaises(RuntimeError):
+            run_sharded(self.make_cfg(), input_files=self.files)
+
+    def test_word_documents_rebuilt_in_order(self):
+        """測試主程序依原始順序為每個來源檔產生 Word"""
+        try:
+            from docx import Document
+        except ImportError:
+            self.skipTest("python-docx 未安裝")
+        results = run_sharded(self.make_cfg(word_enabled=True), input_files=self.files, backend=SyntheticBackend(frame_size=(160, 120)))
+        self.assertEqual(len(results["word_documents"]), 2)
+        doc = Document(next(p for p in results["word_documents"] if "group_a" in p))
+        texts = [p.text for p in doc.paragraphs if p.text]
+        self.assertEqual(texts[:4], ["附註0", "https://group_a.example/0", "附註1", "https://group_a.example/1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
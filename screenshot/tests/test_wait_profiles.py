@@ -0,0 +1,91 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from wait_profiles import WaitProfiles, percentile
+
+
+class TestWaitProfiles(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "wait_profiles.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_percentile(self):
+        """測試線性內插百分位數"""
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(percentile(values, 50), 3.0)
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 100), 5.0)
+        self.assertAlmostEqual(percentile(values, 90), 4.6)
+        self.assertEqual(percentile([7.0], 95), 7.0)
+
+    def test_default_until_enough_samples(self):
+        """測試樣本不足時沿用預設範圍"""
+        profiles = WaitProfiles(self.path, min_samples=5)
+        for s in (2, 3, 2, 3):
+            profiles.record("https://fast.example/a", s)
+        self.assertEqual(profiles.wait_range("https://fast.example/b", (15, 30)), (15, 30))
+        profiles.record("https://fast.example/c", 2)
+        self.assertNotEqual(profiles.wait_range("https://fast.example/b", (15, 30)), (15, 30))
+
+    def test_fast_and_slow_hosts_get_different_waits(self):
+        """測試快的網域等待短、慢的網域等待長"""
+        profiles = WaitProfiles(self.path, min_samples=5)
+        for i in range(10):
+            profiles.record(f"https://fast.example/{i}", 2 + (i % 3) * 0.5)
+            profiles.record(f"https://slow.example/{i}", 20 + i)
+        fast = profiles.wait_range("https://fast.example/x", (15, 30))
+        slow = profiles.wait_range("https://slow.example/x", (15, 30))
+        self.assertLess(fast[1], 15)
+        self.assertGreater(slow[0], fast[1])
+        self.assertGreaterEqual(slow[1], 29)
+        lo, hi = profiles.wait_range("https://fast.example/x", (15, 30), adaptive=True)
+        self.assertLessEqual(lo, 2)
+        self.assertGreater(hi, 3)
+
+    def test_persisted_between_runs(self):
+        """測試紀錄跨執行保存，且只保留最近 N 筆"""
+        profiles = WaitProfiles(self.path, max_samples=3)
+        for s in (1, 2, 3, 4):
+            profiles.record("https://a.example/", s)
+        profiles.record("https://a.example/", 30, ready=False)
+        profiles.save()
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(data["hosts"]["a.example"]["samples"], [3.0, 4.0, 30.0])
+        self.assertEqual(data["hosts"]["a.example"]["timeouts"], 1)
+
+        again = WaitProfiles(self.path, max_samples=3)
+        self.assertEqual(again.hosts["a.example"]["samples"], [3.0, 4.0, 30.0])
+        self.assertFalse(again.dirty)
+
+    def test_corrupt_file_starts_empty(self):
+        """測試紀錄檔損毀時從空白開始"""
+        self.path.write_text("{not json", encoding="utf-8")
+        self.assertEqual(WaitProfiles(self.path).hosts, {})
+
+    def test_report(self):
+        """測試報表列出各網域百分位數與建議等待"""
+        profiles = WaitProfiles(self.path, min_samples=3)
+        for s in (4, 5, 6):
+            profiles.record("https://a.example/", s)
+        profiles.record("https://b.example/", 9)
+        rows = profiles.report_rows((15, 30))
+        self.assertEqual([r["host"] for r in rows], ["a.example", "b.example"])
+        self.assertEqual(rows[0]["p50"], 5.0)
+        self.assertIsNotNone(rows[0]["wait_range"])
+        self.assertIsNone(rows[1]["wait_range"])
+        text = profiles.format_report((15, 30))
+        self.assertIn("a.example", text)
+        self.assertIn("樣本不足", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
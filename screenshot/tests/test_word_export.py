@@ -0,0 +1,56 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to allow importing modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image
+from docx import Document
+
+from utils_system import IncrementalWordDoc
+
+
+class TestIncrementalWordDoc(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.image_path = self.tmp / "shot.png"
+        Image.new("RGB", (64, 48), (200, 30, 30)).save(self.image_path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_saves_only_at_checkpoints(self):
+        """測試只在累積張數到達檢查點時存檔"""
+        word = IncrementalWordDoc(Document(), self.tmp / "out.docx", checkpoint_every=3)
+        for i in range(7):
+            word.add(f"https://example.com/{i}", self.image_path)
+        self.assertEqual(word.saves, 2)
+        self.assertEqual(word.pending, 1)
+
+        word.close()
+        self.assertEqual(word.saves, 3)
+        self.assertEqual(word.pending, 0)
+        self.assertEqual(len(Document(word.path).inline_shapes), 7)
+        self.assertGreater(word.bytes_written, 0)
+
+    def test_close_without_pending_does_not_rewrite(self):
+        """測試沒有新內容時 close 不會重複存檔"""
+        word = IncrementalWordDoc(Document(), self.tmp / "out.docx", checkpoint_every=1)
+        word.add("https://example.com/a", self.image_path, note="文號1")
+        written = word.bytes_written
+        word.close()
+        self.assertEqual(word.saves, 1)
+        self.assertEqual(word.bytes_written, written)
+
+    def test_empty_document_is_created_on_close(self):
+        """測試沒有任何截圖時仍會產生 Word 檔"""
+        word = IncrementalWordDoc(Document(), self.tmp / "empty.docx")
+        word.close()
+        self.assertTrue(word.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,7 @@ from config import (
 from utils_system import (
     clear_done_log,
     default_output_dir_from_urls,
+    done_journal_path,
     parse_keywords,
 )
 
@@ -211,7 +212,31 @@ class OverlayUI:
         if target_w != self._width or target_h != self._height:
             self._apply_geometry(target_w, target_h)
 
-    def countdown_with_status(self, base_lines: list[str], total_seconds: int, final_seconds: int) -> str:
+    def screen_bbox_ratio(self) -> tuple[float, float, float, float] | None:
+        """倒數視窗佔螢幕的範圍（比例），自適應等待比對畫面時排除這塊。"""
+        try:
+            screen_w = self.root.winfo_screenwidth()
+            screen_h = self.root.winfo_screenheight()
+            x, y = self.root.winfo_x(), self.root.winfo_y()
+            w, h = self.root.winfo_width(), self.root.winfo_height()
+        except Exception:
+            return None
+        if screen_w <= 0 or screen_h <= 0:
+            return None
+        return (x / screen_w, y / screen_h, (x + w) / screen_w, (y + h) / screen_h)
+
+    def countdown_with_status(
+        self,
+        base_lines: list[str],
+        total_seconds: int,
+        final_seconds: int,
+        ready_check: Callable[[], bool] | None = None,
+        min_seconds: int = 0,
+    ) -> str:
+        """
+        每秒更新倒數，回傳 "done" / "stop" / "skip"。
+        ready_check: 自適應等待，每秒呼叫一次；回傳 True 且已等滿 min_seconds 時提前回傳 "ready"。
+        """
         if total_seconds <= 0:
             return "done"
         if final_seconds < 0:
@@ -242,7 +267,15 @@ class OverlayUI:
                 self.root.update()
                 return "skip"
 
-            if t > final_seconds:
+            elapsed = total_seconds - t
+            if ready_check is not None and ready_check() and elapsed >= min_seconds:
+                self.root.withdraw()
+                self.root.update()
+                return "ready"
+
+            if ready_check is not None:
+                status = f"等待頁面穩定（已等 {elapsed} 秒，最多 {total_seconds} 秒）"
+            elif t > final_seconds:
                 status = f"頁面載入中，剩 {t} 秒"
             else:
                 status = f"準備截圖，剩 {t} 秒"
@@ -703,7 +736,7 @@ class _SettingsUI:
 
     def _clear_output_records(self):
         done_log = Path(DONE_LOG)
-        if not done_log.exists():
+        if not done_log.exists() and not done_journal_path(done_log).exists():
             messagebox.showinfo("提示", "找不到 done_urls.json，沒有可清除的紀錄。")
             return
 
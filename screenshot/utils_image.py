@@ -1,5 +1,8 @@
 from __future__ import annotations
-import pyautogui
+try:
+    import pyautogui
+except Exception:
+    pyautogui = None
 from pathlib import Path
 from typing import Optional, Union, Tuple
 from PIL import Image, ImageGrab, ImageChops, ImageStat
@@ -11,28 +14,227 @@ except Exception:
 import time
 import time
 from utils_system import focus_browser_window, click_window_corner, looks_like_url, sleep_random
+from keyword_matcher import cached_matcher, normalize_text
+from png_stream import PngStreamWriter, StreamedImage
+from capture_backend import CaptureBackend, DesktopBackend
 from logger_setup import logger
-from config import SCROLL_CAPTURE_MULTIPLIER, SCROLL_SIMILARITY_THRESHOLD, SCROLL_CAPTURE_WAIT_SECONDS
+from config import (
+    SCROLL_CAPTURE_MULTIPLIER,
+    SCROLL_SIMILARITY_THRESHOLD,
+    SCROLL_CAPTURE_WAIT_SECONDS,
+    SCROLL_FINGERPRINT_WIDTH,
+    SCROLL_OVERLAP_MIN_ROWS,
+    SCROLL_FIXED_BAND_MAX_RATIO,
+)
 
-def image_similarity(img1: "Image.Image", img2: "Image.Image") -> float:
+class ImageFingerprint:
+    """
+    截圖的灰階指紋：寬度縮至 SCROLL_FINGERPRINT_WIDTH、高度不變，並記錄每一列的雜湊。
+    每張截圖只算一次，之後的相似度比對都用指紋，不必再縮放原圖。
+    """
+
+    __slots__ = ("size", "thumb", "row_hashes")
+
+    def __init__(self, img: "Image.Image", width: int = SCROLL_FINGERPRINT_WIDTH):
+        self.size = img.size
+        w = max(1, min(int(width), img.width))
+        gray = img.convert("L")
+        self.thumb = gray if gray.width == w else gray.resize((w, img.height), Image.BOX)
+        data = self.thumb.tobytes()
+        self.row_hashes = tuple(hash(data[i:i + w]) for i in range(0, len(data), w))
+
+    def similarity(self, other: "ImageFingerprint") -> float:
+        """相似度 (0.0 ~ 1.0)；逐列雜湊完全相同時直接回傳 1.0。"""
+        if self.row_hashes == other.row_hashes and self.thumb.size == other.thumb.size:
+            return 1.0
+        a, b = self.thumb, other.thumb
+        if a.size != b.size:
+            b = b.resize(a.size, Image.BOX)
+        mean = ImageStat.Stat(ImageChops.difference(a, b)).mean[0]
+        return max(0.0, 1.0 - (mean / 255.0))
+
+
+def image_fingerprint(img: "Union[Image.Image, ImageFingerprint]") -> ImageFingerprint:
+    return img if isinstance(img, ImageFingerprint) else ImageFingerprint(img)
+
+
+def image_similarity(
+    img1: "Union[Image.Image, ImageFingerprint]",
+    img2: "Union[Image.Image, ImageFingerprint]",
+) -> float:
     """
     計算兩張圖片的相似度 (0.0 ~ 1.0)。
-    會先將圖片縮放至相同大小，再計算差異。
+    可直接傳入已算好的 ImageFingerprint，避免重複縮放。
     """
     if ImageChops is None or ImageStat is None:
         return 0.0
-    if img1.size != img2.size:
-        img2 = img2.resize(img1.size)
-    max_w = 800
-    if img1.width > max_w:
-        scale = max_w / img1.width
-        new_size = (max_w, max(1, int(img1.height * scale)))
-        img1 = img1.resize(new_size)
-        img2 = img2.resize(new_size)
-    diff = ImageChops.difference(img1.convert("RGB"), img2.convert("RGB"))
-    stat = ImageStat.Stat(diff)
-    mean = sum(stat.mean) / len(stat.mean)
-    return max(0.0, 1.0 - (mean / 255.0))
+    return image_fingerprint(img1).similarity(image_fingerprint(img2))
+
+def find_scroll_overlap(
+    prev: ImageFingerprint,
+    cur: ImageFingerprint,
+    min_rows: int = SCROLL_OVERLAP_MIN_ROWS,
+    max_band_ratio: float = SCROLL_FIXED_BAND_MAX_RATIO,
+) -> Optional[tuple[int, int, int]]:
+    """
+    找出兩張相鄰捲動截圖的重疊。
+
+    1. 固定頁首/頁尾：同一位置、兩張都相同的開頭/結尾列。
+    2. 內容重疊：在中間區域取目前截圖中內容轉折的列作為錨點，到上一張找相同的列，
+       換算出捲動距離後，驗證整段重疊的列雜湊完全一致。
+
+    Returns:
+        (header, footer, overlap) 列數；找不到可靠的重疊時回傳 None。
+    """
+    a, b = prev.row_hashes, cur.row_hashes
+    if prev.size != cur.size or not a:
+        return None
+    h = len(a)
+    max_band = int(h * max_band_ratio)
+
+    header = 0
+    while header < max_band and a[header] == b[header]:
+        header += 1
+    footer = 0
+    while footer < max_band and a[h - 1 - footer] == b[h - 1 - footer]:
+        footer += 1
+
+    body_a = a[header:h - footer]
+    body_b = b[header:h - footer]
+    n = len(body_a)
+    if n < min_rows:
+        return None
+
+    # 只索引內容「轉折」的列（與上一列不同），同色區塊只算一次
+    positions: dict[int, list[int]] = {}
+    prev_row = None
+    for i, row in enumerate(body_a):
+        if row != prev_row:
+            positions.setdefault(row, []).append(i)
+            prev_row = row
+
+    # 錨點：目前截圖中的轉折列，且在上一張只出現少數幾次
+    # （背景、空白等大量重複的列無法定位，直接略過）
+    tries = 0
+    prev_row = None
+    for anchor, row in enumerate(body_b[:n - min_rows + 1]):
+        if row == prev_row:
+            continue
+        prev_row = row
+        candidates = positions.get(row)
+        if not candidates or len(candidates) > 8:
+            continue
+        # 內容重複時可能有多個可行位置：取捲動距離最大（重疊最少）的，
+        # 寧可留下少量重複也不要裁掉真正的新內容
+        for pos in reversed(candidates):
+            shift = pos - anchor
+            if shift <= 0 or n - shift < min_rows:
+                continue
+            if body_a[shift:] == body_b[:n - shift]:
+                return header, footer, n - shift
+        tries += 1
+        if tries >= 32:
+            break
+    return None
+
+
+def scroll_crop_bounds(prev: ImageFingerprint, cur: ImageFingerprint) -> tuple[int, int]:
+    """
+    回傳 (上一張底部要裁掉的列數, 這一張頂部要裁掉的列數)；找不到重疊時為 (0, 0)。
+    """
+    found = find_scroll_overlap(prev, cur)
+    if found is None:
+        return 0, 0
+    header, footer, overlap = found
+    if header:
+        logger.debug(f"Scroll stitch: fixed header {header}px, overlap {overlap}px")
+    return footer, header + overlap
+
+
+def _frame_part(img: "Image.Image", top: int, bottom: int) -> Optional["Image.Image"]:
+    height = img.height - top - bottom
+    if height <= 0:
+        return None
+    if top == 0 and bottom == 0:
+        return img
+    return img.crop((0, top, img.width, top + height))
+
+
+def stitch_scroll_frames(
+    shots: list["Image.Image"],
+    fingerprints: Optional[list[ImageFingerprint]] = None,
+    gap: int = 0,
+) -> "Image.Image":
+    """
+    合併捲動截圖。gap 為 0 時會去除相鄰截圖的重疊區域與重複的固定頁首/頁尾；
+    找不到可靠重疊的那一組則照舊整張接上。
+    """
+    tops = [0] * len(shots)
+    bottoms = [0] * len(shots)
+    if gap == 0 and len(shots) > 1:
+        if fingerprints is None:
+            fingerprints = [ImageFingerprint(img) for img in shots]
+        for i in range(1, len(shots)):
+            bottoms[i - 1], tops[i] = scroll_crop_bounds(fingerprints[i - 1], fingerprints[i])
+
+    parts = [_frame_part(img, top, bottom) for img, top, bottom in zip(shots, tops, bottoms)]
+    parts = [part for part in parts if part is not None]
+    total_height = sum(part.height for part in parts) + (gap * (len(parts) - 1))
+    merged = Image.new("RGB", (shots[0].width, total_height), color=(255, 255, 255) if gap > 0 else (0, 0, 0))
+    y = 0
+    for part in parts:
+        merged.paste(part, (0, y))
+        y += part.height + gap
+    return merged
+
+class ScrollStitchStream:
+    """
+    邊截圖邊合併：每收到下一張截圖，就把上一張（裁掉重疊後）寫入 PNG 並釋放，
+    記憶體中最多只保留兩張截圖，不會配置整張合併畫布。
+    """
+
+    def __init__(self, path: Union[str, Path], gap: int = 0):
+        self.path = Path(path)
+        self.gap = gap
+        self.frames = 0
+        self._writer: Optional[PngStreamWriter] = None
+        self._last: Optional["Image.Image"] = None
+        self._last_fp: Optional[ImageFingerprint] = None
+        self._last_top = 0
+
+    def add(self, img: "Image.Image", fp: Optional[ImageFingerprint] = None) -> None:
+        if fp is None and self.gap == 0:
+            fp = ImageFingerprint(img)
+        if self._last is not None:
+            bottom, top = (0, 0)
+            if self.gap == 0:
+                bottom, top = scroll_crop_bounds(self._last_fp, fp)
+            if self._writer is None:
+                self._writer = PngStreamWriter(self.path, self._last.width)
+            part = _frame_part(self._last, self._last_top, bottom)
+            if part is not None:
+                self._writer.write_image(part)
+                self._writer.write_blank(self.gap)
+            self._last_top = top
+        self._last, self._last_fp = img, fp
+        self.frames += 1
+
+    def finish(self) -> Union["Image.Image", StreamedImage, None]:
+        """寫入最後一張並完成檔案；只有一張截圖時直接回傳該圖片（不寫檔）。"""
+        last, self._last, self._last_fp = self._last, None, None
+        if self._writer is None:
+            return last
+        part = _frame_part(last, self._last_top, 0)
+        if part is not None:
+            self._writer.write_image(part)
+        self._writer.close()
+        return StreamedImage(self.path, self._writer.width, self._writer.height)
+
+    def abort(self) -> None:
+        self._last = self._last_fp = None
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
 
 def capture_active_window() -> Optional["Image.Image"]:
     """
@@ -221,9 +423,6 @@ def extract_text_content(region: Optional[tuple[int, int, int, int]] = None) ->
 
     return text
 
-def normalize_text(text: str) -> str:
-    return "".join(text.lower().split())
-
 def classify_text(
     text: str,
     captcha_keywords: list[str],
@@ -238,15 +437,15 @@ def classify_text(
         return "無法判斷"
     limit = max(200, int(len(text) * 0.05))
     t = normalize_text(text[:limit])
-    if any(normalize_text(k) in t for k in login_keywords):
-        return "登入"
-    if any(normalize_text(k) in t for k in captcha_keywords):
-        return "驗證是否人類"
-    if any(normalize_text(k) in t for k in not_found_keywords):
-        return "商品不存在"
-    if any(normalize_text(k) in t for k in bsmi_keywords):
-        return "商品存在 且有BSMI認證"
-    return "無法判斷"
+    # 關鍵字清單相同時重用已建立的比對器
+    categories = (
+        ("登入", tuple(login_keywords)),
+        ("驗證是否人類", tuple(captcha_keywords)),
+        ("商品不存在", tuple(not_found_keywords)),
+        ("商品存在 且有BSMI認證", tuple(bsmi_keywords)),
+    )
+    matcher = cached_matcher(categories)
+    return matcher.first_match(t, [name for name, _ in categories]) or "無法判斷"
 
 def capture_scrolling_page(
     scroll_pagedown_times: int,
@@ -257,9 +456,14 @@ def capture_scrolling_page(
     similarity_threshold: float = SCROLL_SIMILARITY_THRESHOLD,
     max_pages: int = SCROLL_CAPTURE_MULTIPLIER,
     wait_seconds: float = SCROLL_CAPTURE_WAIT_SECONDS,
-) -> Tuple["Image.Image", bool]:
+    stream_to: Optional[Union[str, Path]] = None,
+    backend: Optional[CaptureBackend] = None,
+) -> Tuple[Union["Image.Image", StreamedImage], bool]:
     """
     執行捲動截圖並合併。
+    stream_to: 指定時邊截圖邊寫入該 PNG（記憶體最多保留兩張截圖），
+               回傳 StreamedImage；只有一張截圖時仍回傳一般圖片。
+    backend: 截圖/捲動來源，預設為桌面瀏覽器 (DesktopBackend)。
     
     Returns:
         tuple[Image.Image, bool]: (合併後的圖片, 是否使用了視窗截圖模式)
@@ -267,54 +471,62 @@ def capture_scrolling_page(
     if Image is None:
         raise RuntimeError("PIL is not available")
 
+    if backend is None:
+        backend = DesktopBackend()
+
     shots = []
+    fingerprints: list[ImageFingerprint] = []
     used_window_mode = False
 
     def take_shot() -> tuple[Image.Image, bool]:
-        if capture_window:
-            img = capture_active_window()
-            if img is not None:
-                return img, True
-        return pyautogui.screenshot(), False
+        return backend.grab_frame(capture_window)
 
     def post_process(img: Image.Image) -> Image.Image:
         return crop_webpage_area(img, crop_top, crop_bottom)
 
-    no_scroll = False
-    for i in range(max_pages):
-        img, used_win = take_shot()
-        if used_win:
-            used_window_mode = True
-        
-        img = post_process(img)
-        
-        if shots:
-            sim = image_similarity(shots[-1], img)
-            if sim >= similarity_threshold:
-                no_scroll = True
-                break
-        
-        shots.append(img)
-        
-        if i < max_pages - 1:
-            for _ in range(scroll_pagedown_times):
-                pyautogui.press("pagedown")
-            time.sleep(wait_seconds)
+    gap = 20 if not scroll_stitch else 0
+    stream = ScrollStitchStream(stream_to, gap) if stream_to is not None else None
+
+    try:
+        for i in range(max_pages):
+            img, used_win = take_shot()
+            if used_win:
+                used_window_mode = True
+            
+            img = post_process(img)
+            fp = ImageFingerprint(img)
+            
+            if fingerprints:
+                sim = fingerprints[-1].similarity(fp)
+                if sim >= similarity_threshold:
+                    break
+            
+            fingerprints.append(fp)
+            if stream is not None:
+                stream.add(img, fp)
+            else:
+                shots.append(img)
+            del img
+            
+            if i < max_pages - 1:
+                backend.scroll(scroll_pagedown_times)
+                time.sleep(wait_seconds)
+
+        if stream is not None and stream.frames:
+            return stream.finish(), used_window_mode
+    except Exception:
+        if stream is not None:
+            stream.abort()
+        raise
 
     if not shots:
         # Should not happen typically
-        return pyautogui.screenshot(), False
+        return backend.grab_frame()[0], False
 
-    if no_scroll or len(shots) == 1:
+    if len(shots) == 1:
         return shots[0], used_window_mode
 
     # Stitch images
-    gap = 20 if not scroll_stitch else 0
-    total_height = sum(img.height for img in shots) + (gap * (len(shots) - 1))
-    merged = Image.new("RGB", (shots[0].width, total_height), color=(255, 255, 255) if gap > 0 else (0, 0, 0))
-    y = 0
-    for i, img in enumerate(shots):
-        merged.paste(img, (0, y))
-        y += img.height + gap
+    merged = stitch_scroll_frames(shots, fingerprints, gap)
     
     return merged, used_window_mode
@@ -8,7 +8,10 @@ from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 
-import pyautogui
+try:
+    import pyautogui
+except Exception:
+    pyautogui = None
 try:
     import pygetwindow as gw
 except Exception:
@@ -22,7 +25,9 @@ from config import (
     BROWSER_TITLE_KEYWORDS,
     DEDUP_URLS,
     DEFAULT_URLS_FILE,
+    DONE_JOURNAL_COMPACT_EVERY,
 )
+from done_store import SqliteDoneStore, is_sqlite_path
 from logger_setup import logger
 
 def default_output_dir_from_urls(urls_file: str | Path) -> str:
@@ -100,7 +105,14 @@ def parse_keywords(raw: str) -> list[str]:
             items.append(s)
     return items
 
-def append_to_word(doc, word_path: Path, url: str, image_path: Path, note: str | None = None) -> None:
+def append_to_word(
+    doc,
+    word_path: Path,
+    url: str,
+    image_path: Path,
+    note: str | None = None,
+    save: bool = True,
+) -> None:
     if note:
         doc.add_paragraph(note)
     doc.add_paragraph(url)
@@ -130,7 +142,63 @@ def append_to_word(doc, word_path: Path, url: str, image_path: Path, note: str |
     else:
         doc.add_picture(str(image_path))
     doc.add_paragraph("")
-    doc.save(word_path)
+    if save:
+        doc.save(word_path)
+
+
+class IncrementalWordDoc:
+    """
+    在記憶體中累積 Word 內容，只在檢查點才存檔。
+
+    每張截圖都 doc.save() 會讓整份 .docx 重新壓縮寫出，
+    批次越大寫出量越接近 O(n^2)。這裡改為每 checkpoint_every 張
+    或每 checkpoint_seconds 秒存檔一次，結束時 close() 做最後一次存檔。
+    bytes_written 累計實際寫出的位元組數，方便比較。
+    """
+
+    def __init__(
+        self,
+        doc,
+        word_path: str | Path,
+        checkpoint_every: int = 0,
+        checkpoint_seconds: float = 0,
+    ):
+        self.doc = doc
+        self.path = Path(word_path)
+        self.checkpoint_every = max(0, int(checkpoint_every))
+        self.checkpoint_seconds = max(0.0, float(checkpoint_seconds))
+        self.pending = 0
+        self.saves = 0
+        self.bytes_written = 0
+        self._last_save = time.monotonic()
+
+    def add(self, url: str, image_path: Path, note: str | None = None) -> None:
+        append_to_word(self.doc, self.path, url, image_path, note, save=False)
+        self.pending += 1
+        if self._checkpoint_due():
+            self.save()
+
+    def _checkpoint_due(self) -> bool:
+        if self.checkpoint_every and self.pending >= self.checkpoint_every:
+            return True
+        if self.checkpoint_seconds and time.monotonic() - self._last_save >= self.checkpoint_seconds:
+            return True
+        return False
+
+    def save(self) -> None:
+        self.doc.save(self.path)
+        try:
+            self.bytes_written += self.path.stat().st_size
+        except OSError:
+            pass
+        self.saves += 1
+        self.pending = 0
+        self._last_save = time.monotonic()
+
+    def close(self) -> None:
+        """最後存檔（沒有未存內容時不重複寫出）。"""
+        if self.pending or self.saves == 0:
+            self.save()
 
 def load_urls(path: str | Path) -> list[tuple[str, str | None]]:
     """
@@ -171,9 +239,27 @@ def load_urls(path: str | Path) -> list[tuple[str, str | None]]:
 
     return urls
 
+def open_done_log(path: str | Path, record_output: bool = True, record_classification: bool = False):
+    """
+    依副檔名開啟完成紀錄：.db / .sqlite / .sqlite3 使用 SqliteDoneStore，
+    其它使用 JSON 快照 + 日誌 (DoneJournal)。兩者介面相同。
+    """
+    path = Path(path)
+    if is_sqlite_path(path):
+        return SqliteDoneStore(path, record_output, record_classification)
+    return DoneJournal(path, record_output, record_classification)
+
+def done_journal_path(path: str | Path) -> Path:
+    """done_urls.json -> done_urls.json.journal (JSON Lines，每行一筆完成紀錄)"""
+    path = Path(path)
+    return path.with_suffix(path.suffix + ".journal")
+
 def load_done_data(path: str | Path) -> tuple[set[str], dict[str, str], dict[str, str]]:
     """
-    讀取已完成的紀錄檔 (JSON)。
+    讀取已完成的紀錄檔 (JSON 快照 + JSON Lines 日誌)。
+    先讀快照（相容舊版 list / dict 格式），再依序重播日誌中的新增紀錄。
+    副檔名為 .db / .sqlite / .sqlite3 時從 SQLite 讀出複本後即關閉連線（不佔住檔案，之後可清除或取代）；
+    執行中需要逐筆查詢的請用 open_done_log。
     
     Args:
         path: 紀錄檔路徑
@@ -185,11 +271,27 @@ def load_done_data(path: str | Path) -> tuple[set[str], dict[str, str], dict[str
             - classes: URL 對應的分類結果 (dict)
     """
     path = Path(path)
+    if is_sqlite_path(path):
+        store = SqliteDoneStore(path, record_output=True, record_classification=True)
+        try:
+            return set(store.urls()), dict(store.outputs.items()), dict(store.classes.items())
+        finally:
+            store.close()
+
     done_set: set[str] = set()
     outputs: dict[str, str] = {}
     classes: dict[str, str] = {}
-    if not path.exists():
-        return done_set, outputs, classes
+    if path.exists():
+        _load_done_snapshot(path, done_set, outputs, classes)
+    _replay_done_journal(done_journal_path(path), done_set, outputs, classes)
+    return done_set, outputs, classes
+
+def _load_done_snapshot(
+    path: Path,
+    done_set: set[str],
+    outputs: dict[str, str],
+    classes: dict[str, str],
+) -> None:
     try:
         with path.open("r", encoding="utf-8") as f:
             data = json.load(f)
@@ -227,7 +329,41 @@ def load_done_data(path: str | Path) -> tuple[set[str], dict[str, str], dict[str
                         done_set.add(k)
     except Exception as exc:
         logger.warning(f"Warning: failed to read done_log, starting fresh: {path} ({exc})")
-    return done_set, outputs, classes
+
+def _replay_done_journal(
+    journal: Path,
+    done_set: set[str],
+    outputs: dict[str, str],
+    classes: dict[str, str],
+) -> int:
+    """重播日誌，回傳有效行數。寫到一半的最後一行（例如當機）會被略過。"""
+    if not journal.exists():
+        return 0
+    count = 0
+    try:
+        with journal.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                url = item.get("url") if isinstance(item, dict) else None
+                if not isinstance(url, str) or not url:
+                    continue
+                done_set.add(url)
+                output = item.get("output")
+                if isinstance(output, str) and output:
+                    outputs[url] = output
+                cls = item.get("class")
+                if isinstance(cls, str) and cls:
+                    classes[url] = cls
+                count += 1
+    except Exception as exc:
+        logger.warning(f"Warning: failed to replay done journal: {journal} ({exc})")
+    return count
 
 def save_done_data(
     path: str | Path,
@@ -249,6 +385,14 @@ def save_done_data(
         record_classification: 是否記錄分類結果
     """
     path = Path(path)
+    if is_sqlite_path(path):
+        store = SqliteDoneStore(path, record_output, record_classification)
+        try:
+            store.replace_all(done_set, outputs, classes, record_output, record_classification)
+        finally:
+            store.close()
+        return
+
     tmp = path.with_suffix(path.suffix + ".tmp")
     if record_output or record_classification:
         data = []
@@ -268,17 +412,124 @@ def save_done_data(
     with tmp.open("w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     tmp.replace(path)
+    # 快照已包含所有紀錄，日誌可以清空
+    done_journal_path(path).unlink(missing_ok=True)
 
 def clear_done_log(path: str | Path) -> bool:
     path = Path(path)
-    if not path.exists():
+    if is_sqlite_path(path):
+        if not path.exists():
+            return False
+        store = SqliteDoneStore(path)
+        try:
+            store.clear()
+        finally:
+            store.close()
+        return True
+    journal = done_journal_path(path)
+    if not path.exists() and not journal.exists():
         return False
     tmp = path.with_suffix(path.suffix + ".tmp")
     with tmp.open("w", encoding="utf-8") as f:
         json.dump([], f, ensure_ascii=False, indent=2)
     tmp.replace(path)
+    journal.unlink(missing_ok=True)
     return True
 
+
+class DoneJournal:
+    """
+    完成紀錄（append-only）。
+
+    每完成一個網址就在 done_urls.json.journal 追加一行 JSON，
+    不必每次 flush 都排序並重寫整份 done_urls.json。
+    日誌累積到 compact_every 行時才合併回快照 (save_done_data)。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        record_output: bool = True,
+        record_classification: bool = False,
+        compact_every: int = DONE_JOURNAL_COMPACT_EVERY,
+    ):
+        self.path = Path(path)
+        self.journal_path = done_journal_path(self.path)
+        self.record_output = record_output
+        self.record_classification = record_classification
+        self.compact_every = max(0, int(compact_every))
+        self.done: set[str] = set()
+        self.outputs: dict[str, str] = {}
+        self.classes: dict[str, str] = {}
+        if self.path.exists():
+            _load_done_snapshot(self.path, self.done, self.outputs, self.classes)
+        self.journal_lines = _replay_done_journal(self.journal_path, self.done, self.outputs, self.classes)
+        self._fh = None
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def record(
+        self,
+        url: str,
+        output: str | None = None,
+        cls: str | None = None,
+        source: str | Path | None = None,
+    ) -> None:
+        """記錄一筆完成網址並立即追加到日誌。"""
+        self.done.add(url)
+        item = {"url": url}
+        if output and self.record_output:
+            self.outputs[url] = output
+            item["output"] = output
+        if cls and self.record_classification:
+            self.classes[url] = cls
+            item["class"] = cls
+        if source:
+            item["source"] = str(source)
+        item["ts"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        if self._fh is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.journal_path.open("a", encoding="utf-8")
+        self._fh.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.journal_lines += 1
+
+    def flush(self) -> None:
+        """日誌夠長時合併為快照。"""
+        if self._fh is not None:
+            self._fh.flush()
+        if self.compact_every and self.journal_lines >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """將目前所有紀錄寫成快照並清空日誌。"""
+        self._close_handle()
+        save_done_data(
+            self.path,
+            self.done,
+            self.outputs,
+            self.classes,
+            self.record_output,
+            record_classification=self.record_classification,
+        )
+        self.journal_lines = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._close_handle()
+
+    def _close_handle(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
 def focus_browser_window() -> bool:
     """
     嘗試將焦點移至瀏覽器視窗。
@@ -309,6 +560,16 @@ def focus_browser_window() -> bool:
     except Exception:
         return False
 
+def active_window_title() -> str | None:
+    """目前作用中視窗的標題；無法取得時回傳 None。"""
+    if gw is None:
+        return None
+    try:
+        win = gw.getActiveWindow()
+        return (win.title or "") if win is not None else None
+    except Exception:
+        return None
+
 def click_window_corner(where: str = "bottom_left", double: bool = False) -> None:
     try:
         focus_browser_window()
@@ -0,0 +1,159 @@
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+
+from config import (
+    WAIT_PROFILE_MARGIN_SECONDS,
+    WAIT_PROFILE_MAX_SAMPLES,
+    WAIT_PROFILE_MAX_SECONDS,
+    WAIT_PROFILE_MIN_SAMPLES,
+)
+from host_scheduler import host_of
+from logger_setup import logger
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """線性內插百分位數（q: 0 ~ 100）；sorted_values 需已排序且非空。"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class WaitProfiles:
+    """
+    各網域（netloc）開頁到就緒的秒數紀錄，跨執行保存在 JSON 檔：
+    {"hosts": {"shopee.tw": {"samples": [3.2, 4.0, ...], "timeouts": 1, "updated": "..."}}}
+    樣本來自自適應等待（頁面穩定所需時間）與瀏覽器引擎（load + networkidle）。
+    未等到穩定的頁面以實際等待秒數記錄並計入 timeouts，讓慢網域的上限自動拉長。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_samples: int = WAIT_PROFILE_MAX_SAMPLES,
+        min_samples: int = WAIT_PROFILE_MIN_SAMPLES,
+    ):
+        self.path = Path(path)
+        self.max_samples = max(1, int(max_samples))
+        self.min_samples = max(1, int(min_samples))
+        self.hosts: dict[str, dict] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.hosts = {
+                host: {
+                    "samples": [float(s) for s in entry.get("samples", [])][-self.max_samples:],
+                    "timeouts": int(entry.get("timeouts", 0)),
+                    "updated": entry.get("updated", ""),
+                }
+                for host, entry in data.get("hosts", {}).items()
+            }
+        except Exception as exc:
+            logger.warning(f"Failed to load wait profiles ({self.path}): {exc}")
+            self.hosts = {}
+
+    def save(self) -> None:
+        """有新樣本才寫檔（先寫暫存檔再取代）。"""
+        if not self.dirty:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump({"hosts": self.hosts}, f, ensure_ascii=False, indent=2)
+            tmp.replace(self.path)
+            self.dirty = False
+        except Exception as exc:
+            logger.warning(f"Failed to save wait profiles ({self.path}): {exc}")
+
+    def record(self, url: str, seconds: float, ready: bool = True) -> None:
+        host = host_of(url)
+        if not host:
+            return
+        entry = self.hosts.setdefault(host, {"samples": [], "timeouts": 0, "updated": ""})
+        entry["samples"].append(round(max(0.0, float(seconds)), 2))
+        del entry["samples"][:-self.max_samples]
+        if not ready:
+            entry["timeouts"] += 1
+        entry["updated"] = datetime.now().isoformat(timespec="seconds")
+        self.dirty = True
+
+    def merge(self, other: "WaitProfiles") -> None:
+        """併入另一份紀錄的新樣本（分片執行各程序分開記錄，結束時合併）。"""
+        for host, entry in other.hosts.items():
+            if not entry["samples"]:
+                continue
+            mine = self.hosts.setdefault(host, {"samples": [], "timeouts": 0, "updated": ""})
+            mine["samples"].extend(entry["samples"])
+            del mine["samples"][:-self.max_samples]
+            mine["timeouts"] += entry["timeouts"]
+            mine["updated"] = max(mine["updated"], entry["updated"])
+            self.dirty = True
+
+    def percentiles(self, host: str, qs=(50, 90, 95)) -> dict[int, float] | None:
+        entry = self.hosts.get(host)
+        if not entry or not entry["samples"]:
+            return None
+        values = sorted(entry["samples"])
+        return {q: percentile(values, q) for q in qs}
+
+    def wait_range(self, url: str, default: tuple[int, int], adaptive: bool = False) -> tuple[int, int]:
+        """
+        依歷史紀錄決定這個網址的等待範圍；樣本不足時回傳 default。
+        固定倒數：在 p50 ~ p90 之間隨機（+ 緩衝）。
+        自適應等待：下限取 p10（太早的「穩定」多半是白畫面），上限取 p95 x 1.5（+ 緩衝）。
+        """
+        host = host_of(url)
+        entry = self.hosts.get(host)
+        if not entry or len(entry["samples"]) < self.min_samples:
+            return default
+        p = self.percentiles(host, (10, 50, 90, 95))
+        if adaptive:
+            lo = math.floor(p[10])
+            hi = math.ceil(p[95] * 1.5) + WAIT_PROFILE_MARGIN_SECONDS
+        else:
+            lo = math.ceil(p[50])
+            hi = math.ceil(p[90]) + WAIT_PROFILE_MARGIN_SECONDS
+        hi = min(max(hi, lo + 1), WAIT_PROFILE_MAX_SECONDS)
+        return min(lo, hi), hi
+
+    def report_rows(self, default: tuple[int, int], adaptive: bool = False) -> list[dict]:
+        rows = []
+        for host, entry in sorted(self.hosts.items(), key=lambda kv: -len(kv[1]["samples"])):
+            p = self.percentiles(host) or {50: 0.0, 90: 0.0, 95: 0.0}
+            learned = len(entry["samples"]) >= self.min_samples
+            rows.append({
+                "host": host,
+                "samples": len(entry["samples"]),
+                "timeouts": entry["timeouts"],
+                "p50": round(p[50], 1),
+                "p90": round(p[90], 1),
+                "p95": round(p[95], 1),
+                "wait_range": self.wait_range(f"https://{host}/", default, adaptive) if learned else None,
+                "updated": entry["updated"],
+            })
+        return rows
+
+    def format_report(self, default: tuple[int, int], adaptive: bool = False) -> str:
+        rows = self.report_rows(default, adaptive)
+        if not rows:
+            return f"尚無網域等待紀錄（{self.path}）"
+        lines = [
+            f"網域等待紀錄：{self.path}（{'自適應等待' if adaptive else '固定倒數'}，預設 {default[0]}-{default[1]} 秒）",
+            f"{'網域':<32} {'樣本':>4} {'逾時':>4} {'p50':>6} {'p90':>6} {'p95':>6}  建議等待",
+        ]
+        for r in rows:
+            rng = f"{r['wait_range'][0]}-{r['wait_range'][1]} 秒" if r["wait_range"] else f"樣本不足（需 {self.min_samples}）"
+            lines.append(
+                f"{r['host']:<32} {r['samples']:>4} {r['timeouts']:>4} {r['p50']:>6.1f} {r['p90']:>6.1f} {r['p95']:>6.1f}  {rng}"
+            )
+        return "\n".join(lines)